@@ -1,16 +1,16 @@
 import numpy as np
 import os
-import random
-import pickle
 
 from PyQt5.QtCore import QThread, pyqtSignal, QMutex, QWaitCondition, QTimer
 
 
 # Import your modules accordingly
 from modules.FRF import frf
+from modules.evaluator import Evaluator
 from modules.sobol_sensitivity import (
     perform_sobol_analysis
 )
+from RL.experience import POLICY_FILE, ExperienceBuffer, migrate_legacy_file
 
 class RLWorker(QThread):
     """
@@ -89,7 +89,16 @@ class RLWorker(QThread):
         rl_inverse_decay_coefficient=1.0,
         rl_step_interval=10,
         rl_step_decay_amount=None,
-        rl_cosine_decay_amplitude=1.0
+        rl_cosine_decay_amplitude=1.0,
+
+        # Evaluation engine ("serial", "thread", "process" or "batch")
+        evaluation_backend="serial",
+        evaluation_workers=None,
+
+        # Vectorized environments: K copies of the environment share the
+        # policy; every step proposes K parameter vectors, evaluates them as
+        # one batch and updates the policy on the K transitions
+        rl_num_envs=1
     ):
         """
         Initialize the RL worker with scientifically sound continuous optimization approach.
@@ -101,6 +110,10 @@ class RLWorker(QThread):
         self.omega_start = omega_start
         self.omega_end = omega_end
         self.omega_points = omega_points
+        self.evaluator = Evaluator(
+            main_params, omega_start, omega_end, omega_points, target_values_dict, weights_dict,
+            backend=evaluation_backend, n_workers=evaluation_workers,
+        )
 
         # RL Hyperparameters
         self.rl_num_episodes = rl_num_episodes
@@ -122,6 +135,7 @@ class RLWorker(QThread):
         self.batch_size = batch_size
         self.tau = tau
         self.noise_std = noise_std
+        self.rl_num_envs = max(1, int(rl_num_envs))
 
         # Extra epsilon decay parameters
         self.rl_linear_decay_step = rl_linear_decay_step
@@ -154,17 +168,21 @@ class RLWorker(QThread):
         self.policy_weights = np.random.randn(self.num_params) * 0.1
         self.policy_bias = np.zeros(self.num_params)
         
-        # Experience replay buffer
-        self.experience_buffer = []
+        # Experience replay buffer: (parameters, reward = -fitness) transitions
+        # in a preallocated ring; the policy is stateless, so no states
+        self.experience_buffer = ExperienceBuffer(self.replay_buffer_size, self.num_params)
         
         # Track best solution
         self.best_fitness = float('inf')  # Lower is better (consistent with other methods)
         self.best_solution = None
         self.episode_rewards = []
         
-        # Load existing experience if requested
-        if self.load_existing_experience and self.experience_save_path is not None:
-            self._load_experience()
+        if self.experience_save_path is not None:
+            # Earlier versions saved a single pickle file at this path
+            self._migrate_legacy_experience()
+            # Load existing experience if requested
+            if self.load_existing_experience:
+                self._load_experience()
 
         # Thread safety mechanisms - consistent with GAWorker and PSOWorker
         self.mutex = QMutex()                   # Mutex for critical sections
@@ -178,33 +196,52 @@ class RLWorker(QThread):
         self.watchdog_timer.timeout.connect(self.handle_timeout)
         self.last_progress_update = 0
 
+    def _migrate_legacy_experience(self):
+        """
+        Turn an experience file of the earlier pickle format into an
+        experience directory. Raises ValueError if the path is some other file.
+        """
+        if os.path.isfile(self.experience_save_path):
+            migrated = migrate_legacy_file(self.experience_save_path, self.num_params)
+            print(f"Converted legacy experience file {self.experience_save_path} to a directory "
+                  f"({migrated} transitions)")
+
     def _load_experience(self):
-        """Load existing experience from file"""
-        if os.path.exists(self.experience_save_path):
+        """
+        Load existing experience from the experience directory: the most
+        recent transitions of its segments plus the saved policy.
+        """
+        if os.path.isdir(self.experience_save_path):
             try:
-                with open(self.experience_save_path, 'rb') as f:
-                    data = pickle.load(f)
-                    self.experience_buffer = data.get('experience_buffer', [])
-                    self.policy_weights = data.get('policy_weights', self.policy_weights)
-                    self.policy_bias = data.get('policy_bias', self.policy_bias)
-                print(f"Experience loaded from {self.experience_save_path}")
+                loaded = self.experience_buffer.load(self.experience_save_path)
+                policy_path = os.path.join(self.experience_save_path, POLICY_FILE)
+                if os.path.exists(policy_path):
+                    with np.load(policy_path) as policy:
+                        if policy['weights'].shape == self.policy_weights.shape:
+                            self.policy_weights = policy['weights'].copy()
+                            self.policy_bias = policy['bias'].copy()
+                print(f"Experience loaded from {self.experience_save_path} ({loaded} transitions)")
             except Exception as e:
                 print(f"Error loading experience: {e}")
 
     def _save_experience(self):
-        """Save experience to file"""
+        """
+        Save experience to the experience directory. Only the transitions
+        gathered since the last save are written (as a new segment); the
+        policy file is small and is replaced.
+        """
         if self.experience_save_path is not None:
             try:
-                data = {
-                    'experience_buffer': self.experience_buffer,
-                    'policy_weights': self.policy_weights,
-                    'policy_bias': self.policy_bias
-                }
-                with open(self.experience_save_path, 'wb') as f:
-                    pickle.dump(data, f)
-                print(f"Experience saved to {self.experience_save_path}")
+                self._migrate_legacy_experience()
+                written = self.experience_buffer.save(self.experience_save_path)
+                os.makedirs(self.experience_save_path, exist_ok=True)
+                policy_path = os.path.join(self.experience_save_path, POLICY_FILE)
+                with open(policy_path + ".tmp", 'wb') as f:
+                    np.savez(f, weights=self.policy_weights, bias=self.policy_bias)
+                os.replace(policy_path + ".tmp", policy_path)
+                print(f"Experience saved to {self.experience_save_path} ({written} new transitions)")
             except Exception as e:
-                print(f"Error saving experience: {e}")
+                self.update.emit(f"Error saving experience: {e}")
 
     def __del__(self):
         """
@@ -255,6 +292,10 @@ class RLWorker(QThread):
         # Stop the watchdog timer if it's running
         if hasattr(self, 'watchdog_timer') and self.watchdog_timer.isActive():
             self.watchdog_timer.stop()
+
+        # Stop the evaluation threads/processes
+        if hasattr(self, 'evaluator'):
+            self.evaluator.close()
         
         # Clear experience buffer to free memory
         if hasattr(self, 'experience_buffer'):
@@ -271,53 +312,41 @@ class RLWorker(QThread):
         Generate DVA parameters using current policy.
         This replaces the inappropriate tabular Q-learning approach.
         """
+        return self.generate_parameters_batch(1, add_noise)[0]
+
+    def generate_parameters_batch(self, n, add_noise=True):
+        """
+        Generate n DVA parameter vectors from the current policy at once
+        (one per environment or step), each with its own exploration noise.
+        """
         # Generate base parameters using policy
-        raw_params = self.policy_weights + self.policy_bias
+        raw_params = np.tile(self.policy_weights + self.policy_bias, (n, 1))
         
         # Add exploration noise if requested
         if add_noise and self.rl_epsilon > 0:
-            noise = np.random.normal(0, self.noise_std * self.rl_epsilon, self.num_params)
-            raw_params += noise
+            raw_params += np.random.normal(0, self.noise_std * self.rl_epsilon, (n, self.num_params))
         
-        # Apply bounds and handle fixed parameters
-        bounded_params = []
-        for i, (low, high) in enumerate(self.parameter_bounds):
-            if i in self.fixed_parameters:
-                bounded_params.append(self.fixed_parameters[i])
-            else:
-                # Normalize to [0,1] then scale to bounds
-                normalized = 1 / (1 + np.exp(-raw_params[i]))  # Sigmoid activation
-                scaled = low + normalized * (high - low)
-                bounded_params.append(scaled)
+        # Normalize to [0,1] with a sigmoid, then scale to the bounds
+        low = np.array([b[0] for b in self.parameter_bounds], dtype=float)
+        high = np.array([b[1] for b in self.parameter_bounds], dtype=float)
+        bounded_params = low + (high - low) / (1 + np.exp(-raw_params))
+        for i, value in self.fixed_parameters.items():
+            bounded_params[:, i] = value
         
-        return bounded_params
+        return bounded_params.tolist()
 
-    def evaluate_parameters(self, params):
+    def evaluate_parameters(self, params, results=None):
         """
         Evaluate DVA parameters using FRF analysis.
         This uses the same fitness function as GA, PSO, and SA for consistency.
+        FRF summaries already computed by the evaluation engine are passed in
+        as results.
         """
         try:
-            results = frf(
-                main_system_parameters=self.main_params,
-                dva_parameters=tuple(params),
-                omega_start=self.omega_start,
-                omega_end=self.omega_end,
-                omega_points=self.omega_points,
-                target_values_mass1=self.target_values_dict['mass_1'],
-                weights_mass1=self.weights_dict['mass_1'],
-                target_values_mass2=self.target_values_dict['mass_2'],
-                weights_mass2=self.weights_dict['mass_2'],
-                target_values_mass3=self.target_values_dict['mass_3'],
-                weights_mass3=self.weights_dict['mass_3'],
-                target_values_mass4=self.target_values_dict['mass_4'],
-                weights_mass4=self.weights_dict['mass_4'],
-                target_values_mass5=self.target_values_dict['mass_5'],
-                weights_mass5=self.weights_dict['mass_5'],
-                plot_figure=False,
-                show_peaks=False,
-                show_slopes=False
-            )
+            if results is None:
+                results = self.evaluator.evaluate(params)
+            if "error" in results:
+                return 1e6, {"Error": results["error"]}
             
             # Extract singular response (consistent with other methods)
             singular_response = results.get('singular_response', None)
@@ -334,35 +363,31 @@ class RLWorker(QThread):
         except Exception as e:
             return 1e6, {"Error": str(e)}
 
-    def update_policy(self, experiences):
+    def update_policy(self, experiences, batch_size=None, fresh=0):
         """
         Update the policy based on collected experiences.
         Uses policy gradient approach suitable for continuous optimization.
+        The minibatch (batch_size, default self.batch_size) is drawn from
+        the ExperienceBuffer as arrays and the gradients are averaged over
+        it in one operation. The `fresh` most recent transitions are always
+        part of it, topped up with random older ones.
         """
-        if len(experiences) < self.batch_size:
+        batch_size = batch_size or self.batch_size
+        if len(experiences) < batch_size and not fresh:
             return
         
-        # Sample batch from experiences
-        batch = random.sample(experiences, min(self.batch_size, len(experiences)))
+        # Sample batch from experiences; the rewards are -fitness, so the
+        # advantage of a transition is its reward (higher is better)
+        _, params, advantages = experiences.sample(batch_size, include_latest=fresh)
         
-        # Calculate policy gradients
-        policy_gradient_weights = np.zeros_like(self.policy_weights)
-        policy_gradient_bias = np.zeros_like(self.policy_bias)
-        
-        for params, fitness, _ in batch:
-            # Calculate advantage (lower fitness is better)
-            advantage = -fitness  # Convert to reward (higher is better)
-            
-            # Calculate gradients (simplified policy gradient)
-            for i in range(self.num_params):
-                if i not in self.fixed_parameters:
-                    # Gradient with respect to policy parameters
-                    policy_gradient_weights[i] += advantage * params[i] * self.rl_alpha
-                    policy_gradient_bias[i] += advantage * self.rl_alpha
+        # Simplified policy gradient; fixed parameters are not learned
+        free = np.array([i not in self.fixed_parameters for i in range(self.num_params)])
+        policy_gradient_weights = self.rl_alpha * np.mean(advantages[:, None] * params, axis=0) * free
+        policy_gradient_bias = self.rl_alpha * np.mean(advantages) * free
         
         # Update policy parameters
-        self.policy_weights += policy_gradient_weights / len(batch)
-        self.policy_bias += policy_gradient_bias / len(batch)
+        self.policy_weights += policy_gradient_weights
+        self.policy_bias += policy_gradient_bias
         
         # Apply weight decay for regularization
         self.policy_weights *= 0.999
@@ -467,48 +492,64 @@ class RLWorker(QThread):
                 
                 self.update.emit(f"--- RL Episode {episode}/{self.rl_num_episodes} ---")
                 episode_best_fitness = float('inf')
-                episode_experiences = []
 
                 # Update progress bar - consistent with GAWorker
                 progress_percent = int((episode / self.rl_num_episodes) * 100)
                 self.progress.emit(progress_percent)
 
-                for step in range(self.rl_max_steps):
-                    # Check for termination within episode steps
+                if self.rl_num_envs > 1:
+                    # Vectorized environments: every step evaluates the K
+                    # proposals in one batch, then updates the policy
+                    step_sizes = [self.rl_num_envs] * self.rl_max_steps
+                else:
+                    # The policy only changes between episodes, so all steps are
+                    # sampled first and evaluated in one call to the evaluation engine
+                    step_sizes = [self.rl_max_steps]
+
+                for n_proposals in step_sizes:
                     if self.abort or self._terminate_flag:
                         break
+
+                    step_params = self.generate_parameters_batch(n_proposals, add_noise=True)
+                    step_results = self.evaluator.evaluate_many(
+                        step_params, should_stop=lambda: self.abort or self._terminate_flag
+                    )
+
+                    step_fitness = []
+                    for params, summary in zip(step_params, step_results):
+                        # Check for termination within episode steps
+                        if summary is None or self.abort or self._terminate_flag:
+                            break
                         
-                    # Generate parameters using current policy
-                    params = self.generate_parameters(add_noise=True)
-                    
-                    # Evaluate parameters
-                    fitness, results = self.evaluate_parameters(params)
-                    
-                    # Store experience
-                    experience = (params, fitness, results)
-                    episode_experiences.append(experience)
-                    
-                    # Update best solution
-                    if fitness < self.best_fitness:
-                        self.best_fitness = fitness
-                        self.best_solution = params.copy()
+                        # Evaluate parameters
+                        fitness, results = self.evaluate_parameters(params, results=summary)
+                        step_fitness.append(fitness)
+                        
+                        # Update best solution
+                        if fitness < self.best_fitness:
+                            self.best_fitness = fitness
+                            self.best_solution = params.copy()
+                        
+                        if fitness < episode_best_fitness:
+                            episode_best_fitness = fitness
+
+                    # Check for termination before processing experiences
+                    if self.abort or self._terminate_flag:
+                        break
+
+                    # Store experience in the replay buffer (the oldest are
+                    # overwritten once it holds replay_buffer_size transitions)
+                    self.experience_buffer.add(step_params[:len(step_fitness)], -np.array(step_fitness, dtype=float))
                     
-                    if fitness < episode_best_fitness:
-                        episode_best_fitness = fitness
+                    # Update policy based on experiences; with K environments
+                    # each update uses the K transitions just collected,
+                    # topped up from the replay buffer to batch_size
+                    fresh = len(step_fitness) if self.rl_num_envs > 1 else 0
+                    self.update_policy(self.experience_buffer, max(self.batch_size, self.rl_num_envs), fresh)
 
-                # Check for termination before processing experiences
+                # Check for termination before the episode's bookkeeping
                 if self.abort or self._terminate_flag:
                     break
-
-                # Add experiences to replay buffer
-                self.experience_buffer.extend(episode_experiences)
-                
-                # Limit buffer size
-                if len(self.experience_buffer) > self.replay_buffer_size:
-                    self.experience_buffer = self.experience_buffer[-self.replay_buffer_size:]
-                
-                # Update policy based on experiences
-                self.update_policy(self.experience_buffer)
                 
                 # Update exploration rate
                 self.update_epsilon(episode)
@@ -0,0 +1,249 @@
+# experience.py
+
+import glob
+import os
+import pickle
+
+import numpy as np
+
+# -----------------------------------------------------------------------------
+# Configuration
+# -----------------------------------------------------------------------------
+
+# On disk, every save appends one segment file holding the experience added
+# since the previous save: a (rows, 1 + state_dim + action_dim) float array
+# with the reward in the first column
+SEGMENT_PATTERN = "experience_{:06d}.npy"
+SEGMENT_GLOB = "experience_*.npy"
+
+# Policy of the agent, stored next to the segments as an .npz with 'weights'
+# and 'bias' arrays
+POLICY_FILE = "policy.npz"
+
+# Earlier versions pickled the whole buffer to a single file at the save
+# path; a migrated file is kept under its old name plus this suffix
+LEGACY_SUFFIX = ".legacy.pkl"
+
+# -----------------------------------------------------------------------------
+# Replay buffer
+# -----------------------------------------------------------------------------
+
+class ExperienceBuffer:
+    """
+    Fixed-capacity replay buffer of (state, action, reward) transitions.
+
+    Transitions live in preallocated NumPy arrays used as a ring: once the
+    buffer is full, new transitions overwrite the oldest ones. Minibatches
+    are drawn as one index array into them instead of a list of tuples.
+
+    ``save`` appends only the transitions added since the previous save as a
+    new segment file, and ``load`` memory-maps the segments from the newest
+    backwards and copies just the rows that fit, so the cost of both scales
+    with the new experience and the capacity, not with the whole history.
+
+    Parameters:
+    -----------
+    capacity : int
+        Maximum number of transitions kept
+    action_dim : int
+        Length of an action (parameter vector)
+    state_dim : int
+        Length of a state; 0 for a stateless policy
+    """
+
+    def __init__(self, capacity, action_dim, state_dim=0):
+        self.capacity = max(1, int(capacity))
+        self.action_dim = int(action_dim)
+        self.state_dim = int(state_dim)
+        self.states = np.zeros((self.capacity, self.state_dim))
+        self.actions = np.zeros((self.capacity, self.action_dim))
+        self.rewards = np.zeros(self.capacity)
+        self._next = 0
+        self._size = 0
+        # Transitions added since the last save (at most capacity survive)
+        self._unsaved = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, actions, rewards, states=None):
+        """
+        Append a batch of transitions, overwriting the oldest when full.
+
+        Parameters:
+        -----------
+        actions : array-like
+            (N, action_dim) actions
+        rewards : array-like
+            (N,) rewards
+        states : array-like, optional
+            (N, state_dim) states; zeros if omitted
+        """
+        actions = np.asarray(actions, dtype=float).reshape(-1, self.action_dim)
+        rewards = np.asarray(rewards, dtype=float).reshape(-1)
+        n = len(actions)
+        if n == 0:
+            return
+        if states is None:
+            states = np.zeros((n, self.state_dim))
+        states = np.asarray(states, dtype=float).reshape(n, self.state_dim)
+        if n > self.capacity:
+            actions, rewards, states = actions[-self.capacity:], rewards[-self.capacity:], states[-self.capacity:]
+            n = self.capacity
+        rows = (self._next + np.arange(n)) % self.capacity
+        self.actions[rows] = actions
+        self.rewards[rows] = rewards
+        self.states[rows] = states
+        self._next = (self._next + n) % self.capacity
+        self._size = min(self.capacity, self._size + n)
+        self._unsaved = min(self.capacity, self._unsaved + n)
+
+    def _latest_rows(self, n):
+        """Ring rows of the n most recent transitions, oldest first."""
+        return (self._next - n + np.arange(n)) % self.capacity
+
+    def sample(self, batch_size, include_latest=0):
+        """
+        Draw a minibatch without replacement.
+
+        Parameters:
+        -----------
+        batch_size : int
+            Transitions drawn (at most the number held)
+        include_latest : int
+            The most recent transitions always in the minibatch; it is topped
+            up to batch_size with random older ones
+
+        Returns:
+        --------
+        states, actions, rewards : np.ndarray
+            (B, state_dim), (B, action_dim) and (B,) arrays
+        """
+        if include_latest <= 0:
+            # Until the ring wraps the transitions fill rows 0..size-1
+            rows = np.random.choice(self._size, min(batch_size, self._size), replace=False)
+        else:
+            n_latest = min(int(include_latest), self._size)
+            n_older = min(max(0, batch_size - n_latest), self._size - n_latest)
+            # Older transitions counted backwards from the newest of them
+            ages = np.random.choice(self._size - n_latest, n_older, replace=False)
+            older = (self._next - n_latest - 1 - ages) % self.capacity
+            rows = np.concatenate([self._latest_rows(n_latest), older])
+        return self.states[rows], self.actions[rows], self.rewards[rows]
+
+    def clear(self):
+        """Forget all transitions (the arrays are kept)."""
+        self._next = self._size = self._unsaved = 0
+
+    # -------------------------------------------------------------------------
+    # Persistence
+    # -------------------------------------------------------------------------
+
+    def save(self, directory):
+        """
+        Append the transitions added since the last save to ``directory`` as
+        a new segment. The segment is written under a temporary name and
+        renamed, so an interrupted save never leaves a partial segment.
+
+        Returns:
+        --------
+        int
+            Number of transitions written
+        """
+        if self._unsaved == 0:
+            return 0
+        os.makedirs(directory, exist_ok=True)
+        rows = self._latest_rows(self._unsaved)
+        segment = np.column_stack([self.rewards[rows], self.states[rows], self.actions[rows]])
+        existing = sorted(glob.glob(os.path.join(directory, SEGMENT_GLOB)))
+        index = int(os.path.basename(existing[-1])[len("experience_"):-len(".npy")]) + 1 if existing else 0
+        path = os.path.join(directory, SEGMENT_PATTERN.format(index))
+        temporary = path + ".tmp"
+        with open(temporary, "wb") as f:
+            np.save(f, segment)
+        os.replace(temporary, path)
+        written = self._unsaved
+        self._unsaved = 0
+        return written
+
+    def load(self, directory):
+        """
+        Fill the buffer with the most recent saved transitions of
+        ``directory``. Segments are memory-mapped from the newest backwards
+        until the buffer is full; segments of another shape (e.g. a different
+        number of parameters) are skipped.
+
+        Returns:
+        --------
+        int
+            Number of transitions loaded
+        """
+        width = 1 + self.state_dim + self.action_dim
+        parts = []
+        needed = self.capacity
+        for path in sorted(glob.glob(os.path.join(directory, SEGMENT_GLOB)), reverse=True):
+            if needed == 0:
+                break
+            segment = np.load(path, mmap_mode="r")
+            if segment.ndim != 2 or segment.shape[1] != width:
+                continue
+            part = np.array(segment[-needed:])
+            parts.append(part)
+            needed -= len(part)
+        self.clear()
+        if parts:
+            data = np.concatenate(parts[::-1])
+            self.add(data[:, 1 + self.state_dim:], data[:, 0], data[:, 1:1 + self.state_dim])
+            # Loaded transitions are already on disk
+            self._unsaved = 0
+        return self._size
+
+# -----------------------------------------------------------------------------
+# Legacy format
+# -----------------------------------------------------------------------------
+
+def migrate_legacy_file(path, action_dim, state_dim=0):
+    """
+    Convert an experience file of the earlier pickle format into an
+    experience directory at the same path.
+
+    The pickle holds a dict with 'experience_buffer', a list of
+    ``(params, fitness, ...)`` tuples, and optionally 'policy_weights' and
+    'policy_bias'. The transitions become the first segment (reward =
+    -fitness; tuples of another length of params are dropped), the policy is
+    written to POLICY_FILE, and the original file is kept as
+    ``path + LEGACY_SUFFIX``.
+
+    Returns:
+    --------
+    int
+        Number of transitions migrated
+
+    Raises:
+    -------
+    ValueError
+        If ``path`` is a file that is not a legacy experience pickle
+    """
+    try:
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        transitions = list(data.get("experience_buffer", []))
+        weights, bias = data.get("policy_weights"), data.get("policy_bias")
+    except Exception as e:
+        raise ValueError(
+            f"Experience path {path} is a file but experience is now saved to a directory; "
+            f"it is not a legacy experience pickle either, so move or delete it ({e})"
+        ) from e
+    rows = [(np.asarray(t[0], dtype=float).ravel(), float(t[1])) for t in transitions
+            if len(t) >= 2 and np.size(t[0]) == action_dim]
+
+    os.replace(path, path + LEGACY_SUFFIX)
+    os.makedirs(path, exist_ok=True)
+    if rows:
+        buffer = ExperienceBuffer(len(rows), action_dim, state_dim)
+        buffer.add(np.array([r[0] for r in rows]), -np.array([r[1] for r in rows]))
+        buffer.save(path)
+    if weights is not None and bias is not None:
+        np.savez(os.path.join(path, POLICY_FILE),
+                 weights=np.asarray(weights, dtype=float), bias=np.asarray(bias, dtype=float))
+    return len(rows)
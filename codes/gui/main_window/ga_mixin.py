@@ -48,7 +48,10 @@ import time
 from computational_metrics_new import visualize_all_metrics, ensure_all_visualizations_visible
 from modules.plotwindow import PlotWindow
 from workers.GAWorker import GAWorker, build_random_validation_payload
-from modules.FRF import frf
+from workers.GABenchmarkWorker import GABenchmarkWorker
+from workers.GAIslandWorker import GAIslandWorker, MIGRATION_TOPOLOGIES
+from modules.frf_cache import cached_frf
+from modules.evaluator import EVALUATION_BACKENDS, Evaluator
 from scipy.stats import qmc
 
 class GAOptimizationMixin:
@@ -1450,6 +1453,46 @@ class GAOptimizationMixin:
         self.ga_benchmark_runs_box.setRange(1, 1000)
         self.ga_benchmark_runs_box.setValue(1)
         self.ga_benchmark_runs_box.setToolTip("Number of times to run the GA for benchmarking (1 = single run)")
+
+        # How GA and random validation evaluate designs ("distributed" uses the
+        # broker named by the DEVANA_BROKER environment variable)
+        self.ga_eval_backend_combo = QComboBox()
+        self.ga_eval_backend_combo.addItems(list(EVALUATION_BACKENDS))
+        self.ga_eval_backend_combo.setCurrentText("process")
+        self.ga_eval_backend_combo.setToolTip(
+            "FRF evaluation backend; 'distributed' sends populations to the broker set in DEVANA_BROKER (host:port)")
+
+        # Generational GA or asynchronous steady-state GA (no generation barrier)
+        self.ga_mode_combo = QComboBox()
+        self.ga_mode_combo.addItems(["Generational", "Steady-State (asynchronous)"])
+        self.ga_mode_combo.setToolTip(
+            "Steady-state keeps the evaluation pool busy: each offspring replaces the worst individual "
+            "as soon as it is evaluated; progress is reported in evaluations")
+
+        # Island model: sub-populations in separate processes exchanging elites
+        self.ga_islands_box = QSpinBox()
+        self.ga_islands_box.setRange(1, 64)
+        self.ga_islands_box.setValue(1)
+        self.ga_islands_box.setToolTip(
+            "Number of islands (sub-populations of Population Size each, run in separate processes; 1 = single population)")
+        self.ga_island_topology_combo = QComboBox()
+        self.ga_island_topology_combo.addItems(list(MIGRATION_TOPOLOGIES))
+        self.ga_island_topology_combo.setToolTip("Which islands receive the elites of each island")
+        self.ga_migration_interval_box = QSpinBox()
+        self.ga_migration_interval_box.setRange(1, 10000)
+        self.ga_migration_interval_box.setValue(5)
+        self.ga_migration_interval_box.setToolTip("Generations between migrations")
+        self.ga_migrants_box = QSpinBox()
+        self.ga_migrants_box.setRange(1, 1000)
+        self.ga_migrants_box.setValue(2)
+        self.ga_migrants_box.setToolTip("Best individuals sent to each receiving island per migration")
+
+        # Cores shared by concurrent benchmark runs and their evaluation workers
+        self.ga_benchmark_cores_box = QSpinBox()
+        self.ga_benchmark_cores_box.setRange(1, max(1, os.cpu_count() or 1))
+        self.ga_benchmark_cores_box.setValue(max(1, os.cpu_count() or 1))
+        self.ga_benchmark_cores_box.setToolTip(
+            "Cores used by benchmark runs (runs execute concurrently in separate processes; 1 = one run after another)")
         
         # Controller selection (mutually exclusive): None, Adaptive, ML Bandit, RL
         controller_group = QGroupBox("Controller (choose one)")
@@ -1620,6 +1663,13 @@ class GAOptimizationMixin:
         enh_group.updateGeometry()
         ga_hyper_layout.update()
         ga_hyper_layout.addRow("Benchmark Runs:", self.ga_benchmark_runs_box)
+        ga_hyper_layout.addRow("Benchmark Core Budget:", self.ga_benchmark_cores_box)
+        ga_hyper_layout.addRow("Evaluation Backend:", self.ga_eval_backend_combo)
+        ga_hyper_layout.addRow("Evolution Mode:", self.ga_mode_combo)
+        ga_hyper_layout.addRow("Islands:", self.ga_islands_box)
+        ga_hyper_layout.addRow("Migration Topology:", self.ga_island_topology_combo)
+        ga_hyper_layout.addRow("Migration Interval:", self.ga_migration_interval_box)
+        ga_hyper_layout.addRow("Migrants per Island:", self.ga_migrants_box)
         ga_hyper_layout.addRow("", self.adaptive_rates_checkbox)
         ga_hyper_layout.addRow("", self.adaptive_rates_options)
 
@@ -2898,7 +2948,8 @@ class GAOptimizationMixin:
                      method,
                      num_samples,
                      seed,
-                     respect_fixed):
+                     respect_fixed,
+                     evaluation_backend=None):
             super().__init__()
             self.main_params = main_params
             self.omega_start = omega_start
@@ -2941,6 +2992,8 @@ class GAOptimizationMixin:
             self.num_samples = num_samples
             self.seed = seed if seed is not None and seed >= 0 else None
             self.respect_fixed = respect_fixed
+            # Optional Evaluator backend (e.g. "distributed") evaluating all samples up front
+            self.evaluation_backend = evaluation_backend
             self.abort = False
 
         def _sample_matrix(self):
@@ -3007,31 +3060,34 @@ class GAOptimizationMixin:
                 thr = float(self.dva_activation_threshold) if self.dva_activation_threshold is not None else 0.0
                 pen_per = float(self.dva_activation_penalty) if self.dva_activation_penalty is not None else 0.0
 
+                prefetched = None
+                if self.evaluation_backend:
+                    with Evaluator(main_params, omega_start, omega_end, omega_points, target_values, weights,
+                                   backend=self.evaluation_backend, frf_options={'summary': False},
+                                   log=print) as evaluator:
+                        prefetched = evaluator.evaluate_many(X, should_stop=lambda: self.abort)
+
                 for i in range(n):
                     if self.abort:
                         break
                     dva_params = tuple(float(v) for v in X[i, :])
                     try:
-                        res = frf(
-                            main_system_parameters=main_params,
-                            dva_parameters=dva_params,
-                            omega_start=omega_start,
-                            omega_end=omega_end,
-                            omega_points=omega_points,
-                            target_values_mass1=target_values['mass_1'],
-                            weights_mass1=weights['mass_1'],
-                            target_values_mass2=target_values['mass_2'],
-                            weights_mass2=weights['mass_2'],
-                            target_values_mass3=target_values['mass_3'],
-                            weights_mass3=weights['mass_3'],
-                            target_values_mass4=target_values['mass_4'],
-                            weights_mass4=weights['mass_4'],
-                            target_values_mass5=target_values['mass_5'],
-                            weights_mass5=weights['mass_5'],
-                            plot_figure=False,
-                            show_peaks=False,
-                            show_slopes=False
-                        )
+                        # Full results (per-mass peaks and magnitudes) are needed here
+                        if prefetched is not None:
+                            res = prefetched[i]
+                            if res is None or 'error' in res:
+                                raise RuntimeError(res.get('error') if res else "Evaluation aborted")
+                        else:
+                            res = cached_frf(
+                                main_system_parameters=main_params,
+                                dva_parameters=dva_params,
+                                omega_start=omega_start,
+                                omega_end=omega_end,
+                                omega_points=omega_points,
+                                target_values_dict=target_values,
+                                weights_dict=weights,
+                                summary=False,
+                            )
                         singular = res.get('singular_response', np.nan)
                         if not np.isfinite(singular):
                             fitness = 1e6
@@ -3399,6 +3455,7 @@ class GAOptimizationMixin:
             num_samples=num_samples,
             seed=seed,
             respect_fixed=respect_fixed,
+            evaluation_backend=self.ga_eval_backend_combo.currentText(),
         )
         self._rv_worker.progress.connect(self.rv_progress_bar.setValue)
         self._rv_worker.error.connect(lambda msg: QMessageBox.critical(self, "Random Validation Error", msg))
@@ -4496,7 +4553,8 @@ class GAOptimizationMixin:
     def run_ga(self):
         """Run genetic algorithm optimization"""
         # Check if a GA worker is already running
-        if hasattr(self, 'ga_worker') and self.ga_worker.isRunning():
+        if (hasattr(self, 'ga_worker') and self.ga_worker.isRunning()) or \
+                (hasattr(self, 'ga_benchmark_worker') and self.ga_benchmark_worker.isRunning()):
             QMessageBox.warning(self, "Process Running", 
                                "A Genetic Algorithm optimization is already running. Please wait for it to complete.")
             return
@@ -4672,7 +4730,7 @@ class GAOptimizationMixin:
 
         # Store alpha used for this run for later reporting
         self._alpha_used_for_run = alpha
-        self.ga_worker = GAWorker(
+        ga_kwargs = dict(
             main_params=main_params,
             target_values_dict=target_values,
             weights_dict=weights,
@@ -4768,8 +4826,31 @@ class GAOptimizationMixin:
             neural_weight_decay=self.neural_wd.value(),
             neural_enable_grad_refine=self.neural_grad_refine_chk.isChecked(),
             neural_grad_steps=self.neural_grad_steps.value(),
-            neural_device=self.neural_device_combo.currentText()
+            neural_device=self.neural_device_combo.currentText(),
+            evaluation_backend=self.ga_eval_backend_combo.currentText(),
+            ga_mode="steady_state" if self.ga_mode_combo.currentText().startswith("Steady") else "generational"
         )
+
+        # Benchmarks with a core budget run their repetitions concurrently
+        # (island runs already use the budget, so they run one after another)
+        if self.benchmark_runs > 1 and self.ga_benchmark_cores_box.value() > 1 and self.ga_islands_box.value() == 1:
+            self.start_concurrent_ga_benchmark(ga_kwargs)
+            return
+
+        if self.ga_islands_box.value() > 1:
+            # Island model: the archipelago reports like a single GA worker
+            self.ga_worker = GAIslandWorker(
+                ga_kwargs,
+                n_islands=self.ga_islands_box.value(),
+                topology=self.ga_island_topology_combo.currentText(),
+                migration_interval=self.ga_migration_interval_box.value(),
+                n_migrants=self.ga_migrants_box.value(),
+                core_budget=self.ga_benchmark_cores_box.value(),
+            )
+        else:
+            self.ga_worker = GAWorker(**ga_kwargs)
+            self.ga_worker.evaluation_progress.connect(
+                lambda done, total: self.status_bar.showMessage(f"GA evaluations: {done} / {total}"))
         
         # Connect signals using strong references to avoid premature garbage collection
         self.ga_worker.finished.connect(self.handle_ga_finished)
@@ -4789,26 +4870,37 @@ class GAOptimizationMixin:
         # Start the worker
         self.ga_worker.start()
 
+    def _active_ga_worker(self):
+        """The running GA benchmark scheduler or GA worker, else None"""
+        for name in ('ga_benchmark_worker', 'ga_worker'):
+            worker = getattr(self, name, None)
+            if worker is not None and worker.isRunning():
+                return worker
+        return None
+
     def pause_ga(self):
         """Pause the GA optimization"""
-        if hasattr(self, 'ga_worker') and self.ga_worker.isRunning():
-            self.ga_worker.pause()
+        worker = self._active_ga_worker()
+        if worker is not None:
+            worker.pause()
             self.pause_ga_button.setEnabled(False)
             self.resume_ga_button.setEnabled(True)
             self.status_bar.showMessage("GA optimization paused")
 
     def resume_ga(self):
         """Resume a paused GA optimization"""
-        if hasattr(self, 'ga_worker') and self.ga_worker.isRunning():
-            self.ga_worker.resume()
+        worker = self._active_ga_worker()
+        if worker is not None:
+            worker.resume()
             self.pause_ga_button.setEnabled(True)
             self.resume_ga_button.setEnabled(False)
             self.status_bar.showMessage("GA optimization resumed")
 
     def stop_ga(self):
         """Terminate the GA optimization"""
-        if hasattr(self, 'ga_worker') and self.ga_worker.isRunning():
-            self.ga_worker.stop()
+        worker = self._active_ga_worker()
+        if worker is not None:
+            worker.stop()
             self.pause_ga_button.setEnabled(False)
             self.resume_ga_button.setEnabled(False)
             self.stop_ga_button.setEnabled(False)
@@ -4840,6 +4932,66 @@ class GAOptimizationMixin:
                 # Single run - direct progress
                 self.ga_progress_bar.setValue(value)
             
+    def _build_ga_benchmark_run_data(self, results, best_ind, parameter_names, best_fitness, run_number):
+        """Benchmark record of one GA run, as stored in ga_benchmark_data"""
+        # Create a data dictionary for this run
+        # Build results summary from worker results
+        results_summary = {}
+        if isinstance(results, dict):
+            for key in ['singular_response', 'percentage_differences', 'composite_measures']:
+                if key in results:
+                    results_summary[key] = results[key]
+
+        run_data = {
+            'run_number': run_number,
+            'best_fitness': float(best_fitness) if np.isfinite(best_fitness) else np.nan,
+            'best_solution': list(best_ind),
+            'parameter_names': parameter_names, 'active_parameters': getattr(self, 'ga_active_parameters', []),
+            'alpha': getattr(self, '_alpha_used_for_run', None),
+            'percentage_error_scale': float(self.ga_percentage_error_scale_box.value()) if hasattr(self, 'ga_percentage_error_scale_box') else None,
+            'cost_scale_factor': float(self.ga_cost_scale_box.value()) if hasattr(self, 'ga_cost_scale_box') else None,
+            'dva_activation_threshold': float(self.ga_activation_threshold_box.value()) if hasattr(self, 'ga_activation_threshold_box') else None,
+            'dva_activation_penalty': float(self.ga_activation_penalty_box.value()) if hasattr(self, 'ga_activation_penalty_box') else None,
+            'dva_costs': {
+                self.ga_param_table.item(r,0).text(): {
+                    'material': float(self.ga_param_table.cellWidget(r,5).value()) if self.ga_param_table.cellWidget(r,5) else 0.0,
+                    'manufacturing': float(self.ga_param_table.cellWidget(r,6).value()) if self.ga_param_table.cellWidget(r,6) else 0.0,
+                    'maintenance': float(self.ga_param_table.cellWidget(r,7).value()) if self.ga_param_table.cellWidget(r,7) else 0.0,
+                    'operational': float(self.ga_param_table.cellWidget(r,8).value()) if self.ga_param_table.cellWidget(r,8) else 0.0,
+                } for r in range(self.ga_param_table.rowCount())
+            } if hasattr(self, 'ga_param_table') and self.ga_param_table.columnCount() > 8 else {},
+            'use_enhanced_cost': bool(self.enh_cost_enable_chk.isChecked()),
+            'benefit_w_primary': float(self.benefit_w_primary_box.value()),
+            'benefit_w_accuracy': float(self.benefit_w_accuracy_box.value()),
+            'benefit_w_sparsity': float(self.benefit_w_sparsity_box.value()),
+            'category_w_material': float(self.cat_w_material_box.value()),
+            'category_w_manufacturing': float(self.cat_w_manufacturing_box.value()),
+            'category_w_maintenance': float(self.cat_w_maintenance_box.value()),
+            'category_w_operational': float(self.cat_w_operational_box.value()),
+            'benefit_weight_start': float(self.benefit_weight_start_box.value()),
+            'benefit_weight_end': float(self.benefit_weight_end_box.value()),
+            'generation_ratio': float(self.generation_ratio_box.value()),
+            'dva_category_map': {self.ga_param_table.item(r,0).text(): self.ga_param_table.cellWidget(r,6).currentText().lower() for r in range(self.ga_param_table.rowCount()) if isinstance(self.ga_param_table.cellWidget(r,6), QComboBox) and self.ga_param_table.cellWidget(r,6).currentText().lower() != 'auto'},
+            'results_summary': results_summary
+        }
+        
+        # Add any additional metrics from results
+        if isinstance(results, dict):
+            for key, value in results.items():
+                # Only keep simple numeric scalars; avoid nested dicts
+                try:
+                    v = float(value)
+                    if np.isfinite(v):
+                        run_data[key] = v
+                except Exception:
+                    pass
+
+            # Add benchmark metrics if available
+            if 'benchmark_metrics' in results:
+                run_data['benchmark_metrics'] = results['benchmark_metrics']
+
+        return run_data
+
     def handle_ga_finished(self, results, best_ind, parameter_names, best_fitness):
         """Handle the completion of the GA optimization"""
         # Stop the watchdog timer
@@ -4851,62 +5003,9 @@ class GAOptimizationMixin:
         
         # Store benchmark results
         if hasattr(self, 'benchmark_runs') and self.benchmark_runs > 1:
-            # Create a data dictionary for this run
-            # Build results summary from worker results
-            results_summary = {}
-            if isinstance(results, dict):
-                for key in ['singular_response', 'percentage_differences', 'composite_measures']:
-                    if key in results:
-                        results_summary[key] = results[key]
+            run_data = self._build_ga_benchmark_run_data(
+                results, best_ind, parameter_names, best_fitness, self.current_benchmark_run)
 
-            run_data = {
-                'run_number': self.current_benchmark_run,
-                'best_fitness': float(best_fitness) if np.isfinite(best_fitness) else np.nan,
-                'best_solution': list(best_ind),
-                'parameter_names': parameter_names, 'active_parameters': getattr(self, 'ga_active_parameters', []),
-                'alpha': getattr(self, '_alpha_used_for_run', None),
-                'percentage_error_scale': float(self.ga_percentage_error_scale_box.value()) if hasattr(self, 'ga_percentage_error_scale_box') else None,
-                'cost_scale_factor': float(self.ga_cost_scale_box.value()) if hasattr(self, 'ga_cost_scale_box') else None,
-                'dva_activation_threshold': float(self.ga_activation_threshold_box.value()) if hasattr(self, 'ga_activation_threshold_box') else None,
-                'dva_activation_penalty': float(self.ga_activation_penalty_box.value()) if hasattr(self, 'ga_activation_penalty_box') else None,
-                'dva_costs': {
-                    self.ga_param_table.item(r,0).text(): {
-                        'material': float(self.ga_param_table.cellWidget(r,5).value()) if self.ga_param_table.cellWidget(r,5) else 0.0,
-                        'manufacturing': float(self.ga_param_table.cellWidget(r,6).value()) if self.ga_param_table.cellWidget(r,6) else 0.0,
-                        'maintenance': float(self.ga_param_table.cellWidget(r,7).value()) if self.ga_param_table.cellWidget(r,7) else 0.0,
-                        'operational': float(self.ga_param_table.cellWidget(r,8).value()) if self.ga_param_table.cellWidget(r,8) else 0.0,
-                    } for r in range(self.ga_param_table.rowCount())
-                } if hasattr(self, 'ga_param_table') and self.ga_param_table.columnCount() > 8 else {},
-                'use_enhanced_cost': bool(self.enh_cost_enable_chk.isChecked()),
-                'benefit_w_primary': float(self.benefit_w_primary_box.value()),
-                'benefit_w_accuracy': float(self.benefit_w_accuracy_box.value()),
-                'benefit_w_sparsity': float(self.benefit_w_sparsity_box.value()),
-                'category_w_material': float(self.cat_w_material_box.value()),
-                'category_w_manufacturing': float(self.cat_w_manufacturing_box.value()),
-                'category_w_maintenance': float(self.cat_w_maintenance_box.value()),
-                'category_w_operational': float(self.cat_w_operational_box.value()),
-                'benefit_weight_start': float(self.benefit_weight_start_box.value()),
-                'benefit_weight_end': float(self.benefit_weight_end_box.value()),
-                'generation_ratio': float(self.generation_ratio_box.value()),
-                'dva_category_map': {self.ga_param_table.item(r,0).text(): self.ga_param_table.cellWidget(r,6).currentText().lower() for r in range(self.ga_param_table.rowCount()) if isinstance(self.ga_param_table.cellWidget(r,6), QComboBox) and self.ga_param_table.cellWidget(r,6).currentText().lower() != 'auto'},
-                'results_summary': results_summary
-            }
-            
-            # Add any additional metrics from results
-            if isinstance(results, dict):
-                for key, value in results.items():
-                    # Only keep simple numeric scalars; avoid nested dicts
-                    try:
-                        v = float(value)
-                        if np.isfinite(v):
-                            run_data[key] = v
-                    except Exception:
-                        pass
-
-                # Add benchmark metrics if available
-                if 'benchmark_metrics' in results:
-                    run_data['benchmark_metrics'] = results['benchmark_metrics']
-            
             # Store the run data
             self.ga_benchmark_data.append(run_data)
             
@@ -5298,7 +5397,9 @@ class GAOptimizationMixin:
             neural_weight_decay=self.neural_wd.value(),
             neural_enable_grad_refine=self.neural_grad_refine_chk.isChecked(),
             neural_grad_steps=self.neural_grad_steps.value(),
-            neural_device=self.neural_device_combo.currentText()
+            neural_device=self.neural_device_combo.currentText(),
+            evaluation_backend=self.ga_eval_backend_combo.currentText(),
+            ga_mode="steady_state" if self.ga_mode_combo.currentText().startswith("Steady") else "generational"
         )
         
         # Connect signals using strong references to avoid premature garbage collection
@@ -5306,6 +5407,8 @@ class GAOptimizationMixin:
         self.ga_worker.error.connect(self.handle_ga_error)
         self.ga_worker.update.connect(self.handle_ga_update)
         self.ga_worker.progress.connect(self.update_ga_progress)
+        self.ga_worker.evaluation_progress.connect(
+            lambda done, total: self.status_bar.showMessage(f"GA evaluations: {done} / {total}"))
         
         # Set up a watchdog timer for the GA worker
         if hasattr(self, 'ga_watchdog_timer'):
@@ -5319,6 +5422,85 @@ class GAOptimizationMixin:
         # Start the worker
         self.ga_worker.start()
     
+    def start_concurrent_ga_benchmark(self, ga_kwargs):
+        """Run all GA benchmark repetitions concurrently within the core budget"""
+        if hasattr(self, 'ga_benchmark_worker'):
+            try:
+                self.ga_benchmark_worker.run_finished.disconnect()
+                self.ga_benchmark_worker.finished.disconnect()
+                self.ga_benchmark_worker.error.disconnect()
+                self.ga_benchmark_worker.update.disconnect()
+                self.ga_benchmark_worker.progress.disconnect()
+            except Exception:
+                pass
+
+        self.ga_benchmark_worker = GABenchmarkWorker(
+            ga_kwargs, self.benchmark_runs, core_budget=self.ga_benchmark_cores_box.value()
+        )
+        self.ga_benchmark_worker.run_finished.connect(self.handle_ga_benchmark_run_finished)
+        self.ga_benchmark_worker.finished.connect(self.handle_ga_benchmark_finished)
+        self.ga_benchmark_worker.error.connect(self.handle_ga_error)
+        self.ga_benchmark_worker.update.connect(self.handle_ga_update)
+        self.ga_benchmark_worker.progress.connect(self.ga_progress_bar.setValue)
+
+        self.status_bar.showMessage(f"Running {self.benchmark_runs} GA benchmark runs concurrently...")
+        self.ga_benchmark_worker.start()
+
+    def handle_ga_benchmark_run_finished(self, outcome):
+        """Store one completed run of a concurrent GA benchmark"""
+        run_number = outcome.get('run_number')
+        if 'error' in outcome:
+            self.ga_results_text.append(f"\n--- Run {run_number} failed: {outcome['error']} ---")
+            return
+
+        run_data = self._build_ga_benchmark_run_data(
+            outcome['results'], outcome['best_ind'], outcome['parameter_names'],
+            outcome['best_fitness'], run_number)
+        run_data['seed'] = outcome.get('seed')
+        self.ga_benchmark_data.append(run_data)
+        self.current_benchmark_run = len(self.ga_benchmark_data)
+
+        self.status_bar.showMessage(
+            f"GA run {run_number} completed ({self.current_benchmark_run} of {self.benchmark_runs} done)")
+        self.ga_results_text.append(
+            f"\n--- Run {run_number} completed in {outcome.get('elapsed', 0.0):.1f} s "
+            f"(best fitness {outcome['best_fitness']:.6f}) ---")
+
+    def handle_ga_benchmark_finished(self, completed_runs):
+        """Finish a concurrent GA benchmark: report the best run and visualize all runs"""
+        self.ga_benchmark_data.sort(key=lambda run: run.get('run_number', 0))
+
+        if self.ga_benchmark_data:
+            best_run = min(
+                self.ga_benchmark_data,
+                key=lambda run: run['best_fitness'] if np.isfinite(run['best_fitness']) else np.inf)
+            self.current_ga_best_params = dict(zip(best_run['parameter_names'], best_run['best_solution']))
+            self.current_ga_best_fitness = best_run['best_fitness']
+
+            self.visualize_ga_benchmark_results()
+            self.export_benchmark_button.setEnabled(True)
+            if hasattr(self, 'export_ga_results_button'):
+                self.export_ga_results_button.setEnabled(True)
+
+            self.ga_results_text.append(
+                f"\n--- {len(self.ga_benchmark_data)} of {self.benchmark_runs} benchmark runs completed ---")
+            self.ga_results_text.append(
+                f"Best run: {best_run['run_number']} (seed {best_run.get('seed')}), "
+                f"best fitness: {best_run['best_fitness']:.6f}")
+            self.ga_results_text.append("\nBest Parameters:")
+            for param_name, value in self.current_ga_best_params.items():
+                self.ga_results_text.append(f"  {param_name}: {value:.6f}")
+        else:
+            self.ga_results_text.append("\n--- No GA benchmark run completed ---")
+
+        self.run_frf_button.setEnabled(True)
+        self.run_sobol_button.setEnabled(True)
+        self.run_ga_button.setEnabled(True)
+        self.pause_ga_button.setEnabled(False)
+        self.resume_ga_button.setEnabled(False)
+        self.stop_ga_button.setEnabled(False)
+        self.status_bar.showMessage("GA benchmark completed")
+
     def _open_plot_window(self, fig, title):
         """Opens a new window to display a matplotlib figure."""
         plot_window = PlotWindow(fig, title)
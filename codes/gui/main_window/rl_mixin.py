@@ -4,6 +4,7 @@ from PyQt5.QtGui import *
 from matplotlib.figure import Figure
 from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
 from RL.RLWorker import RLWorker
+from modules.evaluator import EVALUATION_BACKENDS
 import numpy as np
 import time
 import json
@@ -112,10 +113,27 @@ class RLOptimizationMixin:
         self.rl_noise_std_box.setValue(0.1)
         self.rl_noise_std_box.setToolTip("Standard deviation of exploration noise")
 
+        # Vectorized environments and how their proposals are evaluated
+        self.rl_num_envs_box = QSpinBox()
+        self.rl_num_envs_box.setRange(1, 256)
+        self.rl_num_envs_box.setValue(1)
+        self.rl_num_envs_box.setToolTip(
+            "Parallel environments K: every step proposes K parameter vectors, evaluates them "
+            "as one batch and updates the policy on all K transitions")
+
+        self.rl_eval_backend_combo = QComboBox()
+        self.rl_eval_backend_combo.addItems(list(EVALUATION_BACKENDS))
+        self.rl_eval_backend_combo.setCurrentText("process")
+        self.rl_eval_backend_combo.setToolTip(
+            "FRF evaluation backend of the proposal batches; 'batch' runs the population FRF, "
+            "'process' a process pool")
+
         advanced_form.addRow("Sparsity Penalty (α):", self.rl_alpha_sparsity_box)
         advanced_form.addRow("Replay Buffer Size:", self.rl_replay_buffer_size_box)
         advanced_form.addRow("Batch Size:", self.rl_batch_size_box)
         advanced_form.addRow("Exploration Noise σ:", self.rl_noise_std_box)
+        advanced_form.addRow("Parallel Environments:", self.rl_num_envs_box)
+        advanced_form.addRow("Evaluation Backend:", self.rl_eval_backend_combo)
 
         hyper_layout.addWidget(advanced_group)
 
@@ -374,6 +392,8 @@ class RLOptimizationMixin:
                 replay_buffer_size=self.rl_replay_buffer_size_box.value(),
                 batch_size=self.rl_batch_size_box.value(),
                 noise_std=self.rl_noise_std_box.value(),
+                rl_num_envs=self.rl_num_envs_box.value(),
+                evaluation_backend=self.rl_eval_backend_combo.currentText(),
                 
                 # Sobol settings (consistent with other methods)
                 sobol_settings={"sample_size": 32}
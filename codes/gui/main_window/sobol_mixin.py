@@ -91,7 +91,8 @@ class SobolAnalysisMixin:
                 num_samples_list=num_samples_list,
                 target_values_dict=target_values,
                 weights_dict=weights,
-                n_jobs=n_jobs
+                n_jobs=n_jobs,
+                evaluation_backend="distributed" if self.sobol_distributed_checkbox.isChecked() else None
             )
             
             # Connect signals
@@ -627,6 +628,13 @@ class SobolAnalysisMixin:
             self.n_jobs_spin.setValue(4)
             self.n_jobs_spin.setToolTip("Number of parallel processes to use")
             sample_form.addRow("Parallel Jobs:", self.n_jobs_spin)
+
+            # Distributed evaluation through the broker named by DEVANA_BROKER
+            self.sobol_distributed_checkbox = QCheckBox("Evaluate on distributed broker")
+            self.sobol_distributed_checkbox.setToolTip(
+                "Send the samples to the evaluation broker set in DEVANA_BROKER (host:port); "
+                "falls back to local threads if it cannot be reached")
+            sample_form.addRow("", self.sobol_distributed_checkbox)
             
             settings_layout.addWidget(sample_settings)
             
@@ -9,6 +9,10 @@ structure and public interfaces remain intact so the module can be dropped into
 existing codebases as a drop‑in replacement.
 """
 
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
 import numpy as np
 import matplotlib.pyplot as plt
 from scipy.integrate import simpson
@@ -288,6 +292,202 @@ def remove_zero_mass_dofs(
 
     return mm, cc, kk, ff, active_dofs
 
+# -----------------------------------------------------------------------------
+# Linear solvers for the dynamic-stiffness system
+# -----------------------------------------------------------------------------
+
+# Available strategies for solving H(omega) A = F over the frequency grid
+SOLVE_METHODS = ('batched', 'loop', 'modal')
+
+# Upper bound on the number of frequencies assembled into one stacked solve.
+# Keeps the (n_omega, n_dofs, n_dofs) complex stack at a few MB even for the
+# very large grids used by the omega-points sensitivity analysis.
+FREQUENCY_BLOCK_SIZE = 8192
+
+# Largest eigenvector-matrix condition number accepted by the modal engine.
+# Above it the eigenbasis is treated as defective (repeated poles with missing
+# eigenvectors) and the response is computed with the direct solve instead.
+MODAL_CONDITION_LIMIT = 1e8
+
+# Frequencies closer than this (relative to the pole magnitude) to a pole are
+# solved directly, where the pole-residue sum would divide by ~zero.
+MODAL_POLE_TOLERANCE = 1e-10
+
+
+def _robust_solve(hmat, rhs):
+    """Solve hmat x = rhs with regularization/pseudoinverse fallbacks."""
+    try:
+        return np.linalg.solve(hmat, rhs)
+    except np.linalg.LinAlgError:
+        # Regularize the system progressively on the diagonal
+        # Scale epsilon with the matrix norm to be unit-agnostic
+        scale = np.linalg.norm(hmat, ord=np.inf)
+        base_eps = (1e-12 if scale == 0 else 1e-12 * scale)
+        I = np.eye(hmat.shape[0], dtype=hmat.dtype)
+        for mult in (1.0, 1e1, 1e2, 1e3, 1e4):
+            try:
+                return np.linalg.solve(hmat + (base_eps * mult) * I, rhs)
+            except np.linalg.LinAlgError:
+                continue
+        # Final fallback: use pseudo-inverse
+        try:
+            return np.linalg.pinv(hmat) @ rhs
+        except Exception:
+            # As a last resort, least-squares
+            return np.linalg.lstsq(hmat, rhs, rcond=None)[0]
+
+
+def solve_frequency_stack(hh_stack, rhs_stack):
+    """
+    Solve a stack of linear systems hh_stack[i] x[i] = rhs_stack[i] at once.
+
+    The whole stack is handed to LAPACK in a single call. If any matrix in the
+    stack is exactly singular, NumPy rejects the complete call, so the singular
+    members are located with one stacked LU (``slogdet``), the regular members
+    are solved together and only the singular ones are routed through
+    ``_robust_solve``.
+
+    Parameters:
+    -----------
+    hh_stack : ndarray, shape (n, n_dofs, n_dofs)
+        Dynamic-stiffness matrices
+    rhs_stack : ndarray, shape (n, n_dofs)
+        Right-hand sides
+
+    Returns:
+    --------
+    ndarray, shape (n, n_dofs)
+        Solutions, one row per system
+    """
+    try:
+        return np.linalg.solve(hh_stack, rhs_stack[..., None])[..., 0]
+    except np.linalg.LinAlgError:
+        pass
+
+    sign, _ = np.linalg.slogdet(hh_stack)
+    singular = sign == 0
+    x = np.empty(rhs_stack.shape, dtype=np.result_type(hh_stack, rhs_stack))
+    regular = ~singular
+    if np.any(regular):
+        x[regular] = np.linalg.solve(hh_stack[regular], rhs_stack[regular][..., None])[..., 0]
+    for i in np.flatnonzero(singular):
+        x[i] = _robust_solve(hh_stack[i], rhs_stack[i])
+    return x
+
+
+def solve_dynamic_stiffness(mm, cc, kk, f_reduced, omega, zeta_dc, omega_dc):
+    """
+    Compute the complex response of every DOF over the whole frequency grid.
+
+    Equivalent to solving ``(-W^2 M + 2 zeta W C + K) * omega_dc^2 A = F`` one
+    frequency at a time, but the dynamic-stiffness matrices are assembled as a
+    (n_omega, n_dofs, n_dofs) stack by broadcasting and solved with
+    ``solve_frequency_stack`` in blocks of ``FREQUENCY_BLOCK_SIZE``.
+
+    Returns:
+    --------
+    ndarray, shape (n_dofs, n_omega)
+        Complex response, laid out like the per-frequency loop result
+    """
+    omega = np.asarray(omega, dtype=float)
+    n_dofs = mm.shape[0]
+    A = np.empty((n_dofs, omega.size), dtype=complex)
+    scale = omega_dc**2
+    for start in range(0, omega.size, FREQUENCY_BLOCK_SIZE):
+        stop = min(start + FREQUENCY_BLOCK_SIZE, omega.size)
+        Om = omega[start:stop, None, None]
+        hh = (-Om**2 * mm + 2 * zeta_dc * Om * cc + kk) * scale
+        rhs = np.ascontiguousarray(f_reduced[:, start:stop].T)
+        A[:, start:stop] = solve_frequency_stack(hh, rhs).T * scale
+    return A
+
+
+def modal_decomposition(mm, cc, kk, zeta_dc):
+    """
+    Pole-residue form of the dynamic-stiffness matrix of one design.
+
+    The quadratic eigenvalue problem ``(-s^2 M + 2 zeta s C + K) x = 0`` is
+    linearized into the first-order companion form
+
+        s [x; y] = S [x; y],   S = [[0, I], [M^-1 K, 2 zeta M^-1 C]],   y = s x
+
+    and solved once with a dense eigendecomposition ``S = V diag(poles) V^-1``.
+    The dynamic-stiffness inverse is then, for any frequency s,
+
+        H(s)^-1 = sum_k  phi_k psi_k / (s - pole_k)
+
+    with ``phi = V[:n]`` (mode shapes) and ``psi = -(V^-1)[:, n:] M^-1``; the
+    sign is folded into the returned ``psi``.
+
+    Parameters:
+    -----------
+    mm, cc, kk : ndarray, shape (n_dofs, n_dofs)
+        Reduced mass, damping and stiffness matrices
+    zeta_dc : float
+        Damping scale of the main system
+
+    Returns:
+    --------
+    tuple or None
+        ``(poles, phi, psi)`` with shapes (2n,), (n, 2n) and (2n, n), or None
+        when the mass matrix is singular or the eigenvectors are defective
+    """
+    n_dofs = mm.shape[0]
+    try:
+        m_inv = np.linalg.inv(mm)
+    except np.linalg.LinAlgError:
+        return None
+    state = np.zeros((2 * n_dofs, 2 * n_dofs))
+    state[:n_dofs, n_dofs:] = np.eye(n_dofs)
+    state[n_dofs:, :n_dofs] = m_inv @ kk
+    state[n_dofs:, n_dofs:] = 2 * zeta_dc * (m_inv @ cc)
+    if not np.all(np.isfinite(state)):
+        return None
+
+    poles, vecs = np.linalg.eig(state)
+    if not np.isfinite(np.linalg.cond(vecs)) or np.linalg.cond(vecs) > MODAL_CONDITION_LIMIT:
+        return None
+    vecs_inv = np.linalg.inv(vecs)
+    return poles, vecs[:n_dofs], -(vecs_inv[:, n_dofs:] @ m_inv)
+
+
+def solve_modal_response(mm, cc, kk, f_reduced, omega, zeta_dc, omega_dc):
+    """
+    Compute the complex response of every DOF with the pole-residue engine.
+
+    Drop-in alternative to ``solve_dynamic_stiffness``. The eigenproblem is
+    solved once per design, after which each frequency costs one projection of
+    the forcing onto the modes instead of a dense complex solve, so grids of
+    10k+ points are evaluated with a handful of broadcast operations.
+    Designs whose eigenvectors are defective fall back to the direct solve, as
+    do individual frequencies that coincide with a pole.
+
+    Returns:
+    --------
+    ndarray, shape (n_dofs, n_omega)
+        Complex response, identical in layout to ``solve_dynamic_stiffness``
+    """
+    modes = modal_decomposition(mm, cc, kk, zeta_dc)
+    if modes is None:
+        return solve_dynamic_stiffness(mm, cc, kk, f_reduced, omega, zeta_dc, omega_dc)
+    poles, phi, psi = modes
+
+    omega = np.asarray(omega, dtype=float)
+    A = np.empty((mm.shape[0], omega.size), dtype=complex)
+    for start in range(0, omega.size, FREQUENCY_BLOCK_SIZE):
+        stop = min(start + FREQUENCY_BLOCK_SIZE, omega.size)
+        distance = omega[start:stop, None] - poles[None, :]
+        near_pole = np.any(
+            np.abs(distance) <= MODAL_POLE_TOLERANCE * np.maximum(np.abs(poles), 1.0), axis=1
+        )
+        distance[near_pole] = 1.0
+        modal_force = (psi @ f_reduced[:, start:stop]) / distance.T
+        A[:, start:stop] = phi @ modal_force
+        if np.any(near_pole):
+            cols = start + np.flatnonzero(near_pole)
+            A[:, cols] = solve_dynamic_stiffness(mm, cc, kk, f_reduced[:, cols], omega[cols], zeta_dc, omega_dc)
+    return A
+
 # -----------------------------------------------------------------------------
 # Peak detection and slope calculation improvements
 # -----------------------------------------------------------------------------
@@ -477,7 +677,66 @@ def calculate_robust_slopes(peak_positions, peak_values, slope_threshold=0.01):
     
     return slopes, slope_max
 
-def process_mass(a_mass, omega, user_peak_positions=None):
+def mass_peak_arrays(a_mag, omega, user_peak_positions=None, refine_peaks=True, model_peaks=None):
+    """
+    Peak positions and values of one magnitude curve, sorted by frequency.
+
+    This is the peak stage of ``process_mass`` (user-specified peaks,
+    prominence-filtered detection, cubic refinement or model peaks) without
+    any dict building, shared with the compact ``frf`` output.
+
+    Returns:
+    --------
+    peak_positions, peak_values : ndarray
+    """
+    # Initialize peak data
+    peak_positions = []
+    peak_values = []
+    
+    if model_peaks is not None:
+        # Peaks computed from the system model: no detection or refinement
+        peak_positions, peak_values = (np.asarray(v, dtype=float) for v in model_peaks)
+        sort_idx = np.argsort(peak_positions)
+        peak_positions = peak_positions[sort_idx]
+        peak_values = peak_values[sort_idx]
+    else:
+        # Handle user-specified peaks
+        if user_peak_positions is not None:
+            user_peak_positions = np.array(user_peak_positions)
+            # Find the closest actual frequency points to user-specified positions
+            for pos in user_peak_positions:
+                idx = np.argmin(np.abs(omega - pos))
+                peak_positions.append(omega[idx])
+                peak_values.append(a_mag[idx])
+        
+        # Find additional significant peaks with prominence filtering
+        detected_positions, detected_values = find_significant_peaks(a_mag, omega)
+        
+        # Combine user-specified and detected peaks
+        if len(detected_positions) > 0:
+            peak_positions.extend(detected_positions)
+            peak_values.extend(detected_values)
+        
+        # Convert to numpy arrays
+        peak_positions = np.array(peak_positions)
+        peak_values = np.array(peak_values)
+        
+        # Sort peaks by frequency
+        sort_idx = np.argsort(peak_positions)
+        peak_positions = peak_positions[sort_idx]
+        peak_values = peak_values[sort_idx]
+        
+        # If we found peaks, refine their positions with interpolation
+        if len(peak_positions) > 0 and refine_peaks:
+            # First convert peak positions back to indices in the original array
+            peak_indices = np.array([np.argmin(np.abs(omega - pos)) for pos in peak_positions])
+            
+            # Then refine with interpolation
+            peak_positions, peak_values = interpolate_peak_vicinity(a_mag, omega, peak_indices)
+    
+    return peak_positions, peak_values
+
+def process_mass(a_mass, omega, user_peak_positions=None, refine_peaks=True, model_peaks=None):
     """
     Process mass response data to calculate peaks, slopes, bandwidths and area.
     
@@ -486,9 +745,16 @@ def process_mass(a_mass, omega, user_peak_positions=None):
     a_mass : ndarray
         Complex frequency response data
     omega : ndarray
-        Frequency values
+        Frequency values (uniform or non-uniform)
     user_peak_positions : list or ndarray, optional
         User-specified peak positions (frequencies) to consider
+    refine_peaks : bool
+        Refine peak positions with a cubic interpolation of the curve. Not
+        needed on grids that are already refined around the peaks
+    model_peaks : tuple of ndarray, optional
+        (peak_positions, peak_values) computed from the system model (see
+        extract_model_peaks). When given, they replace the grid-based peak
+        detection; user-specified peaks must then already be included
         
     Returns:
     --------
@@ -496,44 +762,9 @@ def process_mass(a_mass, omega, user_peak_positions=None):
         Dictionary containing processed results including peaks, slopes, bandwidths and area
     """
     a_mag = np.abs(a_mass)
-    
-    # Initialize peak data
-    peak_positions = []
-    peak_values = []
-    
-    # Handle user-specified peaks
-    if user_peak_positions is not None:
-        user_peak_positions = np.array(user_peak_positions)
-        # Find the closest actual frequency points to user-specified positions
-        for pos in user_peak_positions:
-            idx = np.argmin(np.abs(omega - pos))
-            peak_positions.append(omega[idx])
-            peak_values.append(a_mag[idx])
-    
-    # Find additional significant peaks with prominence filtering
-    detected_positions, detected_values = find_significant_peaks(a_mag, omega)
-    
-    # Combine user-specified and detected peaks
-    if len(detected_positions) > 0:
-        peak_positions.extend(detected_positions)
-        peak_values.extend(detected_values)
-    
-    # Convert to numpy arrays
-    peak_positions = np.array(peak_positions)
-    peak_values = np.array(peak_values)
-    
-    # Sort peaks by frequency
-    sort_idx = np.argsort(peak_positions)
-    peak_positions = peak_positions[sort_idx]
-    peak_values = peak_values[sort_idx]
-    
-    # If we found peaks, refine their positions with interpolation
-    if len(peak_positions) > 0:
-        # First convert peak positions back to indices in the original array
-        peak_indices = np.array([np.argmin(np.abs(omega - pos)) for pos in peak_positions])
-        
-        # Then refine with interpolation
-        peak_positions, peak_values = interpolate_peak_vicinity(a_mag, omega, peak_indices)
+    peak_positions, peak_values = mass_peak_arrays(
+        a_mag, omega, user_peak_positions, refine_peaks=refine_peaks, model_peaks=model_peaks
+    )
     
     # Calculate bandwidths
     bandwidths = {}
@@ -561,6 +792,221 @@ def process_mass(a_mass, omega, user_peak_positions=None):
         "magnitude": a_mag,
     }
 
+# -----------------------------------------------------------------------------
+# Adaptive frequency grid
+# -----------------------------------------------------------------------------
+
+# Available frequency grids for frf()
+FREQUENCY_GRIDS = ('uniform', 'adaptive')
+
+# Size of the coarse starting grid of the adaptive sweep
+ADAPTIVE_INITIAL_POINTS = 129
+
+# Relative tolerance on peak values (and on the local linear-interpolation
+# error of the magnitude curve) at which the adaptive sweep stops refining
+ADAPTIVE_TOLERANCE = 1e-4
+
+# Upper bound on the number of refinement passes
+ADAPTIVE_MAX_PASSES = 30
+
+
+def _refinement_intervals(omega, magnitude, min_width, tol):
+    """
+    Mark the grid intervals [omega[k], omega[k+1]] that need to be subdivided.
+
+    An interval is refined when it brackets a local maximum or minimum of any
+    DOF (resonances and anti-resonances), or when the curvature estimated from
+    the neighbouring points predicts a linear-interpolation error above
+    ``tol`` times the peak magnitude of that DOF. Intervals narrower than
+    ``2 * min_width`` are never split.
+    """
+    h = np.diff(omega)
+    if omega.size < 3:
+        return h >= 2 * min_width
+
+    left, mid, right = magnitude[:, :-2], magnitude[:, 1:-1], magnitude[:, 2:]
+    flat = (mid == left) & (mid == right)
+    extremum = (((mid >= left) & (mid >= right)) | ((mid <= left) & (mid <= right))) & ~flat
+
+    slopes = np.diff(magnitude, axis=1) / h
+    second = 2 * np.abs(np.diff(slopes, axis=1)) / (h[:-1] + h[1:])
+    scale = np.maximum(np.max(magnitude, axis=1, keepdims=True), np.finfo(float).tiny)
+    curved = second * np.maximum(h[:-1], h[1:])**2 / 8 > tol * scale
+
+    points = np.any(extremum | curved, axis=0)
+    refine = np.zeros(h.size, dtype=bool)
+    refine[:-1] |= points
+    refine[1:] |= points
+    return refine & (h >= 2 * min_width)
+
+
+def _peak_estimate(omega, magnitude):
+    """Significant peaks (positions, values) of every DOF on the current grid."""
+    return [find_significant_peaks(mag, omega) for mag in magnitude]
+
+
+def _peaks_converged(previous, current, position_tol, value_tol):
+    for (pos_a, val_a), (pos_b, val_b) in zip(previous, current):
+        if len(pos_a) != len(pos_b):
+            return False
+        order_a, order_b = np.argsort(pos_a), np.argsort(pos_b)
+        if np.any(np.abs(pos_a[order_a] - pos_b[order_b]) > position_tol):
+            return False
+        if np.any(np.abs(val_a[order_a] - val_b[order_b]) > value_tol * np.abs(val_b[order_b])):
+            return False
+    return True
+
+
+def adaptive_frequency_sweep(response_fn, omega_start, omega_end, omega_points,
+                             tol=ADAPTIVE_TOLERANCE, initial_points=ADAPTIVE_INITIAL_POINTS,
+                             max_passes=ADAPTIVE_MAX_PASSES):
+    """
+    Sample a frequency response on a grid refined only around resonances.
+
+    Starts from a coarse uniform grid and repeatedly bisects the intervals
+    selected by ``_refinement_intervals`` (bracketed maxima/minima and high
+    curvature), evaluating ``response_fn`` only at the new midpoints. The
+    sweep stops when the significant peaks of every DOF move by less than one
+    spacing of the equivalent uniform grid and change in value by less than
+    ``tol`` between passes, or when no interval can be split further.
+
+    Parameters:
+    -----------
+    response_fn : callable
+        Maps a 1-D frequency array to the complex response (n_dofs, n_omega)
+    omega_start, omega_end : float
+        Frequency range
+    omega_points : int
+        Size of the equivalent uniform grid; its spacing is the finest
+        resolution the sweep refines to
+    tol : float
+        Relative tolerance on peak values and local interpolation error
+    initial_points : int
+        Size of the coarse starting grid
+    max_passes : int
+        Maximum number of refinement passes
+
+    Returns:
+    --------
+    omega : ndarray, shape (n,)
+        Sorted, non-uniform frequency grid
+    response : ndarray, shape (n_dofs, n)
+        Complex response on that grid
+    """
+    omega = np.linspace(omega_start, omega_end, max(3, min(initial_points, omega_points)))
+    response = response_fn(omega)
+    min_width = (omega_end - omega_start) / max(omega_points - 1, 1)
+
+    previous = None
+    for _ in range(max_passes):
+        magnitude = np.abs(response)
+        current = _peak_estimate(omega, magnitude)
+        if previous is not None and _peaks_converged(previous, current, min_width, tol):
+            break
+        previous = current
+
+        refine = _refinement_intervals(omega, magnitude, min_width, tol)
+        if not np.any(refine):
+            break
+        new_omega = 0.5 * (omega[:-1][refine] + omega[1:][refine])
+        new_response = response_fn(new_omega)
+
+        omega = np.concatenate([omega, new_omega])
+        response = np.concatenate([response, new_response], axis=1)
+        order = np.argsort(omega, kind='stable')
+        omega, response = omega[order], response[:, order]
+
+    return omega, response
+
+# -----------------------------------------------------------------------------
+# Model-based peak extraction
+# -----------------------------------------------------------------------------
+
+# Available peak extraction strategies for frf()
+PEAK_METHODS = ('grid', 'model')
+
+# Poles whose imaginary part is below this fraction of their magnitude are
+# treated as lying on the real frequency axis
+REAL_POLE_TOLERANCE = 1e-9
+
+
+def extract_model_peaks(response_fn, poles, omega_start, omega_end, resolution,
+                        min_prominence_ratio=0.05, max_peaks=5):
+    """
+    Locate the resonance peaks of every DOF directly from the system model.
+
+    Candidates are seeded from the poles returned by ``modal_decomposition``,
+    one per complex-conjugate pair.
+    Around a complex pole the maximum of |H(w)| is found with a bounded Brent
+    search on the model response, i.e. the root of d|H|/dw to machine
+    precision. In the dynamic-stiffness form used by ``frf`` the damping term
+    is real, so poles normally lie on the real axis where |H| is unbounded:
+    the peak position is then the pole itself and the value is |H| at
+    ``resolution`` from it, the level that any grid of spacing
+    ``2 * resolution`` is guaranteed to reach, independent of where its
+    samples happen to fall. No grid search or interpolation is involved,
+    and the cost depends only on the number of poles.
+
+    Parameters:
+    -----------
+    response_fn : callable
+        Maps a 1-D frequency array to the complex response (n_dofs, n)
+    poles : ndarray
+        Poles of the design (see ``modal_decomposition``)
+    omega_start, omega_end : float
+        Frequency range in which peaks are reported
+    resolution : float
+        Half-width used to evaluate peaks at real poles
+    min_prominence_ratio : float
+        Peaks below this fraction of the largest peak of a DOF are dropped
+    max_peaks : int
+        Maximum number of peaks per DOF (the highest ones are kept)
+
+    Returns:
+    --------
+    list of (peak_positions, peak_values)
+        One pair of arrays per DOF, sorted by frequency
+    """
+    from scipy.optimize import minimize_scalar
+
+    poles = np.asarray(poles)
+    # Complex-conjugate pairs share a real part and would seed the same
+    # search twice; keep one member of each pair.
+    seeds = poles[(poles.real > omega_start) & (poles.real < omega_end) & (poles.imag >= 0)]
+    seeds = seeds[np.argsort(seeds.real)]
+    real = np.abs(seeds.imag) <= REAL_POLE_TOLERANCE * np.maximum(np.abs(seeds), 1.0)
+
+    n_dofs = response_fn(np.array([0.5 * (omega_start + omega_end)])).shape[0]
+    positions = np.empty((n_dofs, seeds.size))
+    values = np.empty((n_dofs, seeds.size))
+
+    if np.any(real):
+        centres = seeds.real[real]
+        sides = np.concatenate([centres - resolution, centres + resolution])
+        magnitude = np.abs(response_fn(np.clip(sides, omega_start, omega_end)))
+        positions[:, real] = centres
+        values[:, real] = np.maximum(magnitude[:, :centres.size], magnitude[:, centres.size:])
+
+    for k in np.flatnonzero(~real):
+        half_width = max(3 * abs(seeds[k].imag), resolution)
+        bounds = (max(omega_start, seeds[k].real - half_width), min(omega_end, seeds[k].real + half_width))
+        for dof in range(n_dofs):
+            search = minimize_scalar(
+                lambda w: -np.abs(response_fn(np.array([w]))[dof, 0]),
+                bounds=bounds, method='bounded', options={'xatol': 1e-10 * max(abs(seeds[k]), 1.0)},
+            )
+            positions[dof, k], values[dof, k] = search.x, -search.fun
+
+    peaks = []
+    for dof in range(n_dofs):
+        keep = values[dof] >= min_prominence_ratio * np.max(values[dof], initial=0.0)
+        pos, val = positions[dof, keep], values[dof, keep]
+        if pos.size > max_peaks:
+            top = np.sort(np.argsort(val)[-max_peaks:])
+            pos, val = pos[top], val[top]
+        peaks.append((pos, val))
+    return peaks
+
 # -----------------------------------------------------------------------------
 # Remaining plotting utilities (unchanged)
 # -----------------------------------------------------------------------------
@@ -796,6 +1242,340 @@ def calculate_singular_response(results, target_values_dict, weights_dict):
     
     return results
 
+# -----------------------------------------------------------------------------
+# Compact (metrics-only) results
+# -----------------------------------------------------------------------------
+
+# Result layouts of frf()
+OUTPUT_MODES = ('full', 'compact')
+
+MASS_LABELS = ("mass_1", "mass_2", "mass_3", "mass_4", "mass_5")
+
+# Width of the fixed per-mass peak arrays of FRFCompactResult
+COMPACT_MAX_PEAKS = 5
+
+
+class FRFCompactResult(NamedTuple):
+    """
+    Fixed-layout result of ``frf(..., output="compact")``.
+
+    Arrays are indexed by mass (0..4 for mass_1..mass_5); entries of masses
+    removed as zero-mass DOFs stay NaN / zero. ``magnitudes`` and ``omega``
+    are None unless requested with ``keep_magnitudes=True``.
+    """
+    singular_response: float
+    percentage_error_sum: float         # sum of |percentage differences|
+    composite_measures: np.ndarray      # (5,)
+    active: np.ndarray                  # (5,) bool
+    n_peaks: np.ndarray                 # (5,) int
+    peak_positions: np.ndarray          # (5, COMPACT_MAX_PEAKS), NaN padded
+    peak_values: np.ndarray             # (5, COMPACT_MAX_PEAKS), NaN padded
+    area_under_curve: np.ndarray        # (5,)
+    slope_max: np.ndarray               # (5,)
+    metrics: Optional[np.ndarray] = None    # flat metric vector of the CompiledObjective
+    omega: Optional[np.ndarray] = None
+    magnitudes: Optional[np.ndarray] = None
+
+
+def _pair_slopes(peak_positions, peak_values, slope_threshold=0.01):
+    """
+    Significant slopes between all peak pairs i < j, as in ``calculate_robust_slopes``.
+
+    Returns:
+    --------
+    pairs : list of (i, j)
+        Zero-based peak pairs, in the order calculate_robust_slopes visits them
+    slopes : ndarray
+        Slope of each pair, NaN where the pair is not significant
+    """
+    n = len(peak_positions)
+    pairs = [(i, j) for i in range(n) for j in range(i + 1, n)]
+    slopes = np.full(len(pairs), np.nan)
+    if n <= 1:
+        return pairs, slopes
+    amplitude_range = np.max(peak_values) - np.min(peak_values)
+    frequency_range = np.max(peak_positions) - np.min(peak_positions)
+    if amplitude_range == 0 or frequency_range == 0:
+        return pairs, slopes
+
+    i, j = np.array(pairs).T
+    dx = peak_positions[j] - peak_positions[i]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = (peak_values[j] - peak_values[i]) / dx
+    significant = (dx != 0) & (np.abs(slope * (frequency_range / amplitude_range)) >= slope_threshold)
+    slopes[significant] = slope[significant]
+    return pairs, slopes
+
+
+def _criterion_index(criterion, prefix, n_indices):
+    """Parse the 1-based indices of e.g. 'peak_value_3' or 'bandwidth_1_2'; None if malformed."""
+    try:
+        indices = [int(part) for part in criterion[len(prefix):].split("_")]
+    except ValueError:
+        return None
+    return indices if len(indices) == n_indices else None
+
+
+def compact_mass_metrics(a_mag, omega, **peak_options):
+    """
+    Peak arrays, area and pair slopes of one mass without building result dicts.
+
+    Returns:
+    --------
+    tuple
+        (peak_positions, peak_values, area_under_curve, pairs, slopes,
+        slope_max), with pairs/slopes as returned by ``_pair_slopes``
+    """
+    peak_positions, peak_values = mass_peak_arrays(a_mag, omega, **peak_options)
+    area = simpson(a_mag, x=omega) if len(a_mag) else np.nan
+    pairs, slopes = _pair_slopes(peak_positions, peak_values)
+    slope_max = np.nan
+    if np.any(~np.isnan(slopes)):
+        slope_max = slopes[np.nanargmax(np.abs(slopes))]
+    return peak_positions, peak_values, area, pairs, slopes, slope_max
+
+
+def build_compact_result(A, omega, active, objective, peak_options, keep_magnitudes=False):
+    """
+    Assemble a ``FRFCompactResult`` from the reduced response of one design.
+
+    Parameters:
+    -----------
+    A : ndarray, shape (n_active, n_omega)
+        Complex response of the active DOFs
+    omega : ndarray
+        Frequency grid
+    active : ndarray, shape (5,) bool
+        Active-DOF mask returned by ``remove_zero_mass_dofs``
+    objective : CompiledObjective
+        Targets and weights, see ``compile_objective``
+    peak_options : callable
+        Maps (local_idx, label) to the keyword arguments of ``mass_peak_arrays``
+    keep_magnitudes : bool
+        Also return the (5, n_omega) magnitudes and the grid
+    """
+    n_mass = len(MASS_LABELS)
+    n_peaks = np.zeros(n_mass, dtype=int)
+    peak_positions = np.full((n_mass, COMPACT_MAX_PEAKS), np.nan)
+    peak_values = np.full((n_mass, COMPACT_MAX_PEAKS), np.nan)
+    area_under_curve = np.full(n_mass, np.nan)
+    slope_max = np.full(n_mass, np.nan)
+    metrics = np.zeros(objective.n_metrics)
+    magnitudes = np.zeros((n_mass, omega.size)) if keep_magnitudes else None
+
+    for local_idx, dof in enumerate(np.flatnonzero(active)):
+        lbl = MASS_LABELS[dof]
+        a_mag = np.abs(A[local_idx])
+        positions, values, area, pairs, slopes, s_max = compact_mass_metrics(
+            a_mag, omega, **peak_options(local_idx, lbl)
+        )
+        objective.fill_metrics(metrics, dof, positions, values, area, pairs, slopes)
+        count = min(len(positions), COMPACT_MAX_PEAKS)
+        n_peaks[dof] = count
+        peak_positions[dof, :count] = positions[:count]
+        peak_values[dof, :count] = values[:count]
+        area_under_curve[dof] = area
+        slope_max[dof] = s_max
+        if keep_magnitudes:
+            magnitudes[dof] = a_mag
+
+    active = np.asarray(active, dtype=bool)
+    singular_response, composite_measures, percentage_error_sum = objective.evaluate(metrics, active)
+    return FRFCompactResult(
+        singular_response=float(singular_response),
+        percentage_error_sum=float(percentage_error_sum),
+        composite_measures=composite_measures,
+        active=active,
+        n_peaks=n_peaks,
+        peak_positions=peak_positions,
+        peak_values=peak_values,
+        area_under_curve=area_under_curve,
+        slope_max=slope_max,
+        metrics=metrics,
+        omega=omega if keep_magnitudes else None,
+        magnitudes=magnitudes,
+    )
+
+# -----------------------------------------------------------------------------
+# Compiled objective
+# -----------------------------------------------------------------------------
+
+def _pair_slot(i, j, n_peaks):
+    """Position of the zero-based pair (i, j), i < j, in the pair order of ``_pair_slopes``."""
+    return i * n_peaks - i * (i + 1) // 2 + (j - i - 1)
+
+
+def _criterion_slot(criterion):
+    """
+    Resolve a criterion name once, following ``calculate_composite_measure``.
+
+    Returns:
+    --------
+    tuple or None
+        (kind, i, j) with zero-based peak indices (j is None for single-peak
+        criteria and area), or None if the criterion always reads 0.0
+    """
+    if criterion.startswith("peak_value") or criterion.startswith("peak_position"):
+        kind = "peak_value" if criterion.startswith("peak_value") else "peak_position"
+        index = _criterion_index(criterion, kind + "_", 1)
+        if index is None or index[0] < 1:
+            return None
+        return kind, index[0] - 1, None
+    if criterion.startswith("bandwidth") or criterion.startswith("slope"):
+        # 'slope_max' is looked up among the pairwise slopes as well and so
+        # never matches
+        kind = "bandwidth" if criterion.startswith("bandwidth") else "slope"
+        index = _criterion_index(criterion, kind + "_", 2)
+        if index is None or not 1 <= index[0] < index[1]:
+            return None
+        return kind, index[0] - 1, index[1] - 1
+    if criterion == "area_under_curve":
+        return "area_under_curve", None, None
+    return None
+
+
+def _metric_layout(max_peaks):
+    """Group offsets and size of one mass block of the metric vector."""
+    n_pairs = max_peaks * (max_peaks - 1) // 2
+    offsets = {
+        "peak_value": 0,
+        "peak_position": max_peaks,
+        "area_under_curve": 2 * max_peaks,
+        "bandwidth": 2 * max_peaks + 1,
+        "slope": 2 * max_peaks + 1 + n_pairs,
+    }
+    return offsets, 2 * max_peaks + 1 + 2 * n_pairs
+
+
+@dataclass(frozen=True)
+class CompiledObjective:
+    """
+    Target and weight dicts resolved once into index maps over a metric vector.
+
+    The metric vector of a design holds ``metrics_per_mass`` slots for each
+    of the 5 masses: peak values, peak positions, area under the curve, pair
+    bandwidths and pair slopes, each of the first ``max_peaks`` peaks (see
+    ``metric_offsets``). Missing peaks and insignificant slopes stay 0.0, as
+    in the dict lookups of ``calculate_composite_measure``, so the singular
+    response reduces to ``metrics @ weight_vector`` and, for a population,
+    to ``metrics[P, n_metrics] @ weight_vector``. Build with
+    ``compile_objective``.
+    """
+    max_peaks: int
+    criteria: tuple                     # (mass label, criterion) per term
+    indices: np.ndarray                 # (n_terms,) metric slot, -1 if always 0.0
+    term_masses: np.ndarray             # (n_terms,) mass index
+    targets: np.ndarray                 # (n_terms,)
+    weight_vector: np.ndarray           # (n_metrics,) summed weight / target per slot
+    mass_weights: np.ndarray            # (n_metrics, 5) the same, split by mass
+
+    @property
+    def metric_offsets(self):
+        """Offsets of each metric group inside one mass block."""
+        return _metric_layout(self.max_peaks)[0]
+
+    @property
+    def metrics_per_mass(self):
+        return _metric_layout(self.max_peaks)[1]
+
+    @property
+    def n_metrics(self):
+        return len(MASS_LABELS) * self.metrics_per_mass
+
+    def fill_metrics(self, metrics, mass_index, peak_positions, peak_values, area_under_curve, pairs, slopes):
+        """Write the metrics of one mass into its block of the flat vector ``metrics``."""
+        n = self.max_peaks
+        offsets = self.metric_offsets
+        block = metrics[mass_index * self.metrics_per_mass:(mass_index + 1) * self.metrics_per_mass]
+        count = min(len(peak_positions), n)
+        block[:count] = peak_values[:count]
+        block[offsets["peak_position"]:offsets["peak_position"] + count] = peak_positions[:count]
+        block[offsets["area_under_curve"]] = area_under_curve
+        if len(pairs):
+            i, j = np.array(pairs).T
+            keep = j < n
+            slot = _pair_slot(i[keep], j[keep], n)
+            block[offsets["bandwidth"] + slot] = peak_positions[j[keep]] - peak_positions[i[keep]]
+            block[offsets["slope"] + slot] = np.nan_to_num(slopes[keep], nan=0.0)
+
+    def composite_measures(self, metrics):
+        """Per-mass composite measures, shape (..., 5)."""
+        return metrics @ self.mass_weights
+
+    def singular_response(self, metrics):
+        """Sum of the composite measures as one dot product, shape (...)."""
+        return metrics @ self.weight_vector
+
+    def percentage_differences(self, metrics):
+        """Signed percentage difference of each term from its target, shape (..., n_terms)."""
+        actual = np.where(self.indices >= 0, metrics[..., np.maximum(self.indices, 0)], 0.0)
+        return (actual - self.targets) / self.targets * 100
+
+    def percentage_error_sum(self, metrics, active):
+        """Sum of |percentage differences| over the terms of the active masses."""
+        percentage = np.abs(self.percentage_differences(metrics))
+        return np.sum(percentage * np.asarray(active)[..., self.term_masses], axis=-1)
+
+    def evaluate(self, metrics, active):
+        """(singular_response, composite_measures, percentage_error_sum) of one or P metric vectors."""
+        return (
+            self.singular_response(metrics),
+            self.composite_measures(metrics),
+            self.percentage_error_sum(metrics, active),
+        )
+
+
+def compile_objective(target_values_dict, weights_dict, max_peaks=COMPACT_MAX_PEAKS):
+    """
+    Build a ``CompiledObjective`` from the per-mass target and weight dicts.
+
+    Call once per run: criterion names are parsed here instead of on every
+    evaluation. Only criteria with a non-zero weight and target contribute,
+    as in ``calculate_composite_measure``; ``max_peaks`` is raised to cover
+    the largest peak index any criterion refers to.
+
+    Parameters:
+    -----------
+    target_values_dict, weights_dict : dict
+        Targets and weights keyed by mass label ("mass_1" ... "mass_5")
+    max_peaks : int
+        Minimum number of peaks per mass kept in the metric vector
+    """
+    target_values_dict = target_values_dict or {}
+    weights_dict = weights_dict or {}
+    terms = []
+    for m, lbl in enumerate(MASS_LABELS):
+        weights = weights_dict.get(lbl) or {}
+        for criterion, target in (target_values_dict.get(lbl) or {}).items():
+            w = weights.get(criterion, 0.0)
+            if w == 0.0 or target == 0:
+                continue
+            slot = _criterion_slot(criterion)
+            if slot is not None and slot[1] is not None:
+                max_peaks = max(max_peaks, 1 + max(k for k in slot[1:] if k is not None))
+            terms.append((m, lbl, criterion, slot, float(target), float(w)))
+
+    offsets, per_mass = _metric_layout(max_peaks)
+    indices = np.full(len(terms), -1, dtype=int)
+    mass_weights = np.zeros((len(MASS_LABELS) * per_mass, len(MASS_LABELS)))
+    for t, (m, _, _, slot, target, w) in enumerate(terms):
+        if slot is None:
+            continue
+        kind, i, j = slot
+        local = offsets[kind] + (_pair_slot(i, j, max_peaks) if j is not None else (i or 0))
+        indices[t] = m * per_mass + local
+        mass_weights[indices[t], m] += w / target
+
+    return CompiledObjective(
+        max_peaks=max_peaks,
+        criteria=tuple((lbl, criterion) for _, lbl, criterion, _, _, _ in terms),
+        indices=indices,
+        term_masses=np.array([term[0] for term in terms], dtype=int),
+        targets=np.array([term[4] for term in terms], dtype=float),
+        weight_vector=mass_weights.sum(axis=1),
+        mass_weights=mass_weights,
+    )
+
 # -----------------------------------------------------------------------------
 # Main FRF routine (unchanged apart from the dependency on new DOF function)
 # -----------------------------------------------------------------------------
@@ -823,6 +1603,13 @@ def frf(
     user_peak_positions=None,  # User-specified peaks
     interpolation_method='cubic',  # Added interpolation method
     interpolation_points=1000,  # Added interpolation points
+    solve_method='batched',  # 'batched' (stacked LAPACK solve), 'loop' or 'modal'
+    frequency_grid='uniform',  # 'uniform' or 'adaptive'
+    adaptive_tolerance=ADAPTIVE_TOLERANCE,
+    peak_method='grid',  # 'grid' (sampled curve) or 'model' (poles + Brent)
+    output='full',  # 'full' (nested dicts) or 'compact' (FRFCompactResult)
+    keep_magnitudes=False,  # only used by output='compact'
+    objective=None,  # CompiledObjective, only used by output='compact'
 ):
     """
     Calculate frequency response functions for the system.
@@ -857,7 +1644,51 @@ def frf(
         Options: 'none', 'linear', 'cubic', 'quadratic', 'akima', etc.
     interpolation_points : int
         Number of points to use in the interpolated curve
+    solve_method : str
+        'batched' (default) builds the dynamic-stiffness matrices of all
+        frequencies as one (n_omega, n_dofs, n_dofs) stack and solves them in
+        a single stacked LAPACK call; only exactly singular frequencies go
+        through the regularization/pseudo-inverse fallback.
+        'loop' keeps the original per-frequency Python loop.
+        'modal' solves the quadratic eigenproblem once and evaluates the
+        response in pole-residue form, so the cost barely grows with
+        omega_points; defective designs fall back to the direct solve.
+    frequency_grid : str
+        'uniform' (default) samples np.linspace(omega_start, omega_end,
+        omega_points). 'adaptive' starts from a coarse grid and only refines
+        around resonances and anti-resonances (see adaptive_frequency_sweep),
+        reaching the peak accuracy of the omega_points uniform grid with a
+        fraction of the solves. Magnitudes are then returned on the
+        non-uniform grid stored in results["frequency_grid"]["omega"].
+    adaptive_tolerance : float
+        Relative convergence tolerance of the adaptive sweep
+    peak_method : str
+        'grid' (default) detects peaks on the sampled magnitude curve.
+        'model' seeds peaks from the poles of the design and locates them on
+        the model response itself (see extract_model_peaks), so peak
+        positions and values, and the slopes and bandwidths built on them,
+        do not depend on how the curve is sampled. Falls back to 'grid' when
+        the modal decomposition is not available.
+    output : str
+        'full' (default) returns the nested result dict. 'compact' returns a
+        FRFCompactResult (fixed-layout arrays, no per-key dict building or
+        serialization) for optimizer inner loops; plotting is skipped.
+    keep_magnitudes : bool
+        With output='compact', also return the (5, n_omega) magnitudes
+    objective : CompiledObjective, optional
+        With output='compact', the targets and weights compiled once per run
+        by compile_objective; compiled from the target/weight arguments when
+        None
     """
+    if solve_method not in SOLVE_METHODS:
+        raise ValueError(f"Unknown solve_method '{solve_method}'. Options: {SOLVE_METHODS}")
+    if frequency_grid not in FREQUENCY_GRIDS:
+        raise ValueError(f"Unknown frequency_grid '{frequency_grid}'. Options: {FREQUENCY_GRIDS}")
+    if peak_method not in PEAK_METHODS:
+        raise ValueError(f"Unknown peak_method '{peak_method}'. Options: {PEAK_METHODS}")
+    if output not in OUTPUT_MODES:
+        raise ValueError(f"Unknown output '{output}'. Options: {OUTPUT_MODES}")
+
     # ---------------------------------------------------------------------
     # Unpack parameters (unchanged)…
     # ---------------------------------------------------------------------
@@ -902,54 +1733,95 @@ def frf(
         [-lambda_3, -lambda_6, -lambda_10, -lambda_15, lambda_14 + lambda_6 + lambda_13 + lambda_3 + lambda_15 + lambda_10],
     ])
 
-    # Forcing vector (unchanged)…
-    f_1_omega = F_1 * np.exp(1j * omega)
-    f_2_omega = F_2 * np.exp(1j * omega)
-    u_low = A_LOW * np.exp(1j * omega)
-    u_upp = A_UPP * np.exp(1j * omega)
+    # Forcing vector (unchanged), as a function of the frequency grid so the
+    # adaptive sweep can evaluate it at new points
+    def forcing(omega):
+        f_1_omega = F_1 * np.exp(1j * omega)
+        f_2_omega = F_2 * np.exp(1j * omega)
+        u_low = A_LOW * np.exp(1j * omega)
+        u_upp = A_UPP * np.exp(1j * omega)
 
-    f = np.array([
-        f_1_omega + 2 * ZETA_DC * OMEGA_DC * (1j * omega * u_low + NU_2 * 1j * omega * u_upp) + OMEGA_DC**2 * (u_low + LANDA_2 * u_upp),
-        f_2_omega + 2 * ZETA_DC * OMEGA_DC * (NU_4 * 1j * omega * u_low + NU_5 * 1j * omega * u_upp) + OMEGA_DC**2 * (LANDA_4 * u_low + LANDA_5 * u_upp),
-        beta_7 * (-omega**2) * u_low + 2 * ZETA_DC * OMEGA_DC * (nu_7 * 1j * omega * u_low + nu_8 * 1j * omega * u_upp) + OMEGA_DC**2 * (lambda_7 * u_low + lambda_8 * u_upp) + beta_8 * (-omega**2) * u_upp,
-        beta_11 * (-omega**2) * u_low + 2 * ZETA_DC * OMEGA_DC * (nu_11 * 1j * omega * u_low + nu_12 * 1j * omega * u_upp) + OMEGA_DC**2 * (lambda_11 * u_low + lambda_12 * u_upp) + beta_12 * (-omega**2) * u_upp,
-        beta_13 * (-omega**2) * u_low + 2 * ZETA_DC * OMEGA_DC * (nu_13 * 1j * omega * u_low + nu_14 * 1j * omega * u_upp) + OMEGA_DC**2 * (lambda_13 * u_low + lambda_14 * u_upp) + beta_14 * (-omega**2) * u_upp,
-    ])
+        return np.array([
+            f_1_omega + 2 * ZETA_DC * OMEGA_DC * (1j * omega * u_low + NU_2 * 1j * omega * u_upp) + OMEGA_DC**2 * (u_low + LANDA_2 * u_upp),
+            f_2_omega + 2 * ZETA_DC * OMEGA_DC * (NU_4 * 1j * omega * u_low + NU_5 * 1j * omega * u_upp) + OMEGA_DC**2 * (LANDA_4 * u_low + LANDA_5 * u_upp),
+            beta_7 * (-omega**2) * u_low + 2 * ZETA_DC * OMEGA_DC * (nu_7 * 1j * omega * u_low + nu_8 * 1j * omega * u_upp) + OMEGA_DC**2 * (lambda_7 * u_low + lambda_8 * u_upp) + beta_8 * (-omega**2) * u_upp,
+            beta_11 * (-omega**2) * u_low + 2 * ZETA_DC * OMEGA_DC * (nu_11 * 1j * omega * u_low + nu_12 * 1j * omega * u_upp) + OMEGA_DC**2 * (lambda_11 * u_low + lambda_12 * u_upp) + beta_12 * (-omega**2) * u_upp,
+            beta_13 * (-omega**2) * u_low + 2 * ZETA_DC * OMEGA_DC * (nu_13 * 1j * omega * u_low + nu_14 * 1j * omega * u_upp) + OMEGA_DC**2 * (lambda_13 * u_low + lambda_14 * u_upp) + beta_14 * (-omega**2) * u_upp,
+        ])
+
+    f = forcing(omega)
 
     # *** uses new removal function ***
     mm, cc, kk, f_reduced, active = remove_zero_mass_dofs(mass_matrix, damping_matrix_raw, stiffness_matrix_raw, f)
     if mm.size == 0:
         raise ValueError("All degrees of freedom have zero mass. Cannot perform analysis.")
 
-    n_dofs = mm.shape[0]
-    A = np.zeros((n_dofs, len(omega)), dtype=complex)
-    def _robust_solve(hmat, rhs):
-        """Solve hmat x = rhs with regularization/pseudoinverse fallbacks."""
-        try:
-            return np.linalg.solve(hmat, rhs)
-        except np.linalg.LinAlgError:
-            # Regularize the system progressively on the diagonal
-            # Scale epsilon with the matrix norm to be unit-agnostic
-            scale = np.linalg.norm(hmat, ord=np.inf)
-            base_eps = (1e-12 if scale == 0 else 1e-12 * scale)
-            I = np.eye(hmat.shape[0], dtype=hmat.dtype)
-            for mult in (1.0, 1e1, 1e2, 1e3, 1e4):
-                try:
-                    return np.linalg.solve(hmat + (base_eps * mult) * I, rhs)
-                except np.linalg.LinAlgError:
-                    continue
-            # Final fallback: use pseudo-inverse
-            try:
-                return np.linalg.pinv(hmat) @ rhs
-            except Exception:
-                # As a last resort, least-squares
-                return np.linalg.lstsq(hmat, rhs, rcond=None)[0]
+    def solve(Omega, f_reduced):
+        if solve_method == 'loop':
+            n_dofs = mm.shape[0]
+            A = np.zeros((n_dofs, len(Omega)), dtype=complex)
+            for i, Om in enumerate(Omega):
+                hh = -Om**2 * mm + 2 * ZETA_DC * Om * cc + kk
+                hh *= OMEGA_DC**2
+                # Use robust solver that avoids hard failures on singular/ill-conditioned systems
+                A[:, i] = _robust_solve(hh, f_reduced[:, i]) * OMEGA_DC**2
+            return A
+        if solve_method == 'modal':
+            return solve_modal_response(mm, cc, kk, f_reduced, Omega, ZETA_DC, OMEGA_DC)
+        return solve_dynamic_stiffness(mm, cc, kk, f_reduced, Omega, ZETA_DC, OMEGA_DC)
+
+    if frequency_grid == 'adaptive':
+        omega, A = adaptive_frequency_sweep(
+            lambda om: solve(om, forcing(om)[active]),
+            omega_start, omega_end, omega_points, tol=adaptive_tolerance,
+        )
+    else:
+        A = solve(Omega, f_reduced)
 
-    for i, Om in enumerate(Omega):
-        hh = -Om**2 * mm + 2 * ZETA_DC * Om * cc + kk
-        hh *= OMEGA_DC**2
-        # Use robust solver that avoids hard failures on singular/ill-conditioned systems
-        A[:, i] = _robust_solve(hh, f_reduced[:, i]) * OMEGA_DC**2
+    model_peaks = None
+    if peak_method == 'model':
+        modes = modal_decomposition(mm, cc, kk, ZETA_DC)
+        if modes is not None:
+            response_fn = lambda om: solve(om, forcing(om)[active])
+            resolution = 0.5 * (omega_end - omega_start) / max(omega_points - 1, 1)
+            model_peaks = extract_model_peaks(response_fn, modes[0], omega_start, omega_end, resolution)
+
+    def peak_options(local_idx, lbl):
+        # Get user-specified peaks for this mass if provided
+        mass_peaks = user_peak_positions.get(lbl, None) if user_peak_positions else None
+        dof_peaks = None
+        if model_peaks is not None:
+            dof_peaks = model_peaks[local_idx]
+            if mass_peaks is not None:
+                # User peaks are evaluated exactly on the model as well
+                user_pos = np.asarray(mass_peaks, dtype=float)
+                user_val = np.abs(response_fn(user_pos)[local_idx])
+                dof_peaks = (np.concatenate([user_pos, dof_peaks[0]]), np.concatenate([user_val, dof_peaks[1]]))
+        return {
+            "user_peak_positions": mass_peaks,
+            "refine_peaks": frequency_grid == 'uniform',
+            "model_peaks": dof_peaks,
+        }
+
+    target_dict = {
+        "mass_1": target_values_mass1,
+        "mass_2": target_values_mass2,
+        "mass_3": target_values_mass3,
+        "mass_4": target_values_mass4,
+        "mass_5": target_values_mass5,
+    }
+    weight_dict = {
+        "mass_1": weights_mass1,
+        "mass_2": weights_mass2,
+        "mass_3": weights_mass3,
+        "mass_4": weights_mass4,
+        "mass_5": weights_mass5,
+    }
+
+    if output == 'compact':
+        if objective is None:
+            objective = compile_objective(target_dict, weight_dict)
+        return build_compact_result(A, omega, active, objective, peak_options, keep_magnitudes)
 
     results = {}
     idxs = np.where(active)[0]
@@ -958,9 +1830,7 @@ def frf(
 
     for local_idx, dof in enumerate(idxs):
         lbl = label_map.get(dof, f"mass_{dof+1}")
-        # Get user-specified peaks for this mass if provided
-        mass_peaks = user_peak_positions.get(lbl, None) if user_peak_positions else None
-        mass_res = process_mass(A[local_idx, :], omega, user_peak_positions=mass_peaks)
+        mass_res = process_mass(A[local_idx, :], omega, **peak_options(local_idx, lbl))
         results[lbl] = mass_res
         mass_data_list.append(mass_res)
         mass_labels_list.append(lbl)
@@ -982,21 +1852,6 @@ def frf(
             interpolation_points=interpolation_points
         )
 
-    target_dict = {
-        "mass_1": target_values_mass1,
-        "mass_2": target_values_mass2,
-        "mass_3": target_values_mass3,
-        "mass_4": target_values_mass4,
-        "mass_5": target_values_mass5,
-    }
-    weight_dict = {
-        "mass_1": weights_mass1,
-        "mass_2": weights_mass2,
-        "mass_3": weights_mass3,
-        "mass_4": weights_mass4,
-        "mass_5": weights_mass5,
-    }
-
     results = calculate_singular_response(results, target_dict, weight_dict)
     
     # Add interpolation method information to results
@@ -1004,10 +1859,420 @@ def frf(
         "method": interpolation_method,
         "points": interpolation_points
     }
+    if frequency_grid == 'adaptive':
+        results["frequency_grid"] = {
+            "method": frequency_grid,
+            "omega": omega,
+            "points": int(omega.size),
+        }
     
     # Remove all print statements and just return the results
     return results
 
+# -----------------------------------------------------------------------------
+# Linear-in-parameters assembly operator
+# -----------------------------------------------------------------------------
+
+# Layout of the 48-value DVA vector: beta_1-15, lambda_1-15, mu_1-3, nu_1-15
+DVA_BETA = slice(0, 15)
+DVA_LAMBDA = slice(15, 30)
+DVA_MU = slice(30, 33)
+DVA_NU = slice(33, 48)
+
+# Absorber elements (inerter beta_j, spring lambda_j, damper nu_j share the
+# index j) connecting two DOFs, and elements tied to a base motion
+# ('low' -> A_LOW, 'upp' -> A_UPP) acting on a single DOF.
+COUPLING_ELEMENTS = {1: (0, 2), 2: (0, 3), 3: (0, 4), 4: (1, 2), 5: (1, 3), 6: (1, 4), 9: (2, 3), 10: (2, 4), 15: (3, 4)}
+GROUNDED_ELEMENTS = {7: (2, 'low'), 8: (2, 'upp'), 11: (3, 'low'), 12: (3, 'upp'), 13: (4, 'low'), 14: (4, 'upp')}
+
+# DOF carrying each absorber mass mu_1..mu_3
+ABSORBER_MASS_DOFS = (2, 3, 4)
+
+
+@dataclass(frozen=True)
+class AssemblyOperator:
+    """
+    Sparse linear maps from the 48 DVA parameters to the system matrices.
+
+    With ``d`` a DVA vector and ``M0, C0, K0, f0`` the main-system part
+    (``main_system_matrices``), the model used by ``frf`` is exactly
+
+        M = M0 + (mass @ d).reshape(5, 5)
+        C = C0 + 2 zeta Omega_dc (damping @ d).reshape(5, 5)
+        K = K0 + Omega_dc^2 (stiffness @ d).reshape(5, 5)
+        f = f0 + sum_k (forcing[k] @ d) * basis_k(omega)
+
+    where ``forcing[k]`` (5 x 48) pairs with the base-motion basis functions
+    returned by ``forcing_basis``. Because every map is linear, a population
+    (P, 48) is assembled with one sparse product per matrix, and column j of
+    each map is the exact derivative of the matrix with respect to d[j].
+    """
+    mass: object          # scipy.sparse.csr_matrix, shape (25, 48)
+    damping: object       # scipy.sparse.csr_matrix, shape (25, 48)
+    stiffness: object     # scipy.sparse.csr_matrix, shape (25, 48)
+    forcing: tuple        # 6 x scipy.sparse.csr_matrix, shape (5, 48)
+
+    def parameter_derivatives(self, index, main_system_parameters):
+        """
+        Derivatives dM, dC, dK (5 x 5 each) with respect to DVA parameter ``index``.
+
+        Useful for gradients and for rank-k updates of an already assembled
+        system when only a few parameters change.
+        """
+        omega_dc, zeta_dc = main_system_parameters[15], main_system_parameters[16]
+        column = lambda op: op[:, index].toarray().reshape(5, 5)
+        return (
+            column(self.mass),
+            2 * zeta_dc * omega_dc * column(self.damping),
+            omega_dc**2 * column(self.stiffness),
+        )
+
+
+def _element_stencil(element, offset):
+    """Sparse (row, col, value) triplets for one absorber element of a parameter family."""
+    entries = []
+    if element in COUPLING_ELEMENTS:
+        a, b = COUPLING_ELEMENTS[element]
+        entries += [(5 * a + a, 1.0), (5 * b + b, 1.0), (5 * a + b, -1.0), (5 * b + a, -1.0)]
+    else:
+        dof, _ = GROUNDED_ELEMENTS[element]
+        entries.append((5 * dof + dof, 1.0))
+    return [(row, offset + element - 1, value) for row, value in entries]
+
+
+@lru_cache(maxsize=None)
+def build_assembly_operator():
+    """
+    Build (once) the sparse ``AssemblyOperator`` of the 5-DOF DVA model.
+
+    Returns:
+    --------
+    AssemblyOperator
+    """
+    from scipy.sparse import csr_matrix
+
+    def _matrix(triplets, n_rows):
+        rows, cols, vals = zip(*triplets)
+        return csr_matrix((vals, (rows, cols)), shape=(n_rows, 48))
+
+    elements = sorted(COUPLING_ELEMENTS) + sorted(GROUNDED_ELEMENTS)
+    family = lambda offset: [t for e in elements for t in _element_stencil(e, offset)]
+
+    mass = family(DVA_BETA.start) + [(6 * dof, DVA_MU.start + i, 1.0) for i, dof in enumerate(ABSORBER_MASS_DOFS)]
+
+    # Forcing maps, ordered like forcing_basis: displacement, velocity and
+    # acceleration of the lower and upper base motions
+    forcing = []
+    for offset in (DVA_LAMBDA.start, DVA_NU.start, DVA_BETA.start):
+        for side in ('low', 'upp'):
+            forcing.append(_matrix(
+                [(dof, offset + e - 1, 1.0) for e, (dof, s) in GROUNDED_ELEMENTS.items() if s == side], 5
+            ))
+
+    return AssemblyOperator(
+        mass=_matrix(mass, 25),
+        damping=_matrix(family(DVA_NU.start), 25),
+        stiffness=_matrix(family(DVA_LAMBDA.start), 25),
+        forcing=tuple(forcing),
+    )
+
+
+def forcing_basis(main_system_parameters, omega):
+    """
+    Base-motion basis functions paired with ``AssemblyOperator.forcing``.
+
+    Returns:
+    --------
+    ndarray, shape (6, n_omega), complex
+        Omega_dc^2 u, 2 zeta Omega_dc i w u and -w^2 u for u = u_low, u_upp
+    """
+    A_LOW, A_UPP, OMEGA_DC, ZETA_DC = (main_system_parameters[i] for i in (11, 12, 15, 16))
+    omega = np.asarray(omega, dtype=float)
+    u_low = A_LOW * np.exp(1j * omega)
+    u_upp = A_UPP * np.exp(1j * omega)
+    return np.array([
+        OMEGA_DC**2 * u_low, OMEGA_DC**2 * u_upp,
+        2 * ZETA_DC * OMEGA_DC * 1j * omega * u_low, 2 * ZETA_DC * OMEGA_DC * 1j * omega * u_upp,
+        -omega**2 * u_low, -omega**2 * u_upp,
+    ])
+
+
+def main_system_matrices(main_system_parameters, omega=None):
+    """
+    Main-system part ``M0, C0, K0`` (and ``f0`` if ``omega`` is given) of the model.
+
+    These are the entries of the ``frf`` matrices that do not depend on the
+    DVA parameters; damping and stiffness carry their scale factors.
+    """
+    MU, LANDA_1, LANDA_2, LANDA_3, LANDA_4, LANDA_5, NU_1, NU_2, NU_3, NU_4, NU_5, A_LOW, A_UPP, F_1, F_2, OMEGA_DC, ZETA_DC = main_system_parameters
+
+    m0 = np.zeros((5, 5))
+    m0[0, 0], m0[1, 1] = 1.0, MU
+    c0 = np.zeros((5, 5))
+    c0[:2, :2] = [[1 + NU_1 + NU_2 + NU_3, -NU_3], [-NU_3, NU_5 + NU_4 + NU_3]]
+    k0 = np.zeros((5, 5))
+    k0[:2, :2] = [[1 + LANDA_1 + LANDA_2 + LANDA_3, -LANDA_3], [-LANDA_3, LANDA_5 + LANDA_4 + LANDA_3]]
+    c0 *= 2 * ZETA_DC * OMEGA_DC
+    k0 *= OMEGA_DC**2
+    if omega is None:
+        return m0, c0, k0
+
+    omega = np.asarray(omega, dtype=float)
+    u_low = A_LOW * np.exp(1j * omega)
+    u_upp = A_UPP * np.exp(1j * omega)
+    f0 = np.zeros((5, omega.size), dtype=complex)
+    f0[0] = F_1 * np.exp(1j * omega) + 2 * ZETA_DC * OMEGA_DC * (1j * omega * u_low + NU_2 * 1j * omega * u_upp) + OMEGA_DC**2 * (u_low + LANDA_2 * u_upp)
+    f0[1] = F_2 * np.exp(1j * omega) + 2 * ZETA_DC * OMEGA_DC * (NU_4 * 1j * omega * u_low + NU_5 * 1j * omega * u_upp) + OMEGA_DC**2 * (LANDA_4 * u_low + LANDA_5 * u_upp)
+    return m0, c0, k0, f0
+
+
+def assemble_population(main_system_parameters, dva_matrix, omega=None, operator=None):
+    """
+    Assemble the system matrices of many designs with the assembly operator.
+
+    Parameters:
+    -----------
+    main_system_parameters : sequence of 17 floats
+        Main system parameters, shared by the population
+    dva_matrix : array-like, shape (P, 48) or (48,)
+        DVA parameter vectors, one per row
+    omega : array-like, optional
+        Frequency grid; when given the forcing is assembled as well
+    operator : AssemblyOperator, optional
+        Defaults to ``build_assembly_operator()``
+
+    Returns:
+    --------
+    mass, damping, stiffness : ndarray, shape (P, 5, 5)
+    forcing : ndarray, shape (P, 5, n_omega), complex (only if omega is given)
+    """
+    operator = operator or build_assembly_operator()
+    D = np.atleast_2d(np.asarray(dva_matrix, dtype=float))
+    if D.shape[1] != 48:
+        raise ValueError(f"dva_matrix must have 48 columns, got {D.shape[1]}")
+    OMEGA_DC, ZETA_DC = main_system_parameters[15], main_system_parameters[16]
+    n_pop = D.shape[0]
+
+    base = main_system_matrices(main_system_parameters, omega)
+    apply = lambda op: (op @ D.T).T
+    mass = base[0] + apply(operator.mass).reshape(n_pop, 5, 5)
+    damping = base[1] + 2 * ZETA_DC * OMEGA_DC * apply(operator.damping).reshape(n_pop, 5, 5)
+    stiffness = base[2] + OMEGA_DC**2 * apply(operator.stiffness).reshape(n_pop, 5, 5)
+    if omega is None:
+        return mass, damping, stiffness
+
+    coeffs = np.stack([apply(op) for op in operator.forcing], axis=1)  # (P, 6, 5)
+    forcing = base[3] + np.einsum('pkr,kw->prw', coeffs, forcing_basis(main_system_parameters, omega))
+    return mass, damping, stiffness, forcing
+
+# -----------------------------------------------------------------------------
+# Population-level FRF evaluation
+# -----------------------------------------------------------------------------
+
+# Width of the per-mass peak arrays in FRFBatchResult (matches the default
+# max_peaks of find_significant_peaks)
+BATCH_MAX_PEAKS = 5
+
+# Upper bound on the number of (individual, frequency) systems assembled into
+# one stacked solve by frf_batch
+BATCH_SYSTEMS_BLOCK = 65536
+
+
+@dataclass
+class FRFBatchResult:
+    """
+    Struct-of-arrays result of ``frf_batch`` for a population of P designs.
+
+    Array fields are indexed ``[individual, mass, ...]``; masses whose DOF was
+    eliminated by ``remove_zero_mass_dofs`` have ``active == False``, zero
+    magnitude and NaN metrics. Designs for which every DOF vanished have
+    ``valid == False`` and a NaN singular response (``frf`` raises for them).
+    """
+    omega: np.ndarray                   # (n_omega,)
+    magnitudes: np.ndarray              # (P, 5, n_omega), empty if not kept
+    active: np.ndarray                  # (P, 5) bool
+    valid: np.ndarray                   # (P,) bool
+    n_peaks: np.ndarray                 # (P, 5) int
+    peak_positions: np.ndarray          # (P, 5, BATCH_MAX_PEAKS), NaN padded
+    peak_values: np.ndarray             # (P, 5, BATCH_MAX_PEAKS), NaN padded
+    area_under_curve: np.ndarray        # (P, 5)
+    slope_max: np.ndarray               # (P, 5)
+    composite_measures: np.ndarray      # (P, 5)
+    percentage_error_sum: np.ndarray    # (P,) sum of |percentage differences|
+    singular_response: np.ndarray       # (P,)
+    metrics: np.ndarray                 # (P, n_metrics) rows of the CompiledObjective
+
+    def __len__(self):
+        return self.singular_response.shape[0]
+
+
+def assemble_system_batch(main_system_parameters, dva_matrix, omega):
+    """
+    Assemble mass, damping, stiffness and forcing for a population of designs.
+
+    The matrices are the ones written out in ``frf`` (damping and stiffness
+    already carry their 2*zeta*Omega_dc and Omega_dc^2 factors), built for all
+    P rows of ``dva_matrix`` at once.
+
+    Parameters:
+    -----------
+    main_system_parameters : sequence of 17 floats
+        Main system parameters
+    dva_matrix : ndarray, shape (P, 48)
+        One DVA parameter vector per row
+    omega : ndarray, shape (n_omega,)
+        Frequency grid
+
+    Returns:
+    --------
+    mass, damping, stiffness : ndarray, shape (P, 5, 5)
+    forcing : ndarray, shape (P, 5, n_omega), complex
+    """
+    return assemble_population(main_system_parameters, dva_matrix, omega)
+
+
+def active_dof_mask_batch(mass, damping, stiffness, forcing, *, tol=1e-8):
+    """Vectorized ``remove_zero_mass_dofs`` criterion: (P, n_dofs) mask of DOFs that are kept."""
+    def _zero(mat):
+        zero = np.isclose(mat, 0, atol=tol)
+        return np.all(zero, axis=2) | np.all(zero, axis=1)
+
+    z_force = np.all(np.isclose(forcing, 0, atol=tol), axis=2)
+    return ~(_zero(mass) | (_zero(damping) & _zero(stiffness) & z_force))
+
+
+def solve_population_response(mass, damping, stiffness, forcing, active, omega, zeta_dc, omega_dc):
+    """
+    Complex response (P, n_dofs, n_omega) of a population of assembled systems.
+
+    Designs sharing the same set of active DOFs are reduced together and all
+    of their (individual, frequency) systems are solved as one stacked tensor
+    via ``solve_frequency_stack``. Inactive DOFs are left at zero.
+    """
+    omega = np.asarray(omega, dtype=float)
+    P, n_dofs, _ = mass.shape
+    response = np.zeros((P, n_dofs, omega.size), dtype=complex)
+    if P == 0 or omega.size == 0:
+        return response
+
+    scale = omega_dc**2
+    Om = omega[None, :, None, None]
+    patterns, inverse = np.unique(active, axis=0, return_inverse=True)
+    inverse = np.ravel(inverse)
+    per_block = max(1, BATCH_SYSTEMS_BLOCK // omega.size)
+    for g, pattern in enumerate(patterns):
+        dofs = np.flatnonzero(pattern)
+        if dofs.size == 0:
+            continue
+        members = np.flatnonzero(inverse == g)
+        sel = np.ix_(dofs, dofs)
+        for start in range(0, members.size, per_block):
+            idx = members[start:start + per_block]
+            mm = mass[idx][:, sel[0], sel[1]][:, None]
+            cc = damping[idx][:, sel[0], sel[1]][:, None]
+            kk = stiffness[idx][:, sel[0], sel[1]][:, None]
+            hh = (-Om**2 * mm + 2 * zeta_dc * Om * cc + kk) * scale
+            rhs = forcing[idx][:, dofs, :].transpose(0, 2, 1)
+            k = dofs.size
+            x = solve_frequency_stack(hh.reshape(-1, k, k), np.ascontiguousarray(rhs).reshape(-1, k))
+            response[idx[:, None], dofs[None, :], :] = x.reshape(idx.size, omega.size, k).transpose(0, 2, 1) * scale
+    return response
+
+
+def frf_batch(
+    main_system_parameters,
+    dva_matrix,
+    omega_start,
+    omega_end,
+    omega_points,
+    target_values_dict=None,
+    weights_dict=None,
+    *,
+    keep_magnitudes=True,
+    objective=None,
+):
+    """
+    Evaluate the FRF of a whole population of DVA designs in one call.
+
+    Equivalent to calling ``frf`` once per row of ``dva_matrix``, but the P x
+    n_omega dynamic-stiffness systems are assembled and solved as a single
+    vectorized tensor operation, so a generation costs a few NumPy calls
+    instead of P separate FRF runs. Peak metrics are then extracted per mass
+    with ``compact_mass_metrics`` into a (P, n_metrics) matrix that is scored
+    against the compiled objective in one matrix product.
+
+    Parameters:
+    -----------
+    main_system_parameters : list or array
+        Main system parameters (17 values)
+    dva_matrix : array-like, shape (P, 48)
+        DVA parameter vectors, one per row
+    omega_start, omega_end : float
+        Frequency range
+    omega_points : int
+        Number of frequency points
+    target_values_dict, weights_dict : dict, optional
+        Targets and weights keyed by mass label ("mass_1" ... "mass_5"),
+        as stored by the optimization workers
+    keep_magnitudes : bool
+        If False, the (P, 5, n_omega) magnitude block is not returned
+    objective : CompiledObjective, optional
+        Compiled targets and weights; built from the dicts when None
+
+    Returns:
+    --------
+    FRFBatchResult
+    """
+    if objective is None:
+        objective = compile_objective(target_values_dict, weights_dict)
+    ZETA_DC = main_system_parameters[16]
+    OMEGA_DC = main_system_parameters[15]
+
+    omega = np.linspace(omega_start, omega_end, omega_points)
+    mass, damping, stiffness, forcing = assemble_system_batch(main_system_parameters, dva_matrix, omega)
+    active = active_dof_mask_batch(mass, damping, stiffness, forcing)
+    response = solve_population_response(mass, damping, stiffness, forcing, active, omega, ZETA_DC, OMEGA_DC)
+    magnitudes = np.abs(response)
+
+    P, n_mass = active.shape
+    n_peaks = np.zeros((P, n_mass), dtype=int)
+    peak_positions = np.full((P, n_mass, BATCH_MAX_PEAKS), np.nan)
+    peak_values = np.full((P, n_mass, BATCH_MAX_PEAKS), np.nan)
+    area_under_curve = np.full((P, n_mass), np.nan)
+    slope_max = np.full((P, n_mass), np.nan)
+    metrics = np.zeros((P, objective.n_metrics))
+    valid = np.any(active, axis=1)
+
+    for p in np.flatnonzero(valid):
+        for m in np.flatnonzero(active[p]):
+            positions, values, area, pairs, slopes, s_max = compact_mass_metrics(magnitudes[p, m], omega)
+            objective.fill_metrics(metrics[p], m, positions, values, area, pairs, slopes)
+            count = min(len(positions), BATCH_MAX_PEAKS)
+            n_peaks[p, m] = count
+            peak_positions[p, m, :count] = positions[:count]
+            peak_values[p, m, :count] = values[:count]
+            area_under_curve[p, m] = area
+            slope_max[p, m] = s_max
+
+    singular_response, composite_measures, percentage_error_sum = objective.evaluate(metrics, active)
+    singular_response[~valid] = np.nan
+
+    return FRFBatchResult(
+        omega=omega,
+        magnitudes=magnitudes if keep_magnitudes else np.empty((0, n_mass, 0)),
+        active=active,
+        valid=valid,
+        n_peaks=n_peaks,
+        peak_positions=peak_positions,
+        peak_values=peak_values,
+        area_under_curve=area_under_curve,
+        slope_max=slope_max,
+        composite_measures=composite_measures,
+        percentage_error_sum=percentage_error_sum,
+        singular_response=singular_response,
+        metrics=metrics,
+    )
+
 # -----------------------------------------------------------------------------
 # Omega points sensitivity analysis
 # -----------------------------------------------------------------------------
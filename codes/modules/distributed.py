@@ -0,0 +1,552 @@
+# distributed.py
+
+import argparse
+import hashlib
+import multiprocessing
+import os
+import pickle
+import socket
+import threading
+import time
+import uuid
+from collections import deque
+from multiprocessing.managers import BaseManager
+
+import numpy as np
+
+from modules.frf_cache import cached_frf, get_shared_cache
+
+# -----------------------------------------------------------------------------
+# Configuration
+# -----------------------------------------------------------------------------
+
+# Environment variables naming the broker ("host:port") and its shared
+# secret, so optimizers can target a broker without further settings. There
+# is no default secret: the broker unpickles what clients send, so it must
+# never accept a key anyone could guess
+BROKER_ENV = "DEVANA_BROKER"
+AUTHKEY_ENV = "DEVANA_BROKER_AUTHKEY"
+DEFAULT_PORT = 50555
+
+# Interface a broker listens on unless told otherwise; other machines can
+# only reach it after an explicit --address 0.0.0.0:PORT
+DEFAULT_BROKER_HOST = "127.0.0.1"
+
+# Rows per batch handed to a worker: large enough to amortize the network
+# round trip, small enough to balance uneven workers
+DEFAULT_BATCH_ROWS = 16
+
+# Seconds between heartbeats of a worker, and of silence after which its
+# batches are handed to other workers
+HEARTBEAT_INTERVAL = 1.0
+HEARTBEAT_TIMEOUT = 10.0
+
+# Seconds a batch may be in flight before an idle worker may take over a
+# second copy of it (the first result to arrive is kept)
+STEAL_AFTER = 5.0
+
+# Seconds between result polls of a client and work polls of an idle worker
+POLL_INTERVAL = 0.05
+
+# Seconds a client waits with work queued but no live worker before it gives up
+NO_WORKER_TIMEOUT = 30.0
+
+
+
+class BrokerUnavailable(RuntimeError):
+    """The broker cannot be reached or has no workers to run the batches."""
+
+
+# Errors meaning the broker cannot be reached or used
+DISTRIBUTED_ERRORS = (OSError, EOFError, ConnectionError, TimeoutError, BrokerUnavailable)
+
+
+def parse_address(address=None):
+    """
+    (host, port) of a broker address.
+
+    Accepts a (host, port) tuple, a "host:port" string or None, which reads
+    the DEVANA_BROKER environment variable.
+    """
+    if address is None:
+        address = os.environ.get(BROKER_ENV, "")
+        if not address:
+            raise BrokerUnavailable(f"No broker address given and {BROKER_ENV} is not set")
+    if isinstance(address, str):
+        host, _, port = address.rpartition(":")
+        return (host or "127.0.0.1", int(port) if port else DEFAULT_PORT)
+    return (address[0], int(address[1]))
+
+
+def _authkey(authkey=None):
+    if authkey is None:
+        authkey = os.environ.get(AUTHKEY_ENV, "")
+    if not authkey:
+        raise BrokerUnavailable(f"No broker authkey given and {AUTHKEY_ENV} is not set")
+    return authkey.encode() if isinstance(authkey, str) else bytes(authkey)
+
+
+def problem_config(main_system_parameters, omega_start, omega_end, omega_points,
+                   target_values_dict, weights_dict, frf_options=None):
+    """Everything a worker needs to evaluate designs of one problem."""
+    return {
+        "main_system_parameters": [float(v) for v in main_system_parameters],
+        "omega_start": omega_start,
+        "omega_end": omega_end,
+        "omega_points": omega_points,
+        "target_values_dict": target_values_dict or {},
+        "weights_dict": weights_dict or {},
+        "frf_options": dict(frf_options or {}),
+    }
+
+# -----------------------------------------------------------------------------
+# Broker
+# -----------------------------------------------------------------------------
+
+class BrokerState:
+    """
+    Work queue of the broker process.
+
+    Clients register a problem configuration and submit populations, which
+    are split into batches. Workers pull batches (so faster workers take
+    more), report heartbeats and push results back. Batches of workers that
+    stop sending heartbeats are queued again, and once the queue is empty an
+    idle worker may take over a copy of a batch that has been in flight for
+    too long. Results stay with the broker until the submitting client
+    collects them.
+    """
+
+    def __init__(self, heartbeat_timeout=HEARTBEAT_TIMEOUT, steal_after=STEAL_AFTER):
+        self.heartbeat_timeout = heartbeat_timeout
+        self.steal_after = steal_after
+        self._lock = threading.Lock()
+        self._configs = {}
+        self._batches = {}
+        self._pending = deque()
+        self._workers = {}
+        self._next_batch = 0
+        self.counters = {"batches": 0, "rows": 0, "requeued": 0, "stolen": 0, "duplicates": 0}
+
+    # Client side -------------------------------------------------------------
+
+    def register_config(self, config):
+        """Store a problem configuration; returns its content-derived id."""
+        config_id = hashlib.sha256(pickle.dumps(config, protocol=4)).hexdigest()[:16]
+        with self._lock:
+            self._configs.setdefault(config_id, config)
+        return config_id
+
+    def submit(self, config_id, rows, batch_rows=DEFAULT_BATCH_ROWS):
+        """Queue the rows of a population; returns the batch ids in row order."""
+        rows = np.asarray(rows, dtype=float)
+        batch_rows = max(1, int(batch_rows))
+        with self._lock:
+            if config_id not in self._configs:
+                raise KeyError(f"Unknown configuration {config_id}")
+            batch_ids = []
+            for start in range(0, len(rows), batch_rows):
+                batch_id = self._next_batch
+                self._next_batch += 1
+                self._batches[batch_id] = {
+                    "config_id": config_id,
+                    "rows": rows[start:start + batch_rows],
+                    "assigned": {},
+                    "result": None,
+                }
+                self._pending.append(batch_id)
+                batch_ids.append(batch_id)
+            self.counters["batches"] += len(batch_ids)
+            self.counters["rows"] += len(rows)
+            return batch_ids
+
+    def collect(self, batch_ids):
+        """Results of the finished batches among ``batch_ids``, removed from the broker."""
+        finished = {}
+        with self._lock:
+            for batch_id in batch_ids:
+                batch = self._batches.get(batch_id)
+                if batch is not None and batch["result"] is not None:
+                    finished[batch_id] = self._batches.pop(batch_id)["result"]
+        return finished
+
+    def cancel(self, batch_ids):
+        """Drop batches, queued or in flight; late results are discarded."""
+        with self._lock:
+            for batch_id in batch_ids:
+                self._batches.pop(batch_id, None)
+            self._pending = deque(b for b in self._pending if b in self._batches)
+
+    def status(self):
+        """Queue and worker statistics."""
+        with self._lock:
+            now = time.time()
+            self._reap(now)
+            live = [w for w, seen in self._workers.items() if now - seen <= self.heartbeat_timeout]
+            in_flight = sum(1 for b in self._batches.values() if b["assigned"] and b["result"] is None)
+            status = dict(self.counters)
+            status.update(pending=len(self._pending), in_flight=in_flight, live_workers=len(live))
+            return status
+
+    # Worker side -------------------------------------------------------------
+
+    def heartbeat(self, worker_id):
+        with self._lock:
+            self._workers[worker_id] = time.time()
+
+    def get_config(self, config_id):
+        with self._lock:
+            return self._configs[config_id]
+
+    def get_batch(self, worker_id):
+        """Next batch for a worker as (batch_id, config_id, rows), or None if idle."""
+        with self._lock:
+            now = time.time()
+            self._workers[worker_id] = now
+            self._reap(now)
+            while self._pending:
+                batch_id = self._pending.popleft()
+                batch = self._batches.get(batch_id)
+                if batch is not None and batch["result"] is None:
+                    batch["assigned"][worker_id] = now
+                    return batch_id, batch["config_id"], batch["rows"]
+            # Queue empty: take over a copy of the oldest straggling batch
+            candidates = [
+                (min(b["assigned"].values()), batch_id)
+                for batch_id, b in self._batches.items()
+                if b["result"] is None and len(b["assigned"]) == 1 and worker_id not in b["assigned"]
+                and now - min(b["assigned"].values()) > self.steal_after
+            ]
+            if candidates:
+                batch_id = min(candidates)[1]
+                batch = self._batches[batch_id]
+                batch["assigned"][worker_id] = now
+                self.counters["stolen"] += 1
+                return batch_id, batch["config_id"], batch["rows"]
+            return None
+
+    def put_result(self, worker_id, batch_id, summaries):
+        """Store the summaries of a batch; False if it was finished, cancelled or unknown."""
+        with self._lock:
+            self._workers[worker_id] = time.time()
+            batch = self._batches.get(batch_id)
+            if batch is None:
+                return False
+            if batch["result"] is not None:
+                self.counters["duplicates"] += 1
+                return False
+            batch["result"] = summaries
+            batch["rows"] = None
+            return True
+
+    def _reap(self, now):
+        """Queue again the batches whose workers all stopped sending heartbeats."""
+        for batch_id, batch in self._batches.items():
+            if batch["result"] is not None or not batch["assigned"]:
+                continue
+            alive = {
+                w: t for w, t in batch["assigned"].items()
+                if now - self._workers.get(w, 0.0) <= self.heartbeat_timeout
+            }
+            if len(alive) != len(batch["assigned"]):
+                batch["assigned"] = alive
+                if not alive and batch_id not in self._pending:
+                    self._pending.appendleft(batch_id)
+                    self.counters["requeued"] += 1
+
+
+_broker_state = None
+
+
+def _get_broker_state():
+    """The broker process's single BrokerState."""
+    global _broker_state
+    if _broker_state is None:
+        _broker_state = BrokerState()
+    return _broker_state
+
+
+class BrokerManager(BaseManager):
+    """Manager serving the broker's BrokerState over TCP."""
+
+
+BrokerManager.register(
+    "broker",
+    callable=_get_broker_state,
+    exposed=("register_config", "submit", "collect", "cancel", "status",
+             "heartbeat", "get_config", "get_batch", "put_result"),
+)
+
+
+def start_broker(address=("127.0.0.1", 0), authkey=None):
+    """
+    Start a broker in a background process.
+
+    Parameters:
+    -----------
+    address : tuple or str
+        Listening address; port 0 picks a free port (see the returned
+        manager's ``address``)
+    authkey : str or bytes, optional
+        Shared secret; defaults to DEVANA_BROKER_AUTHKEY, one of the two is
+        required
+
+    Returns:
+    --------
+    BrokerManager
+        Started manager; ``shutdown()`` stops the broker
+    """
+    manager = BrokerManager(parse_address(address), _authkey(authkey),
+                            ctx=multiprocessing.get_context("spawn"))
+    manager.start()
+    return manager
+
+
+def serve_broker(address=None, authkey=None):
+    """
+    Run a broker in this process until interrupted, e.g. on a head node.
+
+    Listens on localhost unless ``address`` names another interface, e.g.
+    "0.0.0.0:50555" to accept workers and clients from other machines.
+    """
+    address = parse_address(address or f"{DEFAULT_BROKER_HOST}:{DEFAULT_PORT}")
+    manager = BrokerManager(address, _authkey(authkey))
+    server = manager.get_server()
+    print(f"DeVana broker listening on {server.address[0]}:{server.address[1]}")
+    if server.address[0] not in ("127.0.0.1", "localhost", "::1"):
+        print("Warning: the broker is reachable from the network; keep the authkey secret")
+    server.serve_forever()
+
+
+def connect_broker(address=None, authkey=None):
+    """Proxy of a running broker's BrokerState."""
+    manager = BrokerManager(parse_address(address), _authkey(authkey))
+    try:
+        manager.connect()
+    except (OSError, EOFError) as e:
+        raise BrokerUnavailable(f"Cannot reach broker at {manager.address}: {e}") from e
+    except multiprocessing.AuthenticationError as e:
+        raise BrokerUnavailable(f"Broker at {manager.address} rejected the authkey") from e
+    return manager.broker()
+
+# -----------------------------------------------------------------------------
+# Workers
+# -----------------------------------------------------------------------------
+
+def evaluate_rows(config, rows, cache=None):
+    """FRF summaries of the rows of one batch, {"error": message} for failed rows."""
+    cache = get_shared_cache() if cache is None else cache
+    summaries = []
+    for row in rows:
+        try:
+            summaries.append(cached_frf(
+                config["main_system_parameters"],
+                tuple(float(v) for v in row),
+                config["omega_start"],
+                config["omega_end"],
+                config["omega_points"],
+                config["target_values_dict"],
+                config["weights_dict"],
+                cache=cache,
+                **config["frf_options"],
+            ))
+        except Exception as e:
+            summaries.append({"error": str(e)})
+    return summaries
+
+
+def run_evaluation_worker(address=None, authkey=None, worker_id=None, idle_timeout=None, stop_event=None):
+    """
+    Pull batches from a broker and evaluate them until stopped.
+
+    Workers are stateless: problem configurations are fetched from the
+    broker when first seen, and results go through the local shared FRF
+    cache. A heartbeat thread keeps the worker's batches assigned to it
+    while frf() runs.
+
+    Parameters:
+    -----------
+    address, authkey :
+        Broker address and secret (see ``parse_address``)
+    worker_id : str, optional
+        Defaults to host, process id and a random suffix
+    idle_timeout : float, optional
+        Return after this many seconds without work; run until the broker
+        goes away if None
+    stop_event : Event, optional
+        Return once set
+
+    Returns:
+    --------
+    int
+        Number of batches evaluated
+    """
+    worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+    broker = connect_broker(address, authkey)
+    stopped = stop_event or threading.Event()
+    finished = threading.Event()
+
+    def send_heartbeats():
+        heartbeat_broker = connect_broker(address, authkey)
+        while not finished.wait(HEARTBEAT_INTERVAL):
+            try:
+                heartbeat_broker.heartbeat(worker_id)
+            except DISTRIBUTED_ERRORS:
+                return
+
+    threading.Thread(target=send_heartbeats, daemon=True).start()
+    configs = {}
+    evaluated = 0
+    idle_since = time.time()
+    try:
+        while not stopped.is_set():
+            try:
+                task = broker.get_batch(worker_id)
+            except DISTRIBUTED_ERRORS:
+                break
+            if task is None:
+                if idle_timeout is not None and time.time() - idle_since > idle_timeout:
+                    break
+                time.sleep(POLL_INTERVAL)
+                continue
+            batch_id, config_id, rows = task
+            if config_id not in configs:
+                configs[config_id] = broker.get_config(config_id)
+            summaries = evaluate_rows(configs[config_id], rows)
+            try:
+                broker.put_result(worker_id, batch_id, summaries)
+            except DISTRIBUTED_ERRORS:
+                break
+            evaluated += 1
+            idle_since = time.time()
+    finally:
+        finished.set()
+    return evaluated
+
+
+def start_local_workers(address, authkey=None, n_workers=None, idle_timeout=None):
+    """
+    Start evaluation workers as local processes, e.g. to use the cores of
+    the broker's machine or to test on localhost.
+
+    Returns:
+    --------
+    list
+        Started multiprocessing.Process objects (daemonic)
+    """
+    n_workers = max(1, int(n_workers or (os.cpu_count() or 2) - 1))
+    context = multiprocessing.get_context("spawn")
+    processes = []
+    for i in range(n_workers):
+        process = context.Process(
+            target=run_evaluation_worker,
+            args=(address, authkey),
+            kwargs={"idle_timeout": idle_timeout},
+            daemon=True,
+            name=f"devana-worker-{i}",
+        )
+        process.start()
+        processes.append(process)
+    return processes
+
+# -----------------------------------------------------------------------------
+# Client
+# -----------------------------------------------------------------------------
+
+class BrokerClient:
+    """
+    Submits populations of one problem to a broker and gathers their results.
+
+    Parameters:
+    -----------
+    config : dict
+        Problem configuration (see ``problem_config``)
+    address, authkey :
+        Broker address and secret (see ``parse_address``)
+    batch_rows : int
+        Rows per batch
+    """
+
+    def __init__(self, config, address=None, authkey=None, batch_rows=DEFAULT_BATCH_ROWS):
+        self.address = parse_address(address)
+        self.batch_rows = batch_rows
+        self._broker = connect_broker(self.address, authkey)
+        self.config_id = self._broker.register_config(config)
+
+    def evaluate(self, population, should_stop=None):
+        """
+        Summary dicts of every row, in row order whatever order the batches finish in.
+
+        Rows of batches still outstanding after an abort are None. Raises
+        BrokerUnavailable when no worker is alive for NO_WORKER_TIMEOUT.
+        """
+        population = np.asarray(population, dtype=float)
+        batch_ids = self._broker.submit(self.config_id, population, self.batch_rows)
+        results = {}
+        outstanding = list(batch_ids)
+        waiting_since = time.time()
+        try:
+            while outstanding:
+                if should_stop is not None and should_stop():
+                    break
+                finished = self._broker.collect(outstanding)
+                if finished:
+                    results.update(finished)
+                    outstanding = [b for b in outstanding if b not in finished]
+                    waiting_since = time.time()
+                    continue
+                if time.time() - waiting_since > NO_WORKER_TIMEOUT:
+                    if self._broker.status()["live_workers"] == 0:
+                        raise BrokerUnavailable(f"No evaluation worker connected to the broker at {self.address}")
+                    waiting_since = time.time()
+                time.sleep(POLL_INTERVAL)
+        finally:
+            if outstanding:
+                try:
+                    self._broker.cancel(outstanding)
+                except DISTRIBUTED_ERRORS:
+                    pass
+        summaries = []
+        for batch_id in batch_ids:
+            n_rows = min(self.batch_rows, len(population) - len(summaries))
+            summaries.extend(results.get(batch_id, [None] * n_rows))
+        return summaries
+
+    def status(self):
+        return self._broker.status()
+
+# -----------------------------------------------------------------------------
+# Command line
+# -----------------------------------------------------------------------------
+
+def main(argv=None):
+    """
+    Command line entry point::
+
+        python -m modules.distributed broker --address 0.0.0.0:50555 --authkey SECRET
+        python -m modules.distributed worker --address head-node:50555 --authkey SECRET --processes 8
+
+    The broker listens on localhost unless given an explicit address, and
+    neither role starts without a secret from --authkey or
+    DEVANA_BROKER_AUTHKEY.
+    """
+    parser = argparse.ArgumentParser(description="DeVana distributed FRF evaluation")
+    parser.add_argument("role", choices=("broker", "worker"))
+    parser.add_argument("--address", default=None,
+                        help=f"host:port (broker default: {DEFAULT_BROKER_HOST}:{DEFAULT_PORT}, "
+                             f"worker default: ${BROKER_ENV})")
+    parser.add_argument("--authkey", default=None, help=f"shared secret (default: ${AUTHKEY_ENV}; required)")
+    parser.add_argument("--processes", type=int, default=1, help="worker processes to start")
+    args = parser.parse_args(argv)
+    if not (args.authkey or os.environ.get(AUTHKEY_ENV)):
+        parser.error(f"a shared secret is required: pass --authkey or set {AUTHKEY_ENV}")
+    if args.role == "broker":
+        serve_broker(args.address, args.authkey)
+    elif args.processes > 1:
+        for process in start_local_workers(args.address, args.authkey, args.processes):
+            process.join()
+    else:
+        run_evaluation_worker(args.address, args.authkey)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,383 @@
+# evaluator.py
+
+import copy
+import os
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import numpy as np
+
+from modules.FRF import MASS_LABELS, compile_objective, frf_batch
+from modules.frf_cache import cached_frf, get_shared_cache, merge_cache_stats
+from modules.process_pool import FRFProcessPool, POOL_ERRORS
+from modules.distributed import BrokerClient, DISTRIBUTED_ERRORS, problem_config
+
+# -----------------------------------------------------------------------------
+# Configuration
+# -----------------------------------------------------------------------------
+
+# Available evaluation backends:
+#   'serial'  - one design after another in the calling thread
+#   'thread'  - a persistent thread pool (NumPy/LAPACK release the GIL)
+#   'process' - persistent worker processes reading a shared-memory block
+#   'batch'   - frf_batch, the whole population as one tensor solve
+#   'distributed' - batches pulled by worker processes of a broker, possibly
+#                   on other machines (see modules.distributed)
+EVALUATION_BACKENDS = ("serial", "thread", "process", "batch", "distributed")
+
+# Rows per frf_batch call of the batch backend; bounds the (rows, 5, n_omega)
+# response block and lets an abort take effect between blocks
+BATCH_BLOCK_ROWS = 64
+
+# Extra cache-key option of batch results: they agree with frf() to rounding
+# error only, so they are kept apart from the entries of the other backends
+_BATCH_CACHE_OPTIONS = {"summary": True, "engine": "frf_batch"}
+
+# -----------------------------------------------------------------------------
+# Evaluator
+# -----------------------------------------------------------------------------
+
+class Evaluator:
+    """
+    FRF evaluation of DVA designs behind one interface for all optimizers.
+
+    An evaluator is bound to one problem (main system, frequency grid,
+    targets and weights) and turns a population of DVA vectors into the
+    summary dicts the optimizers score (see ``cached_frf``). The backend
+    decides how the population is evaluated and can be changed without
+    touching the optimizer; all backends go through the shared FRF cache.
+    Pools are created on first use and kept until ``close``.
+
+    Parameters:
+    -----------
+    main_system_parameters : list or array
+        Main system parameters (17 values)
+    omega_start, omega_end : float
+        Frequency range
+    omega_points : int
+        Number of frequency points
+    target_values_dict, weights_dict : dict
+        Targets and weights keyed by mass label ("mass_1" ... "mass_5")
+    backend : str
+        One of EVALUATION_BACKENDS
+    n_workers : int, optional
+        Threads or processes of the parallel backends; defaults to all cores
+        but one. With a single worker they evaluate serially.
+    cache : FRFCache, optional
+        Defaults to ``get_shared_cache()``
+    frf_options : dict, optional
+        Further keyword arguments of ``frf`` (not supported by 'batch')
+    log : callable, optional
+        Receives warning messages, e.g. a worker's ``update.emit``
+    broker_address, broker_authkey : optional
+        Broker of the 'distributed' backend; default to the DEVANA_BROKER
+        and DEVANA_BROKER_AUTHKEY environment variables
+    """
+
+    def __init__(
+        self,
+        main_system_parameters,
+        omega_start,
+        omega_end,
+        omega_points,
+        target_values_dict,
+        weights_dict,
+        backend="serial",
+        n_workers=None,
+        cache=None,
+        frf_options=None,
+        log=None,
+        broker_address=None,
+        broker_authkey=None,
+    ):
+        if backend not in EVALUATION_BACKENDS:
+            raise ValueError(f"Unknown evaluation backend '{backend}', expected one of {EVALUATION_BACKENDS}")
+        if backend == "batch" and frf_options:
+            raise ValueError("The 'batch' evaluation backend does not accept frf options")
+        self.main_system_parameters = list(main_system_parameters)
+        self.omega_start = omega_start
+        self.omega_end = omega_end
+        self.omega_points = omega_points
+        self.target_values_dict = target_values_dict or {}
+        self.weights_dict = weights_dict or {}
+        self.backend = backend
+        self.n_workers = max(1, int(n_workers or (os.cpu_count() or 2) - 1))
+        self.cache = get_shared_cache() if cache is None else cache
+        self.frf_options = dict(frf_options or {})
+        self.log = log
+        self.evaluation_count = 0
+        self._objective = None
+        self._executor = None
+        self._process_pool = None
+        self.broker_address = broker_address
+        self.broker_authkey = broker_authkey
+        self._broker_client = None
+        self._cache_start = self.cache.stats()
+
+    # -------------------------------------------------------------------------
+    # Public API
+    # -------------------------------------------------------------------------
+
+    def evaluate(self, dva_parameters):
+        """
+        Summary dict of a single design.
+
+        Raises like ``frf`` when the design cannot be evaluated.
+        """
+        self.evaluation_count += 1
+        if self.backend == "batch":
+            summary = self._evaluate_batch(np.atleast_2d(np.asarray(dva_parameters, dtype=float)))[0]
+            if "error" in summary:
+                raise RuntimeError(summary["error"])
+            return summary
+        return self._evaluate_one(dva_parameters)
+
+    def evaluate_many(self, population, should_stop=None):
+        """
+        Summary dicts of every design of a population.
+
+        Parameters:
+        -----------
+        population : array-like, shape (P, n_params)
+            DVA parameter vectors
+        should_stop : callable, optional
+            Polled between designs (or chunks and blocks); it may block
+            (pause) and returns True to abort
+
+        Returns:
+        --------
+        list
+            One summary dict per row, {"error": message} for designs that
+            failed and None for designs skipped by an abort
+        """
+        population = np.asarray(population, dtype=float)
+        if population.size == 0:
+            return []
+        population = population.reshape(len(population), -1)
+        self.evaluation_count += len(population)
+        parallel = self.n_workers > 1 and len(population) > 1
+        if self.backend == "process" and parallel:
+            try:
+                return self._get_process_pool().evaluate(population, should_stop=should_stop)
+            except POOL_ERRORS as e:
+                # Processes unavailable (sandbox, frozen app, crashed worker):
+                # continue with the thread backend
+                self._warn(f"Warning: process evaluation unavailable ({e}); using threads")
+                self.backend = "thread"
+                self._close_process_pool()
+        if self.backend == "distributed":
+            try:
+                return self._get_broker_client().evaluate(population, should_stop=should_stop)
+            except DISTRIBUTED_ERRORS as e:
+                # Broker unreachable or without workers: evaluate locally
+                self._warn(f"Warning: distributed evaluation unavailable ({e}); using threads")
+                self.backend = "thread"
+                self._broker_client = None
+        if self.backend == "batch":
+            return self._evaluate_batch(population, should_stop)
+        if self.backend in ("thread", "process") and parallel:
+            return self._evaluate_threads(population, should_stop)
+        return self._evaluate_serial(population, should_stop)
+
+    def submit(self, dva_parameters):
+        """
+        Start evaluating one design without waiting for it.
+
+        The 'thread' and 'process' backends run the design in their pools,
+        so callers can keep many designs in flight and consume results as
+        they complete (``concurrent.futures.wait``); the other backends
+        evaluate it before returning.
+
+        Returns:
+        --------
+        concurrent.futures.Future
+            Resolves to the summary dict, {"error": message} if the design
+            failed
+        """
+        row = np.asarray(dva_parameters, dtype=float).ravel()
+        self.evaluation_count += 1
+        if self.backend == "process" and self.n_workers > 1:
+            try:
+                return self._get_process_pool().submit(row)
+            except POOL_ERRORS as e:
+                self._warn(f"Warning: process evaluation unavailable ({e}); using threads")
+                self.backend = "thread"
+                self._close_process_pool()
+        if self.backend in ("thread", "process"):
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.n_workers, thread_name_prefix="frfeval")
+            return self._executor.submit(self._evaluate_row, row)
+        future = Future()
+        if self.backend == "batch":
+            future.set_result(self._evaluate_batch(row[None, :])[0])
+        elif self.backend == "distributed":
+            future.set_result(self.evaluate_many(row[None, :])[0])
+            self.evaluation_count -= 1
+        else:
+            future.set_result(self._evaluate_row(row))
+        return future
+
+    def cache_stats(self):
+        """FRF cache statistics since creation (or ``reset_stats``), worker processes included."""
+        stats = self.cache.stats(since=self._cache_start)
+        if self._process_pool is not None:
+            merged = merge_cache_stats(stats, self._process_pool.cache_counters)
+            stats.update(merged)
+        return stats
+
+    def reset_stats(self):
+        """Start counting cache statistics and evaluations afresh."""
+        self._cache_start = self.cache.stats()
+        self.evaluation_count = 0
+        if self._process_pool is not None:
+            self._process_pool.cache_counters = dict.fromkeys(self._process_pool.cache_counters, 0)
+
+    def close(self):
+        """Stop the thread and process pools; they are recreated on further use."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        self._close_process_pool()
+        self._broker_client = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -------------------------------------------------------------------------
+    # Backends
+    # -------------------------------------------------------------------------
+
+    def _warn(self, message):
+        if self.log is not None:
+            try:
+                self.log(message)
+            except Exception:
+                pass
+
+    def _evaluate_one(self, dva_parameters):
+        return cached_frf(
+            self.main_system_parameters,
+            tuple(float(v) for v in dva_parameters),
+            self.omega_start,
+            self.omega_end,
+            self.omega_points,
+            self.target_values_dict,
+            self.weights_dict,
+            cache=self.cache,
+            **self.frf_options,
+        )
+
+    def _evaluate_row(self, row, should_stop=None):
+        """Summary of one row, {"error": ...} on failure, None if aborted."""
+        if should_stop is not None and should_stop():
+            return None
+        try:
+            return self._evaluate_one(row)
+        except Exception as e:
+            return {"error": str(e)}
+
+    def _evaluate_serial(self, population, should_stop):
+        results = [None] * len(population)
+        for i, row in enumerate(population):
+            results[i] = self._evaluate_row(row, should_stop)
+            if results[i] is None:
+                break
+        return results
+
+    def _evaluate_threads(self, population, should_stop):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.n_workers, thread_name_prefix="frfeval")
+        futures = [self._executor.submit(self._evaluate_row, row, should_stop) for row in population]
+        return [future.result() for future in futures]
+
+    def _get_process_pool(self):
+        if self._process_pool is None:
+            self._process_pool = FRFProcessPool(
+                self.main_system_parameters, self.omega_start, self.omega_end, self.omega_points,
+                self.target_values_dict, self.weights_dict,
+                n_workers=self.n_workers, frf_options=self.frf_options,
+            )
+        return self._process_pool
+
+    def _get_broker_client(self):
+        if self._broker_client is None:
+            config = problem_config(
+                self.main_system_parameters, self.omega_start, self.omega_end, self.omega_points,
+                self.target_values_dict, self.weights_dict, self.frf_options,
+            )
+            self._broker_client = BrokerClient(config, self.broker_address, self.broker_authkey)
+        return self._broker_client
+
+    def _close_process_pool(self):
+        if self._process_pool is not None:
+            try:
+                self._process_pool.close()
+            except Exception:
+                pass
+            self._process_pool = None
+
+    def _evaluate_batch(self, population, should_stop=None):
+        """Cached rows from the cache, the others through frf_batch in blocks."""
+        if self._objective is None:
+            self._objective = compile_objective(self.target_values_dict, self.weights_dict)
+        results = [None] * len(population)
+        for start in range(0, len(population), BATCH_BLOCK_ROWS):
+            if should_stop is not None and should_stop():
+                break
+            rows = population[start:start + BATCH_BLOCK_ROWS]
+            keys = [
+                self.cache.key(
+                    self.main_system_parameters, row, self.omega_start, self.omega_end, self.omega_points,
+                    self.target_values_dict, self.weights_dict, _BATCH_CACHE_OPTIONS,
+                )
+                for row in rows
+            ]
+            missing = []
+            for k, key in enumerate(keys):
+                summary = self.cache.get(key)
+                if summary is None:
+                    missing.append(k)
+                else:
+                    results[start + k] = copy.deepcopy(summary)
+            if not missing:
+                continue
+            batch = frf_batch(
+                self.main_system_parameters, rows[missing], self.omega_start, self.omega_end,
+                self.omega_points, keep_magnitudes=False, objective=self._objective,
+            )
+            for b, k in enumerate(missing):
+                if not batch.valid[b]:
+                    # frf() raises for such designs; the error is not cached
+                    results[start + k] = {"error": "All degrees of freedom were removed (zero mass)"}
+                    continue
+                summary = self._batch_summary(batch.metrics[b], batch.active[b])
+                self.cache.put(keys[k], summary)
+                results[start + k] = copy.deepcopy(summary)
+        return results
+
+    def _batch_summary(self, metrics, active):
+        """Summary dict of one frf_batch row, laid out as ``calculate_singular_response``."""
+        objective = self._objective
+        composite = objective.composite_measures(metrics)
+        percentages = objective.percentage_differences(metrics)
+        composite_measures = {}
+        percentage_differences = {}
+        for lbl in self.target_values_dict:
+            m = MASS_LABELS.index(lbl) if lbl in MASS_LABELS else None
+            if m is None or not active[m]:
+                composite_measures[lbl] = 0.0
+                percentage_differences[lbl] = {}
+                continue
+            composite_measures[lbl] = float(composite[m])
+            percentage_differences[lbl] = {
+                criterion: float(percentages[t])
+                for t, (term_lbl, criterion) in enumerate(objective.criteria)
+                if term_lbl == lbl
+            }
+        return {
+            "singular_response": sum(composite_measures.values()),
+            "composite_measures": composite_measures,
+            "percentage_differences": percentage_differences,
+        }
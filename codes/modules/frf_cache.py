@@ -0,0 +1,502 @@
+# frf_cache.py
+
+import copy
+import hashlib
+import json
+import multiprocessing.util
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+import modules.FRF
+from modules.FRF import frf, MASS_LABELS
+
+# -----------------------------------------------------------------------------
+# Configuration
+# -----------------------------------------------------------------------------
+
+# Bump whenever the layout of cached values changes. Changes to the FRF code
+# itself are picked up automatically through FRF_SOURCE_HASH
+CACHE_FORMAT_VERSION = 2
+
+# Entries kept in the in-memory LRU tier of each process
+DEFAULT_MEMORY_ENTRIES = 50000
+
+# DVA vectors are rounded to this many decimals before hashing, so values
+# that differ only by floating-point noise share an entry
+DEFAULT_DECIMALS = 12
+
+# Rows kept in the on-disk tier; the oldest entries are pruned beyond this
+DEFAULT_DISK_ENTRIES = 500000
+
+# Writes to the on-disk tier are committed in batches of this many entries,
+# or after COMMIT_INTERVAL seconds, whichever comes first
+DEFAULT_COMMIT_EVERY = 256
+COMMIT_INTERVAL = 5.0
+
+# Environment variable enabling the on-disk tier of the shared cache, e.g.
+# DEVANA_FRF_CACHE=~/.devana/frf_cache.sqlite; unset or empty keeps the
+# shared cache in memory only
+CACHE_PATH_ENV = "DEVANA_FRF_CACHE"
+
+# Result keys the optimizers read inside their evaluation loops
+SUMMARY_KEYS = ("singular_response", "composite_measures", "percentage_differences")
+
+# frf() options that never change the returned values
+_PLOT_OPTIONS = ("plot_figure", "show_peaks", "show_slopes", "interpolation_method", "interpolation_points")
+
+# -----------------------------------------------------------------------------
+# Keys
+# -----------------------------------------------------------------------------
+
+def _source_hash(module):
+    """SHA-256 of a module's source file, so edits invalidate on-disk entries."""
+    digest = hashlib.sha256()
+    try:
+        with open(module.__file__, "rb") as handle:
+            digest.update(handle.read())
+    except (OSError, TypeError):
+        # No readable source (frozen build): fall back to the format version
+        digest.update(b"no-source")
+    return digest.hexdigest()
+
+
+FRF_SOURCE_HASH = _source_hash(modules.FRF)
+
+
+def objective_fingerprint(target_values_dict, weights_dict):
+    """Canonical string of the per-mass target and weight dicts."""
+    return json.dumps(
+        {"targets": target_values_dict or {}, "weights": weights_dict or {}},
+        sort_keys=True,
+        default=float,
+    )
+
+
+def design_key(
+    main_system_parameters,
+    dva_parameters,
+    omega_start,
+    omega_end,
+    omega_points,
+    target_values_dict,
+    weights_dict,
+    options=None,
+    decimals=DEFAULT_DECIMALS,
+):
+    """
+    Content hash identifying one FRF evaluation.
+
+    The key covers the main system parameters, the quantized DVA vector, the
+    frequency grid, the objective (targets and weights) and any result-
+    affecting frf() options, so it can be shared safely between optimizers,
+    runs and sessions. It also covers the source of ``modules.FRF``, so any
+    edit to the FRF code invalidates entries computed before it.
+
+    Returns:
+    --------
+    str
+        Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    digest.update(f"frf-cache-v{CACHE_FORMAT_VERSION}".encode())
+    digest.update(FRF_SOURCE_HASH.encode())
+    digest.update(np.asarray(main_system_parameters, dtype=np.float64).tobytes())
+    # Adding 0.0 folds -0.0 into 0.0 so both hash alike
+    dva = np.round(np.asarray(dva_parameters, dtype=np.float64), decimals) + 0.0
+    digest.update(dva.tobytes())
+    digest.update(repr((float(omega_start), float(omega_end), int(omega_points))).encode())
+    digest.update(objective_fingerprint(target_values_dict, weights_dict).encode())
+    digest.update(repr(sorted((options or {}).items())).encode())
+    return digest.hexdigest()
+
+# -----------------------------------------------------------------------------
+# Two-tier cache
+# -----------------------------------------------------------------------------
+
+class FRFCache:
+    """
+    Content-addressed store of FRF evaluation results.
+
+    Lookups go through an in-memory LRU tier first and then, if ``path`` is
+    given, through an SQLite database shared by every process and session
+    that opens the same file. The database runs in WAL mode with a busy
+    timeout, so concurrent workers and processes can read and write it at
+    the same time. Each process opens its own connection (also after a
+    fork), and a failing disk tier only disables itself: the cache never
+    makes an evaluation fail.
+
+    Writes are committed in batches (see ``flush``), and the disk tier is
+    pruned to its ``max_disk_entries`` newest rows.
+
+    Parameters:
+    -----------
+    path : str, optional
+        SQLite file of the on-disk tier; memory only if None
+    max_memory_entries : int
+        Capacity of the LRU tier
+    max_disk_entries : int
+        Capacity of the disk tier
+    commit_every : int
+        Number of pending writes that triggers a commit
+    decimals : int
+        Rounding of the DVA vector in ``key``
+    """
+
+    _COUNTERS = ("memory_hits", "disk_hits", "misses", "stores")
+
+    def __init__(self, path=None, max_memory_entries=DEFAULT_MEMORY_ENTRIES,
+                 max_disk_entries=DEFAULT_DISK_ENTRIES, commit_every=DEFAULT_COMMIT_EVERY,
+                 decimals=DEFAULT_DECIMALS):
+        self.path = path
+        self.max_memory_entries = int(max_memory_entries)
+        self.max_disk_entries = int(max_disk_entries)
+        self.commit_every = max(1, int(commit_every))
+        self.decimals = decimals
+        self._memory = OrderedDict()
+        self._lock = threading.RLock()
+        self._connection = None
+        self._connection_pid = None
+        self._pending = 0
+        self._last_commit = time.monotonic()
+        self._disk_rows = 0
+        self._finalizer = None
+        self._disk_enabled = path is not None
+        self.disk_errors = 0
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.stores = 0
+
+    def __getstate__(self):
+        # Connections and locks cannot cross process boundaries; a copy sent
+        # to another process reopens the same database lazily
+        state = self.__dict__.copy()
+        state["_memory"] = OrderedDict()
+        state["_lock"] = None
+        state["_connection"] = None
+        state["_connection_pid"] = None
+        state["_pending"] = 0
+        state["_finalizer"] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def key(self, main_system_parameters, dva_parameters, omega_start, omega_end, omega_points,
+            target_values_dict, weights_dict, options=None):
+        """``design_key`` with this cache's quantization."""
+        return design_key(
+            main_system_parameters, dva_parameters, omega_start, omega_end, omega_points,
+            target_values_dict, weights_dict, options, decimals=self.decimals,
+        )
+
+    def _db(self):
+        """Connection of the current process, opened on first use; None without a disk tier."""
+        if not self._disk_enabled:
+            return None
+        pid = os.getpid()
+        if self._connection is None or self._connection_pid != pid:
+            try:
+                directory = os.path.dirname(os.path.abspath(self.path))
+                os.makedirs(directory, exist_ok=True)
+                connection = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+                connection.execute("PRAGMA journal_mode=WAL")
+                connection.execute("PRAGMA synchronous=NORMAL")
+                connection.execute(
+                    "CREATE TABLE IF NOT EXISTS frf_cache "
+                    "(key TEXT PRIMARY KEY, value BLOB NOT NULL, created REAL NOT NULL)"
+                )
+                connection.execute("CREATE INDEX IF NOT EXISTS frf_cache_created ON frf_cache (created)")
+                connection.commit()
+                self._disk_rows = connection.execute("SELECT COUNT(*) FROM frf_cache").fetchone()[0]
+            except (sqlite3.Error, OSError):
+                self._disable_disk()
+                return None
+            self._connection = connection
+            self._connection_pid = pid
+            self._pending = 0
+            self._last_commit = time.monotonic()
+            # Commit the last batch when the cache is collected or the process
+            # exits, including pool workers, which skip atexit handlers
+            self._finalizer = multiprocessing.util.Finalize(
+                self, _commit_connection, args=(connection,), exitpriority=10,
+            )
+            try:
+                self._prune(connection)
+            except sqlite3.Error:
+                self._disable_disk()
+                return None
+        return self._connection
+
+    def _prune(self, db):
+        """Delete the oldest rows once the disk tier exceeds ``max_disk_entries``."""
+        if self._disk_rows <= self.max_disk_entries:
+            return
+        # Other processes write to the same file, so the local count is only
+        # an estimate; recount before deleting
+        self._disk_rows = db.execute("SELECT COUNT(*) FROM frf_cache").fetchone()[0]
+        excess = self._disk_rows - self.max_disk_entries
+        if excess > 0:
+            # Prune a tenth below the cap so this does not run on every batch
+            excess += self.max_disk_entries // 10
+            db.execute(
+                "DELETE FROM frf_cache WHERE key IN "
+                "(SELECT key FROM frf_cache ORDER BY created LIMIT ?)",
+                (excess,),
+            )
+            db.commit()
+            self._disk_rows = max(0, self._disk_rows - excess)
+
+    def _disable_disk(self):
+        self.disk_errors += 1
+        self._disk_enabled = False
+        self._connection = None
+
+    def _remember(self, key, value):
+        self._memory[key] = value
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key, default=None):
+        """Cached value of ``key`` or ``default``; disk hits are promoted to memory."""
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return self._memory[key]
+            db = self._db()
+            if db is not None:
+                try:
+                    row = db.execute("SELECT value FROM frf_cache WHERE key = ?", (key,)).fetchone()
+                    if row is not None:
+                        value = pickle.loads(row[0])
+                        self._remember(key, value)
+                        self.disk_hits += 1
+                        return value
+                except (sqlite3.Error, pickle.UnpicklingError, EOFError, AttributeError):
+                    self._disable_disk()
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """Store ``value`` (any picklable object) in both tiers."""
+        with self._lock:
+            self._remember(key, value)
+            self.stores += 1
+            db = self._db()
+            if db is not None:
+                try:
+                    db.execute(
+                        "INSERT OR REPLACE INTO frf_cache (key, value, created) VALUES (?, ?, ?)",
+                        (key, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), time.time()),
+                    )
+                    self._pending += 1
+                    self._disk_rows += 1
+                    if (self._pending >= self.commit_every
+                            or time.monotonic() - self._last_commit >= COMMIT_INTERVAL):
+                        self._commit(db)
+                except (sqlite3.Error, pickle.PicklingError):
+                    self._disable_disk()
+
+    def _commit(self, db):
+        db.commit()
+        self._pending = 0
+        self._last_commit = time.monotonic()
+        self._prune(db)
+
+    def flush(self):
+        """Commit pending writes so other processes and sessions see them."""
+        with self._lock:
+            if self._connection is None or self._connection_pid != os.getpid() or not self._pending:
+                return
+            try:
+                self._commit(self._connection)
+            except sqlite3.Error:
+                self._disable_disk()
+
+    def get_or_compute(self, key, compute):
+        """Cached value of ``key``, computing and storing ``compute()`` on a miss."""
+        value = self.get(key)
+        if value is None:
+            value = compute()
+            self.put(key, value)
+        return value
+
+    def stats(self, since=None):
+        """
+        Hit-rate statistics of this process.
+
+        Parameters:
+        -----------
+        since : dict, optional
+            Earlier ``stats()`` snapshot; counters are then reported relative
+            to it, e.g. for a single optimization run
+
+        Returns:
+        --------
+        dict
+            memory_hits, disk_hits, misses, stores, lookups, hit_rate,
+            memory_entries and disk_enabled
+        """
+        with self._lock:
+            counters = {name: getattr(self, name) for name in self._COUNTERS}
+            if since:
+                counters = {name: value - since.get(name, 0) for name, value in counters.items()}
+            lookups = counters["memory_hits"] + counters["disk_hits"] + counters["misses"]
+            hits = counters["memory_hits"] + counters["disk_hits"]
+            counters.update(
+                lookups=lookups,
+                hit_rate=hits / lookups if lookups else 0.0,
+                memory_entries=len(self._memory),
+                disk_enabled=self._disk_enabled,
+            )
+            return counters
+
+    def clear(self, memory_only=False):
+        """Drop all entries (of the memory tier only if ``memory_only``)."""
+        with self._lock:
+            self._memory.clear()
+            db = None if memory_only else self._db()
+            if db is not None:
+                try:
+                    db.execute("DELETE FROM frf_cache")
+                    db.commit()
+                    self._pending = 0
+                    self._disk_rows = 0
+                except sqlite3.Error:
+                    self._disable_disk()
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            if self._connection is not None and self._connection_pid == os.getpid():
+                self._finalizer.cancel()
+                self._connection.close()
+            self._connection = None
+
+def _commit_connection(connection):
+    try:
+        connection.commit()
+    except sqlite3.Error:
+        pass
+
+
+def merge_cache_stats(*stats):
+    """Combine ``FRFCache.stats()`` counters, e.g. of several processes."""
+    counters = {name: sum(s.get(name, 0) for s in stats) for name in FRFCache._COUNTERS}
+    lookups = counters["memory_hits"] + counters["disk_hits"] + counters["misses"]
+    counters.update(
+        lookups=lookups,
+        hit_rate=(counters["memory_hits"] + counters["disk_hits"]) / lookups if lookups else 0.0,
+    )
+    return counters
+
+# -----------------------------------------------------------------------------
+# Shared instance and cached frf()
+# -----------------------------------------------------------------------------
+
+_shared_caches = {}
+_shared_lock = threading.Lock()
+
+
+def get_shared_cache(path=None):
+    """
+    Process-wide cache shared by all optimization workers.
+
+    Parameters:
+    -----------
+    path : str, optional
+        SQLite file of the disk tier. Defaults to the ``DEVANA_FRF_CACHE``
+        environment variable; unset or empty gives a memory-only cache, so
+        the disk tier is opt-in.
+    """
+    if path is None:
+        path = os.environ.get(CACHE_PATH_ENV, "")
+    path = os.path.expanduser(path) if path else None
+    with _shared_lock:
+        cache = _shared_caches.get(path)
+        if cache is None:
+            cache = _shared_caches[path] = FRFCache(path)
+        return cache
+
+
+def release_shared_cache(path):
+    """Close the shared cache of ``path`` (if opened), e.g. before deleting its file."""
+    path = os.path.expanduser(path) if path else None
+    with _shared_lock:
+        cache = _shared_caches.pop(path, None)
+    if cache is not None:
+        cache.close()
+
+
+def cached_frf(
+    main_system_parameters,
+    dva_parameters,
+    omega_start,
+    omega_end,
+    omega_points,
+    target_values_dict,
+    weights_dict,
+    *,
+    cache=None,
+    summary=True,
+    **frf_options,
+):
+    """
+    ``frf`` through the shared evaluation cache.
+
+    Parameters:
+    -----------
+    main_system_parameters, dva_parameters, omega_start, omega_end, omega_points :
+        As for ``frf``
+    target_values_dict, weights_dict : dict
+        Targets and weights keyed by mass label ("mass_1" ... "mass_5")
+    cache : FRFCache, optional
+        Defaults to ``get_shared_cache()``
+    summary : bool
+        If True (default) only SUMMARY_KEYS are cached and returned, which is
+        all the optimizers' evaluation loops read; False caches the full
+        nested result dict including magnitudes.
+    **frf_options :
+        Further keyword arguments of ``frf``; plotting requests bypass the
+        cache
+
+    Returns:
+    --------
+    dict
+        A private copy of the (summary) result, safe to modify
+    """
+    target_values_dict = target_values_dict or {}
+    weights_dict = weights_dict or {}
+    mass_args = []
+    for lbl in MASS_LABELS:
+        mass_args += [target_values_dict.get(lbl, {}), weights_dict.get(lbl, {})]
+
+    def compute():
+        results = frf(
+            main_system_parameters, dva_parameters, omega_start, omega_end, omega_points,
+            *mass_args, **frf_options
+        )
+        if summary:
+            results = {k: results[k] for k in SUMMARY_KEYS if k in results}
+        return results
+
+    if frf_options.get("plot_figure") or frf_options.get("output", "full") != "full":
+        return compute()
+
+    cache = get_shared_cache() if cache is None else cache
+    options = {k: v for k, v in frf_options.items() if k not in _PLOT_OPTIONS}
+    options["summary"] = bool(summary)
+    key = cache.key(
+        main_system_parameters, dva_parameters, omega_start, omega_end, omega_points,
+        target_values_dict, weights_dict, options,
+    )
+    return copy.deepcopy(cache.get_or_compute(key, compute))
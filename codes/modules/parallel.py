@@ -0,0 +1,41 @@
+# parallel.py
+
+import os
+
+# -----------------------------------------------------------------------------
+# Configuration
+# -----------------------------------------------------------------------------
+
+# Seconds between control checks of the schedulers that run whole optimizer
+# runs in processes (GA benchmark repetitions, GA islands, CMA-ES restarts):
+# of the scheduler while waiting for runs and of each run for pause/stop
+# requests
+POLL_INTERVAL = 0.2
+
+# -----------------------------------------------------------------------------
+# Core budget
+# -----------------------------------------------------------------------------
+
+def plan_core_budget(n_runs, core_budget=None):
+    """
+    Split a core budget between concurrent runs and per-run evaluation workers.
+
+    Runs come first, because independent runs scale without coordination;
+    cores left over when there are fewer runs than cores go to the
+    evaluation workers of each run. The product never exceeds the budget.
+
+    Parameters:
+    -----------
+    n_runs : int
+        Number of independent runs (benchmark repetitions, restarts, ...)
+    core_budget : int, optional
+        Cores all runs together may use; defaults to all cores
+
+    Returns:
+    --------
+    tuple
+        (concurrent_runs, evaluation_workers_per_run)
+    """
+    core_budget = max(1, int(core_budget or os.cpu_count() or 1))
+    concurrent_runs = max(1, min(int(n_runs), core_budget))
+    return concurrent_runs, max(1, core_budget // concurrent_runs)
@@ -0,0 +1,518 @@
+# pareto.py
+
+import bisect
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+# -----------------------------------------------------------------------------
+# Non-dominated sorting and crowding distance on objective arrays
+# -----------------------------------------------------------------------------
+#
+# All functions of this module take an (N, M) array of objectives to be minimized (for DEAP
+# individuals: ``-np.array([ind.fitness.wvalues for ind in pop])``) and work
+# on row indices, so the fronts of a generation can be computed once and
+# shared by selection, metrics and convergence checks. They reproduce the
+# results of DEAP's sortNondominated / assignCrowdingDist / selNSGA2.
+
+
+def dominance_matrix(objectives):
+    """
+    Pairwise Pareto dominance of all rows.
+
+    Parameters:
+    -----------
+    objectives : array-like
+        (N, M) objectives to be minimized
+
+    Returns:
+    --------
+    np.ndarray
+        (N, N) boolean array, True at [i, j] if row i dominates row j
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    n = len(objectives)
+    no_worse = np.ones((n, n), dtype=bool)
+    better = np.zeros((n, n), dtype=bool)
+    # One objective at a time keeps the temporaries at (N, N)
+    for column in objectives.T:
+        no_worse &= column[:, None] <= column[None, :]
+        better |= column[:, None] < column[None, :]
+    return no_worse & better
+
+
+def non_dominated_sort(objectives, k=None, first_front_only=False):
+    """
+    Fast non-dominated sort (Deb et al.) of an objective array.
+
+    Parameters:
+    -----------
+    objectives : array-like
+        (N, M) objectives to be minimized
+    k : int, optional
+        Stop once at least k rows are ranked (default: all rows)
+    first_front_only : bool
+        Return only the first front
+
+    Returns:
+    --------
+    list of np.ndarray
+        Row indices of each front, best front first
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    n = len(objectives)
+    if n == 0:
+        return []
+    k = n if k is None else min(k, n)
+    dominates = dominance_matrix(objectives)
+    # Number of rows dominating each row; ranked rows are set to -1
+    dominated_count = dominates.sum(axis=0)
+    fronts = []
+    ranked = 0
+    while ranked < k:
+        front = np.flatnonzero(dominated_count == 0)
+        fronts.append(front)
+        ranked += len(front)
+        if first_front_only:
+            break
+        dominated_count -= dominates[front].sum(axis=0)
+        dominated_count[front] = -1
+    return fronts
+
+
+def crowding_distance(objectives):
+    """
+    Crowding distance of the rows of one front.
+
+    Parameters:
+    -----------
+    objectives : array-like
+        (N, M) objectives of the front's members
+
+    Returns:
+    --------
+    np.ndarray
+        (N,) distances; the extreme rows of every objective get inf
+    """
+    objectives = np.asarray(objectives, dtype=float).reshape(len(objectives), -1)
+    n, n_obj = objectives.shape
+    distances = np.zeros(n)
+    if n == 0:
+        return distances
+    # Like DEAP, ties are broken by the order of the previous objective
+    order = np.arange(n)
+    for column in objectives.T:
+        order = order[np.argsort(column[order], kind="stable")]
+        distances[order[0]] = distances[order[-1]] = np.inf
+        span = column[order[-1]] - column[order[0]]
+        if span == 0:
+            continue
+        sorted_values = column[order]
+        distances[order[1:-1]] += (sorted_values[2:] - sorted_values[:-2]) / (n_obj * span)
+    return distances
+
+
+def select_nsga2(objectives, k):
+    """
+    NSGA-II environmental selection of k rows.
+
+    Parameters:
+    -----------
+    objectives : array-like
+        (N, M) objectives of the merged parent and offspring population
+    k : int
+        Number of rows to keep
+
+    Returns:
+    --------
+    chosen : np.ndarray
+        Indices of the kept rows: whole fronts in order, then the members of
+        the split front with the largest crowding distance
+    ranks : np.ndarray
+        Front index of every row (len(fronts) for rows left unranked)
+    crowding : np.ndarray
+        Crowding distance of every row within its front (0 if unranked)
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    n = len(objectives)
+    fronts = non_dominated_sort(objectives, k)
+    ranks = np.full(n, len(fronts), dtype=int)
+    crowding = np.zeros(n)
+    for rank, front in enumerate(fronts):
+        ranks[front] = rank
+        crowding[front] = crowding_distance(objectives[front])
+
+    chosen = np.concatenate(fronts[:-1]) if len(fronts) > 1 else np.empty(0, dtype=int)
+    if fronts:
+        last = fronts[-1]
+        order = np.argsort(-crowding[last], kind="stable")
+        chosen = np.concatenate([chosen, last[order[:k - len(chosen)]]]).astype(int)
+    return chosen, ranks, crowding
+
+
+def tournament_dcd(objectives, crowding, k):
+    """
+    Binary tournaments on dominance, then crowding distance (selTournamentDCD).
+
+    Every row takes part in about 2k/N tournaments: the contestants are
+    consecutive rows of shuffled index permutations. Unlike DEAP, k does not
+    have to be a multiple of four.
+
+    Parameters:
+    -----------
+    objectives : array-like
+        (N, M) objectives to be minimized
+    crowding : array-like
+        (N,) crowding distances, e.g. from ``select_nsga2``
+    k : int
+        Number of winners
+
+    Returns:
+    --------
+    np.ndarray
+        (k,) indices of the winners
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    crowding = np.asarray(crowding, dtype=float)
+    n = len(objectives)
+    n_perms = -(-2 * k // n)
+    contestants = np.concatenate([np.random.permutation(n) for _ in range(n_perms)])
+    a, b = contestants[:2 * k].reshape(k, 2).T
+    obj_a, obj_b = objectives[a], objectives[b]
+    a_dominates = np.all(obj_a <= obj_b, axis=1) & np.any(obj_a < obj_b, axis=1)
+    b_dominates = np.all(obj_b <= obj_a, axis=1) & np.any(obj_b < obj_a, axis=1)
+    # Neither dominates: larger crowding distance wins, ties are a coin flip
+    a_wins = np.where(crowding[a] == crowding[b], np.random.random(k) <= 0.5, crowding[a] > crowding[b])
+    a_wins = a_dominates | (a_wins & ~b_dominates)
+    return np.where(a_wins, a, b)
+
+
+# -----------------------------------------------------------------------------
+# Quality indicators
+# -----------------------------------------------------------------------------
+
+# Points that may enter or leave the tracked front in one update before the
+# hypervolume is recomputed with one sweep instead of point by point (one
+# contribution costs about a fifth of a sweep for fronts of 10^2..10^3 points)
+INCREMENTAL_HV_MAX_CHANGES = 4
+
+# Reference rows per block of the IGD+ distance computation
+IGD_BLOCK_ROWS = 256
+
+
+def _hypervolume_2d(points, ref_point):
+    """Area dominated by 2-objective points (all inside the reference box)."""
+    order = np.lexsort((points[:, 1], points[:, 0]))
+    x, y = points[order, 0], np.minimum.accumulate(points[order, 1])
+    widths = np.diff(np.append(x, ref_point[0]))
+    return float(np.sum(widths * (ref_point[1] - y)))
+
+
+def _hypervolume_3d(points, ref_point):
+    """
+    Volume dominated by 3-objective points (all inside the reference box).
+
+    HV3D sweep: the points are visited in increasing f3 while the area
+    dominated in (f1, f2) is kept up to date on a staircase sorted by f1.
+    Each insertion only walks the steps it removes, so the sweep costs
+    O(N log N) plus the list updates.
+    """
+    ref_x, ref_y, ref_z = (float(v) for v in ref_point)
+    xs, ys = [], []
+    area = volume = 0.0
+    z_prev = None
+    for x, y, z in sorted(points.tolist(), key=lambda p: p[2]):
+        if z_prev is not None:
+            volume += area * (z - z_prev)
+        z_prev = z
+        i = bisect.bisect_left(xs, x)
+        # Dominated in (f1, f2) by the step left of it or at the same f1
+        if (i > 0 and ys[i - 1] <= y) or (i < len(xs) and xs[i] == x and ys[i] <= y):
+            continue
+        height = ys[i - 1] if i > 0 else ref_y
+        added = ((xs[i] if i < len(xs) else ref_x) - x) * (height - y)
+        j = i
+        while j < len(xs) and ys[j] >= y:
+            added += ((xs[j + 1] if j + 1 < len(xs) else ref_x) - xs[j]) * (ys[j] - y)
+            j += 1
+        xs[i:j] = [x]
+        ys[i:j] = [y]
+        area += added
+    if z_prev is not None:
+        volume += area * (ref_z - z_prev)
+    return volume
+
+
+def hypervolume(points, ref_point):
+    """
+    Exact hypervolume of a 2- or 3-objective point set.
+
+    Parameters:
+    -----------
+    points : array-like
+        (N, M) objectives to be minimized, M = 2 or 3; dominated points and
+        points outside the reference box are allowed and add nothing
+    ref_point : array-like
+        (M,) reference point
+
+    Returns:
+    --------
+    float
+        Volume dominated by the points and bounded by the reference point
+    """
+    ref_point = np.asarray(ref_point, dtype=float)
+    points = np.asarray(points, dtype=float).reshape(-1, len(ref_point))
+    points = points[np.all(points < ref_point, axis=1)]
+    if len(points) == 0:
+        return 0.0
+    if len(ref_point) == 2:
+        return _hypervolume_2d(points, ref_point)
+    if len(ref_point) == 3:
+        return _hypervolume_3d(points, ref_point)
+    raise ValueError(f"Hypervolume is implemented for 2 or 3 objectives, got {len(ref_point)}")
+
+
+def hypervolume_contribution(point, others, ref_point):
+    """
+    Hypervolume that ``point`` adds to the set ``others``.
+
+    The contribution is the volume of the box between the point and the
+    reference point minus the part of it dominated by ``others``, which is
+    the hypervolume of the others projected onto the box. Projections equal
+    to the point in all objectives but one are slabs; only the lowest slab
+    per objective is kept and everything behind it is dropped, so usually
+    only the point's neighbours on the front reach the sweep.
+    """
+    ref_point = np.asarray(ref_point, dtype=float)
+    point = np.asarray(point, dtype=float)
+    if np.any(point >= ref_point):
+        return 0.0
+    others = np.asarray(others, dtype=float).reshape(-1, len(point))
+    projected = np.maximum(others, point)
+    projected = projected[np.all(projected < ref_point, axis=1)]
+    at_point = projected == point
+    if np.any(np.all(at_point, axis=1)):
+        return 0.0
+    keep = np.ones(len(projected), dtype=bool)
+    for k in range(len(point)):
+        slabs = np.flatnonzero(np.all(np.delete(at_point, k, axis=1), axis=1))
+        if len(slabs):
+            lowest = slabs[np.argmin(projected[slabs, k])]
+            keep &= projected[:, k] < projected[lowest, k]
+            keep[lowest] = True
+    box = float(np.prod(ref_point - point))
+    return box - hypervolume(projected[keep], ref_point)
+
+
+class HypervolumeTracker:
+    """
+    Exact hypervolume of a front that changes a little every generation.
+
+    ``update`` compares the new front with the tracked one and subtracts
+    the contributions of the points that left, then adds those of the
+    points that entered, instead of recomputing the whole volume. When more
+    than INCREMENTAL_HV_MAX_CHANGES points changed, one full sweep is
+    cheaper and is used instead.
+
+    Parameters:
+    -----------
+    ref_point : array-like
+        (M,) reference point, M = 2 or 3
+    """
+
+    def __init__(self, ref_point):
+        self.ref_point = np.asarray(ref_point, dtype=float)
+        self.points = {}
+        self.value = 0.0
+
+    def update(self, front):
+        """Track ``front`` ((N, M) objectives) and return its hypervolume."""
+        front = np.asarray(front, dtype=float).reshape(-1, len(self.ref_point))
+        front = front[np.all(front < self.ref_point, axis=1)]
+        new_points = {tuple(row): row for row in front.tolist()}
+        leaving = [key for key in self.points if key not in new_points]
+        entering = [key for key in new_points if key not in self.points]
+
+        if len(leaving) + len(entering) > INCREMENTAL_HV_MAX_CHANGES:
+            self.points = new_points
+            self.value = hypervolume(list(new_points.values()), self.ref_point)
+            return self.value
+
+        for key in leaving:
+            point = self.points.pop(key)
+            self.value -= hypervolume_contribution(point, list(self.points.values()), self.ref_point)
+        for key in entering:
+            self.value += hypervolume_contribution(new_points[key], list(self.points.values()), self.ref_point)
+            self.points[key] = new_points[key]
+        self.value = max(self.value, 0.0)
+        return self.value
+
+
+def generational_distance(front, reference):
+    """Mean Euclidean distance from the front's points to the nearest reference point."""
+    front = np.asarray(front, dtype=float)
+    if len(front) == 0:
+        return float("inf")
+    distances, _ = cKDTree(reference).query(front)
+    return float(np.mean(distances))
+
+
+def igd_plus(front, reference):
+    """
+    Inverted generational distance plus (Ishibuchi et al.).
+
+    Mean over the reference points of the smallest dominance-aware distance
+    ``||max(a - r, 0)||`` to a front point a. This distance is not a metric
+    a KD-tree can search, so it is computed in blocks of IGD_BLOCK_ROWS
+    reference points.
+    """
+    front = np.asarray(front, dtype=float)
+    reference = np.asarray(reference, dtype=float)
+    if len(front) == 0:
+        return float("inf")
+    nearest = []
+    for start in range(0, len(reference), IGD_BLOCK_ROWS):
+        block = reference[start:start + IGD_BLOCK_ROWS]
+        squared = np.zeros((len(block), len(front)))
+        for k in range(front.shape[1]):
+            squared += np.maximum(front[None, :, k] - block[:, None, k], 0.0) ** 2
+        nearest.append(np.sqrt(squared.min(axis=1)))
+    return float(np.mean(np.concatenate(nearest)))
+
+
+def spread(front, reference):
+    """
+    Generalized spread (Delta) of a front (Zhou et al.).
+
+    Combines the distances from the reference front's extreme points (the
+    point with the largest value of each objective) to the front with the
+    spread of the front's nearest-neighbour distances; 0 means an even front
+    reaching the extremes. Neighbours are found with a KD-tree.
+    """
+    front = np.asarray(front, dtype=float)
+    reference = np.asarray(reference, dtype=float)
+    if len(front) < 2:
+        return 1.0
+    tree = cKDTree(front)
+    neighbour_distances = tree.query(front, k=2)[0][:, 1]
+    extremes = reference[np.argmax(reference, axis=0)]
+    extreme_distance = float(np.sum(tree.query(extremes)[0]))
+    mean_distance = float(np.mean(neighbour_distances))
+    denominator = extreme_distance + len(front) * mean_distance
+    if denominator == 0:
+        return 0.0
+    return (extreme_distance + float(np.sum(np.abs(neighbour_distances - mean_distance)))) / denominator
+
+
+def merge_fronts(reference, front):
+    """
+    Non-dominated points of two fronts, each already non-dominated.
+
+    Only the points of one front are compared with those of the other, so
+    merging a generation's front into a large reference costs O(N R).
+    """
+    reference = np.asarray(reference, dtype=float)
+    front = np.unique(np.asarray(front, dtype=float), axis=0)
+    if len(reference) == 0:
+        return front
+    no_worse = np.ones((len(front), len(reference)), dtype=bool)
+    no_better = np.ones((len(front), len(reference)), dtype=bool)
+    for k in range(front.shape[1]):
+        no_worse &= front[:, None, k] <= reference[None, :, k]
+        no_better &= front[:, None, k] >= reference[None, :, k]
+    # A front point equal to a reference point is dropped as weakly dominated
+    reference_kept = ~np.any(no_worse & ~no_better, axis=0)
+    front_kept = ~np.any(no_better, axis=1)
+    return np.vstack([reference[reference_kept], front[front_kept]])
+
+
+def score_front(front, reference):
+    """
+    IGD+, GD and Spread of a front against a reference front.
+
+    Both are scaled to [0, 1] over the reference front's range first, so the
+    objectives weigh alike.
+
+    Parameters:
+    -----------
+    front, reference : array-like
+        (N, M) and (R, M) objectives
+
+    Returns:
+    --------
+    dict
+        "IGD+", "GD" and "Spread"
+    """
+    front = np.asarray(front, dtype=float)
+    reference = np.asarray(reference, dtype=float)
+    if len(front) == 0 or len(reference) == 0:
+        return {"IGD+": float("inf"), "GD": float("inf"), "Spread": 1.0}
+    low = reference.min(axis=0)
+    span = reference.max(axis=0) - low
+    span[span == 0] = 1.0
+    scaled_front = (front - low) / span
+    scaled_reference = (reference - low) / span
+    return {
+        "IGD+": igd_plus(scaled_front, scaled_reference),
+        "GD": generational_distance(scaled_front, scaled_reference),
+        "Spread": spread(scaled_front, scaled_reference),
+    }
+
+
+class FrontMetrics:
+    """
+    Per-generation quality indicators of a multi-objective run.
+
+    Keeps the hypervolume of the current front with a HypervolumeTracker and
+    scores the front against a reference front with IGD+, GD and Spread
+    (``score_front``). Without a known reference front the best front seen
+    so far (all fronts passed to ``update``, merged) is used. For elitist
+    algorithms that front is the current one, so IGD+ and GD stay at 0
+    during the run; the fronts are therefore kept and ``rescore`` scores
+    them all against the final reference once the run is over.
+
+    Parameters:
+    -----------
+    ref_point : array-like
+        Hypervolume reference point
+    reference_front : array-like, optional
+        (R, M) known reference front
+    """
+
+    def __init__(self, ref_point, reference_front=None):
+        self.hypervolume = HypervolumeTracker(ref_point)
+        self.fixed_reference = reference_front is not None
+        self.reference = (np.asarray(reference_front, dtype=float) if self.fixed_reference
+                          else np.empty((0, len(self.hypervolume.ref_point))))
+        self.fronts = []
+
+    def update(self, front):
+        """
+        Indicators of the current front.
+
+        Parameters:
+        -----------
+        front : array-like
+            (N, M) objectives of the current non-dominated front
+
+        Returns:
+        --------
+        dict
+            "HV", "IGD+", "GD" and "Spread"
+        """
+        front = np.unique(np.asarray(front, dtype=float).reshape(-1, len(self.hypervolume.ref_point)), axis=0)
+        metrics = {"HV": self.hypervolume.update(front)}
+        if not self.fixed_reference:
+            self.reference = merge_fronts(self.reference, front)
+            self.fronts.append(front)
+        metrics.update(score_front(front, self.reference))
+        return metrics
+
+    def rescore(self, reference=None):
+        """
+        IGD+, GD and Spread of every front passed to ``update`` (kept only
+        without a known reference front) against ``reference``, by default
+        the best front of the whole run.
+        """
+        reference = self.reference if reference is None else np.asarray(reference, dtype=float)
+        return [score_front(front, reference) for front in self.fronts]
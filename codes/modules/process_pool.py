@@ -0,0 +1,270 @@
+# process_pool.py
+
+import math
+import multiprocessing
+import os
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from modules.frf_cache import cached_frf, get_shared_cache
+
+# -----------------------------------------------------------------------------
+# Configuration
+# -----------------------------------------------------------------------------
+
+# Chunks per worker a population is split into: enough to balance uneven
+# evaluation times, few enough to keep the per-chunk overhead small
+CHUNKS_PER_WORKER = 4
+
+# Chunks kept in flight per worker; dispatch stops here so a pause or abort
+# takes effect after the chunks already running
+INFLIGHT_PER_WORKER = 2
+
+# Seconds between pause/abort checks while waiting for chunks
+POLL_INTERVAL = 0.05
+
+# Errors meaning worker processes cannot be used on this machine/session
+POOL_ERRORS = (OSError, NotImplementedError, BrokenProcessPool, RuntimeError)
+
+# -----------------------------------------------------------------------------
+# Worker process side
+# -----------------------------------------------------------------------------
+
+_worker_config = None
+_worker_block = None
+
+
+def _init_worker(config):
+    """Store the run configuration once per worker process."""
+    global _worker_config
+    _worker_config = config
+
+
+def _attach_block(name, shape):
+    """Population view on the parent's shared-memory block, attached once per block."""
+    global _worker_block
+    if _worker_block is None or _worker_block[0] != name:
+        if _worker_block is not None:
+            _worker_block[1].close()
+        _worker_block = (name, shared_memory.SharedMemory(name=name))
+    return np.ndarray(shape, dtype=np.float64, buffer=_worker_block[1].buf)
+
+
+def _evaluate_chunk(block_name, shape, start, stop):
+    """
+    FRF summaries of rows start..stop of the shared population block.
+
+    Returns:
+    --------
+    tuple
+        (start, summaries, cache counters of this chunk); failed rows hold
+        {"error": message}
+    """
+    summaries, counters = _evaluate_rows(_attach_block(block_name, shape)[start:stop])
+    return start, summaries, counters
+
+
+def _evaluate_rows(rows):
+    """FRF summaries of the given rows and the cache counters of the call."""
+    config = _worker_config
+    cache = get_shared_cache(config["cache_path"])
+    before = cache.stats()
+    summaries = []
+    for row in rows:
+        try:
+            summaries.append(cached_frf(
+                config["main_system_parameters"],
+                tuple(float(v) for v in row),
+                config["omega_start"],
+                config["omega_end"],
+                config["omega_points"],
+                config["target_values_dict"],
+                config["weights_dict"],
+                cache=cache,
+                **config["frf_options"],
+            ))
+        except Exception as e:
+            summaries.append({"error": str(e)})
+    return summaries, cache.stats(since=before)
+
+# -----------------------------------------------------------------------------
+# Parent side
+# -----------------------------------------------------------------------------
+
+class FRFProcessPool:
+    """
+    Persistent worker processes evaluating FRF summaries of whole populations.
+
+    Each worker is initialized once with the main system parameters,
+    frequency grid, targets and weights, and consults the shared FRF cache
+    (same database as the parent). Populations are written into one
+    shared-memory float64 block that workers read in place, so only row
+    ranges and the small result dicts cross process boundaries. Processes
+    are started with the 'spawn' method, which is safe from the Qt worker
+    threads.
+
+    Parameters:
+    -----------
+    main_system_parameters : list or array
+        Main system parameters (17 values)
+    omega_start, omega_end : float
+        Frequency range
+    omega_points : int
+        Number of frequency points
+    target_values_dict, weights_dict : dict
+        Targets and weights keyed by mass label
+    n_workers : int, optional
+        Number of processes; defaults to all cores but one
+    chunk_size : int, optional
+        Rows per task; defaults to an even split into
+        CHUNKS_PER_WORKER chunks per worker
+    frf_options : dict, optional
+        Further keyword arguments of ``cached_frf``
+    """
+
+    def __init__(
+        self,
+        main_system_parameters,
+        omega_start,
+        omega_end,
+        omega_points,
+        target_values_dict,
+        weights_dict,
+        n_workers=None,
+        chunk_size=None,
+        frf_options=None,
+    ):
+        self.n_workers = max(1, int(n_workers or (os.cpu_count() or 2) - 1))
+        self.chunk_size = chunk_size
+        cache_path = get_shared_cache().path
+        config = {
+            "main_system_parameters": list(main_system_parameters),
+            "omega_start": omega_start,
+            "omega_end": omega_end,
+            "omega_points": omega_points,
+            "target_values_dict": target_values_dict,
+            "weights_dict": weights_dict,
+            "cache_path": cache_path or "",
+            "frf_options": dict(frf_options or {}),
+        }
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.n_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(config,),
+        )
+        self._block = None
+        self.cache_counters = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+
+    def _population_block(self, population):
+        """Copy the population into the shared block, growing it when needed."""
+        if self._block is None or self._block.size < population.nbytes:
+            self._release_block()
+            self._block = shared_memory.SharedMemory(create=True, size=max(population.nbytes, 8))
+        view = np.ndarray(population.shape, dtype=np.float64, buffer=self._block.buf)
+        view[:] = population
+        return self._block.name
+
+    def _release_block(self):
+        if self._block is not None:
+            self._block.close()
+            self._block.unlink()
+            self._block = None
+
+    def evaluate(self, population, should_stop=None):
+        """
+        FRF summaries of every row of ``population``.
+
+        Parameters:
+        -----------
+        population : array-like, shape (P, n_params)
+            DVA parameter vectors
+        should_stop : callable, optional
+            Polled between chunks; it may block (pause) and returns True to
+            abort. Chunks not yet started are then cancelled.
+
+        Returns:
+        --------
+        list
+            One summary dict per row (see ``cached_frf``), or None for rows
+            skipped by an abort
+        """
+        population = np.ascontiguousarray(population, dtype=np.float64)
+        n_rows = population.shape[0]
+        results = [None] * n_rows
+        if n_rows == 0:
+            return results
+        block_name = self._population_block(population)
+        size = self.chunk_size or math.ceil(n_rows / (self.n_workers * CHUNKS_PER_WORKER))
+        chunks = [(start, min(start + size, n_rows)) for start in range(0, n_rows, size)]
+        max_inflight = self.n_workers * INFLIGHT_PER_WORKER
+
+        def collect(futures):
+            for future in futures:
+                if future.cancelled():
+                    continue
+                start, summaries, counters = future.result()
+                results[start:start + len(summaries)] = summaries
+                for name in self.cache_counters:
+                    self.cache_counters[name] += counters.get(name, 0)
+
+        pending = set()
+        next_chunk = 0
+        while next_chunk < len(chunks) or pending:
+            if should_stop is not None and should_stop():
+                for future in pending:
+                    future.cancel()
+                # Chunks already running still finish and are kept
+                collect(wait(pending).done)
+                break
+            while next_chunk < len(chunks) and len(pending) < max_inflight:
+                start, stop = chunks[next_chunk]
+                pending.add(self._executor.submit(_evaluate_chunk, block_name, population.shape, start, stop))
+                next_chunk += 1
+            done, pending = wait(pending, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            collect(done)
+        return results
+
+    def submit(self, row):
+        """
+        Start evaluating a single design in the background.
+
+        The row is sent by value (the shared block serves whole
+        populations), so many single designs can be in flight at once,
+        e.g. for a steady-state GA.
+
+        Returns:
+        --------
+        concurrent.futures.Future
+            Resolves to the design's summary dict ({"error": message} if
+            frf() failed)
+        """
+        result = Future()
+        task = self._executor.submit(_evaluate_rows, np.asarray(row, dtype=np.float64).reshape(1, -1))
+
+        def forward(task):
+            try:
+                summaries, counters = task.result()
+            except BaseException as e:
+                result.set_exception(e)
+                return
+            for name in self.cache_counters:
+                self.cache_counters[name] += counters.get(name, 0)
+            result.set_result(summaries[0])
+
+        task.add_done_callback(forward)
+        return result
+
+    def close(self):
+        """Stop the worker processes and free the shared block."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+        self._release_block()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -7,7 +7,7 @@ import seaborn as sns
 from SALib.sample import saltelli
 from SALib.analyze import sobol
 from joblib import Parallel, delayed
-from modules.FRF import frf  # Ensure FRF.py is in the same directory or properly installed
+from modules.frf_cache import cached_frf  # Ensure FRF.py is in the same directory or properly installed
 import pandas as pd
 
 # Set Seaborn style for better aesthetics
@@ -26,7 +26,8 @@ def perform_sobol_analysis(
     target_values_dict,
     weights_dict,
     visualize=False,
-    n_jobs=1
+    n_jobs=1,
+    evaluation_backend=None
 ):
     """
     Perform Sobol sensitivity analysis on the singular response using the FRF module.
@@ -46,6 +47,8 @@ def perform_sobol_analysis(
         weights_dict (dict): Dictionary containing weights for each mass.
         visualize (bool, optional): Whether to generate visualizations. Defaults to False.
         n_jobs (int, optional): Number of parallel jobs. Defaults to 1.
+        evaluation_backend (str, optional): Evaluate the samples through an Evaluator backend
+            (e.g. 'distributed' for a broker) instead of joblib. Defaults to None.
 
     Returns:
         all_results (dict): Dictionary containing Sobol sensitivity results.
@@ -93,13 +96,20 @@ def perform_sobol_analysis(
         param_values = saltelli.sample(problem, N, calc_second_order=True)
 
         print(f"  Evaluating singular response for {param_values.shape[0]} samples...")
-        Y = Parallel(n_jobs=n_jobs)(
-            delayed(evaluate_frf)(
+        if evaluation_backend:
+            Y = evaluate_samples(
                 main_system_parameters, fixed_parameters, variable_parameters, dva_parameter_order,
-                omega_start, omega_end, omega_points, params,
-                target_values_dict, weights_dict
-            ) for params in param_values
-        )
+                omega_start, omega_end, omega_points, param_values,
+                target_values_dict, weights_dict, evaluation_backend, n_jobs
+            )
+        else:
+            Y = Parallel(n_jobs=n_jobs)(
+                delayed(evaluate_frf)(
+                    main_system_parameters, fixed_parameters, variable_parameters, dva_parameter_order,
+                    omega_start, omega_end, omega_points, params,
+                    target_values_dict, weights_dict
+                ) for params in param_values
+            )
 
         Y = np.array(Y, dtype=np.float64)
 
@@ -178,38 +188,15 @@ def evaluate_frf(
         # Ensure the parameters are ordered correctly
         dva_parameters_tuple = tuple(dva_parameters_combined[param] for param in dva_parameter_order)
 
-        # Extract target values and weights for each mass
-        target_values_mass1 = target_values_dict.get('mass_1', {})
-        weights_mass1 = weights_dict.get('mass_1', {})
-        target_values_mass2 = target_values_dict.get('mass_2', {})
-        weights_mass2 = weights_dict.get('mass_2', {})
-        target_values_mass3 = target_values_dict.get('mass_3', {})
-        weights_mass3 = weights_dict.get('mass_3', {})
-        target_values_mass4 = target_values_dict.get('mass_4', {})
-        weights_mass4 = weights_dict.get('mass_4', {})
-        target_values_mass5 = target_values_dict.get('mass_5', {})
-        weights_mass5 = weights_dict.get('mass_5', {})
-
-        # Run the FRF analysis
-        frf_results = frf(
+        # Run the FRF analysis through the shared evaluation cache
+        frf_results = cached_frf(
             main_system_parameters=main_system_parameters,
             dva_parameters=dva_parameters_tuple,
             omega_start=omega_start,
             omega_end=omega_end,
             omega_points=omega_points,
-            target_values_mass1=target_values_mass1,
-            weights_mass1=weights_mass1,
-            target_values_mass2=target_values_mass2,
-            weights_mass2=weights_mass2,
-            target_values_mass3=target_values_mass3,
-            weights_mass3=weights_mass3,
-            target_values_mass4=target_values_mass4,
-            weights_mass4=weights_mass4,
-            target_values_mass5=target_values_mass5,
-            weights_mass5=weights_mass5,
-            plot_figure=False,    # Disable plotting during sensitivity analysis
-            show_peaks=False,     # Disable peak annotations during sensitivity analysis
-            show_slopes=False     # Disable slope plotting during sensitivity analysis
+            target_values_dict=target_values_dict,
+            weights_dict=weights_dict,
         )
 
         # Extract the singular response
@@ -220,6 +207,54 @@ def evaluate_frf(
         return 0.0  # Return default value to maintain sample size
 
 
+def evaluate_samples(
+    main_system_parameters,
+    fixed_parameters,
+    variable_parameters,
+    dva_parameter_order,
+    omega_start,
+    omega_end,
+    omega_points,
+    param_values,
+    target_values_dict,
+    weights_dict,
+    evaluation_backend,
+    n_workers=None
+):
+    """
+    Evaluate the singular response of all samples at once through an Evaluator.
+
+    Parameters:
+        param_values (numpy.ndarray): Sampled values for variable parameters, one row per sample.
+        evaluation_backend (str): Evaluator backend, e.g. 'distributed' or 'process'.
+        n_workers (int, optional): Workers of the 'thread'/'process' backends.
+        Other parameters as for evaluate_frf.
+
+    Returns:
+        list: Singular responses in sample order; failed or non-finite evaluations give 0.0.
+    """
+    from modules.evaluator import Evaluator
+
+    names = list(variable_parameters.keys())
+    rows = np.empty((len(param_values), len(dva_parameter_order)), dtype=np.float64)
+    for j, param in enumerate(dva_parameter_order):
+        if param in fixed_parameters:
+            rows[:, j] = fixed_parameters[param]
+        else:
+            rows[:, j] = param_values[:, names.index(param)]
+
+    with Evaluator(main_system_parameters, omega_start, omega_end, omega_points,
+                   target_values_dict, weights_dict, backend=evaluation_backend,
+                   n_workers=n_workers, log=print) as evaluator:
+        summaries = evaluator.evaluate_many(rows)
+
+    values = []
+    for summary in summaries:
+        value = summary.get('singular_response', 0.0) if isinstance(summary, dict) else 0.0
+        values.append(value if value is not None and np.isfinite(value) else 0.0)
+    return values
+
+
 def save_results(all_results, param_names, num_samples_list, folder_name='sobol_analysis'):
     """
     Save the Sobol sensitivity results to CSV files and generate sorted sensitivity CSV.
@@ -1,3 +1,4 @@
+import json
 import numpy as np
 import random
 import time
@@ -8,8 +9,9 @@ from PyQt5.QtCore import QObject, pyqtSignal
 
 from deap import base, creator, tools, algorithms
 
-# Assuming FRF function is available in modules.FRF
-from modules.FRF import frf
+from modules.evaluator import Evaluator
+from modules.pareto import FrontMetrics, non_dominated_sort
+from modules.pareto_archive import ParetoArchive
 
 class AdaVEAWorker(QObject):
     progress = pyqtSignal(int, int, int, dict) # run_idx, current_gen, total_gens, metrics
@@ -20,7 +22,10 @@ class AdaVEAWorker(QObject):
                  omega_start, omega_end, omega_points,
                  pop_size, generations, cxpb, mutpb, eta_c, eta_m,
                  num_runs, random_seed, convergence_epsilon, convergence_window, convergence_min_gen,
-                 hv_ref_point, heuristic_init_ratio):
+                 hv_ref_point, heuristic_init_ratio,
+                 evaluation_backend="serial", evaluation_workers=None, reference_front=None,
+                 archive_max_size=None, archive_prune="crowding", archive_epsilon=None,
+                 results_dir="adavea_results"):
         super().__init__()
         
         self.main_system_parameters = main_system_parameters
@@ -51,6 +56,25 @@ class AdaVEAWorker(QObject):
         self.convergence_min_gen = convergence_min_gen
         self.hv_ref_point = hv_ref_point if hv_ref_point else [1.0, 100.0, 100.0]
         self.heuristic_init_ratio = heuristic_init_ratio
+        # Known (f1, f2, f3) front for IGD+/GD/Spread; without one, each run
+        # is scored against the best front it has found so far
+        self.reference_front = reference_front
+        # Non-dominated designs of all evaluations of all runs
+        self.archive_max_size = archive_max_size
+        self.archive_prune = archive_prune
+        self.archive_epsilon = archive_epsilon
+        self.archive = None
+        # The archive is written to <results_dir>/adavea_archive.json at the end
+        self.results_dir = results_dir
+
+        # self.target_values_weights is expected to be a tuple (target_values_dict, weights_dict)
+        # as passed from adavea_mixin.py
+        target_values_dict, weights_dict = self.target_values_weights
+        self.evaluator = Evaluator(
+            self.main_system_parameters, self.omega_start, self.omega_end, self.omega_points,
+            target_values_dict, weights_dict,
+            backend=evaluation_backend, n_workers=evaluation_workers,
+        )
 
         self.is_running = False
         self.is_paused = False
@@ -80,33 +104,18 @@ class AdaVEAWorker(QObject):
         self.toolbox.register("mutate", tools.mutPolynomialBounded, low=self.low_bounds, up=self.high_bounds, eta=self.eta_m, indpb=1.0/self.num_params)
         self.toolbox.register("select", tools.selNSGA2) 
 
-    def _evaluate_objectives(self, individual):
+    def _evaluate_population(self, individuals):
+        """Objectives of all individuals, with the FRF stage run by the evaluator in one call."""
+        summaries = self.evaluator.evaluate_many(individuals)
+        return [self._evaluate_objectives(ind, summary) for ind, summary in zip(individuals, summaries)]
+
+    def _evaluate_objectives(self, individual, results=None):
         try:
-            # self.target_values_weights is expected to be a tuple (target_values_dict, weights_dict) 
-            # as passed from adavea_mixin.py
-            target_values_dict, weights_dict = self.target_values_weights
-            
-            results = frf(
-                main_system_parameters=self.main_system_parameters,
-                dva_parameters=tuple(individual),
-                omega_start=self.omega_start,
-                omega_end=self.omega_end,
-                omega_points=self.omega_points,
-                target_values_mass1=target_values_dict.get('mass_1', {}),
-                weights_mass1=weights_dict.get('mass_1', {}),
-                target_values_mass2=target_values_dict.get('mass_2', {}),
-                weights_mass2=weights_dict.get('mass_2', {}),
-                target_values_mass3=target_values_dict.get('mass_3', {}),
-                weights_mass3=weights_dict.get('mass_3', {}),
-                target_values_mass4=target_values_dict.get('mass_4', {}),
-                weights_mass4=weights_dict.get('mass_4', {}),
-                target_values_mass5=target_values_dict.get('mass_5', {}),
-                weights_mass5=weights_dict.get('mass_5', {}),
-                plot_figure=False,
-                show_peaks=False,
-                show_slopes=False,
-            )
-            
+            if results is None:
+                results = self.evaluator.evaluate(individual)
+            if "error" in results:
+                raise RuntimeError(results["error"])
+
             f1 = results.get('singular_response', 1e9)
             if not np.isfinite(f1):
                 f1 = 1e9
@@ -137,108 +146,135 @@ class AdaVEAWorker(QObject):
                 ind[i] = self.low_bounds[i]
         return ind
 
+    def save_archive(self, results_dir):
+        """Write the campaign's archive to adavea_archive.json."""
+        os.makedirs(results_dir, exist_ok=True)
+        file_path = os.path.join(results_dir, "adavea_archive.json")
+        with open(file_path, 'w') as f:
+            json.dump(self.archive.to_dict(), f, indent=4)
+
     def run(self):
         self.is_running = True
         self.stop_requested = False
         
-        all_runs_data = []
-
-        for run_idx in range(self.num_runs):
-            if self.stop_requested:
-                break
-
-            random.seed(self.random_seed + run_idx)
-            np.random.seed(self.random_seed + run_idx)
+        try:
+            all_runs_data = []
+            self.archive = ParetoArchive(3, self.archive_max_size, self.archive_prune, self.archive_epsilon)
 
-            pop = []
-            # Heuristic Initialization
-            num_heuristic = int(self.pop_size * self.heuristic_init_ratio)
-            for _ in range(num_heuristic):
-                pop.append(self._heuristic_initialization())
-            # Random Initialization for the rest
-            for _ in range(self.pop_size - num_heuristic):
-                pop.append(self.toolbox.individual())
+            for run_idx in range(self.num_runs):
+                if self.stop_requested:
+                    break
 
-            # Evaluate the initial population
-            fitnesses = self.toolbox.map(self.toolbox.evaluate, pop)
-            for ind, fit in zip(pop, fitnesses):
-                ind.fitness.values = fit
+                random.seed(self.random_seed + run_idx)
+                np.random.seed(self.random_seed + run_idx)
+
+                pop = []
+                # Heuristic Initialization
+                num_heuristic = int(self.pop_size * self.heuristic_init_ratio)
+                for _ in range(num_heuristic):
+                    pop.append(self._heuristic_initialization())
+                # Random Initialization for the rest
+                for _ in range(self.pop_size - num_heuristic):
+                    pop.append(self.toolbox.individual())
+
+                # Evaluate the initial population
+                fitnesses = self._evaluate_population(pop)
+                for ind, fit in zip(pop, fitnesses):
+                    ind.fitness.values = fit
+                self.archive.add_many(-np.array([ind.fitness.wvalues for ind in pop]), pop)
 
-            generation_metrics = []
-            start_time = time.time()
+                front_metrics = FrontMetrics(self.hv_ref_point, self.reference_front)
+                generation_metrics = []
+                start_time = time.time()
 
-            for gen in range(1, self.generations + 1):
-                if self.stop_requested:
-                    break
-                while self.is_paused:
-                    time.sleep(0.1) 
+                for gen in range(1, self.generations + 1):
+                    if self.stop_requested:
+                        break
+                    while self.is_paused:
+                        time.sleep(0.1) 
 
-                gen_start = time.time()
-                process = psutil.Process(os.getpid())
+                    gen_start = time.time()
+                    process = psutil.Process(os.getpid())
 
-                # --- Adaptive Crossover Rate ---
-                tau_crossover = self.generations / 4.0
-                current_cxpb = 0.5 + 0.5 * np.exp(-gen / tau_crossover)
+                    # --- Adaptive Crossover Rate ---
+                    tau_crossover = self.generations / 4.0
+                    current_cxpb = 0.5 + 0.5 * np.exp(-gen / tau_crossover)
 
-                # --- Adaptive Mutation Rate ---
-                current_mutpb = self.initial_mutpb * (1.0 - gen / self.generations) + (1.0/self.num_params) * (gen / self.generations)
+                    # --- Adaptive Mutation Rate ---
+                    current_mutpb = self.initial_mutpb * (1.0 - gen / self.generations) + (1.0/self.num_params) * (gen / self.generations)
                 
-                # Select the next generation individuals
-                offspring = algorithms.varAnd(pop, self.toolbox, current_cxpb, current_mutpb)
+                    # Select the next generation individuals
+                    offspring = algorithms.varAnd(pop, self.toolbox, current_cxpb, current_mutpb)
                 
-                # Evaluate the individuals with an invalid fitness
-                invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
-                fitnesses = self.toolbox.map(self.toolbox.evaluate, invalid_ind)
-                for ind, fit in zip(invalid_ind, fitnesses):
-                    ind.fitness.values = fit
-
-                # Combine the current population and offspring
-                pop = self.toolbox.select(pop + offspring, self.pop_size)
+                    # Evaluate the individuals with an invalid fitness
+                    invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
+                    fitnesses = self._evaluate_population(invalid_ind)
+                    for ind, fit in zip(invalid_ind, fitnesses):
+                        ind.fitness.values = fit
+                    if invalid_ind:
+                        self.archive.add_many(-np.array([ind.fitness.wvalues for ind in invalid_ind]), invalid_ind)
+
+                    # Combine the current population and offspring
+                    pop = self.toolbox.select(pop + offspring, self.pop_size)
                 
-                current_pareto_front = tools.sortNondominated(pop, len(pop), first_front_only=True)[0]
-
-                # Calculate Hypervolume
-                try:
-                    from deap.tools._hypervolume import hv
-                    objs = [ind.fitness.values for ind in current_pareto_front]
-                    hypervolume_val = hv.hypervolume(objs, self.hv_ref_point)
-                except Exception:
-                    hypervolume_val = 0.0
-
-                time_gen = time.time() - gen_start
-                memory_peak = process.memory_info().rss / (1024 * 1024) 
-
-                metrics = {
-                    "gen": gen,
-                    "hv": hypervolume_val,
-                    "igd": 0.0,
-                    "n_pareto": len(current_pareto_front),
-                    "time_gen": time_gen,
-                    "memory_peak": memory_peak
-                }
-                generation_metrics.append(metrics)
-
-                self.progress.emit(run_idx, gen, self.generations, metrics)
+                    objectives = -np.array([ind.fitness.wvalues for ind in pop])
+                    pareto_indices = non_dominated_sort(objectives, first_front_only=True)[0]
+                    current_pareto_front = [pop[i] for i in pareto_indices]
+
+                    # HV (incremental), IGD+, GD and Spread of the current front
+                    front_values = front_metrics.update(objectives[pareto_indices])
+
+                    time_gen = time.time() - gen_start
+                    memory_peak = process.memory_info().rss / (1024 * 1024) 
+
+                    metrics = {
+                        "gen": gen,
+                        "hv": front_values["HV"],
+                        "igd": front_values["IGD+"],
+                        "gd": front_values["GD"],
+                        "spread": front_values["Spread"],
+                        "n_pareto": len(current_pareto_front),
+                        "n_archive": len(self.archive),
+                        "time_gen": time_gen,
+                        "memory_peak": memory_peak
+                    }
+                    generation_metrics.append(metrics)
+
+                    self.progress.emit(run_idx, gen, self.generations, metrics)
                 
-                # Convergence check
-                if gen > self.convergence_min_gen and gen % self.convergence_window == 0:
-                    recent_hvs = [m['hv'] for m in generation_metrics[-self.convergence_window:]]
-                    if np.max(recent_hvs) - np.min(recent_hvs) < self.convergence_epsilon:
-                        break
-
-            final_pareto_front = tools.sortNondominated(pop, len(pop), first_front_only=True)[0]
+                    # Convergence check
+                    if gen > self.convergence_min_gen and gen % self.convergence_window == 0:
+                        recent_hvs = [m['hv'] for m in generation_metrics[-self.convergence_window:]]
+                        if np.max(recent_hvs) - np.min(recent_hvs) < self.convergence_epsilon:
+                            break
+
+                if self.reference_front is None:
+                    # Score every generation against the run's final best front
+                    for metrics, values in zip(generation_metrics, front_metrics.rescore()):
+                        metrics.update({"igd": values["IGD+"], "gd": values["GD"], "spread": values["Spread"]})
+
+                final_objectives = -np.array([ind.fitness.wvalues for ind in pop])
+                final_pareto_front = [pop[i] for i in non_dominated_sort(final_objectives, first_front_only=True)[0]]
             
-            run_results = {
-                "run_id": run_idx + 1,
-                "total_time_hours": (time.time() - start_time) / 3600,
-                "generation_metrics": generation_metrics,
-                "final_pareto_front_objectives": [list(ind.fitness.values) for ind in final_pareto_front],
-                "final_population_parameters": [list(ind) for ind in final_pareto_front],
-            }
-            all_runs_data.append(run_results)
-
-        self.is_running = False
-        self.finished.emit(all_runs_data)
+                run_results = {
+                    "run_id": run_idx + 1,
+                    "total_time_hours": (time.time() - start_time) / 3600,
+                    "generation_metrics": generation_metrics,
+                    "final_pareto_front_objectives": [list(ind.fitness.values) for ind in final_pareto_front],
+                    "final_population_parameters": [list(ind) for ind in final_pareto_front],
+                }
+                all_runs_data.append(run_results)
+
+            try:
+                self.save_archive(self.results_dir)
+            except OSError as e:
+                self.error.emit(f"Could not save the Pareto archive: {e}")
+            self.finished.emit(all_runs_data)
+        except Exception as e:
+            self.error.emit(str(e))
+        finally:
+            self.is_running = False
+            self.evaluator.close()
 
     def pause(self):
         self.is_paused = True
@@ -3,11 +3,413 @@ import random
 import time
 import platform
 import psutil
+import multiprocessing
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
 import cma  # Make sure the cma package is installed
 from PyQt5.QtCore import QThread, pyqtSignal, QTimer
 from modules.FRF import frf
+from modules.evaluator import Evaluator
+from modules.parallel import POLL_INTERVAL, plan_core_budget
+from modules.process_pool import POOL_ERRORS
+
+# -----------------------------------------------------------------------------
+# Configuration
+# -----------------------------------------------------------------------------
+
+# Restart schedules: a single run, increasing population (IPOP) or
+# alternating large and small populations (BIPOP)
+RESTART_STRATEGIES = ("none", "ipop", "bipop")
+
+# Relative sigma changes the ML/RL controllers choose from
+_SIGMA_ACTIONS = [-0.5, -0.25, 0.0, 0.25, 0.5]
+
+
+def cmaes_fitness(x, results, alpha, percentage_error_scale):
+    """
+    CMA-ES fitness of a candidate from its FRF summary: |singular response - 1|
+    plus the sparsity penalty and the scaled sum of percentage errors (as in
+    the GA); 1e6 for failed evaluations. A module-level function of plain
+    values, so restarts in worker processes can use it.
+    """
+    try:
+        if not isinstance(results, dict) or "error" in results:
+            return 1e6
+        singular_response = results.get('singular_response', None)
+        if singular_response is None or not np.isfinite(singular_response):
+            return 1e6
+        primary_objective = abs(singular_response - 1)
+        sparsity_penalty = alpha * sum(abs(xi) for xi in x)
+        percentage_error_sum = 0.0
+        for mass_key, pdiffs in results.get("percentage_differences", {}).items():
+            for criterion, percent_diff in pdiffs.items():
+                percentage_error_sum += abs(percent_diff)
+        return primary_objective + sparsity_penalty + percentage_error_sum / percentage_error_scale
+    except Exception:
+        return 1e6
+
+
+class SigmaController:
+    """
+    Adapts the step size (sigma) of one CMA-ES run.
+
+    kind 'ml_bandit' picks actions by UCB on their mean reward; kind 'rl'
+    uses epsilon-greedy Q-learning over two states (improved last iteration
+    or not). ``select`` returns the new sigma, ``update`` rewards the action.
+    Every restart owns its controller.
+    """
+
+    def __init__(self, kind, ucb_c=0.6, rl_alpha=0.1, rl_gamma=0.9, rl_epsilon=0.2, rl_epsilon_decay=0.95):
+        self.kind = kind
+        self.ucb_c = float(ucb_c)
+        self.rl_alpha = float(rl_alpha)
+        self.rl_gamma = float(rl_gamma)
+        self.epsilon = float(rl_epsilon)
+        self.epsilon_decay = float(rl_epsilon_decay)
+        self.counts = [0 for _ in _SIGMA_ACTIONS]
+        self.sums = [0.0 for _ in _SIGMA_ACTIONS]
+        self.q = {0: [0.0 for _ in _SIGMA_ACTIONS], 1: [0.0 for _ in _SIGMA_ACTIONS]}
+        self.state = 0
+        self.t = 0
+        self.last_action = 0
+
+    def select(self, cur_sigma):
+        if self.kind == 'ml_bandit':
+            self.t += 1
+            scores = []
+            for i in range(len(_SIGMA_ACTIONS)):
+                if self.counts[i] == 0:
+                    scores.append((float('inf'), i))
+                else:
+                    avg = self.sums[i] / self.counts[i]
+                    bonus = self.ucb_c * np.sqrt(np.log(max(self.t, 1)) / self.counts[i])
+                    scores.append((avg + bonus, i))
+            scores.sort(key=lambda t: t[0], reverse=True)
+            _, idx = scores[0]
+        elif random.random() < self.epsilon:
+            idx = random.randrange(len(_SIGMA_ACTIONS))
+        else:
+            idx = int(np.argmax(self.q[self.state]))
+        self.last_action = idx
+        return max(1e-8, cur_sigma * (1.0 + _SIGMA_ACTIONS[idx]))
+
+    def update(self, reward, improved):
+        idx = self.last_action
+        if self.kind == 'ml_bandit':
+            self.counts[idx] += 1
+            self.sums[idx] += float(reward)
+            return
+        next_state = 1 if improved else 0
+        q_old = self.q[self.state][idx]
+        q_next = max(self.q[next_state])
+        self.q[self.state][idx] = q_old + self.rl_alpha * (reward + self.rl_gamma * q_next - q_old)
+        self.state = next_state
+        self.epsilon *= self.epsilon_decay
+
+
+class RestartSchedule:
+    """
+    Population sizes and initial step sizes of successive CMA-ES restarts.
+
+    The first run uses the default population of the dimension. IPOP
+    multiplies the population by ``incpopsize`` at every restart. BIPOP
+    alternates between that large-population regime and a small-population
+    regime with a random population between the default and the last large
+    one and a smaller initial sigma; a small run is scheduled whenever the
+    small regime has used fewer evaluations than the large one. Restarts
+    can run concurrently, so the budgets only count the evaluations of
+    finished restarts (see ``record``).
+
+    Parameters:
+    -----------
+    strategy : str
+        One of RESTART_STRATEGIES
+    n_restarts : int
+        Restarts after the first run
+    dimension : int
+        Number of parameters
+    sigma0 : float
+        Initial sigma of the first run and the large-population regime
+    incpopsize : float
+        Population factor between successive large runs
+    rng : random.Random, optional
+        Random source of the small-population regime
+    """
+
+    def __init__(self, strategy, n_restarts, dimension, sigma0, incpopsize=2.0, rng=None):
+        self.strategy = strategy if strategy in RESTART_STRATEGIES else "none"
+        self.total = 1 + (max(0, int(n_restarts)) if self.strategy != "none" else 0)
+        self.default_popsize = 4 + int(3 * np.log(max(1, dimension)))
+        self.sigma0 = float(sigma0)
+        self.incpopsize = float(incpopsize)
+        self.rng = rng or random.Random()
+        self.scheduled = 0
+        self.n_large = 0
+        self.budget = {"large": 0, "small": 0}
+
+    def __len__(self):
+        return self.total
+
+    def next_restart(self):
+        """Settings of the next restart as a dict, or None once all are scheduled."""
+        if self.scheduled >= self.total:
+            return None
+        restart = self.scheduled
+        self.scheduled += 1
+        spec = {"restart": restart, "regime": "large", "sigma0": self.sigma0}
+        if restart > 0 and self.strategy == "bipop" and self.budget["small"] < self.budget["large"]:
+            u = self.rng.random()
+            large = self.default_popsize * self.incpopsize ** max(0, self.n_large - 1)
+            spec.update(regime="small", sigma0=self.sigma0 * 10 ** (-2 * u),
+                        popsize=int(self.default_popsize * (large / self.default_popsize) ** (u * u)))
+        else:
+            spec["popsize"] = int(round(self.default_popsize * self.incpopsize ** self.n_large))
+            self.n_large += 1
+        return spec
+
+    def record(self, outcome):
+        """Charge the evaluations of a finished restart to its regime."""
+        self.budget[outcome.get("regime", "large")] += int(outcome.get("evaluations", 0))
+
+# -----------------------------------------------------------------------------
+# Restart side (worker processes or the CMA-ES thread)
+# -----------------------------------------------------------------------------
+
+def run_cmaes_restart(spec, settings, stop_event=None, report=None, evaluator=None):
+    """
+    One CMA-ES run driven through ask/tell until it stops.
+
+    Every sampled population is evaluated in one ``evaluate_many`` call. A
+    module-level function, so independent restarts can be sent to worker
+    processes, where the evaluator is built from ``settings['evaluator']``.
+
+    Parameters:
+    -----------
+    spec : dict
+        Restart settings from RestartSchedule (restart, regime, popsize,
+        sigma0) plus its seed
+    settings : dict
+        parameter_bounds, fixed_parameters, max_iter, tol, alpha,
+        percentage_error_scale, controller ('fixed', 'ml_bandit' or 'rl')
+        with its controller_options, and the Evaluator keyword arguments
+    stop_event : Event, optional
+        The run ends at the next iteration once set
+    report : callable, optional
+        Called as report(spec, iteration, best_fitness) after every iteration
+    evaluator : Evaluator, optional
+        Evaluator to use instead of building one (not closed here)
+
+    Returns:
+    --------
+    dict
+        restart, regime, popsize, sigma0, seed, best_fitness, best_candidate,
+        iterations, evaluations, stop conditions, per-iteration history
+        (the CMAESWorker metrics keys) or error
+    """
+    seed = int(spec.get("seed", 0))
+    random.seed(seed)
+    np.random.seed(seed % (2 ** 32))
+    outcome = {key: spec[key] for key in ("restart", "regime", "popsize", "sigma0") if key in spec}
+    outcome.update(seed=seed, best_fitness=float('inf'), best_candidate=None, iterations=0, evaluations=0)
+    history = {key: [] for key in ('generation_times', 'time_per_generation_breakdown', 'evaluation_times',
+                                   'fitness_history', 'mean_fitness_history', 'std_fitness_history',
+                                   'best_fitness_per_gen', 'best_individual_per_gen', 'convergence_rate',
+                                   'rates_history')}
+    outcome["history"] = history
+    owns_evaluator = evaluator is None
+    if owns_evaluator:
+        evaluator = Evaluator(**settings["evaluator"])
+    try:
+        parameter_bounds = settings["parameter_bounds"]
+        fixed_parameters = settings["fixed_parameters"]
+        # CMA-ES searches the free parameters only (cma rejects equal bounds);
+        # candidates are expanded with the fixed values before evaluation
+        free = [j for j in range(len(parameter_bounds)) if j not in fixed_parameters]
+        template = np.array([fixed_parameters.get(j, 0.0) for j in range(len(parameter_bounds))], dtype=float)
+        lower_bounds = [parameter_bounds[j][0] for j in free]
+        upper_bounds = [parameter_bounds[j][1] for j in free]
+        x0 = [random.uniform(parameter_bounds[j][0], parameter_bounds[j][1]) for j in free]
+
+        def apply_fixed(x):
+            # Full parameter vector of a candidate, with the fixed values in place.
+            full = template.copy()
+            full[free] = x
+            return full
+
+        options = {
+            'bounds': [lower_bounds, upper_bounds],
+            'maxiter': settings["max_iter"],
+            'verb_disp': 0,  # We handle our own logging
+            'tolx': settings["tol"],
+            'seed': seed % (2 ** 32) or 1,
+        }
+        if spec.get("popsize"):
+            options['popsize'] = max(2, int(spec["popsize"]))
+        es = cma.CMAEvolutionStrategy(x0, spec["sigma0"], options)
+        outcome["popsize"] = int(es.popsize)
+
+        controller = None
+        if settings.get("controller") in ('ml_bandit', 'rl'):
+            controller = SigmaController(settings["controller"], **settings.get("controller_options", {}))
+
+        while not es.stop():
+            if stop_event is not None and stop_event.is_set():
+                outcome["stopped"] = True
+                break
+            outcome["iterations"] += 1
+            iter_count = outcome["iterations"]
+            iter_start = time.time()
+            # Controller: adjust sigma
+            if controller is not None:
+                es.sigma = controller.select(float(es.sigma))
+            solutions = es.ask()
+            eval_t0 = time.time()
+            candidates = [apply_fixed(x) for x in solutions]
+            summaries = evaluator.evaluate_many(candidates)
+            fitnesses = [cmaes_fitness(x, results, settings["alpha"], settings["percentage_error_scale"])
+                         for x, results in zip(candidates, summaries)]
+            eval_time = time.time() - eval_t0
+            outcome["evaluations"] += len(solutions)
+            es.tell(solutions, fitnesses)
+
+            last_best = outcome["best_fitness"]
+            current_best = min(fitnesses)
+            if current_best < last_best:
+                outcome["best_fitness"] = float(current_best)
+                outcome["best_candidate"] = [float(v) for v in candidates[fitnesses.index(current_best)]]
+            best_fitness = outcome["best_fitness"]
+
+            # Per-iteration history
+            gen_time = time.time() - iter_start
+            history['generation_times'].append(gen_time)
+            history['time_per_generation_breakdown'].append({'total': gen_time, 'evaluation': eval_time})
+            history['evaluation_times'].append(eval_time)
+            history['fitness_history'].append([float(f) for f in fitnesses])
+            history['mean_fitness_history'].append(float(np.mean(fitnesses)))
+            history['std_fitness_history'].append(float(np.std(fitnesses)))
+            history['best_fitness_per_gen'].append(best_fitness)
+            history['best_individual_per_gen'].append(outcome["best_candidate"])
+            improvement = (last_best - best_fitness) if np.isfinite(last_best) else 0.0
+            history['convergence_rate'].append(max(0.0, improvement))
+            history['rates_history'].append({'iteration': iter_count, 'sigma': float(es.sigma), 'popsize': es.popsize})
+
+            # Controller reward
+            if controller is not None:
+                reward = improvement / max(gen_time, 1e-6)
+                controller.update(reward, improvement > 0)
+                entry = {'iteration': iter_count, 'best_fitness': best_fitness, 'reward': reward}
+                if controller.kind == 'rl':
+                    entry['epsilon'] = controller.epsilon
+                history.setdefault(f"{controller.kind.split('_')[0]}_controller_history", []).append(entry)
+
+            if report is not None:
+                report(outcome, iter_count, best_fitness)
+            if best_fitness <= settings["tol"]:
+                outcome["converged"] = True
+                break
+
+        if outcome["best_candidate"] is None and es.result.xbest is not None:
+            outcome["best_candidate"] = [float(v) for v in apply_fixed(es.result.xbest)]
+        outcome["stop"] = {str(key): str(value) for key, value in es.stop().items()}
+    except Exception as e:
+        outcome["error"] = str(e)
+    finally:
+        if owns_evaluator:
+            evaluator.close()
+    return outcome
+
+# -----------------------------------------------------------------------------
+# Result aggregation
+# -----------------------------------------------------------------------------
+
+def _per_iteration(histories, combine):
+    """Combine per-restart per-iteration lists; restarts that stopped early drop out."""
+    length = max((len(h) for h in histories), default=0)
+    return [combine([h[g] for h in histories if g < len(h)]) for g in range(length)]
+
+
+def merge_restart_histories(outcomes):
+    """
+    Merge the histories of restarts into one set of CMAESWorker metrics.
+
+    Restarts are aligned by iteration, as if they ran side by side: best
+    fitness is the minimum over restarts (each carries its best forward
+    once it has stopped), mean and spread are averaged over the restarts
+    still running, all fitness values of an iteration are pooled, and an
+    iteration lasts as long as its slowest restart. Evaluation times are
+    summed. A single restart gives back its own history.
+
+    Parameters:
+    -----------
+    outcomes : list of dict
+        Outcomes of ``run_cmaes_restart``
+
+    Returns:
+    --------
+    dict
+        Merged metrics, with 'restarts' holding one summary per restart
+    """
+    histories = [o.get("history") or {} for o in outcomes]
+
+    def history(key):
+        return [h.get(key) or [] for h in histories]
+
+    length = max((len(h) for h in history('best_fitness_per_gen')), default=0)
+    carried = [h + h[-1:] * (length - len(h)) for h in history('best_fitness_per_gen') if h]
+    individuals = [h + h[-1:] * (length - len(h)) for h in history('best_individual_per_gen') if h]
+    merged = {
+        'best_fitness_per_gen': [min(h[g] for h in carried) for g in range(length)],
+        'best_individual_per_gen': [
+            min(zip((h[g] for h in carried), (i[g] for i in individuals)), key=lambda pair: pair[0])[1]
+            for g in range(length)
+        ] if len(individuals) == len(carried) else [],
+        'mean_fitness_history': _per_iteration(history('mean_fitness_history'), lambda v: float(np.mean(v))),
+        'std_fitness_history': _per_iteration(history('std_fitness_history'), lambda v: float(np.mean(v))),
+        'fitness_history': _per_iteration(history('fitness_history'), lambda v: [f for fits in v for f in fits]),
+        'generation_times': _per_iteration(history('generation_times'), max),
+        'evaluation_times': _per_iteration(history('evaluation_times'), sum),
+    }
+    merged['time_per_generation_breakdown'] = [
+        {'total': total, 'evaluation': evaluation}
+        for total, evaluation in zip(merged['generation_times'], merged['evaluation_times'])
+    ]
+    best = merged['best_fitness_per_gen']
+    merged['convergence_rate'] = [0.0] + [max(0.0, best[g - 1] - best[g]) for g in range(1, len(best))]
+    merged['rates_history'] = [dict(entry, restart=o.get("restart", 0))
+                               for o, h in zip(outcomes, histories) for entry in h.get('rates_history', [])]
+    for key in ('ml_controller_history', 'rl_controller_history'):
+        entries = [dict(entry, restart=o.get("restart", 0))
+                   for o, h in zip(outcomes, histories) for entry in h.get(key, [])]
+        if entries:
+            merged[key] = entries
+    merged['evaluation_count'] = int(sum(o.get("evaluations", 0) for o in outcomes))
+    merged['restarts'] = [{key: o.get(key) for key in ('restart', 'regime', 'popsize', 'sigma0', 'seed',
+                                                      'best_fitness', 'iterations', 'evaluations', 'stop', 'error')}
+                          for o in outcomes]
+    finals = [o.get("best_fitness", float('inf')) for o in outcomes]
+    merged['best_restart'] = int(outcomes[int(np.argmin(finals))].get("restart", 0)) if outcomes else 0
+    return merged
+
+# -----------------------------------------------------------------------------
+# CMA-ES thread
+# -----------------------------------------------------------------------------
 
 class CMAESWorker(QThread):
+    """
+    CMA-ES on the DVA parameters, optionally with IPOP/BIPOP restarts.
+
+    Each run uses the ask/tell interface and evaluates every sampled
+    population in one call to the evaluation engine. With a restart
+    strategy, the independent restarts of the schedule (see
+    ``RestartSchedule``) run concurrently in 'spawn' worker processes,
+    ``restart_workers`` at a time, sharing the core budget with their
+    evaluation workers (see ``plan_core_budget``); they run one after
+    another in this thread if processes cannot be started. Every restart
+    has its own sigma controller, and the run stops early once a restart
+    reaches ``cma_tol``. The restart histories are merged into one set of
+    metrics (see ``merge_restart_histories``).
+    """
+
     # Emits: finished(final_results, best_candidate, parameter_names, best_fitness)
     finished = pyqtSignal(dict, list, list, float)
     error = pyqtSignal(str)
@@ -15,8 +417,9 @@ class CMAESWorker(QThread):
     progress = pyqtSignal(int)
     benchmark_data = pyqtSignal(dict)
     generation_metrics = pyqtSignal(dict)
+    restart_finished = pyqtSignal(dict)  # outcome of one restart (see run_cmaes_restart)
 
-    def __init__(self, 
+    def __init__(self,
                  main_params,
                  target_values_dict,
                  weights_dict,
@@ -24,7 +427,7 @@ class CMAESWorker(QThread):
                  omega_end,
                  omega_points,
                  cma_initial_sigma,   # Scalar: initial standard deviation for search
-                 cma_max_iter,        # Maximum number of iterations/generations
+                 cma_max_iter,        # Maximum number of iterations/generations (per restart)
                  cma_tol,             # Tolerance to stop the search
                  cma_parameter_data,  # List of tuples: (name, lower bound, upper bound, fixed flag)
                  alpha=0.01,          # Sparsity penalty factor
@@ -37,7 +440,15 @@ class CMAESWorker(QThread):
                  rl_gamma=0.9,
                  rl_epsilon=0.2,
                  rl_epsilon_decay=0.95,
-                 sigma_scale=1.0):         # base sigma scale multiplier
+                 sigma_scale=1.0,          # base sigma scale multiplier
+                 evaluation_backend="serial",  # "serial", "thread", "process" or "batch"
+                 evaluation_workers=None,
+                 restart_strategy="none",  # "none", "ipop" or "bipop"
+                 n_restarts=0,             # restarts after the first run
+                 incpopsize=2.0,           # population factor between large-population restarts
+                 restart_workers=None,     # concurrent restarts; planned from core_budget if None
+                 core_budget=None,         # cores shared by restarts and their evaluation workers
+                 seed=None):               # restart i is seeded with seed + i; random if None
         super().__init__()
         self.main_params = main_params
         self.target_values_dict = target_values_dict
@@ -61,6 +472,31 @@ class CMAESWorker(QThread):
         self.rl_epsilon = float(rl_epsilon)
         self.rl_epsilon_decay = float(rl_epsilon_decay)
         self.sigma_scale = float(sigma_scale)
+        # Restarts
+        self.restart_strategy = restart_strategy if restart_strategy in RESTART_STRATEGIES else "none"
+        self.n_restarts = max(0, int(n_restarts)) if self.restart_strategy != "none" else 0
+        self.incpopsize = float(incpopsize)
+        concurrent, workers = plan_core_budget(1 + self.n_restarts, core_budget)
+        self.restart_workers = max(1, int(restart_workers)) if restart_workers else concurrent
+        self.seed = int(seed) if seed is not None else random.SystemRandom().randrange(2 ** 31)
+        self.abort = False
+        self._stop_event = None
+        # Evaluates each sampled generation in one call on the chosen backend.
+        # Restarts in worker processes build their own from the same settings,
+        # with the core budget split between them
+        self.evaluator_kwargs = dict(
+            main_system_parameters=main_params, omega_start=omega_start, omega_end=omega_end,
+            omega_points=omega_points, target_values_dict=target_values_dict, weights_dict=weights_dict,
+            backend=evaluation_backend, n_workers=evaluation_workers,
+        )
+        if self.restart_workers > 1 and evaluation_backend in ("serial", "thread", "process"):
+            self.evaluator_kwargs.update(backend="thread" if workers > 1 else "serial", n_workers=workers)
+        self.evaluator = Evaluator(
+            main_params, omega_start, omega_end, omega_points, target_values_dict, weights_dict,
+            backend=evaluation_backend, n_workers=evaluation_workers,
+        )
+        self.outcomes = []
+        self._retry = []
 
         self.metrics = {
             'start_time': None,
@@ -89,6 +525,15 @@ class CMAESWorker(QThread):
         self._metrics_interval = 500
         self._watchdog = QTimer(); self._watchdog.setSingleShot(True); self._watchdog.timeout.connect(self._handle_timeout)
 
+    def stop(self):
+        """Stop the running restarts at their next iteration; queued restarts never start."""
+        self.abort = True
+        if self._stop_event is not None:
+            try:
+                self._stop_event.set()
+            except (OSError, EOFError):
+                pass
+
     def run(self):
         try:
             # Controller descriptor
@@ -125,194 +570,48 @@ class CMAESWorker(QThread):
                     parameter_bounds.append((low, high))
             num_params = len(parameter_bounds)
 
-            # Build initial candidate x0.
-            x0 = []
-            for j in range(num_params):
-                low, high = parameter_bounds[j]
-                if j in fixed_parameters:
-                    x0.append(fixed_parameters[j])
-                else:
-                    x0.append(random.uniform(low, high))
-
             # Use provided cma_initial_sigma as the initial standard deviation (scaled).
             sigma0 = self.cma_initial_sigma * max(1e-6, self.sigma_scale)
-
-            # Build lower and upper bound arrays.
-            lower_bounds = [lb for lb, ub in parameter_bounds]
-            upper_bounds = [ub for lb, ub in parameter_bounds]
-
-            # Define the objective function.
-            def objective(x):
-                # For dimensions with fixed values, force them.
-                for idx, fixed_val in fixed_parameters.items():
-                    x[idx] = fixed_val
-                try:
-                    results = frf(
-                        main_system_parameters=self.main_params,
-                        dva_parameters=tuple(x),
-                        omega_start=self.omega_start,
-                        omega_end=self.omega_end,
-                        omega_points=self.omega_points,
-                        target_values_mass1=self.target_values_dict['mass_1'],
-                        weights_mass1=self.weights_dict['mass_1'],
-                        target_values_mass2=self.target_values_dict['mass_2'],
-                        weights_mass2=self.weights_dict['mass_2'],
-                        target_values_mass3=self.target_values_dict['mass_3'],
-                        weights_mass3=self.weights_dict['mass_3'],
-                        target_values_mass4=self.target_values_dict['mass_4'],
-                        weights_mass4=self.weights_dict['mass_4'],
-                        target_values_mass5=self.target_values_dict['mass_5'],
-                        weights_mass5=self.weights_dict['mass_5'],
-                        plot_figure=False,
-                        show_peaks=False,
-                        show_slopes=False
-                    )
-                    singular_response = results.get('singular_response', None)
-                    if singular_response is None or not np.isfinite(singular_response):
-                        return 1e6
-                    else:
-                        primary_objective = abs(singular_response - 1)
-                        sparsity_penalty = self.alpha * sum(abs(xi) for xi in x)
-                        # Percentage error component to match GA
-                        percentage_error_sum = 0.0
-                        if "percentage_differences" in results:
-                            for mass_key, pdiffs in results["percentage_differences"].items():
-                                for criterion, percent_diff in pdiffs.items():
-                                    percentage_error_sum += abs(percent_diff)
-                        return primary_objective + sparsity_penalty + percentage_error_sum / self.percentage_error_scale
-                except Exception:
-                    return 1e6
-
-            # Set up options for CMA-ES, including bounds.
-            options = {
-                'bounds': [lower_bounds, upper_bounds],
-                'maxiter': self.cma_max_iter,
-                'verb_disp': 0,  # We handle our own logging
-                'tolx': self.cma_tol
+            settings = {
+                'parameter_bounds': parameter_bounds,
+                'fixed_parameters': fixed_parameters,
+                'max_iter': self.cma_max_iter,
+                'tol': self.cma_tol,
+                'alpha': self.alpha,
+                'percentage_error_scale': self.percentage_error_scale,
+                'controller': self.metrics['controller'],
+                'controller_options': dict(ucb_c=self.ml_ucb_c, rl_alpha=self.rl_alpha, rl_gamma=self.rl_gamma,
+                                           rl_epsilon=self.rl_epsilon, rl_epsilon_decay=self.rl_epsilon_decay),
+                'evaluator': self.evaluator_kwargs,
             }
-            es = cma.CMAEvolutionStrategy(x0, sigma0, options)
-
-            iter_count = 0
-            best_fitness = float('inf')
-            best_candidate = None
-
-            # CMA-ES main loop.
-            # Optional ML/RL controller setup to modulate sigma
-            if self.use_ml_adaptive:
-                deltas = [-0.5, -0.25, 0.0, 0.25, 0.5]
-                ml_actions = [d for d in deltas]
-                ml_counts = [0 for _ in ml_actions]
-                ml_sums = [0.0 for _ in ml_actions]
-                ml_t = 0
-                def ml_select(cur_sigma):
-                    nonlocal ml_t
-                    ml_t += 1
-                    scores = []
-                    for i in range(len(ml_actions)):
-                        if ml_counts[i] == 0:
-                            scores.append((float('inf'), i))
-                        else:
-                            avg = ml_sums[i] / ml_counts[i]
-                            bonus = self.ml_ucb_c * np.sqrt(np.log(max(ml_t, 1)) / ml_counts[i])
-                            scores.append((avg + bonus, i))
-                    scores.sort(key=lambda t: t[0], reverse=True)
-                    _, idx = scores[0]
-                    d = ml_actions[idx]
-                    new_sigma = max(1e-8, cur_sigma * (1.0 + d))
-                    return idx, new_sigma
-                def ml_update(idx, reward):
-                    ml_counts[idx] += 1
-                    ml_sums[idx] += float(reward)
-            if self.use_rl_controller:
-                deltas = [-0.5, -0.25, 0.0, 0.25, 0.5]
-                rl_actions = [d for d in deltas]
-                rl_q = {0: [0.0 for _ in rl_actions], 1: [0.0 for _ in rl_actions]}
-                rl_state = 0
-                def rl_select(cur_sigma):
-                    if random.random() < self.rl_epsilon:
-                        idx = random.randrange(len(rl_actions))
-                    else:
-                        values = rl_q[rl_state]
-                        idx = int(np.argmax(values)) if values else 0
-                    d = rl_actions[idx]
-                    new_sigma = max(1e-8, cur_sigma * (1.0 + d))
-                    return idx, new_sigma
-                def rl_update(state, action_idx, reward, next_state):
-                    q_old = rl_q[state][action_idx]
-                    q_next = max(rl_q[next_state]) if rl_q[next_state] else 0.0
-                    rl_q[state][action_idx] = q_old + self.rl_alpha * (reward + self.rl_gamma * q_next - q_old)
-
-            while not es.stop():
-                iter_count += 1
-                iter_start = time.time()
-                try:
-                    self.progress.emit(int(min(100, (iter_count / max(1, self.cma_max_iter)) * 100)))
-                except Exception:
-                    pass
-                # Controller: adjust sigma if possible
-                if hasattr(es, 'sigma'):
-                    try:
-                        cur_sigma = float(es.sigma)
-                        if self.use_ml_adaptive:
-                            ml_idx, new_sigma = ml_select(cur_sigma)
-                            es.sigma = new_sigma
-                        elif self.use_rl_controller:
-                            rl_idx, new_sigma = rl_select(cur_sigma)
-                            es.sigma = new_sigma
-                    except Exception:
-                        pass
-                solutions = es.ask()
-                eval_t0 = time.time()
-                fitnesses = [objective(x) for x in solutions]
-                eval_time = time.time() - eval_t0
-                es.tell(solutions, fitnesses)
-                current_best = min(fitnesses)
-                if current_best < best_fitness:
-                    best_fitness = current_best
-                    best_candidate = solutions[fitnesses.index(current_best)]
-                self.update.emit(f"Iteration {iter_count}: Best fitness = {best_fitness:.6f}")
-                if best_fitness <= self.cma_tol:
-                    self.update.emit(f"[INFO] Convergence reached at iteration {iter_count}")
-                    break
-
-                # Metrics per generation
-                if self.track_metrics:
-                    gen_time = time.time() - iter_start
-                    self.metrics['generation_times'].append(gen_time)
-                    self.metrics['time_per_generation_breakdown'].append({'total': gen_time, 'evaluation': eval_time})
-                    self.metrics['evaluation_times'].append(eval_time)
-                    self.metrics['fitness_history'].append(fitnesses[:])
-                    self.metrics['mean_fitness_history'].append(float(np.mean(fitnesses)))
-                    self.metrics['std_fitness_history'].append(float(np.std(fitnesses)))
-                    self.metrics['best_fitness_per_gen'].append(best_fitness)
-                    if hasattr(es, 'sigma'):
-                        try:
-                            self.metrics['rates_history'].append({'iteration': iter_count, 'sigma': float(es.sigma), 'popsize': getattr(es, 'popsize', None)})
-                        except Exception:
-                            self.metrics['rates_history'].append({'iteration': iter_count, 'sigma': None, 'popsize': getattr(es, 'popsize', None)})
-                    # Controller reward
-                    if self.use_ml_adaptive or self.use_rl_controller:
-                        last_best = self.metrics['best_fitness_per_gen'][-2] if len(self.metrics['best_fitness_per_gen']) > 1 else None
-                        imp = (last_best - best_fitness) if (last_best is not None and last_best > best_fitness) else 0.0
-                        reward = (imp / max(gen_time, 1e-6))
-                        if self.use_ml_adaptive:
-                            try:
-                                ml_update(ml_idx, reward)
-                            except Exception:
-                                pass
-                            self.metrics.setdefault('ml_controller_history', []).append({'iteration': iter_count, 'best_fitness': best_fitness, 'reward': reward})
-                        elif self.use_rl_controller:
-                            try:
-                                next_state = 1 if imp > 0 else 0
-                                rl_update(rl_state, rl_idx, reward, next_state)
-                                rl_state = next_state
-                                self.rl_epsilon *= self.rl_epsilon_decay
-                            except Exception:
-                                pass
-                            self.metrics.setdefault('rl_controller_history', []).append({'iteration': iter_count, 'best_fitness': best_fitness, 'reward': reward, 'epsilon': self.rl_epsilon})
-
-            if best_candidate is None:
-                best_candidate = es.result.xbest
+            schedule = RestartSchedule(self.restart_strategy, self.n_restarts, num_params - len(fixed_parameters), sigma0,
+                                       self.incpopsize, random.Random(self.seed))
+            if len(schedule) > 1:
+                self.update.emit(
+                    f"Running CMA-ES with {self.restart_strategy.upper()} restarts: {len(schedule)} runs, "
+                    f"{self.restart_workers} at a time"
+                )
+
+            self.outcomes = []
+            self._retry = []
+            self.progress.emit(0)
+            if self.restart_workers > 1 and len(schedule) > 1:
+                self._run_in_processes(schedule, settings)
+            self._run_in_thread(schedule, settings)
+            if not self.outcomes:
+                raise RuntimeError("CMA-ES stopped before completing an iteration")
+            errors = [o for o in self.outcomes if o.get("error")]
+            successful = [o for o in self.outcomes if not o.get("error") and o.get("best_candidate") is not None]
+            if not successful:
+                raise RuntimeError("; ".join(o["error"] for o in errors) or "CMA-ES produced no candidate")
+            for o in errors:
+                self.update.emit(f"Warning: CMA-ES restart {o.get('restart', 0) + 1} failed: {o['error']}")
+            best = min(successful, key=lambda o: o["best_fitness"])
+            best_candidate = best["best_candidate"]
+            best_fitness = float(best["best_fitness"])
+            if len(schedule) > 1:
+                self.update.emit(f"CMA-ES finished: best fitness {best_fitness:.6f} from restart "
+                                 f"{best['restart'] + 1} (population {best['popsize']})")
 
             # Final evaluation using the best candidate.
             try:
@@ -340,6 +639,11 @@ class CMAESWorker(QThread):
                 final_results = {"Error": str(e)}
 
             if self.track_metrics:
+                self.metrics.update(merge_restart_histories(self.outcomes))
+                self.metrics['restart_strategy'] = {
+                    'strategy': self.restart_strategy, 'n_restarts': self.n_restarts,
+                    'incpopsize': self.incpopsize, 'restart_workers': self.restart_workers, 'seed': self.seed,
+                }
                 self._stop_metrics_tracking()
                 if not self.metrics.get('system_info'):
                     self.metrics['system_info'] = self._get_system_info()
@@ -349,6 +653,7 @@ class CMAESWorker(QThread):
                     self.benchmark_data.emit(self.metrics)
                 except Exception:
                     pass
+            self.progress.emit(100)
             self.finished.emit(final_results, best_candidate, parameter_names, best_fitness)
 
         except Exception as e:
@@ -359,6 +664,112 @@ class CMAESWorker(QThread):
                     self._watchdog.stop()
             except Exception:
                 pass
+            self.evaluator.close()
+
+    # ------------------------------------------------------------------
+    # Restart execution
+    # ------------------------------------------------------------------
+    def _next_restart(self, schedule):
+        """Next restart of the schedule with its seed, or None when done, stopped or converged."""
+        if self.abort or any(o.get("converged") for o in self.outcomes):
+            return None
+        if self._retry:
+            return self._retry.pop(0)
+        spec = schedule.next_restart()
+        if spec is not None:
+            spec["seed"] = self.seed + spec["restart"]
+        return spec
+
+    def _record(self, schedule, outcome):
+        schedule.record(outcome)
+        self.outcomes.append(outcome)
+        if len(schedule) > 1:
+            self.update.emit(
+                f"Restart {outcome['restart'] + 1}/{len(schedule)} ({outcome.get('regime', 'large')} regime, "
+                f"population {outcome.get('popsize')}): best fitness {outcome['best_fitness']:.6f} "
+                f"after {outcome['iterations']} iterations"
+            )
+            self.progress.emit(min(99, int(len(self.outcomes) * 100 / len(schedule))))
+        self.restart_finished.emit(outcome)
+
+    def _run_in_thread(self, schedule, settings):
+        """Run the restarts still to schedule one after another with this worker's evaluator."""
+        self._stop_event = threading.Event()
+        if self.abort:
+            self._stop_event.set()
+        n_runs = len(schedule)
+
+        def report(outcome, iteration, best_fitness):
+            done = len(self.outcomes) + min(1.0, iteration / max(1, self.cma_max_iter))
+            self.progress.emit(int(min(100, done * 100 / n_runs)))
+            prefix = f"Restart {outcome['restart'] + 1}, iteration" if n_runs > 1 else "Iteration"
+            self.update.emit(f"{prefix} {iteration}: Best fitness = {best_fitness:.6f}")
+
+        try:
+            while True:
+                spec = self._next_restart(schedule)
+                if spec is None:
+                    return
+                outcome = run_cmaes_restart(spec, settings, self._stop_event, report, self.evaluator)
+                if outcome.get("converged"):
+                    self.update.emit(f"[INFO] Convergence reached at iteration {outcome['iterations']}")
+                self._record(schedule, outcome)
+        finally:
+            self._stop_event = None
+
+    def _run_in_processes(self, schedule, settings):
+        """Run restarts in worker processes until the schedule is done or the pool fails."""
+        context = multiprocessing.get_context("spawn")
+        try:
+            manager = context.Manager()
+        except POOL_ERRORS as e:
+            self.update.emit(f"Warning: restart processes unavailable ({e}); running restarts sequentially")
+            return
+        executor = None
+        running = {}
+        submitting = None
+        try:
+            self._stop_event = manager.Event()
+            if self.abort:
+                self._stop_event.set()
+            executor = ProcessPoolExecutor(max_workers=self.restart_workers, mp_context=context)
+            while True:
+                # Keep every slot busy; BIPOP picks the regime of each new
+                # restart from the budgets of the finished ones
+                while len(running) < self.restart_workers:
+                    submitting = self._next_restart(schedule)
+                    if submitting is None:
+                        break
+                    running[executor.submit(run_cmaes_restart, submitting, settings, self._stop_event)] = submitting
+                    submitting = None
+                if not running:
+                    return
+                done, _ = wait(running, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    spec = running.pop(future)
+                    try:
+                        outcome = future.result()
+                    except POOL_ERRORS as e:
+                        # Lost the worker processes: the unfinished restarts are scheduled again
+                        self.update.emit(f"Warning: restart processes failed ({e}); running restarts sequentially")
+                        self._retry = sorted([spec] + list(running.values()), key=lambda s: s["restart"])
+                        for f in running:
+                            f.cancel()
+                        return
+                    if outcome.get("converged"):
+                        self._stop_event.set()
+                    self._record(schedule, outcome)
+        except POOL_ERRORS as e:
+            # The pool broke while submitting or waiting: the restart being
+            # submitted and the running ones are scheduled again
+            self.update.emit(f"Warning: restart processes unavailable ({e}); running restarts sequentially")
+            unfinished = list(running.values()) + ([submitting] if submitting is not None else [])
+            self._retry = sorted(unfinished + self._retry, key=lambda s: s["restart"])
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+            self._stop_event = None
+            manager.shutdown()
 
     # Metrics helpers
     def _get_system_info(self):
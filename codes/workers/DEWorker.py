@@ -16,6 +16,7 @@ import psutil
 
 # Local imports
 from modules.FRF import frf
+from modules.evaluator import Evaluator
 from modules.sobol_sensitivity import (
     perform_sobol_analysis
 )
@@ -80,6 +81,30 @@ class MultiRunStatistics:
         self.run_execution_times = []
         self.parameter_distributions = {}
 
+def de_fitness(individual, results, alpha, beta):
+    """
+    DE fitness of an individual from its FRF summary: |singular response - 1|
+    plus the sparsity (alpha) and smoothness (beta) penalties; 1e6 for failed
+    evaluations. A module-level function of plain values, so it can be
+    pickled to and run in worker processes.
+    """
+    if not isinstance(results, dict) or "error" in results:
+        return 1e6
+    singular_response = results.get('singular_response', None)
+    if singular_response is None or not np.isfinite(singular_response):
+        return 1e6
+    primary_objective = abs(singular_response - 1)
+    sparsity_penalty = alpha * sum(abs(x) for x in individual)
+    
+    # Smoothness penalty (parameter differences)
+    smoothness_penalty = 0
+    if beta > 0 and len(individual) > 1:
+        for i in range(len(individual) - 1):
+            smoothness_penalty += abs(individual[i+1] - individual[i])
+        smoothness_penalty *= beta
+    
+    return primary_objective + sparsity_penalty + smoothness_penalty
+
 class DEWorker(QThread):
     # Signals: finished(dict, best_individual, parameter_names, best_fitness, statistics), error(str), update(str)
     finished = pyqtSignal(dict, list, list, float, object)
@@ -129,7 +154,10 @@ class DEWorker(QThread):
                  rl_alpha=0.1,
                  rl_gamma=0.9,
                  rl_epsilon=0.2,
-                 rl_epsilon_decay=0.95):        # Number of independent runs
+                 rl_epsilon_decay=0.95,
+                 evaluation_backend=None,   # "serial", "thread", "process" or "batch"
+                 evaluation_workers=None,
+                 evaluator=None):           # Shared Evaluator (e.g. of tune_hyperparameters); not closed here
         super().__init__()
         
         # Initialize base parameters
@@ -161,6 +189,17 @@ class DEWorker(QThread):
         # Computational settings
         self.use_parallel = use_parallel
         self.n_processes = n_processes or max(1, mp.cpu_count() - 1)
+        # Populations and trial vectors are evaluated through the shared
+        # evaluation engine; use_parallel selects its process backend. Its
+        # worker processes start on first use and persist across the runs of
+        # _run_multiple until run() ends.
+        if evaluation_backend is None:
+            evaluation_backend = "process" if use_parallel else "serial"
+        self._owns_evaluator = evaluator is None
+        self.evaluator = evaluator if evaluator is not None else Evaluator(
+            main_params, omega_start, omega_end, omega_points, target_values_dict, weights_dict,
+            backend=evaluation_backend, n_workers=evaluation_workers or self.n_processes,
+        )
         
         # Set random seed for reproducibility if provided
         self.base_seed = seed
@@ -179,7 +218,6 @@ class DEWorker(QThread):
         
         # Runtime variables
         self.should_stop = False
-        self.pool = None
 
         # Metrics and controllers (GA/PSO parity)
         self.track_metrics = bool(track_metrics)
@@ -266,10 +304,9 @@ class DEWorker(QThread):
                 self._run_single()
         except Exception as e:
             self.error.emit(f"Error in DE optimization: {str(e)}")
-            if self.pool:
-                self.pool.close()
-                self.pool.join()
         finally:
+            if self._owns_evaluator:
+                self.evaluator.close()
             try:
                 if self._watchdog.isActive():
                     self._watchdog.stop()
@@ -343,10 +380,9 @@ class DEWorker(QThread):
                 parameter_bounds.append((low, high))
         num_params = len(parameter_bounds)
         
-        # Setup parallel processing if enabled
-        if self.use_parallel:
-            self.pool = mp.Pool(processes=self.n_processes)
-            self.update.emit(f"[INFO] Running with {self.n_processes} parallel processes")
+        if self.evaluator.backend != "serial":
+            self.update.emit(f"[INFO] Evaluating with the '{self.evaluator.backend}' backend "
+                             f"({self.evaluator.n_workers} workers)")
         
         # Initialize adaptive parameters if using an adaptive method
         self._initialize_adaptive_parameters(num_params)
@@ -355,10 +391,7 @@ class DEWorker(QThread):
         population = self._initialize_population(parameter_bounds, fixed_parameters, num_params)
         
         # Evaluate initial population
-        if self.use_parallel:
-            fitnesses = self._evaluate_population_parallel(population)
-        else:
-            fitnesses = [self.evaluate_individual(ind) for ind in population]
+        fitnesses = self.evaluate_population(population)
         
         # Identify global best
         best_idx = np.argmin(fitnesses)
@@ -489,59 +522,53 @@ class DEWorker(QThread):
                         population = resize_population(population, newPop, parameter_bounds, fixed_parameters)
                         # Recompute fitnesses for new individuals
                         if len(fitnesses) != len(population):
-                            fitnesses = [self.evaluate_individual(ind) for ind in population]
+                            fitnesses = self.evaluate_population(population)
                 elif self.use_rl_controller:
                     rl_idx, newF, newCR, newPop = rl_select(self.de_F, self.de_CR, len(population))
                     self.de_F, self.de_CR = newF, newCR
                     if newPop != len(population):
                         population = rl_resize_population(population, newPop, parameter_bounds, fixed_parameters)
                         if len(fitnesses) != len(population):
-                            fitnesses = [self.evaluate_individual(ind) for ind in population]
+                            fitnesses = self.evaluate_population(population)
 
-            # Create new generation
-            new_population = []
-            new_fitnesses = []
-            successful_mutations = 0
-            
             mut_time_acc = 0.0
             cross_time_acc = 0.0
             eval_time_acc = 0.0
 
-            for i in range(self.de_pop_size):
-                target = population[i]
-                
-                # Apply DE strategy to create donor vector
-                _t0 = time.time()
-                trial = self._apply_de_strategy(i, population, global_best, fitnesses, parameter_bounds, fixed_parameters, num_params)
-                mut_time_acc += (time.time() - _t0)
-                
-                # Evaluate trial vector
-                _t1 = time.time()
-                trial_fitness = self.evaluate_individual(trial)
-                eval_time_acc += (time.time() - _t1)
-                
-                # Selection: if trial is better, it replaces target
-                if trial_fitness < fitnesses[i]:
-                    new_population.append(trial)
-                    new_fitnesses.append(trial_fitness)
-                    successful_mutations += 1
-                    
-                    # Update global best if necessary
-                    if trial_fitness < best_fitness:
-                        global_best = trial.copy()
-                        best_fitness = trial_fitness
-                        no_improvement_count = 0
-                    else:
-                        no_improvement_count += 1
-                else:
-                    new_population.append(target)
-                    new_fitnesses.append(fitnesses[i])
-            
-            population = new_population
-            fitnesses = new_fitnesses
+            # Apply DE strategy to create the trial vectors of the whole
+            # generation at once, relative to the best of the previous generation
+            _t0 = time.time()
+            trials, gen_F, gen_CR = self._generate_trials(population, global_best, parameter_bounds, fixed_parameters)
+            mut_time_acc += (time.time() - _t0)
+
+            # Evaluate all trial vectors in one call to the evaluation engine
+            _t1 = time.time()
+            trial_fitnesses = self.evaluate_population(trials)
+            eval_time_acc += (time.time() - _t1)
+
+            # Selection: every trial that is better replaces its target
+            pop_array, fit_array, improved = self._select(population, fitnesses, trials, trial_fitnesses)
+            self._record_successful_parameters(gen_F, gen_CR, improved)
+            successful_mutations = int(np.count_nonzero(improved))
+
+            # Successful trials that did not improve on the best so far (in
+            # population order) count towards stagnation
+            success_fitnesses = fit_array[improved]
+            best_before = np.minimum.accumulate(np.concatenate(([best_fitness], success_fitnesses)))[:-1]
+            new_bests = np.flatnonzero(success_fitnesses < best_before)
+            if new_bests.size:
+                no_improvement_count = successful_mutations - 1 - int(new_bests[-1])
+                best_idx = int(np.argmin(fit_array))
+                global_best = pop_array[best_idx].tolist()
+                best_fitness = float(fit_array[best_idx])
+            else:
+                no_improvement_count += successful_mutations
+
+            population = pop_array.tolist()
+            fitnesses = fit_array.tolist()
             
             # Calculate success rate for this generation
-            success_rate = successful_mutations / self.de_pop_size
+            success_rate = successful_mutations / len(population)
             
             # Apply diversity preservation if enabled
             if self.diversity_preservation:
@@ -636,11 +663,6 @@ class DEWorker(QThread):
                             'epsilon': self.rl_epsilon
                         })
 
-        # Cleanup
-        if self.pool:
-            self.pool.close()
-            self.pool.join()
-        
         if return_convergence:
             return global_best, best_fitness, convergence_gen
         else:
@@ -845,48 +867,18 @@ class DEWorker(QThread):
         
         return results
 
-    def evaluate_individual(self, individual):
+    def evaluate_individual(self, individual, results=None):
         """
         Evaluate the fitness of an individual (candidate DVA parameters)
         using the FRF function. The fitness is defined as the absolute difference 
         between the singular response and 1 plus a sparsity penalty and smoothness penalty.
+        FRF summaries already computed by ``evaluate_population`` are passed in
+        as ``results``.
         """
         try:
-            results = frf(
-                main_system_parameters=self.main_params,
-                dva_parameters=tuple(individual),
-                omega_start=self.omega_start,
-                omega_end=self.omega_end,
-                omega_points=self.omega_points,
-                target_values_mass1=self.target_values_dict['mass_1'],
-                weights_mass1=self.weights_dict['mass_1'],
-                target_values_mass2=self.target_values_dict['mass_2'],
-                weights_mass2=self.weights_dict['mass_2'],
-                target_values_mass3=self.target_values_dict['mass_3'],
-                weights_mass3=self.weights_dict['mass_3'],
-                target_values_mass4=self.target_values_dict['mass_4'],
-                weights_mass4=self.weights_dict['mass_4'],
-                target_values_mass5=self.target_values_dict['mass_5'],
-                weights_mass5=self.weights_dict['mass_5'],
-                plot_figure=False,
-                show_peaks=False,
-                show_slopes=False
-            )
-            singular_response = results.get('singular_response', None)
-            if singular_response is None or not np.isfinite(singular_response):
-                return 1e6
-            else:
-                primary_objective = abs(singular_response - 1)
-                sparsity_penalty = self.alpha * sum(abs(x) for x in individual)
-                
-                # Smoothness penalty (parameter differences)
-                smoothness_penalty = 0
-                if self.beta > 0 and len(individual) > 1:
-                    for i in range(len(individual) - 1):
-                        smoothness_penalty += abs(individual[i+1] - individual[i])
-                    smoothness_penalty *= self.beta
-                
-                return primary_objective + sparsity_penalty + smoothness_penalty
+            if results is None:
+                results = self.evaluator.evaluate(individual)
+            return de_fitness(individual, results, self.alpha, self.beta)
         except Exception:
             return 1e6
 
@@ -945,187 +937,137 @@ class DEWorker(QThread):
                 
         return population
 
-    def _evaluate_population_parallel(self, population):
-        """Evaluate population in parallel"""
-        return self.pool.map(self.evaluate_individual, population)
+    def evaluate_population(self, population):
+        """Evaluate a population, with the FRF stage run by the evaluation engine in one call"""
+        summaries = self.evaluator.evaluate_many(population)
+        return [self.evaluate_individual(ind, results) for ind, results in zip(population, summaries)]
 
-    def _apply_de_strategy(self, i, population, global_best, fitnesses, parameter_bounds, fixed_parameters, num_params):
-        """Apply the selected DE strategy to create a trial vector"""
-        target = population[i]
-        
-        # Get current F and CR values (may be adapted)
-        F = self._get_current_F(i)
-        CR = self._get_current_CR(i)
-        
-        # Select indices for mutation (excluding current index i)
-        idxs = list(range(self.de_pop_size))
-        idxs.remove(i)
-        
-        # Apply different mutation strategies
-        if self.strategy == DEStrategy.RAND_1:
+    # Number of distinct random population members each strategy draws
+    _STRATEGY_DRAWS = {
+        DEStrategy.RAND_1: 3,
+        DEStrategy.RAND_2: 5,
+        DEStrategy.BEST_1: 2,
+        DEStrategy.BEST_2: 4,
+        DEStrategy.CURRENT_TO_BEST_1: 2,
+        DEStrategy.CURRENT_TO_RAND_1: 3,
+    }
+
+    def _generate_trials(self, population, global_best, parameter_bounds, fixed_parameters):
+        """
+        Create the trial vectors of a whole generation with the selected DE strategy.
+
+        Mutation, binomial crossover and bounds handling are applied to the
+        population matrix at once; every target vector gets its own F and CR
+        (see ``_get_control_parameters``).
+
+        Parameters:
+        -----------
+        population : array-like
+            Current population, one individual per row
+        global_best : array-like
+            Best individual found so far
+        parameter_bounds : list
+            (low, high) of every parameter
+        fixed_parameters : dict
+            Index -> value of the fixed parameters
+
+        Returns:
+        --------
+        tuple
+            (trials, F, CR): the (size, num_params) trial matrix and the
+            per-individual F and CR arrays used to create it
+        """
+        population = np.asarray(population, dtype=float)
+        size = len(population)
+        F, CR = self._get_control_parameters(size)
+
+        donors = self._create_donors(population, np.asarray(global_best, dtype=float), F)
+        trials = self._apply_crossover(population, donors, CR)
+        trials = self._handle_constraints(trials, parameter_bounds)
+        if fixed_parameters:
+            fixed_idx = list(fixed_parameters)
+            trials[:, fixed_idx] = [fixed_parameters[j] for j in fixed_idx]
+        return trials, F, CR
+
+    def _mutation_indices(self, size, count):
+        """(size, count) random population indices, distinct in every row and never the row itself"""
+        if size - 1 < count:
+            raise ValueError(f"DE/{self.strategy.value} needs a population of at least {count + 1} individuals")
+        keys = np.random.random((size, size))
+        keys[np.arange(size), np.arange(size)] = np.inf
+        picked = np.argpartition(keys, count - 1, axis=1)[:, :count]
+        # argpartition leaves the picked indices in no particular order: shuffle them by key
+        order = np.argsort(np.take_along_axis(keys, picked, axis=1), axis=1)
+        return np.take_along_axis(picked, order, axis=1)
+
+    def _create_donors(self, population, global_best, F):
+        """Donor vectors of all target vectors for the selected strategy"""
+        size = len(population)
+        strategy = self.strategy if self.strategy in self._STRATEGY_DRAWS else DEStrategy.RAND_1
+        r = self._mutation_indices(size, self._STRATEGY_DRAWS[strategy])
+        x = [population[r[:, k]] for k in range(r.shape[1])]
+        F = F[:, np.newaxis]
+
+        if strategy == DEStrategy.RAND_1:
             # DE/rand/1: v = x_r1 + F*(x_r2 - x_r3)
-            r1, r2, r3 = random.sample(idxs, 3)
-            x_r1, x_r2, x_r3 = population[r1], population[r2], population[r3]
-            donor = self._create_donor_rand_1(x_r1, x_r2, x_r3, F, parameter_bounds, fixed_parameters, num_params)
-            
-        elif self.strategy == DEStrategy.RAND_2:
+            return x[0] + F * (x[1] - x[2])
+        if strategy == DEStrategy.RAND_2:
             # DE/rand/2: v = x_r1 + F*(x_r2 - x_r3 + x_r4 - x_r5)
-            r1, r2, r3, r4, r5 = random.sample(idxs, 5)
-            x_r1, x_r2, x_r3 = population[r1], population[r2], population[r3]
-            x_r4, x_r5 = population[r4], population[r5]
-            donor = self._create_donor_rand_2(x_r1, x_r2, x_r3, x_r4, x_r5, F, parameter_bounds, fixed_parameters, num_params)
-            
-        elif self.strategy == DEStrategy.BEST_1:
+            return x[0] + F * (x[1] - x[2] + x[3] - x[4])
+        if strategy == DEStrategy.BEST_1:
             # DE/best/1: v = x_best + F*(x_r1 - x_r2)
-            r1, r2 = random.sample(idxs, 2)
-            x_r1, x_r2 = population[r1], population[r2]
-            donor = self._create_donor_best_1(global_best, x_r1, x_r2, F, parameter_bounds, fixed_parameters, num_params)
-            
-        elif self.strategy == DEStrategy.BEST_2:
+            return global_best + F * (x[0] - x[1])
+        if strategy == DEStrategy.BEST_2:
             # DE/best/2: v = x_best + F*(x_r1 - x_r2 + x_r3 - x_r4)
-            r1, r2, r3, r4 = random.sample(idxs, 4)
-            x_r1, x_r2 = population[r1], population[r2]
-            x_r3, x_r4 = population[r3], population[r4]
-            donor = self._create_donor_best_2(global_best, x_r1, x_r2, x_r3, x_r4, F, parameter_bounds, fixed_parameters, num_params)
-            
-        elif self.strategy == DEStrategy.CURRENT_TO_BEST_1:
+            return global_best + F * (x[0] - x[1] + x[2] - x[3])
+        if strategy == DEStrategy.CURRENT_TO_BEST_1:
             # DE/current-to-best/1: v = x_i + F*(x_best - x_i) + F*(x_r1 - x_r2)
-            r1, r2 = random.sample(idxs, 2)
-            x_r1, x_r2 = population[r1], population[r2]
-            donor = self._create_donor_current_to_best_1(target, global_best, x_r1, x_r2, F, parameter_bounds, fixed_parameters, num_params)
-            
-        elif self.strategy == DEStrategy.CURRENT_TO_RAND_1:
-            # DE/current-to-rand/1: v = x_i + K*(x_r1 - x_i) + F*(x_r2 - x_r3)
-            r1, r2, r3 = random.sample(idxs, 3)
-            x_r1, x_r2, x_r3 = population[r1], population[r2], population[r3]
-            K = random.random()  # Random value between 0 and 1
-            donor = self._create_donor_current_to_rand_1(target, x_r1, x_r2, x_r3, K, F, parameter_bounds, fixed_parameters, num_params)
-        
-        else:
-            # Default to DE/rand/1 if strategy not recognized
-            r1, r2, r3 = random.sample(idxs, 3)
-            x_r1, x_r2, x_r3 = population[r1], population[r2], population[r3]
-            donor = self._create_donor_rand_1(x_r1, x_r2, x_r3, F, parameter_bounds, fixed_parameters, num_params)
-        
-        # Crossover: create trial vector
-        trial = self._apply_crossover(target, donor, CR, fixed_parameters, num_params)
-        
-        # Handle constraints if needed
-        trial = self._handle_constraints(trial, parameter_bounds)
-        
-        return trial
-
-    def _create_donor_rand_1(self, x_r1, x_r2, x_r3, F, parameter_bounds, fixed_parameters, num_params):
-        """Create donor vector using DE/rand/1 strategy"""
-        donor = []
-        for j in range(num_params):
-            if j in fixed_parameters:
-                donor.append(fixed_parameters[j])
-            else:
-                mutated_val = x_r1[j] + F * (x_r2[j] - x_r3[j])
-                donor.append(mutated_val)
-        return donor
-
-    def _create_donor_rand_2(self, x_r1, x_r2, x_r3, x_r4, x_r5, F, parameter_bounds, fixed_parameters, num_params):
-        """Create donor vector using DE/rand/2 strategy"""
-        donor = []
-        for j in range(num_params):
-            if j in fixed_parameters:
-                donor.append(fixed_parameters[j])
-            else:
-                mutated_val = x_r1[j] + F * (x_r2[j] - x_r3[j] + x_r4[j] - x_r5[j])
-                donor.append(mutated_val)
-        return donor
-
-    def _create_donor_best_1(self, x_best, x_r1, x_r2, F, parameter_bounds, fixed_parameters, num_params):
-        """Create donor vector using DE/best/1 strategy"""
-        donor = []
-        for j in range(num_params):
-            if j in fixed_parameters:
-                donor.append(fixed_parameters[j])
-            else:
-                mutated_val = x_best[j] + F * (x_r1[j] - x_r2[j])
-                donor.append(mutated_val)
-        return donor
-
-    def _create_donor_best_2(self, x_best, x_r1, x_r2, x_r3, x_r4, F, parameter_bounds, fixed_parameters, num_params):
-        """Create donor vector using DE/best/2 strategy"""
-        donor = []
-        for j in range(num_params):
-            if j in fixed_parameters:
-                donor.append(fixed_parameters[j])
-            else:
-                mutated_val = x_best[j] + F * (x_r1[j] - x_r2[j] + x_r3[j] - x_r4[j])
-                donor.append(mutated_val)
-        return donor
-
-    def _create_donor_current_to_best_1(self, x_i, x_best, x_r1, x_r2, F, parameter_bounds, fixed_parameters, num_params):
-        """Create donor vector using DE/current-to-best/1 strategy"""
-        donor = []
-        for j in range(num_params):
-            if j in fixed_parameters:
-                donor.append(fixed_parameters[j])
-            else:
-                mutated_val = x_i[j] + F * (x_best[j] - x_i[j]) + F * (x_r1[j] - x_r2[j])
-                donor.append(mutated_val)
-        return donor
-
-    def _create_donor_current_to_rand_1(self, x_i, x_r1, x_r2, x_r3, K, F, parameter_bounds, fixed_parameters, num_params):
-        """Create donor vector using DE/current-to-rand/1 strategy"""
-        donor = []
-        for j in range(num_params):
-            if j in fixed_parameters:
-                donor.append(fixed_parameters[j])
-            else:
-                mutated_val = x_i[j] + K * (x_r1[j] - x_i[j]) + F * (x_r2[j] - x_r3[j])
-                donor.append(mutated_val)
-        return donor
-
-    def _apply_crossover(self, target, donor, CR, fixed_parameters, num_params):
-        """Apply binomial crossover to create trial vector"""
-        trial = []
-        j_rand = random.randint(0, num_params - 1)
-        
-        for j in range(num_params):
-            if j in fixed_parameters:
-                trial.append(fixed_parameters[j])
-            else:
-                if random.random() <= CR or j == j_rand:
-                    trial.append(donor[j])
-                else:
-                    trial.append(target[j])
-        
-        return trial
+            return population + F * (global_best - population) + F * (x[0] - x[1])
+        # DE/current-to-rand/1: v = x_i + K*(x_r1 - x_i) + F*(x_r2 - x_r3), K ~ U(0, 1) per individual
+        K = np.random.random((size, 1))
+        return population + K * (x[0] - population) + F * (x[1] - x[2])
+
+    def _apply_crossover(self, population, donors, CR):
+        """Binomial crossover: take each donor component with probability CR, and at least one (j_rand)"""
+        size, num_params = population.shape
+        mask = np.random.random((size, num_params)) <= CR[:, np.newaxis]
+        mask[np.arange(size), np.random.randint(num_params, size=size)] = True
+        return np.where(mask, donors, population)
 
-    def _handle_constraints(self, trial, parameter_bounds):
-        """Handle constraints based on the selected method"""
+    def _handle_constraints(self, trials, parameter_bounds):
+        """Handle constraints of all trial vectors based on the selected method"""
         if self.constraint_handling == "penalty":
             # Already handled in fitness evaluation
-            return trial
-        
-        elif self.constraint_handling == "reflection":
-            # Reflect values that are out of bounds
-            for j, (low, high) in enumerate(parameter_bounds):
-                if trial[j] < low:
-                    trial[j] = low + (low - trial[j])
-                    # Make sure reflection doesn't go beyond upper bound
-                    trial[j] = min(trial[j], high)
-                elif trial[j] > high:
-                    trial[j] = high - (trial[j] - high)
-                    # Make sure reflection doesn't go below lower bound
-                    trial[j] = max(trial[j], low)
-            return trial
-        
-        elif self.constraint_handling == "projection":
-            # Simply project values to boundaries
-            for j, (low, high) in enumerate(parameter_bounds):
-                trial[j] = max(low, min(trial[j], high))
-            return trial
-        
-        else:  # Default to projection
-            for j, (low, high) in enumerate(parameter_bounds):
-                trial[j] = max(low, min(trial[j], high))
-            return trial
+            return trials
+
+        bounds = np.asarray(parameter_bounds, dtype=float)
+        low, high = bounds[:, 0], bounds[:, 1]
+        if self.constraint_handling == "reflection":
+            # Reflect values that are out of bounds, without passing the opposite bound
+            trials = np.where(trials < low, np.minimum(2 * low - trials, high), trials)
+            trials = np.where(trials > high, np.maximum(2 * high - trials, low), trials)
+            return trials
+
+        # "projection" and default: simply project values to boundaries
+        return np.clip(trials, low, high)
+
+    def _select(self, population, fitnesses, trials, trial_fitnesses):
+        """
+        One-to-one survivor selection: every trial replaces its target if it is better.
+
+        Returns:
+        --------
+        tuple
+            (population, fitnesses, improved) with population and fitnesses as
+            arrays and ``improved`` the boolean mask of replaced targets
+        """
+        population = np.array(population, dtype=float)
+        fitnesses = np.array(fitnesses, dtype=float)
+        trial_fitnesses = np.asarray(trial_fitnesses, dtype=float)
+        improved = trial_fitnesses < fitnesses
+        population[improved] = trials[improved]
+        fitnesses[improved] = trial_fitnesses[improved]
+        return population, fitnesses, improved
 
     def _initialize_adaptive_parameters(self, num_params):
         """Initialize parameters for adaptive methods"""
@@ -1153,7 +1095,7 @@ class DEWorker(QThread):
             self.adaptive_params["CR_history"] = []  # History of successful CR values
             self.adaptive_params["window_size"] = 10  # Size of history window
             
-        # For jitter, we'll just use a small random perturbation in _get_current_F
+        # For jitter, we'll just use a small random perturbation in _get_control_parameters
         # For dither, we'll generate random F for each generation in _adapt_control_parameters
 
     def _adapt_control_parameters(self, gen, population, fitnesses):
@@ -1168,7 +1110,7 @@ class DEWorker(QThread):
             self.de_F = random.uniform(F_min, F_max)
             
         elif self.adaptive_method == AdaptiveMethod.JADE:
-            # JADE method is handled in _get_current_F and _get_current_CR
+            # JADE method is handled in _get_control_parameters
             # We update the means of successful F and CR after selection
             pass
             
@@ -1178,66 +1120,71 @@ class DEWorker(QThread):
                 self.adaptive_params["CRm"] = np.mean(self.adaptive_params["success_memory"])
                 
         elif self.adaptive_method == AdaptiveMethod.SUCCESS_HISTORY:
-            # Success history is updated during selection and used in _get_current_F and _get_current_CR
+            # Success history is updated during selection and used in _get_control_parameters
             pass
 
-    def _get_current_F(self, i):
-        """Get the current F value, possibly adapted"""
-        if self.adaptive_method == AdaptiveMethod.NONE:
-            return self.de_F
-            
-        elif self.adaptive_method == AdaptiveMethod.JITTER:
+    def _get_control_parameters(self, size):
+        """
+        Per-individual F and CR arrays for the next generation, possibly adapted.
+
+        Returns:
+        --------
+        tuple
+            (F, CR), arrays of length ``size``
+        """
+        F = np.full(size, float(self.de_F))
+        CR = np.full(size, float(self.de_CR))
+
+        if self.adaptive_method == AdaptiveMethod.JITTER:
             # Add small random perturbation to F
             jitter_range = self.adaptive_params.get("jitter_range", 0.1)
-            return max(0.1, min(0.9, self.de_F + random.uniform(-jitter_range, jitter_range)))
-            
-        elif self.adaptive_method == AdaptiveMethod.DITHER:
-            # Dither sets a common F for all individuals in a generation
-            return self.de_F
-            
+            F = np.clip(self.de_F + np.random.uniform(-jitter_range, jitter_range, size), 0.1, 0.9)
+
         elif self.adaptive_method == AdaptiveMethod.JADE:
-            # JADE: generate F from Cauchy distribution with location parameter mu_F and scale 0.1
-            F = np.random.standard_cauchy() * 0.1 + self.adaptive_params["mu_F"]
-            return max(0.1, min(1.0, F))  # truncate to [0.1, 1.0]
-            
+            # JADE: F from a Cauchy distribution around mu_F (scale 0.1), truncated to [0.1, 1.0];
+            # CR from a normal distribution around mu_CR (std 0.1), truncated to [0, 1]
+            F = np.clip(np.random.standard_cauchy(size) * 0.1 + self.adaptive_params["mu_F"], 0.1, 1.0)
+            CR = np.clip(np.random.normal(self.adaptive_params["mu_CR"], 0.1, size), 0.0, 1.0)
+
         elif self.adaptive_method == AdaptiveMethod.SaDE:
-            # SaDE uses fixed F (or could be randomized within a range)
-            return self.de_F
-            
+            # SaDE: fixed F, CR from a normal distribution around CRm (std 0.1)
+            CR = np.clip(np.random.normal(self.adaptive_params["CRm"], 0.1, size), 0.0, 1.0)
+
         elif self.adaptive_method == AdaptiveMethod.SUCCESS_HISTORY:
-            # Use history of successful F values if available
-            history = self.adaptive_params["F_history"]
-            if len(history) > 0:
-                return random.choice(history)
-            else:
-                return self.de_F
-                
-        return self.de_F  # Default
+            # Draw from the histories of successful F and CR values if available
+            if self.adaptive_params["F_history"]:
+                F = np.random.choice(self.adaptive_params["F_history"], size)
+            if self.adaptive_params["CR_history"]:
+                CR = np.random.choice(self.adaptive_params["CR_history"], size)
+
+        # NONE, DITHER (common F set per generation) and unknown methods use de_F and de_CR
+        return F, CR
+
+    def _record_successful_parameters(self, F, CR, improved):
+        """Feed the F and CR values of the trials that replaced their targets back into the adaptive method"""
+        if not np.any(improved):
+            return
+        success_F = F[improved]
+        success_CR = CR[improved]
+
+        if self.adaptive_method == AdaptiveMethod.JADE:
+            # Move the means towards the Lehmer mean of successful F and the mean of successful CR
+            c = self.adaptive_params["c"]
+            lehmer_F = float(np.sum(success_F ** 2) / np.sum(success_F))
+            self.adaptive_params["mu_F"] = (1 - c) * self.adaptive_params["mu_F"] + c * lehmer_F
+            self.adaptive_params["mu_CR"] = (1 - c) * self.adaptive_params["mu_CR"] + c * float(np.mean(success_CR))
 
-    def _get_current_CR(self, i):
-        """Get the current CR value, possibly adapted"""
-        if self.adaptive_method == AdaptiveMethod.NONE:
-            return self.de_CR
-            
-        elif self.adaptive_method == AdaptiveMethod.JADE:
-            # JADE: generate CR from normal distribution with mean mu_CR and std 0.1
-            CR = np.random.normal(self.adaptive_params["mu_CR"], 0.1)
-            return max(0.0, min(1.0, CR))  # truncate to [0, 1]
-            
         elif self.adaptive_method == AdaptiveMethod.SaDE:
-            # SaDE: generate CR from normal distribution with mean CRm and std 0.1
-            CR = np.random.normal(self.adaptive_params["CRm"], 0.1)
-            return max(0.0, min(1.0, CR))  # truncate to [0, 1]
-            
+            memory = self.adaptive_params["success_memory"]
+            memory.extend(success_CR.tolist())
+            del memory[:-self.adaptive_params["memory_size"]]
+
         elif self.adaptive_method == AdaptiveMethod.SUCCESS_HISTORY:
-            # Use history of successful CR values if available
-            history = self.adaptive_params["CR_history"]
-            if len(history) > 0:
-                return random.choice(history)
-            else:
-                return self.de_CR
-                
-        return self.de_CR  # Default
+            window = self.adaptive_params["window_size"]
+            for key, values in (("F_history", success_F), ("CR_history", success_CR)):
+                history = self.adaptive_params[key]
+                history.extend(values.tolist())
+                del history[:-window]
 
     def _calculate_diversity(self, population):
         """Calculate population diversity as the average Euclidean distance between individuals"""
@@ -1603,10 +1550,15 @@ class DEWorker(QThread):
         cr_values = [0.3, 0.5, 0.7, 0.9]
         strategies = [DEStrategy.RAND_1, DEStrategy.BEST_1, DEStrategy.CURRENT_TO_BEST_1]
         
-        # Set up parallel processing if enabled
-        if parallel:
-            import multiprocessing as mp
-            pool = mp.Pool(processes=n_processes or max(1, mp.cpu_count() - 1))
+        # One evaluation engine serves every combination and trial: with
+        # parallel=True its worker processes start once and evaluate each
+        # generation's population from shared memory, instead of pickling
+        # tuning closures to a pool that cannot run them
+        evaluator = Evaluator(
+            main_params, omega_start, omega_end, omega_points, target_values_dict, weights_dict,
+            backend="process" if parallel else "serial",
+            n_workers=n_processes or max(1, mp.cpu_count() - 1),
+        )
         
         best_combination = None
         best_fitness = float('inf')
@@ -1647,7 +1599,8 @@ class DEWorker(QThread):
                     de_parameter_data=de_parameter_data,
                     strategy=strategy,
                     record_statistics=True,
-                    seed=trial  # Different seed for each trial
+                    seed=trial,  # Different seed for each trial
+                    evaluator=evaluator
                 )
                 
                 # Execute in current thread (no QThread for tuning)
@@ -1668,7 +1621,7 @@ class DEWorker(QThread):
                     
                     # Initialize and evaluate population
                     population = de._initialize_population(parameter_bounds, fixed_parameters, num_params)
-                    fitnesses_list = [de.evaluate_individual(ind) for ind in population]
+                    fitnesses_list = de.evaluate_population(population)
                     
                     # Find initial best
                     best_idx = np.argmin(fitnesses_list)
@@ -1678,27 +1631,17 @@ class DEWorker(QThread):
                     # Simplified DE loop
                     converged_at = None
                     for gen in range(1, 51):  # Max 50 generations for tuning
-                        new_population = []
-                        new_fitnesses = []
-                        
-                        for i in range(pop_size):
-                            target = population[i]
-                            trial = de._apply_de_strategy(i, population, global_best, fitnesses_list, 
-                                                       parameter_bounds, fixed_parameters, num_params)
-                            trial_fitness = de.evaluate_individual(trial)
-                            
-                            if trial_fitness < fitnesses_list[i]:
-                                new_population.append(trial)
-                                new_fitnesses.append(trial_fitness)
-                                if trial_fitness < best_fitness_value:
-                                    global_best = trial.copy()
-                                    best_fitness_value = trial_fitness
-                            else:
-                                new_population.append(target)
-                                new_fitnesses.append(fitnesses_list[i])
-                        
-                        population = new_population
-                        fitnesses_list = new_fitnesses
+                        # Trial vectors of the whole generation, evaluated in one call
+                        trials, gen_F, gen_CR = de._generate_trials(population, global_best,
+                                                                    parameter_bounds, fixed_parameters)
+                        trial_fitnesses = de.evaluate_population(trials)
+                        population, fitnesses_list, improved = de._select(population, fitnesses_list,
+                                                                          trials, trial_fitnesses)
+                        de._record_successful_parameters(gen_F, gen_CR, improved)
+                        best_idx = int(np.argmin(fitnesses_list))
+                        if fitnesses_list[best_idx] < best_fitness_value:
+                            global_best = population[best_idx].copy()
+                            best_fitness_value = float(fitnesses_list[best_idx])
                         
                         # Check for convergence
                         if best_fitness_value <= 1e-6:
@@ -1720,13 +1663,10 @@ class DEWorker(QThread):
             return params, avg_fitness, avg_convergence
         
         # Run evaluations
-        results = []
-        if parallel:
-            results = pool.map(evaluate_params, param_combinations)
-            pool.close()
-            pool.join()
-        else:
+        try:
             results = [evaluate_params(params) for params in param_combinations]
+        finally:
+            evaluator.close()
         
         # Find best combination
         for params, avg_fitness, avg_convergence in results:
@@ -0,0 +1,265 @@
+import multiprocessing
+import pickle
+import random
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+import numpy as np
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from modules.parallel import POLL_INTERVAL, plan_core_budget
+from modules.process_pool import POOL_ERRORS
+
+# -----------------------------------------------------------------------------
+# Run process side
+# -----------------------------------------------------------------------------
+
+def _picklable(value):
+    """``value`` without the dict entries that cannot cross a process boundary."""
+    if isinstance(value, dict):
+        kept = {}
+        for key, item in value.items():
+            try:
+                pickle.dumps(item)
+                kept[key] = item
+            except Exception:
+                if isinstance(item, dict):
+                    kept[key] = _picklable(item)
+        return kept
+    return value
+
+
+def run_ga_benchmark_job(run_number, seed, ga_kwargs, control=None):
+    """
+    One seeded GA run executed to completion in the calling thread.
+
+    A module-level function, so it can be sent to worker processes. The
+    GAWorker is driven synchronously through ``run()``; ``control`` is an
+    optional (stop_event, pause_event) pair whose requests are forwarded to
+    the worker.
+
+    Returns:
+    --------
+    dict
+        run_number, seed, elapsed and either results, best_ind,
+        parameter_names and best_fitness, or error
+    """
+    from workers.GAWorker import GAWorker
+
+    random.seed(seed)
+    np.random.seed(seed % (2 ** 32))
+    outcome = {"run_number": run_number, "seed": seed}
+    start = time.time()
+    worker = GAWorker(seeding_seed=seed, **ga_kwargs)
+
+    def on_finished(results, best_ind, parameter_names, best_fitness):
+        outcome.update(results=_picklable(results), best_ind=list(best_ind),
+                       parameter_names=list(parameter_names), best_fitness=float(best_fitness))
+
+    worker.finished.connect(on_finished)
+    worker.error.connect(lambda message: outcome.setdefault("error", message))
+
+    done = threading.Event()
+    if control is not None:
+        def forward_control():
+            stop_event, pause_event = control
+            paused = False
+            while not done.wait(POLL_INTERVAL):
+                try:
+                    if stop_event.is_set():
+                        worker.stop()
+                        return
+                    if pause_event.is_set() != paused:
+                        paused = not paused
+                        worker.pause() if paused else worker.resume()
+                except (OSError, EOFError):
+                    # Manager gone: the benchmark was torn down
+                    worker.stop()
+                    return
+        threading.Thread(target=forward_control, daemon=True).start()
+    try:
+        worker.run()
+    except Exception as e:
+        outcome.setdefault("error", str(e))
+    finally:
+        done.set()
+    if "results" not in outcome:
+        outcome.setdefault("error", "GA run ended without results")
+    outcome["elapsed"] = time.time() - start
+    return outcome
+
+# -----------------------------------------------------------------------------
+# Scheduler thread
+# -----------------------------------------------------------------------------
+
+class GABenchmarkWorker(QThread):
+    """
+    Runs the repetitions of a GA benchmark concurrently in worker processes.
+
+    Every run is an independent GAWorker with its own seed. Runs are spread
+    over persistent 'spawn' processes and reported through ``run_finished``
+    as soon as each completes, in completion order. The core budget is
+    shared by the two levels of parallelism (see ``plan_core_budget``):
+    each run evaluates its populations with ``evaluation_workers`` threads,
+    so runs times workers never exceeds the budget. If processes cannot be
+    started the remaining runs are executed one after another in this
+    thread.
+
+    Parameters:
+    -----------
+    ga_kwargs : dict
+        GAWorker keyword arguments shared by all runs (no seeding options);
+        the evaluation options are replaced unless they select the
+        'distributed' backend
+    n_runs : int
+        Number of runs
+    core_budget : int, optional
+        Cores the benchmark may use; defaults to all cores
+    base_seed : int, optional
+        Run i is seeded with base_seed + i; drawn at random if None
+    """
+
+    run_finished = pyqtSignal(dict)     # outcome of one run (see run_ga_benchmark_job)
+    progress = pyqtSignal(int)          # percentage of completed runs
+    update = pyqtSignal(str)
+    error = pyqtSignal(str)
+    finished = pyqtSignal(int)          # number of completed runs
+
+    def __init__(self, ga_kwargs, n_runs, core_budget=None, base_seed=None):
+        super().__init__()
+        self.n_runs = int(n_runs)
+        self.concurrent_runs, self.evaluation_workers = plan_core_budget(self.n_runs, core_budget)
+        self.ga_kwargs = dict(ga_kwargs)
+        if self.ga_kwargs.get("evaluation_backend") != "distributed":
+            # Runs on a broker use its workers, not the local core budget
+            self.ga_kwargs.update(
+                evaluation_backend="thread" if self.evaluation_workers > 1 else "serial",
+                evaluation_workers=self.evaluation_workers,
+            )
+        if base_seed is None:
+            base_seed = random.SystemRandom().randrange(2 ** 31)
+        self.seeds = [int(base_seed) + i for i in range(self.n_runs)]
+        self.completed = 0
+        self.abort = False
+        self.paused = False
+        self._control = None
+
+    # ------------------------------------------------------------------
+    # Control methods (called from the GUI thread)
+    # ------------------------------------------------------------------
+    def pause(self):
+        self.paused = True
+        self._set_control(1, True)
+
+    def resume(self):
+        self.paused = False
+        self._set_control(1, False)
+
+    def stop(self):
+        self.abort = True
+        self.paused = False
+        self._set_control(0, True)
+        self._set_control(1, False)
+
+    def _set_control(self, index, value):
+        control = self._control
+        if control is None:
+            return
+        try:
+            control[index].set() if value else control[index].clear()
+        except (OSError, EOFError):
+            pass
+
+    def _wait_while_paused(self):
+        while self.paused and not self.abort:
+            time.sleep(POLL_INTERVAL)
+        return self.abort
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+    def run(self):
+        pending = list(zip(range(1, self.n_runs + 1), self.seeds))
+        try:
+            self.update.emit(
+                f"Running {self.n_runs} GA runs, {self.concurrent_runs} at a time with "
+                f"{self.evaluation_workers} evaluation worker(s) each"
+            )
+            if self.concurrent_runs > 1:
+                pending = self._run_in_processes(pending)
+            if pending and not self.abort:
+                self._run_in_thread(pending)
+        except Exception as e:
+            self.error.emit(f"GA benchmark failed: {str(e)}")
+        finally:
+            self.finished.emit(self.completed)
+
+    def _report(self, outcome):
+        self.completed += 1
+        self.run_finished.emit(outcome)
+        self.progress.emit(int(self.completed * 100 / max(1, self.n_runs)))
+
+    def _open_control(self, stop_event, pause_event):
+        # Requests made before the events existed are carried over
+        self._control = (stop_event, pause_event)
+        if self.abort:
+            stop_event.set()
+        if self.paused:
+            pause_event.set()
+        return self._control
+
+    def _run_in_thread(self, pending):
+        control = self._open_control(threading.Event(), threading.Event())
+        try:
+            for run_number, seed in pending:
+                if self._wait_while_paused():
+                    return
+                self._report(run_ga_benchmark_job(run_number, seed, self.ga_kwargs, control))
+        finally:
+            self._control = None
+
+    def _run_in_processes(self, pending):
+        """Run ``pending`` in worker processes; returns the runs still to do after a pool failure."""
+        context = multiprocessing.get_context("spawn")
+        try:
+            manager = context.Manager()
+        except POOL_ERRORS as e:
+            self.update.emit(f"Warning: benchmark processes unavailable ({e}); running sequentially")
+            return pending
+        executor = None
+        try:
+            control = self._open_control(manager.Event(), manager.Event())
+            executor = ProcessPoolExecutor(max_workers=self.concurrent_runs, mp_context=context)
+            futures = {
+                executor.submit(run_ga_benchmark_job, run_number, seed, self.ga_kwargs, control):
+                    (run_number, seed)
+                for run_number, seed in pending
+            }
+            remaining = set(futures)
+            reported = set()
+            while remaining:
+                done, remaining = wait(remaining, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.cancelled():
+                        continue
+                    try:
+                        outcome = future.result()
+                    except POOL_ERRORS as e:
+                        # Lost the worker processes: hand the unreported runs back
+                        self.update.emit(f"Warning: benchmark processes failed ({e}); running sequentially")
+                        for f in remaining:
+                            f.cancel()
+                        return [run for f, run in futures.items() if run[0] not in reported]
+                    reported.add(outcome["run_number"])
+                    self._report(outcome)
+                if self.abort:
+                    # Queued runs never start; running ones stop at their next check
+                    for future in remaining:
+                        future.cancel()
+            return []
+        finally:
+            if executor is not None:
+                executor.shutdown(wait=True, cancel_futures=True)
+            self._control = None
+            manager.shutdown()
@@ -0,0 +1,455 @@
+import multiprocessing
+import os
+import queue
+import random
+import shutil
+import tempfile
+import threading
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+import numpy as np
+from PyQt5.QtCore import QThread, pyqtSignal
+
+from modules.frf_cache import merge_cache_stats, release_shared_cache
+from modules.parallel import POLL_INTERVAL
+from modules.process_pool import POOL_ERRORS
+from workers.GABenchmarkWorker import run_ga_benchmark_job
+
+# -----------------------------------------------------------------------------
+# Configuration
+# -----------------------------------------------------------------------------
+
+# Migration topologies: who sends elites to whom
+MIGRATION_TOPOLOGIES = ("ring", "fully_connected", "star", "random")
+
+
+def migration_targets(topology, n_islands, island, rng=None):
+    """
+    Islands that receive the emigrants of ``island``.
+
+    Parameters:
+    -----------
+    topology : str
+        'ring' (to the next island), 'fully_connected' (to every other
+        island), 'star' (island 0 to all others, the others to island 0) or
+        'random' (to one other island drawn at every migration)
+    n_islands : int
+        Number of islands
+    island : int
+        Index of the sending island
+    rng : random.Random, optional
+        Random source of the 'random' topology
+
+    Returns:
+    --------
+    list
+        Indices of the receiving islands
+    """
+    others = [i for i in range(n_islands) if i != island]
+    if not others:
+        return []
+    if topology == "fully_connected":
+        return others
+    if topology == "star":
+        return others if island == 0 else [0]
+    if topology == "random":
+        return [(rng or random).choice(others)]
+    return [(island + 1) % n_islands]
+
+# -----------------------------------------------------------------------------
+# Island process side
+# -----------------------------------------------------------------------------
+
+class IslandMigration:
+    """
+    Migration hook of one island (see GAWorker ``migration_hook``).
+
+    Called after every generation. Every ``interval`` generations the
+    ``n_migrants`` best individuals are put in the inboxes of the target
+    islands, and whatever has arrived in this island's inbox is returned as
+    immigrants. Nothing blocks: islands never wait for each other, so a slow
+    island simply receives several batches at its next migration.
+
+    Inboxes and the status queue are multiprocessing manager queues when the
+    islands run in processes (the hook is pickled with the GA arguments) and
+    ``queue.Queue`` objects when they run in threads.
+    """
+
+    def __init__(self, island, n_islands, inboxes, topology="ring", interval=5, n_migrants=2,
+                 status=None, seed=None):
+        self.island = int(island)
+        self.n_islands = int(n_islands)
+        self.inboxes = inboxes
+        self.topology = topology if topology in MIGRATION_TOPOLOGIES else "ring"
+        self.interval = max(1, int(interval))
+        self.n_migrants = max(1, int(n_migrants))
+        self.status = status
+        self.rng = random.Random(seed)
+        self.sent = 0
+        self.received = 0
+
+    def __call__(self, gen, population):
+        try:
+            evaluated = sorted((ind for ind in population if ind.fitness.valid),
+                               key=lambda ind: ind.fitness.values[0])
+            if self.status is not None and evaluated:
+                self.status.put((self.island, int(gen), float(evaluated[0].fitness.values[0])))
+            if gen % self.interval:
+                return []
+            emigrants = [([float(v) for v in ind], float(ind.fitness.values[0]))
+                         for ind in evaluated[:self.n_migrants]]
+            if emigrants:
+                for target in migration_targets(self.topology, self.n_islands, self.island, self.rng):
+                    self.inboxes[target].put(emigrants)
+                    self.sent += len(emigrants)
+            immigrants = []
+            while True:
+                try:
+                    immigrants.extend(self.inboxes[self.island].get_nowait())
+                except queue.Empty:
+                    break
+            self.received += len(immigrants)
+            return immigrants
+        except (OSError, EOFError):
+            # Manager gone: the archipelago was torn down
+            return []
+
+
+def run_island_job(island, seed, ga_kwargs, migration, control=None):
+    """
+    One island of the archipelago: a seeded GA run with a migration hook.
+
+    A module-level function, so it can be sent to worker processes.
+
+    Returns:
+    --------
+    dict
+        The outcome of ``run_ga_benchmark_job`` with island, migrants_sent
+        and migrants_received added
+    """
+    outcome = run_ga_benchmark_job(island + 1, seed, dict(ga_kwargs, migration_hook=migration), control)
+    outcome.update(island=island, migrants_sent=migration.sent, migrants_received=migration.received)
+    return outcome
+
+# -----------------------------------------------------------------------------
+# Result aggregation
+# -----------------------------------------------------------------------------
+
+def _per_generation(histories, combine):
+    """Combine per-island per-generation lists; islands that stopped early drop out."""
+    length = max((len(h) for h in histories), default=0)
+    return [combine([h[g] for h in histories if g < len(h)]) for g in range(length)]
+
+
+def merge_island_metrics(island_metrics, island_model=None):
+    """
+    Merge the benchmark metrics of the islands into one GAWorker ``metrics`` dict.
+
+    The metrics of the island that found the best solution are the base, so
+    every key the benchmark visualizations read is present. The
+    per-generation histories describe the whole archipelago: best fitness is
+    the minimum over islands, mean and spread are averaged, all fitness
+    values of a generation are pooled, and a generation lasts as long as its
+    slowest island. Evaluation counts and CPU time are summed. The unmerged
+    island metrics are kept under 'islands'.
+
+    Parameters:
+    -----------
+    island_metrics : list of dict
+        'benchmark_metrics' of each island, in island order
+    island_model : dict, optional
+        Archipelago settings stored under 'island_model'
+
+    Returns:
+    --------
+    dict
+        Merged metrics
+    """
+    island_metrics = [m if isinstance(m, dict) else {} for m in island_metrics]
+    finals = [min(m.get('best_fitness_per_gen') or [float('inf')]) for m in island_metrics]
+    best_island = int(np.argmin(finals)) if finals else 0
+    merged = dict(island_metrics[best_island]) if island_metrics else {}
+
+    def history(key):
+        return [m.get(key) or [] for m in island_metrics]
+
+    best_per_gen = history('best_fitness_per_gen')
+    merged['best_fitness_per_gen'] = _per_generation(best_per_gen, min)
+    merged['mean_fitness_history'] = _per_generation(history('mean_fitness_history'), lambda v: float(np.mean(v)))
+    merged['std_fitness_history'] = _per_generation(history('std_fitness_history'), lambda v: float(np.mean(v)))
+    merged['fitness_history'] = _per_generation(history('fitness_history'), lambda v: [f for fits in v for f in fits])
+    merged['generation_times'] = _per_generation(history('generation_times'), max)
+    merged['pop_size_history'] = _per_generation(history('pop_size_history'), sum)
+
+    # Best individual of each generation comes from the island holding that generation's best
+    individuals = history('best_individual_per_gen')
+    merged['best_individual_per_gen'] = [
+        min(((best_per_gen[i][g], individuals[i][g]) for i in range(len(island_metrics))
+             if g < len(best_per_gen[i]) and g < len(individuals[i])),
+            key=lambda pair: pair[0])[1]
+        for g in range(min(len(merged['best_fitness_per_gen']), max((len(h) for h in individuals), default=0)))
+    ]
+    best = merged['best_fitness_per_gen']
+    merged['convergence_rate'] = [0.0] + [max(0.0, best[g - 1] - best[g]) for g in range(1, len(best))]
+    improvements = [r for r in merged['convergence_rate'] if r > 0]
+    if improvements:
+        merged['avg_improvement_per_gen'] = sum(improvements) / len(improvements)
+        merged['max_improvement'] = max(improvements)
+    if len(best) > 1 and best[0] - min(best) > 0:
+        merged['convergence_percentage'] = [(best[0] - f) / (best[0] - min(best)) * 100 for f in best]
+
+    merged['evaluation_count'] = int(sum(m.get('evaluation_count') or 0 for m in island_metrics))
+    starts = [m['start_time'] for m in island_metrics if m.get('start_time') is not None]
+    ends = [m['end_time'] for m in island_metrics if m.get('end_time') is not None]
+    if starts and ends:
+        merged['start_time'], merged['end_time'] = min(starts), max(ends)
+        merged['total_duration'] = merged['end_time'] - merged['start_time']
+    cpu_times = [m['proc_cpu_time_used'] for m in island_metrics if m.get('proc_cpu_time_used') is not None]
+    merged['proc_cpu_time_used'] = float(sum(cpu_times)) if cpu_times else None
+    cache_stats = [m['frf_cache'] for m in island_metrics if isinstance(m.get('frf_cache'), dict)]
+    if cache_stats:
+        merged['frf_cache'] = merge_cache_stats(*cache_stats)
+
+    merged['best_island'] = best_island
+    merged['island_model'] = dict(island_model or {})
+    merged['islands'] = island_metrics
+    return merged
+
+# -----------------------------------------------------------------------------
+# Archipelago thread
+# -----------------------------------------------------------------------------
+
+class GAIslandWorker(QThread):
+    """
+    Island-model GA: K sub-populations evolving in separate processes.
+
+    Each island is a complete GAWorker with its own seed and its own
+    adaptive-rate, ML or RL controller state (``island_overrides`` can give
+    islands different settings). Every ``migration_interval`` generations an
+    island sends its ``n_migrants`` best individuals to its neighbours on the
+    migration topology and takes in the immigrants that have arrived, which
+    replace its worst individuals. Islands are not synchronized with each
+    other. They share the FRF cache through one SQLite file per run (see
+    ``modules.frf_cache.get_shared_cache``), so a design evaluated by one
+    island is a cache hit for the others; the file is deleted when the run
+    ends unless ``ga_kwargs`` names its own ``frf_cache_path``.
+
+    The worker exposes the GAWorker signals, so it can stand in for one: on
+    completion ``finished`` carries the final results of the best island
+    with 'benchmark_metrics' replaced by the merged archipelago metrics (see
+    ``merge_island_metrics``). If processes cannot be started the islands run
+    in threads of this process.
+
+    Parameters:
+    -----------
+    ga_kwargs : dict
+        GAWorker keyword arguments shared by all islands; ga_pop_size is the
+        size of each island
+    n_islands : int
+        Number of islands
+    topology : str
+        Migration topology (see ``migration_targets``)
+    migration_interval : int
+        Generations between migrations
+    n_migrants : int
+        Individuals sent to each target island per migration
+    island_overrides : list of dict, optional
+        Per-island GAWorker keyword arguments applied over ``ga_kwargs``
+    core_budget : int, optional
+        Cores shared by the islands' evaluation workers; defaults to all cores
+    base_seed : int, optional
+        Island i is seeded with base_seed + i; drawn at random if None
+    """
+
+    finished = pyqtSignal(dict, list, list, float)
+    error = pyqtSignal(str)
+    update = pyqtSignal(str)
+    progress = pyqtSignal(int)
+    island_finished = pyqtSignal(dict)  # outcome of one island (see run_island_job)
+
+    def __init__(self, ga_kwargs, n_islands=4, topology="ring", migration_interval=5, n_migrants=2,
+                 island_overrides=None, core_budget=None, base_seed=None):
+        super().__init__()
+        self.n_islands = max(1, int(n_islands))
+        self.topology = topology if topology in MIGRATION_TOPOLOGIES else "ring"
+        self.migration_interval = max(1, int(migration_interval))
+        self.n_migrants = max(1, int(n_migrants))
+        # All islands must run at once for migration to flow, so they share
+        # the budget as evaluation workers rather than queueing for cores
+        core_budget = max(1, int(core_budget or os.cpu_count() or 1))
+        self.evaluation_workers = max(1, core_budget // self.n_islands)
+        # Islands run the generational loop: migration happens between generations
+        self.ga_kwargs = dict(ga_kwargs, ga_mode="generational", track_metrics=True)
+        if self.ga_kwargs.get("evaluation_backend") != "distributed":
+            self.ga_kwargs.update(
+                evaluation_backend="thread" if self.evaluation_workers > 1 else "serial",
+                evaluation_workers=self.evaluation_workers,
+            )
+        self.island_overrides = list(island_overrides or [])
+        if base_seed is None:
+            base_seed = random.SystemRandom().randrange(2 ** 31)
+        self.seeds = [int(base_seed) + i for i in range(self.n_islands)]
+        self.num_generations = max(1, int(self.ga_kwargs.get("ga_num_generations", 1)))
+        self.outcomes = []
+        self.abort = False
+        self.paused = False
+        self._control = None
+        self._generations = [0] * self.n_islands
+        self._cache_path = None
+
+    # ------------------------------------------------------------------
+    # Control methods (called from the GUI thread)
+    # ------------------------------------------------------------------
+    def pause(self):
+        self.paused = True
+        self._set_control(1, True)
+
+    def resume(self):
+        self.paused = False
+        self._set_control(1, False)
+
+    def stop(self):
+        self.abort = True
+        self.paused = False
+        self._set_control(0, True)
+        self._set_control(1, False)
+
+    def _set_control(self, index, value):
+        control = self._control
+        if control is None:
+            return
+        try:
+            control[index].set() if value else control[index].clear()
+        except (OSError, EOFError):
+            pass
+
+    def _open_control(self, stop_event, pause_event):
+        # Requests made before the events existed are carried over
+        self._control = (stop_event, pause_event)
+        if self.abort:
+            stop_event.set()
+        if self.paused:
+            pause_event.set()
+        return self._control
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+    def island_kwargs(self, island):
+        """GAWorker keyword arguments of ``island``."""
+        kwargs = dict(self.ga_kwargs)
+        if self._cache_path and not kwargs.get("frf_cache_path"):
+            kwargs["frf_cache_path"] = self._cache_path
+        if island < len(self.island_overrides) and self.island_overrides[island]:
+            kwargs.update(self.island_overrides[island])
+        return kwargs
+
+    def run(self):
+        cache_dir = tempfile.mkdtemp(prefix="devana_islands_")
+        self._cache_path = os.path.join(cache_dir, "frf_cache.sqlite")
+        try:
+            self.update.emit(
+                f"Running {self.n_islands} GA islands ({self.topology} topology, "
+                f"{self.n_migrants} migrant(s) every {self.migration_interval} generation(s), "
+                f"{self.evaluation_workers} evaluation worker(s) each)"
+            )
+            if not self._run_in_processes() and not self.abort:
+                self._run_islands(ThreadPoolExecutor(max_workers=self.n_islands),
+                                  [queue.Queue() for _ in range(self.n_islands)], queue.Queue(),
+                                  self._open_control(threading.Event(), threading.Event()))
+            self._finish()
+        except Exception as e:
+            self.error.emit(f"Island GA failed: {str(e)}")
+        finally:
+            # Islands run in threads opened the file in this process
+            release_shared_cache(self._cache_path)
+            self._cache_path = None
+            shutil.rmtree(cache_dir, ignore_errors=True)
+
+    def _run_in_processes(self):
+        """Run the islands in worker processes; returns False if processes are unavailable."""
+        context = multiprocessing.get_context("spawn")
+        try:
+            manager = context.Manager()
+        except POOL_ERRORS as e:
+            self.update.emit(f"Warning: island processes unavailable ({e}); running islands in threads")
+            return False
+        try:
+            try:
+                executor = ProcessPoolExecutor(max_workers=self.n_islands, mp_context=context)
+            except POOL_ERRORS as e:
+                self.update.emit(f"Warning: island processes unavailable ({e}); running islands in threads")
+                return False
+            return self._run_islands(executor, [manager.Queue() for _ in range(self.n_islands)],
+                                     manager.Queue(), self._open_control(manager.Event(), manager.Event()))
+        finally:
+            manager.shutdown()
+
+    def _run_islands(self, executor, inboxes, status, control):
+        """Run every island on ``executor``; returns False if the executor lost its workers."""
+        self.outcomes = []
+        self._generations = [0] * self.n_islands
+        try:
+            futures = []
+            for island, seed in enumerate(self.seeds):
+                migration = IslandMigration(island, self.n_islands, inboxes, self.topology,
+                                            self.migration_interval, self.n_migrants, status, seed)
+                futures.append(executor.submit(run_island_job, island, seed,
+                                               self.island_kwargs(island), migration, control))
+            remaining = set(futures)
+            while remaining:
+                done, remaining = wait(remaining, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+                self._drain_status(status)
+                for future in done:
+                    try:
+                        outcome = future.result()
+                    except POOL_ERRORS as e:
+                        self.update.emit(f"Warning: island processes failed ({e}); running islands in threads")
+                        for f in remaining:
+                            f.cancel()
+                        return False
+                    self.outcomes.append(outcome)
+                    self.island_finished.emit(outcome)
+            self._drain_status(status)
+            return True
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+            self._control = None
+
+    def _drain_status(self, status):
+        """Report island generations received since the last call."""
+        try:
+            while True:
+                island, gen, best = status.get_nowait()
+                self._generations[island] = gen
+                self.update.emit(f"Island {island + 1}: generation {gen}, best fitness {best:.6f}")
+        except (queue.Empty, OSError, EOFError):
+            pass
+        self.progress.emit(min(99, int(sum(self._generations) * 100 / (self.num_generations * self.n_islands))))
+
+    def _finish(self):
+        self.outcomes.sort(key=lambda o: o.get("island", 0))
+        successful = [o for o in self.outcomes if "results" in o]
+        if not successful:
+            if self.abort:
+                self.update.emit("Island GA stopped by user")
+                return
+            errors = "; ".join(o.get("error", "") for o in self.outcomes if o.get("error"))
+            self.error.emit("Island GA produced no results" + (f": {errors}" if errors else ""))
+            return
+        best = min(successful, key=lambda o: o["best_fitness"])
+        island_model = dict(
+            n_islands=self.n_islands, topology=self.topology,
+            migration_interval=self.migration_interval, n_migrants=self.n_migrants,
+            seeds=list(self.seeds),
+            best_fitness=[o.get("best_fitness") for o in self.outcomes],
+            migrants_sent=[o.get("migrants_sent", 0) for o in self.outcomes],
+            migrants_received=[o.get("migrants_received", 0) for o in self.outcomes],
+        )
+        results = dict(best["results"])
+        results["benchmark_metrics"] = merge_island_metrics(
+            [o.get("results", {}).get("benchmark_metrics", {}) for o in self.outcomes], island_model)
+        self.update.emit(
+            f"Island GA finished: best fitness {best['best_fitness']:.6f} on island {best['island'] + 1}")
+        self.progress.emit(100)
+        self.finished.emit(results, best["best_ind"], best["parameter_names"], float(best["best_fitness"]))
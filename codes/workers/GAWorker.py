@@ -156,6 +156,9 @@ from PyQt5.QtCore import QThread, pyqtSignal, QMutex, QWaitCondition, QTimer
 # Import a custom function 'frf' from the modules.FRF module.
 # This is likely a user-defined module for a specific purpose (e.g., Frequency Response Function).
 from modules.FRF import frf
+from modules.frf_cache import get_shared_cache
+from modules.evaluator import Evaluator, EVALUATION_BACKENDS
+from concurrent.futures import FIRST_COMPLETED, wait
 from .MemorySeeder import MemorySeeder
 
 # Import the random module for generating random numbers (used in algorithms like genetic algorithms).
@@ -170,8 +173,6 @@ from scipy.stats import qmc
 # Import NeuralSeeder from a local module in the same package.
 # This is likely a custom class for initializing neural networks or populations.
 from .NeuralSeeder import NeuralSeeder
-from concurrent.futures import ThreadPoolExecutor
-import threading
 
 # -----------------------------------------------------------------------------------------------
 
@@ -303,6 +304,7 @@ class GAWorker(QThread):
     progress = pyqtSignal(int)
     benchmark_data = pyqtSignal(dict)
     generation_metrics = pyqtSignal(dict)
+    evaluation_progress = pyqtSignal(int, int)   # (evaluations completed, evaluation budget) in steady-state mode
 
     # ----------------------------- Helpers ---------------------------------
     def _attach_frf_peak_positions(self, results_dict):
@@ -486,7 +488,16 @@ class GAWorker(QThread):
         dva_category_map=None,         # Optional explicit mapping param_name -> category name
         # Performance/monitoring knobs
         metrics_timer_interval=2000,   # ms between resource metric polls (higher = less overhead)
-        metrics_verbose=False          # emit verbose metrics updates to log
+        metrics_verbose=False,         # emit verbose metrics updates to log
+        # Parallel evaluation backend
+        evaluation_backend="process",  # "process" (falls back to threads), "thread", "batch", "serial" or "distributed"
+        evaluation_workers=None,       # Number of evaluation workers (default: all cores but one)
+        # Evolution scheme
+        ga_mode="generational",        # "generational" or "steady_state" (asynchronous, no generation barrier)
+        steady_state_replacement="worst",  # Steady-state insertion: "worst" or "tournament" replacement
+        steady_state_inflight=None,    # Offspring kept in evaluation at once (default: 2 per evaluation worker)
+        migration_hook=None,           # Island model: callable(gen, population) -> [(vector, fitness), ...] immigrants (re-evaluated locally)
+        frf_cache_path=None            # SQLite file of the FRF cache's disk tier (default: DEVANA_FRF_CACHE, memory only if unset)
     ):
         # ------------------------------------------------------------------------
         # Genetic Algorithm Worker Initialization
@@ -970,9 +981,22 @@ class GAWorker(QThread):
         except Exception:
             self._metrics_heavy_every = 5
         self.log_component_table_every_n = 5
-        # Persistent executor for parallel fitness evaluation (reduces per-call overhead)
-        self._executor = None
-        self._eval_workers = None
+        # Fitness evaluation engine (see modules.evaluator), built at the start of
+        # each run; its thread/process pools persist across generations
+        self._eval_workers = int(evaluation_workers) if evaluation_workers else None
+        self.evaluation_backend = evaluation_backend if evaluation_backend in EVALUATION_BACKENDS else "thread"
+        self.evaluator = None
+        # Steady-state mode breeds one offspring whenever an evaluation slot
+        # frees up and inserts each result as soon as it completes
+        self.ga_mode = ga_mode if ga_mode in ("generational", "steady_state") else "generational"
+        self.steady_state_replacement = steady_state_replacement if steady_state_replacement in ("worst", "tournament") else "worst"
+        self.steady_state_inflight = int(steady_state_inflight) if steady_state_inflight else None
+        # Island model: called after every generation with the evaluated
+        # population; returns immigrants that replace the worst individuals
+        self.migration_hook = migration_hook
+        # Disk tier of the shared FRF cache; islands of one archipelago pass
+        # the same file so designs evaluated on one island are hits on others
+        self.frf_cache_path = frf_cache_path
         # History/window controls
         self.metrics_window = 200  # keep last N generations of metrics/history
         self.surrogate_dataset_max = 3000  # cap KNN memory to avoid O(N) blowup
@@ -1058,11 +1082,11 @@ class GAWorker(QThread):
         # Like turning off the microwave timer
         if self.watchdog_timer.isActive():
             self.watchdog_timer.stop()
-        # Shutdown persistent executor if it exists
+        # Stop the evaluation threads/processes and free their shared memory
         try:
-            if self._executor is not None:
-                self._executor.shutdown(wait=False, cancel_futures=True)
-                self._executor = None
+            if self.evaluator is not None:
+                self.evaluator.close()
+                self.evaluator = None
         except Exception:
             pass
  
@@ -1224,9 +1248,17 @@ class GAWorker(QThread):
             # This is like setting up our workshop with all the tools we'll need
             toolbox = base.Toolbox()
 
-            # Thread-safe FRF evaluation cache to avoid recomputing identical individuals
-            frf_cache = {}
-            cache_lock = threading.Lock()
+            # Evaluation engine for this run. It goes through the cache shared with
+            # the other optimizers and runs (in-memory LRU plus the optional
+            # on-disk tier), so identical designs skip the FRF
+            if self.evaluator is not None:
+                self.evaluator.close()
+            self.evaluator = Evaluator(
+                self.main_params, self.omega_start, self.omega_end, self.omega_points,
+                self.target_values_dict, self.weights_dict,
+                backend=self.evaluation_backend, n_workers=self._eval_workers,
+                cache=get_shared_cache(self.frf_cache_path), log=self.update.emit,
+            )
 
             # Precompute arrays and maps used repeatedly (avoid per-evaluation overhead)
             # Bounds arrays
@@ -1348,7 +1380,7 @@ class GAWorker(QThread):
             # 4. Returns a score (fitness) that tells us how good the solution is
             # ============================================================================
 
-            def evaluate_individual(individual):
+            def evaluate_individual(individual, results=None):
                 """
                 ============================================================================
                 SCIENTIFIC EXPLANATION:
@@ -1383,41 +1415,6 @@ class GAWorker(QThread):
                 # This is like preparing the robot for testing
                 dva_parameters_tuple = tuple(float(v) for v in individual)
 
-                # Fast path: check cache for identical parameter vector
-                try:
-                    with cache_lock:
-                        cached = frf_cache.get(dva_parameters_tuple)
-                    if cached is not None:
-                        # Support both legacy (4-tuple) and extended (6-tuple) cache formats
-                        if isinstance(cached, (list, tuple)):
-                            if len(cached) >= 6:
-                                primary_objective, sparsity_penalty, percentage_error_component, activation_penalty_term, cost_term, fitness_value = cached[:6]
-                                individual.activation_penalty = activation_penalty_term
-                                individual.cost_term = cost_term / self.cost_scale_factor
-                            else:
-                                primary_objective, sparsity_penalty, percentage_error_component, fitness_value = cached[:4]
-                                individual.activation_penalty = 0.0
-                                individual.cost_term = 0.0
-                        elif isinstance(cached, dict):
-                            primary_objective = float(cached.get('primary_objective', 0.0))
-                            sparsity_penalty = float(cached.get('sparsity_penalty', 0.0))
-                            percentage_error_component = float(cached.get('percentage_error', 0.0))
-                            fitness_value = float(cached.get('fitness', 1e6))
-                            individual.activation_penalty = float(cached.get('activation_penalty', 0.0))
-                            individual.cost_term = float(cached.get('cost_term', 0.0)) / self.cost_scale_factor
-                        else:
-                            primary_objective = sparsity_penalty = percentage_error_component = 0.0
-                            fitness_value = 1e6
-                            individual.activation_penalty = 0.0
-                            individual.cost_term = 0.0
-                        # Restore component attributes for reporting
-                        individual.primary_objective = primary_objective
-                        individual.sparsity_penalty = sparsity_penalty
-                        individual.percentage_error = percentage_error_component
-                        return (fitness_value,)
-                except Exception:
-                    pass
-
                 try:
                     
                     # ============================================================================
@@ -1430,37 +1427,20 @@ class GAWorker(QThread):
                     # - How well it matches our target performance for each mass
                     # ============================================================================
 
-                    # Run the FRF analysis with all necessary parameters
-                    results = frf(
-                        # Main system parameters (like the base structure of our robot)
-                        main_system_parameters=self.main_params,
-                        # Our solution parameters (like the robot's settings)
-                        dva_parameters=dva_parameters_tuple,
-                        # Frequency range to analyze (like testing different speeds)
-                        omega_start=self.omega_start,
-                        omega_end=self.omega_end,
-                        omega_points=self.omega_points,
-                        # Target values and weights for each mass (like performance goals)
-                        target_values_mass1=self.target_values_dict['mass_1'],
-                        weights_mass1=self.weights_dict['mass_1'],
-                        target_values_mass2=self.target_values_dict['mass_2'],
-                        weights_mass2=self.weights_dict['mass_2'],
-                        target_values_mass3=self.target_values_dict['mass_3'],
-                        weights_mass3=self.weights_dict['mass_3'],
-                        target_values_mass4=self.target_values_dict['mass_4'],
-                        weights_mass4=self.weights_dict['mass_4'],
-                        target_values_mass5=self.target_values_dict['mass_5'],
-                        weights_mass5=self.weights_dict['mass_5'],
-                        # Disable visualization for speed (like turning off the camera during testing)
-                        plot_figure=False,
-                        show_peaks=False,
-                        show_slopes=False
-                    )
+                    # Run the FRF analysis through the run's evaluator; designs seen
+                    # before (in this run, another optimizer or an earlier session)
+                    # come straight from the shared cache. Results already computed
+                    # for a whole population by evaluate_many are passed in instead.
+                    if results is None:
+                        results = self.evaluator.evaluate(dva_parameters_tuple)
                     
                     # Check if results are in the correct format
                     if not isinstance(results, dict):
                         self.update.emit("Warning: FRF returned non-dictionary result")
                         return (1e6,)  # Return bad score if results are invalid
+                    if "error" in results:
+                        # An evaluation process failed on this design
+                        raise RuntimeError(results["error"])
                     
                     # ============================================================================
                     # SCIENTIFIC EXPLANATION:
@@ -1684,19 +1664,6 @@ class GAWorker(QThread):
                         + activation_penalty_term
                         + individual.cost_term
                     )
-                    # Memoize results for identical parameter vectors
-                    try:
-                        with cache_lock:
-                            frf_cache[dva_parameters_tuple] = (
-                                primary_objective,
-                                sparsity_penalty,
-                                individual.percentage_error,
-                                activation_penalty_term,
-                                cost_term,
-                                float(fitness)
-                            )
-                    except Exception:
-                        pass
                     return (fitness,)
                 except Exception as e:
                     # If anything goes wrong (like  math error or invalid input)
@@ -1721,27 +1688,18 @@ class GAWorker(QThread):
             def parallel_evaluate(individuals):
                 if not individuals:
                     return []
-                # Determine worker count once; retain at least 1
-                workers = getattr(self, '_eval_workers', None)
-                if workers is None:
-                    try:
-                        cpu_n = os.cpu_count() or 1
-                    except Exception:
-                        cpu_n = 1
-                    # Leave one core free for UI/OS
-                    workers = max(1, cpu_n - 1)
-                    self._eval_workers = workers
-                # Avoid oversubscription when evaluating small batches
-                eff_workers = min(workers, max(1, len(individuals)))
-                if eff_workers <= 1:
-                    return [toolbox.evaluate(ind) for ind in individuals]
-                # Reuse a persistent executor to avoid per-call creation overhead
-                if self._executor is None:
-                    try:
-                        self._executor = ThreadPoolExecutor(max_workers=eff_workers, thread_name_prefix="gaeval")
-                    except Exception:
-                        self._executor = ThreadPoolExecutor(max_workers=eff_workers)
-                return list(self._executor.map(toolbox.evaluate, individuals))
+                # The evaluator runs the FRF stage of the whole population on its
+                # backend (threads, worker processes or one batched solve); the
+                # cheap penalty/cost terms are added here
+                summaries = self.evaluator.evaluate_many(
+                    np.asarray(individuals, dtype=float), should_stop=self._check_pause_abort
+                )
+                # Follow a process-to-thread fallback of the evaluator
+                self.evaluation_backend = self.evaluator.backend
+                return [
+                    toolbox.evaluate(ind, results=summary) if summary is not None else (1e6,)
+                    for ind, summary in zip(individuals, summaries)
+                ]
             toolbox.register("mate", tools.cxBlend, alpha=0.5)  # Blend two solutions together
 
             # ============================================================================
@@ -2615,11 +2573,23 @@ class GAWorker(QThread):
                     # Return the resized population (either shrunk or grown)
                     return pop
             # =========================
+            # Steady-State Evolution
+            # =========================
+            # In steady-state mode the same evaluation budget (generations x population)
+            # is spent without generation barriers and the generational loop is skipped.
+            num_generations = self.ga_num_generations
+            if self.ga_mode == "steady_state":
+                best_ind_overall, best_fitness_overall = self._run_steady_state(
+                    population, toolbox, parameter_bounds, fixed_parameters
+                )
+                num_generations = 0
+
+            # =========================
             # Main Evolutionary Loop
             # =========================
             # This loop runs the genetic algorithm for a specified number of generations.
             # Each generation consists of selection, crossover, mutation, and evaluation steps.
-            for gen in range(1, self.ga_num_generations + 1):
+            for gen in range(1, num_generations + 1):
                 # Track current generation index for adaptive components
                 try:
                     self._current_generation = int(gen)
@@ -3457,6 +3427,39 @@ class GAWorker(QThread):
                     except Exception:
                         pass
 
+                # ----------------------------------------
+                # Island Model Migration
+                # ----------------------------------------
+                # Elites are sent to the neighbouring islands by the hook; the
+                # immigrants it returns replace the worst individuals they beat.
+                # The fitness an immigrant had on its home island may use other
+                # settings or generation-dependent weights, so it is evaluated
+                # again here before being compared with local individuals.
+                if self.migration_hook is not None:
+                    # Commit pending cache writes first, so the islands receiving
+                    # our emigrants find them in the shared disk tier
+                    self.evaluator.cache.flush()
+                    immigrants = []
+                    for vector, _home_fitness in self.migration_hook(gen, population) or ():
+                        immigrant = toolbox.clone(population[0])
+                        immigrant[:] = [float(v) for v in vector]
+                        del immigrant.fitness.values
+                        immigrants.append(immigrant)
+                    for immigrant, fit in zip(immigrants, parallel_evaluate(immigrants)):
+                        immigrant.fitness.values = fit
+                    for immigrant in immigrants:
+                        fitness = float(immigrant.fitness.values[0])
+                        worst = max(range(len(population)),
+                                    key=lambda i: population[i].fitness.values[0] if population[i].fitness.valid else float('inf'))
+                        if population[worst].fitness.valid and fitness >= population[worst].fitness.values[0]:
+                            continue
+                        population[worst] = immigrant
+                        if fitness < best_fitness_overall:
+                            best_fitness_overall = float(fitness)
+                            best_ind_overall = immigrant
+                            min_fit = min(min_fit, float(fitness))
+                            self.update.emit(f"  New best solution received from another island! Fitness: {best_fitness_overall:.6f}")
+
                 # Check if we've found a good enough solution
                 if min_fit <= self.ga_tol:
                     self.update.emit(f"\n[INFO] Solution found within tolerance at generation {gen}")
@@ -3471,6 +3474,13 @@ class GAWorker(QThread):
             # Stop metrics tracking
             if self.track_metrics:
                 self._stop_metrics_tracking()
+            # Hit-rate statistics of the shared FRF cache for this run
+            cache_stats = self.evaluator.cache_stats()
+            self.metrics['frf_cache'] = cache_stats
+            self.update.emit(
+                f"FRF cache: {cache_stats['memory_hits'] + cache_stats['disk_hits']}/{cache_stats['lookups']} hits "
+                f"({100.0 * cache_stats['hit_rate']:.1f}%)"
+            )
             # Capture process CPU time end and compute used
             try:
                 proc = psutil.Process(os.getpid())
@@ -3696,6 +3706,108 @@ class GAWorker(QThread):
             self.cleanup()
             self.error.emit(error_msg)
 
+    def _run_steady_state(self, population, toolbox, parameter_bounds, fixed_parameters):
+        """
+        Asynchronous steady-state evolution of ``population`` (modified in place).
+
+        Offspring are bred one at a time and submitted to the evaluator as
+        soon as an evaluation slot is free, so the evaluation pool never
+        waits for the slowest design of a generation. Each completed
+        offspring is inserted right away: it replaces the worst individual
+        ("worst") or the worst of a random tournament ("tournament") if it
+        is better. The evaluation budget is ga_num_generations x
+        population size; progress is reported in evaluations.
+
+        Returns:
+        --------
+        tuple
+            (best individual, best fitness)
+        """
+        budget = max(1, int(self.ga_num_generations) * len(population))
+        inflight_limit = self.steady_state_inflight or 2 * max(1, self.evaluator.n_workers)
+        best_ind = tools.selBest(population, 1)[0]
+        best_fitness = best_ind.fitness.values[0]
+        in_flight = {}
+        submitted = 0
+        completed = 0
+        last_percent = -1
+        next_watchdog_reset = len(population)
+        self.update.emit(
+            f"Steady-state evolution: {budget} evaluations, up to {inflight_limit} in flight, "
+            f"{self.steady_state_replacement} replacement"
+        )
+
+        def breed():
+            parent1, parent2 = map(toolbox.clone, toolbox.select(population, 2))
+            varied = False
+            if random.random() < self.ga_cxpb:
+                toolbox.mate(parent1, parent2)
+                for i in range(len(parent1)):
+                    if i in fixed_parameters:
+                        parent1[i] = fixed_parameters[i]
+                    else:
+                        min_val, max_val = parameter_bounds[i]
+                        parent1[i] = max(min_val, min(parent1[i], max_val))
+                varied = True
+            if random.random() < self.ga_mutpb or not varied:
+                toolbox.mutate(parent1)
+            del parent1.fitness.values
+            return parent1
+
+        def insert(child):
+            if self.steady_state_replacement == "tournament":
+                contenders = random.sample(range(len(population)), min(3, len(population)))
+            else:
+                contenders = range(len(population))
+            worst = max(contenders, key=lambda i: population[i].fitness.values[0])
+            if child.fitness.values[0] < population[worst].fitness.values[0]:
+                population[worst] = child
+
+        try:
+            while completed < budget:
+                if self._check_pause_abort():
+                    self.update.emit("Optimization aborted by user")
+                    break
+                # Keep the evaluation pool saturated
+                while len(in_flight) < inflight_limit and submitted < budget:
+                    child = breed()
+                    in_flight[self.evaluator.submit(child)] = child
+                    submitted += 1
+                done, _ = wait(list(in_flight), timeout=0.1, return_when=FIRST_COMPLETED)
+                for future in done:
+                    child = in_flight.pop(future)
+                    try:
+                        summary = future.result()
+                    except Exception as e:
+                        summary = {"error": str(e)}
+                    child.fitness.values = toolbox.evaluate(child, results=summary)
+                    insert(child)
+                    completed += 1
+                    if child.fitness.values[0] < best_fitness:
+                        best_fitness = child.fitness.values[0]
+                        best_ind = toolbox.clone(child)
+                        self.update.emit(f"  Evaluation {completed}: new best fitness {best_fitness:.6f}")
+                self.evaluation_backend = self.evaluator.backend
+                self.evaluation_progress.emit(completed, budget)
+                if completed >= next_watchdog_reset:
+                    # Same watchdog budget as one generation of the generational loop
+                    if self.watchdog_timer.isActive():
+                        self.watchdog_timer.stop()
+                    self.watchdog_timer.start(600000)
+                    next_watchdog_reset = completed + len(population)
+                percent = int(completed * 100 / budget)
+                if percent != last_percent:
+                    self.progress.emit(percent)
+                    last_percent = percent
+                if best_fitness <= self.ga_tol:
+                    self.update.emit(f"\n[INFO] Solution found within tolerance after {completed} evaluations")
+                    break
+        finally:
+            for future in in_flight:
+                future.cancel()
+        self.metrics['steady_state_evaluations'] = completed
+        return best_ind, best_fitness
+
     def _get_system_info(self):
         """Collect system information for benchmarking"""
         try:
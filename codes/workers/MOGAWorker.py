@@ -1,3 +1,6 @@
+import json
+import os
+
 import numpy as np
 from deap import base, creator, tools
 from PyQt5.QtCore import QThread, pyqtSignal
@@ -5,7 +8,9 @@ import time
 import random
 import psutil
 
-from modules.FRF import frf
+from modules.evaluator import Evaluator
+from modules.pareto import FrontMetrics, non_dominated_sort
+from modules.pareto_archive import ParetoArchive
 
 def safe_deap_operation(func):
     def wrapper(*args, **kwargs):
@@ -33,7 +38,9 @@ class MOGAWorker(QThread):
 
     def __init__(self, main_params, dva_params, target_values_weights, omega_start, omega_end, omega_points,
                  pop_size, generations, cxpb, mutpb, eta_c, eta_m, indpb, sparsity_tau, sparsity_alpha, sparsity_beta,
-                 num_runs=1, random_seed=None, parent=None):
+                 num_runs=1, random_seed=None, parent=None, evaluation_backend="serial", evaluation_workers=None,
+                 hv_ref_point=None, reference_front=None, archive_max_size=None, archive_prune="crowding",
+                 archive_epsilon=None, results_dir="moga_results"):
         super().__init__(parent)
         self.main_params = main_params
         # Parse dva_params
@@ -59,6 +66,23 @@ class MOGAWorker(QThread):
         self.sparsity_beta = sparsity_beta
         self.num_runs = num_runs
         self.random_seed = random_seed
+        self.hv_ref_point = hv_ref_point if hv_ref_point else [1.0, 100.0, 100.0]
+        # Known (f1, f2, f3) front for IGD+/GD/Spread; without one, each run
+        # is scored against the best front it has found so far
+        self.reference_front = reference_front
+        # Non-dominated designs of all evaluations of all runs
+        self.archive_max_size = archive_max_size
+        self.archive_prune = archive_prune
+        self.archive_epsilon = archive_epsilon
+        self.archive = None
+        # The archive is written to <results_dir>/moga_archive.json at the end
+        self.results_dir = results_dir
+        self.evaluator = Evaluator(
+            main_params, omega_start, omega_end, omega_points,
+            {f"mass_{m + 1}": tv for m, (tv, _) in enumerate(target_values_weights)},
+            {f"mass_{m + 1}": w for m, (_, w) in enumerate(target_values_weights)},
+            backend=evaluation_backend, n_workers=evaluation_workers,
+        )
         
         self.abort = False
         self.is_paused = False
@@ -72,29 +96,25 @@ class MOGAWorker(QThread):
     def resume(self):
         self.is_paused = False
 
-    def evaluate(self, individual):
+    def evaluate_population(self, individuals):
+        """Objectives of all individuals, with the FRF stage run by the evaluator in one call."""
+        summaries = self.evaluator.evaluate_many(individuals)
+        return [self.evaluate(ind, summary) for ind, summary in zip(individuals, summaries)]
+
+    def save_archive(self, results_dir):
+        """Write the campaign's archive to moga_archive.json."""
+        os.makedirs(results_dir, exist_ok=True)
+        file_path = os.path.join(results_dir, "moga_archive.json")
+        with open(file_path, 'w') as f:
+            json.dump(self.archive.to_dict(), f, indent=4)
+
+    def evaluate(self, individual, results=None):
         # Objective 1: FRF
         try:
-            results = frf(
-                main_system_parameters=self.main_params,
-                dva_parameters=tuple(individual),
-                omega_start=self.omega_start,
-                omega_end=self.omega_end,
-                omega_points=self.omega_points,
-                target_values_mass1=self.target_values_weights[0][0],
-                weights_mass1=self.target_values_weights[0][1],
-                target_values_mass2=self.target_values_weights[1][0],
-                weights_mass2=self.target_values_weights[1][1],
-                target_values_mass3=self.target_values_weights[2][0],
-                weights_mass3=self.target_values_weights[2][1],
-                target_values_mass4=self.target_values_weights[3][0],
-                weights_mass4=self.target_values_weights[3][1],
-                target_values_mass5=self.target_values_weights[4][0],
-                weights_mass5=self.target_values_weights[4][1],
-                plot_figure=False,
-                show_peaks=False,
-                show_slopes=False
-            )
+            if results is None:
+                results = self.evaluator.evaluate(individual)
+            if "error" in results:
+                raise RuntimeError(results["error"])
             f1 = results.get('singular_response', 1e6)
             if not np.isfinite(f1):
                 f1 = 1e6
@@ -115,6 +135,7 @@ class MOGAWorker(QThread):
         try:
             all_runs_data = []
             process = psutil.Process()
+            self.archive = ParetoArchive(3, self.archive_max_size, self.archive_prune, self.archive_epsilon)
 
             for run_idx in range(self.num_runs):
                 if self.abort: break
@@ -144,8 +165,13 @@ class MOGAWorker(QThread):
                 toolbox.register("select", tools.selNSGA2)
 
                 pop = toolbox.population(n=self.pop_size)
-                fitnesses = list(map(toolbox.evaluate, pop))
+                fitnesses = self.evaluate_population(pop)
                 for ind, fit in zip(pop, fitnesses): ind.fitness.values = fit
+                self.archive.add_many(-np.array([ind.fitness.wvalues for ind in pop]), pop)
+                # Assigns the crowding distances selTournamentDCD needs; no selection happens
+                pop = toolbox.select(pop, len(pop))
+
+                front_metrics = FrontMetrics(self.hv_ref_point, self.reference_front)
 
                 for gen in range(self.generations):
                     while self.is_paused and not self.abort: time.sleep(0.1)
@@ -166,22 +192,37 @@ class MOGAWorker(QThread):
                             del ind.fitness.values
 
                     invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
-                    fitnesses = map(toolbox.evaluate, invalid_ind)
+                    fitnesses = self.evaluate_population(invalid_ind)
                     for ind, fit in zip(invalid_ind, fitnesses): ind.fitness.values = fit
+                    if invalid_ind:
+                        self.archive.add_many(-np.array([ind.fitness.wvalues for ind in invalid_ind]), invalid_ind)
 
                     pop = toolbox.select(pop + offspring, self.pop_size)
-                    
+
+                    objectives = -np.array([ind.fitness.wvalues for ind in pop])
+                    pareto_front = objectives[non_dominated_sort(objectives, first_front_only=True)[0]]
+                    front_values = front_metrics.update(pareto_front)
+
                     metrics = {
                         "gen": gen,
                         "min_f1": min(ind.fitness.values[0] for ind in pop),
                         "avg_f1": np.mean([ind.fitness.values[0] for ind in pop]),
-                        "mem_mb": process.memory_info().rss / 1024 / 1024
+                        "mem_mb": process.memory_info().rss / 1024 / 1024,
+                        "hv": front_values["HV"],
+                        "igd_plus": front_values["IGD+"],
+                        "gd": front_values["GD"],
+                        "spread": front_values["Spread"],
+                        "n_pareto": len(pareto_front),
+                        "n_archive": len(self.archive)
                     }
                     self.progress.emit(run_idx, gen, self.generations, metrics)
 
                 final_pop = [list(ind) for ind in tools.selNSGA2(pop, len(pop))]
                 all_runs_data.append(final_pop)
 
+            self.save_archive(self.results_dir)
             self.finished.emit(all_runs_data)
         except Exception as e:
             self.error.emit(str(e))
+        finally:
+            self.evaluator.close()
@@ -3,10 +3,13 @@ from deap import base, creator, tools
 from PyQt5.QtCore import QThread, pyqtSignal
 import time
 import random
+import json
 import psutil
 import os
 
-from modules.FRF import frf
+from modules.evaluator import Evaluator
+from modules.pareto import FrontMetrics, merge_fronts, score_front, select_nsga2, tournament_dcd
+from modules.pareto_archive import ParetoArchive
 
 def safe_deap_operation(func):
     def wrapper(*args, **kwargs):
@@ -35,7 +38,8 @@ class NSGA2Worker(QThread):
     def __init__(self, main_params, dva_params, target_values_weights, omega_start, omega_end, omega_points,
                  pop_size, generations, cxpb, mutpb, eta_c, eta_m, indpb, sparsity_tau, sparsity_alpha, sparsity_beta,
                  num_runs=1, random_seed=None, convergence_epsilon=0.001, convergence_window=50, convergence_min_gen=500,
-                 hv_ref_point=None, parent=None):
+                 hv_ref_point=None, parent=None, evaluation_backend="serial", evaluation_workers=None,
+                 reference_front=None, archive_max_size=None, archive_prune="crowding", archive_epsilon=None):
         super().__init__(parent)
         self.main_params = main_params
         # Parse dva_params
@@ -65,6 +69,23 @@ class NSGA2Worker(QThread):
         self.convergence_window = convergence_window
         self.convergence_min_gen = convergence_min_gen
         self.hv_ref_point = hv_ref_point if hv_ref_point else [1.0, 100.0, 100.0]
+        # Known (f1, f2, f3) front for IGD+/GD/Spread; without one, each run
+        # is scored against the best front it has found so far
+        self.reference_front = reference_front
+        # Every evaluated design of all runs is offered to one external
+        # archive, which keeps the non-dominated ones that NSGA-II's
+        # crowding would otherwise drop (unbounded if archive_max_size is None)
+        self.archive_max_size = archive_max_size
+        self.archive_prune = archive_prune
+        self.archive_epsilon = archive_epsilon
+        self.archive = None
+        # target_values_weights is a list of 5 (masses) tuples of (target_values, weights)
+        self.evaluator = Evaluator(
+            main_params, omega_start, omega_end, omega_points,
+            {f"mass_{m + 1}": tv for m, (tv, _) in enumerate(target_values_weights)},
+            {f"mass_{m + 1}": w for m, (_, w) in enumerate(target_values_weights)},
+            backend=evaluation_backend, n_workers=evaluation_workers,
+        )
         
         self.abort = False
         self.is_paused = False
@@ -78,30 +99,43 @@ class NSGA2Worker(QThread):
     def resume(self):
         self.is_paused = False
 
-    def evaluate(self, individual):
+    def evaluate_population(self, individuals):
+        """Objectives of all individuals, with the FRF stage run by the evaluator in one call."""
+        summaries = self.evaluator.evaluate_many(individuals)
+        return [self.evaluate(ind, summary) for ind, summary in zip(individuals, summaries)]
+
+    @staticmethod
+    def objective_array(individuals):
+        """(N, 3) array of the individuals' objectives, all to be minimized."""
+        return -np.array([ind.fitness.wvalues for ind in individuals], dtype=float).reshape(len(individuals), -1)
+
+    @staticmethod
+    def save_run(run_data, results_dir):
+        """Write one run's results to nsga2_run_<id>.json."""
+        file_path = os.path.join(results_dir, f"nsga2_run_{run_data['run_id']}.json")
+        with open(file_path, 'w') as f:
+            json.dump(run_data, f, indent=4)
+
+    def save_archive(self, results_dir):
+        """Write the campaign's archive to nsga2_archive.json."""
+        file_path = os.path.join(results_dir, "nsga2_archive.json")
+        with open(file_path, 'w') as f:
+            json.dump(self.archive.to_dict(), f, indent=4)
+
+    def decision_diversity(self, individuals):
+        """Mean distance of the individuals to their centroid, each parameter scaled to its bounds."""
+        low, high = np.array(self.low_bounds, dtype=float), np.array(self.high_bounds, dtype=float)
+        span = np.where(high > low, high - low, 1.0)
+        scaled = (np.array(individuals, dtype=float) - low) / span
+        return float(np.mean(np.linalg.norm(scaled - scaled.mean(axis=0), axis=1)))
+
+    def evaluate(self, individual, results=None):
         # Objective 1: FRF
         try:
-            # target_values_weights is a list of 5 (masses) tuples of (target_values, weights)
-            results = frf(
-                main_system_parameters=self.main_params,
-                dva_parameters=tuple(individual),
-                omega_start=self.omega_start,
-                omega_end=self.omega_end,
-                omega_points=self.omega_points,
-                target_values_mass1=self.target_values_weights[0][0],
-                weights_mass1=self.target_values_weights[0][1],
-                target_values_mass2=self.target_values_weights[1][0],
-                weights_mass2=self.target_values_weights[1][1],
-                target_values_mass3=self.target_values_weights[2][0],
-                weights_mass3=self.target_values_weights[2][1],
-                target_values_mass4=self.target_values_weights[3][0],
-                weights_mass4=self.target_values_weights[3][1],
-                target_values_mass5=self.target_values_weights[4][0],
-                weights_mass5=self.target_values_weights[4][1],
-                plot_figure=False,
-                show_peaks=False,
-                show_slopes=False
-            )
+            if results is None:
+                results = self.evaluator.evaluate(individual)
+            if "error" in results:
+                raise RuntimeError(results["error"])
             f1 = results.get('singular_response', 1e6)
             if not np.isfinite(f1):
                 f1 = 1e6
@@ -128,6 +162,8 @@ class NSGA2Worker(QThread):
             if not os.path.exists(results_dir):
                 os.makedirs(results_dir)
 
+            self.archive = ParetoArchive(3, self.archive_max_size, self.archive_prune, self.archive_epsilon)
+
             for run_idx in range(self.num_runs):
                 if self.abort: break
                 
@@ -153,12 +189,19 @@ class NSGA2Worker(QThread):
                 toolbox.register("evaluate", self.evaluate)
                 toolbox.register("mate", tools.cxSimulatedBinaryBounded, low=self.low_bounds, up=self.high_bounds, eta=self.eta_c)
                 toolbox.register("mutate", tools.mutPolynomialBounded, low=self.low_bounds, up=self.high_bounds, eta=self.eta_m, indpb=self.indpb)
-                toolbox.register("select", tools.selNSGA2)
 
                 pop = toolbox.population(n=self.pop_size)
-                fitnesses = list(map(toolbox.evaluate, pop))
+                fitnesses = self.evaluate_population(pop)
                 for ind, fit in zip(pop, fitnesses): ind.fitness.values = fit
 
+                # Fronts and crowding distances are computed once per generation
+                # on the objective array and shared by the parent tournament,
+                # the survivor selection, the metrics and the convergence check
+                objectives = self.objective_array(pop)
+                _, ranks, crowding = select_nsga2(objectives, len(pop))
+                self.archive.add_many(objectives, pop, [(run_idx + 1, 0)] * len(pop))
+
+                front_metrics = FrontMetrics(self.hv_ref_point, self.reference_front)
                 generation_metrics = []
                 start_time = time.time()
 
@@ -168,8 +211,8 @@ class NSGA2Worker(QThread):
 
                     gen_start = time.time()
 
-                    offspring = tools.selTournamentDCD(pop, len(pop))
-                    offspring = [toolbox.clone(ind) for ind in offspring]
+                    parents = tournament_dcd(objectives, crowding, len(pop))
+                    offspring = [toolbox.clone(pop[i]) for i in parents]
 
                     for ind1, ind2 in zip(offspring[::2], offspring[1::2]):
                         if random.random() < self.cxpb:
@@ -183,28 +226,36 @@ class NSGA2Worker(QThread):
                             del ind.fitness.values
 
                     invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
-                    fitnesses = map(toolbox.evaluate, invalid_ind)
+                    fitnesses = self.evaluate_population(invalid_ind)
                     for ind, fit in zip(invalid_ind, fitnesses): ind.fitness.values = fit
+                    if invalid_ind:
+                        self.archive.add_many(self.objective_array(invalid_ind), invalid_ind,
+                                              [(run_idx + 1, gen + 1)] * len(invalid_ind))
 
-                    pop = toolbox.select(pop + offspring, self.pop_size)
-                    
-                    # Calculate Hypervolume
-                    try:
-                        from deap.tools._hypervolume import hv
-                        pareto_front = tools.sortNondominated(pop, len(pop), first_front_only=True)[0]
-                        objs = [ind.fitness.values for ind in pareto_front]
-                        hypervolume_val = hv.hypervolume(objs, self.hv_ref_point)
-                    except Exception:
-                        hypervolume_val = 0.0
+                    # Survivors keep their rank and crowding distance: the kept
+                    # fronts are whole except the last, so the ranks within the
+                    # new population are those within parents + offspring
+                    combined = pop + offspring
+                    combined_objectives = self.objective_array(combined)
+                    chosen, combined_ranks, combined_crowding = select_nsga2(combined_objectives, self.pop_size)
+                    pop = [combined[i] for i in chosen]
+                    objectives = combined_objectives[chosen]
+                    ranks = combined_ranks[chosen]
+                    crowding = combined_crowding[chosen]
+                    pareto_mask = ranks == 0
+
+                    # HV (incremental), IGD+, GD and Spread of the current front
+                    front_values = front_metrics.update(objectives[pareto_mask])
 
                     metrics = {
                         "Gen": gen + 1,
-                        "HV": hypervolume_val,
-                        "IGD+": 0.0, # Placeholder
-                        "GD": 0.0, # Placeholder
-                        "Spread": 0.0, # Placeholder
-                        "N_Pareto": len(tools.sortNondominated(pop, len(pop), first_front_only=True)[0]),
-                        "Diversity": 0.0, # Placeholder
+                        "HV": front_values["HV"],
+                        "IGD+": front_values["IGD+"],
+                        "GD": front_values["GD"],
+                        "Spread": front_values["Spread"],
+                        "N_Pareto": int(np.count_nonzero(pareto_mask)),
+                        "N_Archive": len(self.archive),
+                        "Diversity": self.decision_diversity(pop),
                         "Time (s)": time.time() - start_time,
                         "Memory (MB)": process.memory_info().rss / 1024 / 1024,
                         "Rank Diversity": 0.0, # Placeholder
@@ -220,11 +271,19 @@ class NSGA2Worker(QThread):
                         if np.max(recent_hvs) - np.min(recent_hvs) < self.convergence_epsilon:
                             break
 
-                final_pareto = tools.sortNondominated(pop, len(pop), first_front_only=True)[0]
+                if self.reference_front is None:
+                    # Score every generation against the run's final best front
+                    for metrics, values in zip(generation_metrics, front_metrics.rescore()):
+                        metrics.update(values)
+
+                final_pareto = [ind for ind, rank in zip(pop, ranks) if rank == 0]
                 run_data = {
                     "run_id": run_idx + 1,
                     "total_time_hours": (time.time() - start_time) / 3600,
                     "final_HV": generation_metrics[-1]['HV'] if generation_metrics else 0,
+                    "final_IGD+": generation_metrics[-1]['IGD+'] if generation_metrics else 0,
+                    "final_GD": generation_metrics[-1]['GD'] if generation_metrics else 0,
+                    "final_Spread": generation_metrics[-1]['Spread'] if generation_metrics else 0,
                     "pareto_size": len(final_pareto),
                     "generation_metrics": generation_metrics,
                     "final_pareto_front_objectives": [list(ind.fitness.values) for ind in final_pareto],
@@ -234,11 +293,23 @@ class NSGA2Worker(QThread):
                 all_runs_data.append(run_data)
 
                 # Save individual run to JSON
-                file_path = os.path.join(results_dir, f"nsga2_run_{run_idx + 1}.json")
-                with open(file_path, 'w') as f:
-                    import json
-                    json.dump(run_data, f, indent=4)
+                self.save_run(run_data, results_dir)
+
+            self.save_archive(results_dir)
+
+            if self.reference_front is None and all_runs_data:
+                # Final fronts are compared on the best front of the whole
+                # campaign: the archive, plus any final members it pruned
+                reference = self.archive.objectives
+                for run_data in all_runs_data:
+                    reference = merge_fronts(reference, np.reshape(run_data["final_pareto_front_objectives"], (-1, 3)))
+                for run_data in all_runs_data:
+                    values = score_front(np.reshape(run_data["final_pareto_front_objectives"], (-1, 3)), reference)
+                    run_data.update({f"final_{key}": value for key, value in values.items()})
+                    self.save_run(run_data, results_dir)
 
             self.finished.emit(all_runs_data)
         except Exception as e:
             self.error.emit(str(e))
+        finally:
+            self.evaluator.close()
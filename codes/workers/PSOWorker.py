@@ -112,6 +112,7 @@ import random
 
 # Local imports (assuming similar modules as in GAWorker)
 from modules.FRF import frf
+from modules.evaluator import Evaluator
 
 
 
@@ -131,6 +132,75 @@ class TopologyType(Enum):
     VON_NEUMANN = 3
     RANDOM = 4
 
+class Swarm:
+    """
+    Struct-of-arrays particle swarm.
+    
+    Row i of every array belongs to particle i: positions, velocities,
+    personal bests and neighborhood bests are (N, D) arrays, fitness values
+    and stagnation counters (N,) arrays. Updates of the whole swarm are
+    NumPy expressions over these arrays instead of loops over particles
+    and dimensions.
+    
+    Parameters:
+    -----------
+    positions : array-like
+        (N, D) initial positions
+    velocities : array-like
+        (N, D) initial velocities
+    fitness : array-like
+        (N,) fitness of the initial positions
+    """
+
+    def __init__(self, positions, velocities, fitness):
+        self.positions = np.array(positions, dtype=float)
+        self.velocities = np.array(velocities, dtype=float)
+        self.fitness = np.array(fitness, dtype=float)               # Current fitness
+        self.best_positions = self.positions.copy()                  # Personal bests
+        self.best_fitness = self.fitness.copy()
+        self.stagnation = np.zeros(len(self.fitness), dtype=int)    # Iterations without personal improvement
+        self.neighborhood_best_positions = self.positions.copy()
+        self.neighborhood_best_fitness = np.full(len(self.fitness), np.inf)
+
+    def __len__(self):
+        return len(self.fitness)
+
+    @property
+    def global_best_index(self):
+        """Index of the particle holding the best personal best."""
+        return int(np.argmin(self.best_fitness))
+
+    def update_personal_bests(self, fitness):
+        """Record ``fitness`` of the current positions; returns the mask of improved particles."""
+        self.fitness = np.asarray(fitness, dtype=float)
+        improved = self.fitness < self.best_fitness
+        self.best_positions[improved] = self.positions[improved]
+        self.best_fitness[improved] = self.fitness[improved]
+        self.stagnation = np.where(improved, 0, self.stagnation + 1)
+        return improved
+
+    def update_neighborhood_bests(self, neighborhoods):
+        """Move each neighborhood best to the best personal best among the neighbors if it is better."""
+        rows = np.arange(len(self))
+        candidates = neighborhoods[rows, np.argmin(self.best_fitness[neighborhoods], axis=1)]
+        better = self.best_fitness[candidates] < self.neighborhood_best_fitness
+        self.neighborhood_best_fitness[better] = self.best_fitness[candidates[better]]
+        self.neighborhood_best_positions[better] = self.best_positions[candidates[better]]
+
+    def keep(self, indices):
+        """Reduce the swarm to the particles at ``indices``."""
+        for name in ('positions', 'velocities', 'fitness', 'best_positions', 'best_fitness', 'stagnation',
+                     'neighborhood_best_positions', 'neighborhood_best_fitness'):
+            setattr(self, name, getattr(self, name)[indices])
+
+    def extend(self, positions, velocities, fitness):
+        """Append new particles whose personal bests are their positions."""
+        added = Swarm(positions, velocities, fitness)
+        for name in ('positions', 'velocities', 'fitness', 'best_positions', 'best_fitness', 'stagnation',
+                     'neighborhood_best_positions', 'neighborhood_best_fitness'):
+            setattr(self, name, np.concatenate([getattr(self, name), getattr(added, name)]))
+
+
 class PSOWorker(QThread):
     """
     Advanced Particle Swarm Optimization (PSO) worker thread for vibration system optimization.
@@ -206,7 +276,10 @@ class PSOWorker(QThread):
                  rl_alpha=0.1,
                  rl_gamma=0.9,
                  rl_epsilon=0.2,
-                 rl_epsilon_decay=0.95):
+                 rl_epsilon_decay=0.95,
+                 # Evaluation engine
+                 evaluation_backend="serial",  # "serial", "thread", "process" or "batch"
+                 evaluation_workers=None):
         """
         Initialize the enhanced PSO optimization worker with advanced features.
         
@@ -264,6 +337,11 @@ class PSOWorker(QThread):
             Minimum diversity threshold as fraction of parameter range (default: 0.01)
         quasi_random_init : bool
             Use quasi-random initialization (Sobol sequence) for better space coverage (default: True)
+        evaluation_backend : str
+            Backend of the evaluation engine evaluating each swarm: "serial", "thread",
+            "process" or "batch" (default: "serial")
+        evaluation_workers : int
+            Threads/processes of the parallel backends (default: all cores but one)
         """
         super().__init__()
         
@@ -277,6 +355,10 @@ class PSOWorker(QThread):
         self.omega_start = omega_start
         self.omega_end = omega_end
         self.omega_points = omega_points
+        self.evaluator = Evaluator(
+            main_params, omega_start, omega_end, omega_points, target_values_dict, weights_dict,
+            backend=evaluation_backend, n_workers=evaluation_workers,
+        )
         
         # PSO parameters
         self.pso_swarm_size = pso_swarm_size
@@ -534,8 +616,8 @@ class PSOWorker(QThread):
         
         Parameters:
         -----------
-        swarm : list
-            List of particle dictionaries
+        swarm : Swarm or ndarray
+            The swarm, or its (N, D) array of positions
         parameter_bounds : list
             List of (min, max) tuples for each parameter
             
@@ -544,42 +626,25 @@ class PSOWorker(QThread):
         float
             Diversity value between 0 (no diversity) and 1 (maximum diversity)
         """
-        if not swarm:
+        positions = np.asarray(getattr(swarm, 'positions', swarm), dtype=float)
+        if positions.ndim != 2 or positions.shape[0] <= 1:
             return 0
         
-        num_particles = len(swarm)
-        if num_particles <= 1:
-            return 0
+        num_particles, num_dimensions = positions.shape
         
-        num_dimensions = len(swarm[0]['position'])
-        
-        # Calculate swarm center (centroid)
-        centroid = [0.0] * num_dimensions
-        for particle in swarm:
-            for j in range(num_dimensions):
-                centroid[j] += particle['position'][j]
-        
-        for j in range(num_dimensions):
-            centroid[j] /= num_particles
-        
-        # Calculate average normalized distance to centroid
-        total_distance = 0
-        for particle in swarm:
-            distance_sq = 0
-            for j in range(num_dimensions):
-                # Normalize by parameter range to handle different scales
-                param_range = parameter_bounds[j][1] - parameter_bounds[j][0]
-                if param_range > 0:  # Avoid division by zero
-                    normalized_diff = (particle['position'][j] - centroid[j]) / param_range
-                    distance_sq += normalized_diff ** 2
-            
-            total_distance += math.sqrt(distance_sq / num_dimensions)
+        # Normalize the offsets from the swarm center (centroid) by the
+        # parameter ranges to handle different scales; fixed parameters
+        # (zero range) do not contribute
+        param_range = np.array([high - low for low, high in parameter_bounds], dtype=float)
+        scale = np.divide(1.0, param_range, out=np.zeros_like(param_range), where=param_range > 0)
+        normalized_diff = (positions - positions.mean(axis=0)) * scale
+        total_distance = np.sqrt((normalized_diff ** 2).sum(axis=1) / num_dimensions).sum()
         
         # Normalize by theoretical maximum diversity (assuming uniform distribution)
         # and scale by dimensionality
         diversity = total_distance / (num_particles * math.sqrt(num_dimensions / 12))
         
-        return min(1.0, diversity)  # Cap at 1.0 for meaningful interpretation
+        return min(1.0, float(diversity))  # Cap at 1.0 for meaningful interpretation
 
     def create_neighborhoods(self, swarm_size, topology_type):
         """
@@ -603,62 +668,46 @@ class PSOWorker(QThread):
             
         Returns:
         --------
-        list
-            List of neighborhood lists for each particle
+        ndarray
+            (swarm_size, K) index array: row i lists the neighbors of particle i,
+            itself included. Rows with fewer neighbors are padded with i, which
+            leaves the neighborhood best unchanged.
         """
-        neighborhoods = []
+        index = np.arange(swarm_size)
         
         if topology_type == TopologyType.GLOBAL:
             # Global topology: each particle is connected to all others
-            for i in range(swarm_size):
-                neighbors = list(range(swarm_size))
-                neighborhoods.append(neighbors)
+            return np.tile(index, (swarm_size, 1))
                 
-        elif topology_type == TopologyType.RING:
+        if topology_type == TopologyType.RING:
             # Ring topology: each particle is connected to its immediate neighbors
-            for i in range(swarm_size):
-                left = (i - 1) % swarm_size
-                right = (i + 1) % swarm_size
-                neighborhoods.append([left, i, right])
+            return np.stack([(index - 1) % swarm_size, index, (index + 1) % swarm_size], axis=1)
                 
-        elif topology_type == TopologyType.VON_NEUMANN:
+        if topology_type == TopologyType.VON_NEUMANN:
             # Von Neumann topology: grid-like arrangement with 4 neighbors per particle
             # Calculate grid dimensions for closest square-like grid
             side = int(math.ceil(math.sqrt(swarm_size)))
-            for i in range(swarm_size):
-                row, col = i // side, i % side
-                neighbors = [i]  # Include self
+            row, col = index // side, index % side
+            neighbors = np.stack([
+                index,
+                ((row - 1) % side) * side + col,   # north
+                ((row + 1) % side) * side + col,   # south
+                row * side + ((col - 1) % side),   # west
+                row * side + ((col + 1) % side),   # east
+            ], axis=1)
+            # Grid cells beyond the swarm do not exist
+            return np.where(neighbors < swarm_size, neighbors, index[:, None])
                 
-                # Add north, east, south, west neighbors if they exist
-                north = ((row - 1) % side) * side + col
-                south = ((row + 1) % side) * side + col
-                west = row * side + ((col - 1) % side)
-                east = row * side + ((col + 1) % side)
-                
-                if north < swarm_size:
-                    neighbors.append(north)
-                if south < swarm_size:
-                    neighbors.append(south)
-                if west < swarm_size:
-                    neighbors.append(west)
-                if east < swarm_size:
-                    neighbors.append(east)
-                
-                neighborhoods.append(neighbors)
-                
-        elif topology_type == TopologyType.RANDOM:
+        if topology_type == TopologyType.RANDOM:
             # Random topology: each particle is connected to k random others
             k = min(5, swarm_size - 1)  # Number of random connections
-            for i in range(swarm_size):
-                # Always include self
-                neighbors = [i]
-                # Add k random distinct neighbors
-                potential_neighbors = list(range(swarm_size))
-                potential_neighbors.remove(i)  # Remove self
-                neighbors.extend(random.sample(potential_neighbors, k))
-                neighborhoods.append(neighbors)
+            # Random distinct offsets exclude the particle itself
+            if k < 1:
+                return index[:, None]
+            offsets = np.argpartition(np.random.random((swarm_size, swarm_size - 1)), k - 1, axis=1)[:, :k] + 1
+            return np.concatenate([index[:, None], (index[:, None] + offsets) % swarm_size], axis=1)
         
-        return neighborhoods
+        return index[:, None]
 
     def update_neighborhoods(self, iteration):
         """
@@ -674,11 +723,11 @@ class PSOWorker(QThread):
         """
         # Only update for RANDOM topology, and only every 5 iterations
         if self.topology == TopologyType.RANDOM and iteration % 5 == 0:
-            self.neighborhoods = self.create_neighborhoods(self.pso_swarm_size, self.topology)
+            self.neighborhoods = self.create_neighborhoods(len(self.neighborhoods), self.topology)
 
-    def handle_boundary_violation(self, position, velocity, dim, low, high):
+    def handle_boundary_violation(self, positions, velocities, lows, highs):
         """
-        Handle boundary violations using different strategies.
+        Handle boundary violations of the whole swarm using different strategies.
         
         Implements three boundary handling methods:
         1. Absorbing: Position is set to boundary, velocity zeroed
@@ -692,57 +741,45 @@ class PSOWorker(QThread):
         
         Parameters:
         -----------
-        position : float
-            Current position value for the dimension
-        velocity : float
-            Current velocity value for the dimension
-        dim : int
-            Dimension index
-        low : float
-            Lower bound for the dimension
-        high : float
-            Upper bound for the dimension
+        positions : ndarray
+            (N, D) positions after the move
+        velocities : ndarray
+            (N, D) velocities of the move
+        lows, highs : ndarray
+            (D,) lower and upper bounds
             
         Returns:
         --------
         tuple
-            Updated (position, velocity)
+            Updated (positions, velocities)
         """
-        if low <= position <= high:
-            return position, velocity
+        below = positions < lows
+        above = positions > highs
+        if not (below.any() or above.any()):
+            return positions, velocities
         
-        if self.boundary_handling == "absorbing":
-            # Set position to boundary and zero out velocity
-            if position < low:
-                return low, 0
-            else:
-                return high, 0
-                
-        elif self.boundary_handling == "reflecting":
-            # Bounce off boundary and invert velocity
-            if position < low:
-                overshoot = low - position
-                return low + overshoot, -velocity * 0.8  # Dampen velocity
-            else:
-                overshoot = position - high
-                return high - overshoot, -velocity * 0.8  # Dampen velocity
-                
-        elif self.boundary_handling == "invisible":
+        if self.boundary_handling == "invisible":
             # Allow particles to move outside boundaries
             # (fitness function will penalize invalid positions)
-            return position, velocity
+            return positions, velocities
+                
+        if self.boundary_handling == "reflecting":
+            # Bounce off boundary and invert velocity
+            positions = np.where(below, 2 * lows - positions, np.where(above, 2 * highs - positions, positions))
+            velocities = np.where(below | above, -velocities * 0.8, velocities)  # Dampen velocity
+            return positions, velocities
             
-        # Default to absorbing if invalid method
-        if position < low:
-            return low, 0
-        else:
-            return high, 0
+        # Absorbing (also the default for an invalid method): set position to
+        # boundary and zero out velocity
+        positions = np.clip(positions, lows, highs)
+        velocities = np.where(below | above, 0.0, velocities)
+        return positions, velocities
 
-    def apply_mutation(self, position, parameter_bounds, fixed_parameters):
+    def apply_mutation(self, positions, parameter_bounds, fixed_parameters):
         """
-        Apply mutation to particle position to maintain diversity.
+        Apply mutation to the particle positions to maintain diversity.
         
-        Mutation randomly perturbs some dimensions of the position vector
+        Mutation randomly perturbs some dimensions of the position vectors
         to help the swarm escape local optima and explore the search space.
         
         Scientific basis:
@@ -752,8 +789,8 @@ class PSOWorker(QThread):
         
         Parameters:
         -----------
-        position : list
-            Current position vector
+        positions : ndarray
+            (N, D) position vectors
         parameter_bounds : list
             List of (min, max) tuples for each parameter
         fixed_parameters : dict
@@ -761,29 +798,25 @@ class PSOWorker(QThread):
             
         Returns:
         --------
-        list
-            Mutated position vector
+        ndarray
+            Mutated position vectors
         """
-        mutated_position = position[:]
-        
-        for j in range(len(position)):
-            # Skip fixed parameters
-            if j in fixed_parameters:
-                continue
-                
-            # Apply mutation with probability mutation_rate
-            if random.random() < self.mutation_rate:
-                low, high = parameter_bounds[j]
-                # Gaussian mutation centered on current value
-                # with standard deviation proportional to parameter range
-                sigma = (high - low) * 0.1
-                mutation = random.gauss(0, sigma)
-                mutated_position[j] += mutation
-                
-                # Ensure bounds are respected
-                mutated_position[j] = max(low, min(high, mutated_position[j]))
-                
-        return mutated_position
+        positions = np.array(positions, dtype=float)
+        lows = np.array([b[0] for b in parameter_bounds], dtype=float)
+        highs = np.array([b[1] for b in parameter_bounds], dtype=float)
+        
+        # Apply mutation with probability mutation_rate, skipping fixed parameters
+        mutate = np.random.random(positions.shape) < self.mutation_rate
+        if fixed_parameters:
+            mutate[:, list(fixed_parameters)] = False
+        
+        # Gaussian mutation centered on current value
+        # with standard deviation proportional to parameter range
+        sigma = (highs - lows) * 0.1
+        mutated = positions + np.random.normal(size=positions.shape) * sigma
+        
+        # Ensure bounds are respected
+        return np.where(mutate, np.clip(mutated, lows, highs), positions)
 
     def quasi_random_initialize(self, num_params, parameter_bounds, fixed_parameters, num_particles):
         """
@@ -811,8 +844,8 @@ class PSOWorker(QThread):
             
         Returns:
         --------
-        list
-            List of initialized position vectors
+        ndarray
+            (num_particles, num_params) initial positions
         """
         # Create Sobol sequence generator
         sampler = qmc.Sobol(d=num_params, scramble=True)
@@ -820,20 +853,10 @@ class PSOWorker(QThread):
         # Generate samples in [0, 1] range
         samples = sampler.random(n=num_particles)
         
-        # Scale to parameter bounds
-        positions = []
-        for i in range(num_particles):
-            position = []
-            for j in range(num_params):
-                if j in fixed_parameters:
-                    pos = fixed_parameters[j]
-                else:
-                    low, high = parameter_bounds[j]
-                    pos = low + samples[i, j] * (high - low)
-                position.append(pos)
-            positions.append(position)
-            
-        return positions
+        # Scale to parameter bounds (fixed parameters have identical bounds)
+        lows = np.array([b[0] for b in parameter_bounds], dtype=float)
+        highs = np.array([b[1] for b in parameter_bounds], dtype=float)
+        return lows + samples * (highs - lows)
 
     def run(self):
         """
@@ -909,12 +932,19 @@ class PSOWorker(QThread):
                     parameter_bounds.append((low, high))
             num_params = len(parameter_bounds)
 
+            # Bounds, fixed-parameter mask and velocity limits as (D,) arrays
+            lows = np.array([b[0] for b in parameter_bounds], dtype=float)
+            highs = np.array([b[1] for b in parameter_bounds], dtype=float)
+            fixed_mask = np.zeros(num_params, dtype=bool)
+            fixed_mask[list(fixed_parameters)] = True
+            fixed_values = lows  # fixed parameters have identical bounds
+            # Max velocities for each dimension (for velocity clamping)
+            max_velocities = (highs - lows) * self.max_velocity_factor
+
             # Create neighborhood structure based on topology
             self.neighborhoods = self.create_neighborhoods(self.pso_swarm_size, self.topology)
             
             # Initialize the swarm with random or quasi-random positions
-            swarm = []
-            
             if self.quasi_random_init:
                 # Quasi-random initialization for positions (better space coverage)
                 positions = self.quasi_random_initialize(
@@ -922,81 +952,45 @@ class PSOWorker(QThread):
                 )
             else:
                 # Standard random initialization
-                positions = []
-            for i in range(self.pso_swarm_size):
-                position = []
-                for j in range(num_params):
-                    low, high = parameter_bounds[j]
-                    if j in fixed_parameters:
-                        pos = fixed_parameters[j]
-                    else:
-                        pos = random.uniform(low, high)
-                    position.append(pos)
-                    positions.append(position)
+                positions = np.random.uniform(lows, highs, size=(self.pso_swarm_size, num_params))
             
-            # Calculate max velocities for each dimension (for velocity clamping)
-            max_velocities = []
-            for j in range(num_params):
-                low, high = parameter_bounds[j]
-                max_velocities.append((high - low) * self.max_velocity_factor)
-            
-            # Initialize each particle
-            for i in range(self.pso_swarm_size):
-                position = positions[i]
-                velocity = []
-                
-                # Initialize velocity
-                for j in range(num_params):
-                    if j in fixed_parameters:
-                        vel = 0
-                    else:
-                        # Initialize velocity with a smaller range for stability
-                        max_vel = max_velocities[j]
-                        vel = random.uniform(-max_vel/2, max_vel/2)
-                    velocity.append(vel)
-                
-                # Evaluate initial fitness
-                fitness = self.evaluate_particle(position, parameter_bounds)
-                
-                # Create particle
-                particle = {
-                    'position': position,                 # Current position vector
-                    'velocity': velocity,                 # Current velocity vector
-                    'best_position': position[:],         # Best position found by this particle
-                    'best_fitness': fitness,              # Best fitness achieved by this particle
-                    'current_fitness': fitness,           # Current fitness (for tracking improvement)
-                    'stagnation_counter': 0,              # Counter for personal stagnation
-                    'neighborhood_best_position': None,   # Best position in the neighborhood
-                    'neighborhood_best_fitness': float('inf')  # Best fitness in the neighborhood
-                }
-                swarm.append(particle)
+            # Initialize velocities with a smaller range for stability; the
+            # initial swarm is evaluated in one call
+            velocities = np.random.uniform(-max_velocities / 2, max_velocities / 2,
+                                           size=(self.pso_swarm_size, num_params))
+            velocities[:, fixed_mask] = 0.0
+            swarm = Swarm(positions, velocities, self.evaluate_swarm(positions, parameter_bounds))
 
             # Calculate initial diversity
             diversity = self.calculate_diversity(swarm, parameter_bounds)
             self.iteration_diversity.append(diversity)
             
-            # Determine the global best particle in the initial swarm
-            global_best_particle_idx = 0
-            global_best_fitness = float('inf')
-            
-            for i, particle in enumerate(swarm):
-                if particle['best_fitness'] < global_best_fitness:
-                    global_best_fitness = particle['best_fitness']
-                    global_best_particle_idx = i
-            
             # Set initial neighborhood bests based on topology
-            for i, particle in enumerate(swarm):
-                neighborhood_best_fitness = float('inf')
-                neighborhood_best_idx = i
-                
-                for neighbor_idx in self.neighborhoods[i]:
-                    neighbor = swarm[neighbor_idx]
-                    if neighbor['best_fitness'] < neighborhood_best_fitness:
-                        neighborhood_best_fitness = neighbor['best_fitness']
-                        neighborhood_best_idx = neighbor_idx
-                
-                particle['neighborhood_best_position'] = swarm[neighborhood_best_idx]['best_position'][:]
-                particle['neighborhood_best_fitness'] = neighborhood_best_fitness
+            swarm.update_neighborhood_bests(self.neighborhoods)
+
+            def particles_around_best(count):
+                # Random positions within 10% of the range around the global best
+                # particle, with fresh velocities
+                center = swarm.positions[swarm.global_best_index]
+                radius = (highs - lows) * 0.1
+                new_pos = np.random.uniform(np.maximum(lows, center - radius), np.minimum(highs, center + radius),
+                                            size=(count, num_params))
+                new_pos[:, fixed_mask] = fixed_values[fixed_mask]
+                new_vel = np.random.uniform(-max_velocities / 2, max_velocities / 2, size=(count, num_params))
+                new_vel[:, fixed_mask] = 0.0
+                return new_pos, new_vel
+
+            def resize_swarm(new_size):
+                # Shrink: keep best by personal best fitness
+                if new_size < len(swarm):
+                    swarm.keep(np.argsort(swarm.best_fitness, kind='stable')[:new_size])
+                # Grow: add random particles around global best
+                elif new_size > len(swarm):
+                    new_pos, new_vel = particles_around_best(new_size - len(swarm))
+                    swarm.extend(new_pos, new_vel, self.evaluate_swarm(new_pos, parameter_bounds))
+                # The topology follows the swarm size
+                self.neighborhoods = self.create_neighborhoods(len(swarm), self.topology)
+                swarm.update_neighborhood_bests(self.neighborhoods)
 
             # Optional ML/Bandit controller (GA parity) over PSO rates and swarm size
             if self.use_ml_adaptive:
@@ -1031,41 +1025,6 @@ class PSOWorker(QThread):
                     ml_counts[idx] += 1
                     ml_sums[idx] += float(reward)
 
-                def resize_swarm(swarm_list, new_size):
-                    # Shrink: keep best by current fitness
-                    if new_size < len(swarm_list):
-                        swarm_list.sort(key=lambda p: p['best_fitness'])
-                        return swarm_list[:new_size]
-                    # Grow: add random particles around global best
-                    extra = new_size - len(swarm_list)
-                    for _ in range(extra):
-                        gb = swarm[global_best_particle_idx]
-                        new_pos = []
-                        for j in range(num_params):
-                            lo, hi = parameter_bounds[j]
-                            center = gb['position'][j]
-                            radius = (hi - lo) * 0.1
-                            new_pos.append(random.uniform(max(lo, center - radius), min(hi, center + radius)))
-                        new_vel = []
-                        for j in range(num_params):
-                            if j in fixed_parameters:
-                                new_vel.append(0.0)
-                            else:
-                                max_vel = (parameter_bounds[j][1] - parameter_bounds[j][0]) * self.max_velocity_factor
-                                new_vel.append(random.uniform(-max_vel/2, max_vel/2))
-                        new_fit = self.evaluate_particle(new_pos, parameter_bounds)
-                        swarm_list.append({
-                            'position': new_pos,
-                            'velocity': new_vel,
-                            'best_position': new_pos[:],
-                            'best_fitness': new_fit,
-                            'current_fitness': new_fit,
-                            'stagnation_counter': 0,
-                            'neighborhood_best_position': None,
-                            'neighborhood_best_fitness': float('inf')
-                        })
-                    return swarm_list
-
             # Optional RL controller setup (GA parity)
             if self.use_rl_controller:
                 # Define action space for RL agent: relative deltas for w, c1, c2 and population multiplier
@@ -1103,42 +1062,7 @@ class PSOWorker(QThread):
                     q_next_max = max(rl_q[next_state]) if rl_q[next_state] else 0.0
                     rl_q[state][action_idx] = q_old + self.rl_alpha * (reward + self.rl_gamma * q_next_max - q_old)
 
-                def rl_resize_swarm(swarm_list, new_size):
-                    # Shrink: keep best by current fitness
-                    if new_size < len(swarm_list):
-                        swarm_list.sort(key=lambda p: p['best_fitness'])
-                        return swarm_list[:new_size]
-                    # Grow: add random particles around global best
-                    extra = new_size - len(swarm_list)
-                    for _ in range(extra):
-                        gb = swarm[global_best_particle_idx]
-                        new_pos = []
-                        for j in range(num_params):
-                            lo, hi = parameter_bounds[j]
-                            center = gb['position'][j]
-                            radius = (hi - lo) * 0.1
-                            new_pos.append(random.uniform(max(lo, center - radius), min(hi, center + radius)))
-                        new_vel = []
-                        for j in range(num_params):
-                            if j in fixed_parameters:
-                                new_vel.append(0.0)
-                            else:
-                                max_vel = (parameter_bounds[j][1] - parameter_bounds[j][0]) * self.max_velocity_factor
-                                new_vel.append(random.uniform(-max_vel/2, max_vel/2))
-                        new_fit = self.evaluate_particle(new_pos, parameter_bounds)
-                        swarm_list.append({
-                            'position': new_pos,
-                            'velocity': new_vel,
-                            'best_position': new_pos[:],
-                            'best_fitness': new_fit,
-                            'current_fitness': new_fit,
-                            'stagnation_counter': 0,
-                            'neighborhood_best_position': None,
-                            'neighborhood_best_fitness': float('inf')
-                        })
-                    return swarm_list
-
-            # PSO main loop: update each particle's velocity and position.
+            # PSO main loop: update the velocities and positions of the whole swarm.
             for iteration in range(1, self.pso_num_iterations + 1):
                 # Check if termination has been requested
                 if self._terminate_flag:
@@ -1162,7 +1086,7 @@ class PSOWorker(QThread):
                 if self.adaptive_params or self.use_ml_adaptive or self.use_rl_controller:
                     adapt_start = time.time() if self.track_metrics else None
                     # Calculate current average fitness
-                    avg_fitness = sum(p['current_fitness'] for p in swarm) / len(swarm)
+                    avg_fitness = float(np.mean(swarm.fitness))
                     
                     # Calculate current diversity
                     diversity = self.calculate_diversity(swarm, parameter_bounds)
@@ -1175,9 +1099,7 @@ class PSOWorker(QThread):
                         idx, new_w, new_c1, new_c2, new_pop = ml_select_action(self.pso_w, self.pso_c1, self.pso_c2, len(swarm))
                         self.pso_w, self.pso_c1, self.pso_c2 = new_w, new_c1, new_c2
                         if self.ml_adapt_population and new_pop != len(swarm):
-                            swarm = resize_swarm(swarm, new_pop)
-                            # Recompute global best after resizing
-                            global_best_particle_idx = min(range(len(swarm)), key=lambda i: swarm[i]['best_fitness'])
+                            resize_swarm(new_pop)
                         # Log/record rates for this iteration
                         if self.track_metrics:
                             self.metrics['rates_history'].append({'generation': iteration, 'w': self.pso_w, 'c1': self.pso_c1, 'c2': self.pso_c2})
@@ -1186,15 +1108,14 @@ class PSOWorker(QThread):
                         rl_idx, new_w, new_c1, new_c2, new_pop = rl_select_action(self.pso_w, self.pso_c1, self.pso_c2, len(swarm))
                         self.pso_w, self.pso_c1, self.pso_c2 = new_w, new_c1, new_c2
                         if new_pop != len(swarm):
-                            swarm = rl_resize_swarm(swarm, new_pop)
-                            global_best_particle_idx = min(range(len(swarm)), key=lambda i: swarm[i]['best_fitness'])
+                            resize_swarm(new_pop)
                         if self.track_metrics:
                             self.metrics['rates_history'].append({'generation': iteration, 'w': self.pso_w, 'c1': self.pso_c1, 'c2': self.pso_c2})
                     else:
                         # Update inertia weight
                         self.pso_w = self.adaptive_inertia_weight(
                             iteration, self.pso_num_iterations,
-                            swarm[global_best_particle_idx]['best_fitness'],
+                            swarm.best_fitness[swarm.global_best_index],
                             avg_fitness, diversity
                         )
                         # Update acceleration coefficients
@@ -1207,102 +1128,59 @@ class PSOWorker(QThread):
                     if self.track_metrics and adapt_start is not None:
                         time_breakdown['adaptation'] = time.time() - adapt_start
                 
-                # Update all particles
-                current_fitnesses = []
-                
                 # Check termination flag again before updating particles
                 if self._terminate_flag:
                     break
                     
                 update_start = time.time() if self.track_metrics else None
-                eval_time_accum = 0.0
-                velpos_time_accum = 0.0
-                for i, particle in enumerate(swarm):
-                    # Update velocities and positions for each dimension
-                    velpos_start_particle = time.time() if self.track_metrics else None
-                    for j in range(num_params):
-                        # For fixed parameters, ensure they remain constant
-                        if j in fixed_parameters:
-                            particle['velocity'][j] = 0
-                            particle['position'][j] = fixed_parameters[j]
-                        else:
-                            # Generate random weights for cognitive and social components
-                            r1 = random.random()  # Random factor for cognitive component
-                            r2 = random.random()  # Random factor for social component
-                            
-                            # Determine social attractor (neighborhood best or global best)
-                            if self.topology != TopologyType.GLOBAL:
-                                # Use neighborhood best for local topologies
-                                social_best_position = particle['neighborhood_best_position'][j]
-                            else:
-                                # Use global best for global topology
-                                social_best_position = swarm[global_best_particle_idx]['best_position'][j]
-                            
-                            # Calculate cognitive component: attraction to particle's best position
-                            cognitive = self.pso_c1 * r1 * (particle['best_position'][j] - particle['position'][j])
-                            
-                            # Calculate social component: attraction to neighborhood/global best position
-                            social = self.pso_c2 * r2 * (social_best_position - particle['position'][j])
-                            
-                            # Calculate raw velocity update
-                            raw_velocity = self.pso_w * particle['velocity'][j] + cognitive + social
-                            
-                            # Apply constriction factor for stability if needed
-                            if self.constriction_factor != 1.0:
-                                raw_velocity *= self.constriction_factor
-                            
-                            # Apply velocity clamping to prevent explosion
-                            max_vel = max_velocities[j]
-                            particle['velocity'][j] = max(-max_vel, min(max_vel, raw_velocity))
-                            
-                            # Update position
-                            particle['position'][j] += particle['velocity'][j]
-                            
-                            # Handle boundary violations
-                            particle['position'][j], particle['velocity'][j] = self.handle_boundary_violation(
-                                particle['position'][j], particle['velocity'][j], j, parameter_bounds[j][0], parameter_bounds[j][1]
-                            )
-                    
-                    # Apply mutation for diversity maintenance if needed
-                    if diversity < self.diversity_threshold:
-                        mutated_position = self.apply_mutation(
-                            particle['position'], parameter_bounds, fixed_parameters
-                        )
-                        particle['position'] = mutated_position
-                    
-                    # Evaluate new position
-                    if self.track_metrics:
-                        _eval_t0 = time.time()
-                    fitness = self.evaluate_particle(particle['position'], parameter_bounds)
-                    if self.track_metrics:
-                        eval_time_accum += (time.time() - _eval_t0)
-                    if self.track_metrics:
-                        self.metrics['evaluation_count'] += 1
-                    particle['current_fitness'] = fitness
-                    current_fitnesses.append(fitness)
-                    
-                    # Update personal best if improved
-                    if fitness < particle['best_fitness']:
-                        particle['best_position'] = particle['position'][:]
-                        particle['best_fitness'] = fitness
-                        particle['stagnation_counter'] = 0  # Reset stagnation counter
-                        # Attach fitness components if available (GA-style reporting support)
-                        if hasattr(self, '_last_eval_components') and isinstance(self._last_eval_components, dict):
-                            # mirror GA individual's component attributes names
-                            particle['primary_objective'] = self._last_eval_components.get('primary_objective', 0.0)
-                            particle['sparsity_penalty'] = self._last_eval_components.get('sparsity_penalty', 0.0)
-                            particle['percentage_error'] = self._last_eval_components.get('percentage_error', 0.0)
-                    else:
-                        # Increment stagnation counter if no improvement
-                        particle['stagnation_counter'] += 1
-                    
-                    # Update global best if improved
-                    if fitness < swarm[global_best_particle_idx]['best_fitness']:
-                        global_best_particle_idx = i
-                        self.last_improvement_iter = iteration
-                
-                    if self.track_metrics and velpos_start_particle is not None:
-                        velpos_time_accum += (time.time() - velpos_start_particle)
+
+                # Velocity update for the whole swarm: random weights per particle
+                # and dimension for the cognitive and social components
+                velocity_start = time.time()
+                r1 = np.random.random(swarm.positions.shape)
+                r2 = np.random.random(swarm.positions.shape)
+                # Social attractor: neighborhood best for local topologies, global best otherwise
+                if self.topology != TopologyType.GLOBAL:
+                    social_best = swarm.neighborhood_best_positions
+                else:
+                    social_best = swarm.best_positions[swarm.global_best_index]
+                cognitive = self.pso_c1 * r1 * (swarm.best_positions - swarm.positions)
+                social = self.pso_c2 * r2 * (social_best - swarm.positions)
+                raw_velocity = self.pso_w * swarm.velocities + cognitive + social
+                # Apply constriction factor for stability if needed
+                if self.constriction_factor != 1.0:
+                    raw_velocity *= self.constriction_factor
+                # Apply velocity clamping to prevent explosion
+                velocities = np.clip(raw_velocity, -max_velocities, max_velocities)
+                velocity_time = time.time() - velocity_start
+
+                # Position update with boundary handling; fixed parameters stay constant
+                position_start = time.time()
+                positions, velocities = self.handle_boundary_violation(
+                    swarm.positions + velocities, velocities, lows, highs
+                )
+                velocities[:, fixed_mask] = 0.0
+                positions[:, fixed_mask] = fixed_values[fixed_mask]
+                # Apply mutation for diversity maintenance if needed
+                if diversity < self.diversity_threshold:
+                    positions = self.apply_mutation(positions, parameter_bounds, fixed_parameters)
+                swarm.positions, swarm.velocities = positions, velocities
+                position_time = time.time() - position_start
+
+                # Evaluate the new positions of the whole swarm in one call to the
+                # evaluation engine (the swarm moves synchronously, towards the
+                # bests of the previous iteration)
+                _eval_t0 = time.time()
+                previous_best = swarm.best_fitness[swarm.global_best_index]
+                current_fitnesses = self.evaluate_swarm(swarm.positions, parameter_bounds)
+                if self.track_metrics:
+                    self.metrics['evaluation_count'] += len(swarm)
+                # Update personal bests (resetting or incrementing stagnation counters)
+                swarm.update_personal_bests(current_fitnesses)
+                global_best_particle_idx = swarm.global_best_index
+                if swarm.best_fitness[global_best_particle_idx] < previous_best:
+                    self.last_improvement_iter = iteration
+                eval_time_accum = time.time() - _eval_t0
                 if self.track_metrics and update_start is not None:
                     time_breakdown['update'] = time.time() - update_start
 
@@ -1310,70 +1188,45 @@ class PSOWorker(QThread):
                 neigh_start = time.time() if self.track_metrics else None
                 neigh_time = 0.0
                 if self.topology != TopologyType.GLOBAL:
-                    for i, particle in enumerate(swarm):
-                        for neighbor_idx in self.neighborhoods[i]:
-                            neighbor = swarm[neighbor_idx]
-                            if neighbor['best_fitness'] < particle['neighborhood_best_fitness']:
-                                particle['neighborhood_best_fitness'] = neighbor['best_fitness']
-                                particle['neighborhood_best_position'] = neighbor['best_position'][:]
+                    swarm.update_neighborhood_bests(self.neighborhoods)
                 if self.track_metrics and neigh_start is not None:
                     neigh_time = time.time() - neigh_start
                     time_breakdown['neighborhood'] = neigh_time
                 
                 # Calculate and store statistics
-                avg_fitness = sum(current_fitnesses) / len(current_fitnesses)
-                self.iteration_best_fitness.append(swarm[global_best_particle_idx]['best_fitness'])
+                best_fitness_now = float(swarm.best_fitness[global_best_particle_idx])
+                avg_fitness = float(np.mean(current_fitnesses))
+                self.iteration_best_fitness.append(best_fitness_now)
                 self.iteration_avg_fitness.append(avg_fitness)
                 if self.track_metrics:
-                    fits = current_fitnesses[:]
-                    self.metrics['fitness_history'].append(fits)
-                    length = len(fits)
-                    mean = sum(fits) / max(1, length)
-                    sum2 = sum(f ** 2 for f in fits)
-                    std = abs(sum2 / max(1, length) - mean ** 2) ** 0.5
-                    self.metrics['mean_fitness_history'].append(mean)
-                    self.metrics['std_fitness_history'].append(std)
-                    self.metrics['best_fitness_per_gen'].append(swarm[global_best_particle_idx]['best_fitness'])
-                    self.metrics['best_individual_per_gen'].append(list(swarm[global_best_particle_idx]['best_position']))
+                    self.metrics['fitness_history'].append(current_fitnesses.tolist())
+                    self.metrics['mean_fitness_history'].append(avg_fitness)
+                    self.metrics['std_fitness_history'].append(float(np.std(current_fitnesses)))
+                    self.metrics['best_fitness_per_gen'].append(best_fitness_now)
+                    self.metrics['best_individual_per_gen'].append(swarm.best_positions[global_best_particle_idx].tolist())
                     # Record current swarm size (may change under ML controller)
                     self.metrics['pop_size_history'].append(len(swarm))
                     self.metrics['rates_history'].append({'generation': iteration, 'w': self.pso_w, 'c1': self.pso_c1, 'c2': self.pso_c2})
-                    # Per-iteration operation timings (provide approximate split for vel/pos)
+                    # Per-iteration operation timings
                     self.metrics.setdefault('evaluation_times', []).append(float(eval_time_accum))
-                    # Split combined vel/pos time evenly for visualization purposes
-                    half = float(velpos_time_accum) * 0.5
-                    self.metrics.setdefault('velocity_update_times', []).append(half)
-                    self.metrics.setdefault('position_update_times', []).append(half)
+                    self.metrics.setdefault('velocity_update_times', []).append(float(velocity_time))
+                    self.metrics.setdefault('position_update_times', []).append(float(position_time))
                     self.metrics.setdefault('neighborhood_update_times', []).append(float(neigh_time))
                 
                 # Handle stagnation: Reinitialize particles that haven't improved
-                for i, particle in enumerate(swarm):
-                    if particle['stagnation_counter'] >= self.stagnation_limit:
-                        # Reinitialize position (except fixed parameters)
-                        for j in range(num_params):
-                            if j not in fixed_parameters:
-                                low, high = parameter_bounds[j]
-                                # Reinitialize around global best with some noise
-                                center = swarm[global_best_particle_idx]['position'][j]
-                                radius = (high - low) * 0.1
-                                particle['position'][j] = random.uniform(
-                                    max(low, center - radius),
-                                    min(high, center + radius)
-                                )
-                                # Reset velocity
-                                particle['velocity'][j] = random.uniform(-max_velocities[j]/2, max_velocities[j]/2)
-                        
-                        # Reset stagnation counter
-                        particle['stagnation_counter'] = 0
-                        
-                        # Evaluate new position
-                        fitness = self.evaluate_particle(particle['position'], parameter_bounds)
-                        particle['current_fitness'] = fitness
+                # around the global best and evaluate them together
+                stagnant = np.flatnonzero(swarm.stagnation >= self.stagnation_limit)
+                if len(stagnant):
+                    new_pos, new_vel = particles_around_best(len(stagnant))
+                    swarm.positions[stagnant] = new_pos
+                    swarm.velocities[stagnant] = new_vel
+                    swarm.stagnation[stagnant] = 0
+                    swarm.fitness[stagnant] = self.evaluate_swarm(new_pos, parameter_bounds)
                 
                 # Emit progress
                 if iteration % 5 == 0 or iteration == 1:
                     self.update.emit(
-                        f"  Iteration {iteration}: Best fitness = {swarm[global_best_particle_idx]['best_fitness']:.6f}, "
+                        f"  Iteration {iteration}: Best fitness = {best_fitness_now:.6f}, "
                         f"Avg fitness = {avg_fitness:.6f}, Diversity = {diversity:.4f}, w = {self.pso_w:.4f}"
                     )
                     if self.use_ml_adaptive:
@@ -1457,7 +1310,7 @@ class PSOWorker(QThread):
                             pass
 
                 # Check for convergence
-                if swarm[global_best_particle_idx]['best_fitness'] <= self.pso_tol:
+                if best_fitness_now <= self.pso_tol:
                     self.update.emit(f"[INFO] Convergence reached at iteration {iteration} (fitness below tolerance)")
                     break
 
@@ -1475,8 +1328,8 @@ class PSOWorker(QThread):
                         break
             
             # Extract best solution
-            best_particle = swarm[global_best_particle_idx]['best_position']
-            best_fitness = swarm[global_best_particle_idx]['best_fitness']
+            best_particle = swarm.best_positions[swarm.global_best_index].tolist()
+            best_fitness = float(swarm.best_fitness[swarm.global_best_index])
             
             # Calculate elapsed time
             elapsed_time = time.time() - self.start_time
@@ -1555,6 +1408,7 @@ class PSOWorker(QThread):
                     self.watchdog_timer.stop()
             except Exception:
                 pass
+            self.evaluator.close()
 
     def _handle_timeout(self):
         try:
@@ -1664,7 +1518,22 @@ class PSOWorker(QThread):
         except Exception:
             pass
 
-    def evaluate_particle(self, position, parameter_bounds):
+    def evaluate_swarm(self, positions, parameter_bounds):
+        """
+        Fitness of every row of ``positions``, evaluated in one call to the
+        evaluation engine.
+        
+        Returns:
+        --------
+        ndarray
+            (N,) fitness values
+        """
+        positions = np.asarray(positions, dtype=float)
+        summaries = self.evaluator.evaluate_many(positions)
+        return np.array([self.evaluate_particle(position, parameter_bounds, results=results)
+                         for position, results in zip(positions, summaries)], dtype=float)
+
+    def evaluate_particle(self, position, parameter_bounds, results=None):
         """
         Evaluate the fitness of a particle based on its position.
         
@@ -1692,6 +1561,9 @@ class PSOWorker(QThread):
             The position vector of the particle (DVA parameters)
         parameter_bounds : list
             List of (min, max) tuples for each parameter
+        results : dict, optional
+            FRF summary of ``position`` already computed by the evaluation
+            engine (e.g. for the whole swarm); evaluated here if None
             
         Returns:
         --------
@@ -1717,27 +1589,11 @@ class PSOWorker(QThread):
                 if penalty > 1.0:
                     return 1e6 * penalty
             
-            # Call FRF function to get frequency response
-            results = frf(
-                main_system_parameters=self.main_params,
-                dva_parameters=tuple(position),
-                omega_start=self.omega_start,
-                omega_end=self.omega_end,
-                omega_points=self.omega_points,
-                target_values_mass1=self.target_values_dict['mass_1'],
-                weights_mass1=self.weights_dict['mass_1'],
-                target_values_mass2=self.target_values_dict['mass_2'],
-                weights_mass2=self.weights_dict['mass_2'],
-                target_values_mass3=self.target_values_dict['mass_3'],
-                weights_mass3=self.weights_dict['mass_3'],
-                target_values_mass4=self.target_values_dict['mass_4'],
-                weights_mass4=self.weights_dict['mass_4'],
-                target_values_mass5=self.target_values_dict['mass_5'],
-                weights_mass5=self.weights_dict['mass_5'],
-                plot_figure=False,
-                show_peaks=False,
-                show_slopes=False
-            )
+            # Frequency response through the evaluation engine
+            if results is None:
+                results = self.evaluator.evaluate(position)
+            if "error" in results:
+                return 1e6
             
             # Extract the singular response (key performance metric)
             singular_response = results.get('singular_response', None)
@@ -5,6 +5,76 @@ import platform
 import psutil
 from PyQt5.QtCore import QThread, pyqtSignal, QTimer
 from modules.FRF import frf
+from modules.evaluator import Evaluator
+
+# Actions of the ML-bandit and RL controllers: relative changes of the step
+# scale and cooling rate, and a temperature multiplier
+_CONTROLLER_DELTAS = [-0.5, -0.25, 0.0, 0.25, 0.5]
+_CONTROLLER_TEMP_MULTS = [0.75, 1.0, 1.25]
+_CONTROLLER_ACTIONS = [(dS, dC, tm) for dS in _CONTROLLER_DELTAS for dC in _CONTROLLER_DELTAS
+                       for tm in _CONTROLLER_TEMP_MULTS]
+
+
+class SAStepController:
+    """
+    Adapts the step scale, cooling rate and temperature of one annealing chain.
+
+    kind 'ml_bandit' picks actions by UCB on their mean reward; kind 'rl'
+    uses epsilon-greedy Q-learning over two states (improved last step or
+    not). ``select`` applies the chosen action, ``update`` rewards it.
+    """
+
+    def __init__(self, kind, ucb_c=0.6, rl_alpha=0.1, rl_gamma=0.9, rl_epsilon=0.2, rl_epsilon_decay=0.95):
+        self.kind = kind
+        self.ucb_c = float(ucb_c)
+        self.rl_alpha = float(rl_alpha)
+        self.rl_gamma = float(rl_gamma)
+        self.epsilon = float(rl_epsilon)
+        self.epsilon_decay = float(rl_epsilon_decay)
+        self.counts = [0 for _ in _CONTROLLER_ACTIONS]
+        self.sums = [0.0 for _ in _CONTROLLER_ACTIONS]
+        self.q = {0: [0.0 for _ in _CONTROLLER_ACTIONS], 1: [0.0 for _ in _CONTROLLER_ACTIONS]}
+        self.state = 0
+        self.t = 0
+        self.last_action = 0
+
+    def select(self, cur_step, cur_cooling, cur_T):
+        if self.kind == 'ml_bandit':
+            self.t += 1
+            scores = []
+            for i in range(len(_CONTROLLER_ACTIONS)):
+                if self.counts[i] == 0:
+                    scores.append((float('inf'), i))
+                else:
+                    avg = self.sums[i] / self.counts[i]
+                    bonus = self.ucb_c * np.sqrt(np.log(max(self.t, 1)) / self.counts[i])
+                    scores.append((avg + bonus, i))
+            scores.sort(key=lambda t: t[0], reverse=True)
+            _, idx = scores[0]
+        elif random.random() < self.epsilon:
+            idx = random.randrange(len(_CONTROLLER_ACTIONS))
+        else:
+            idx = int(np.argmax(self.q[self.state]))
+        self.last_action = idx
+        dS, dC, tm = _CONTROLLER_ACTIONS[idx]
+        new_step = max(1e-6, cur_step * (1.0 + dS))
+        new_cooling = min(0.9999, max(1e-6, cur_cooling * (1.0 + dC)))
+        new_T = max(1e-12, cur_T * tm)
+        return new_step, new_cooling, new_T
+
+    def update(self, reward, improved):
+        idx = self.last_action
+        if self.kind == 'ml_bandit':
+            self.counts[idx] += 1
+            self.sums[idx] += float(reward)
+            return
+        next_state = 1 if improved else 0
+        q_old = self.q[self.state][idx]
+        q_next = max(self.q[next_state])
+        self.q[self.state][idx] = q_old + self.rl_alpha * (reward + self.rl_gamma * q_next - q_old)
+        self.state = next_state
+        self.epsilon *= self.epsilon_decay
+
 
 class SAWorker(QThread):
     # Signals: finished(final_results, best_candidate, parameter_names, best_fitness), error(str), update(str)
@@ -38,7 +108,13 @@ class SAWorker(QThread):
                  rl_gamma=0.9,
                  rl_epsilon=0.2,
                  rl_epsilon_decay=0.95,
-                 step_scale=0.1):
+                 step_scale=0.1,
+                 evaluation_backend="serial",  # "serial", "thread", "process" or "batch"
+                 evaluation_workers=None,
+                 sa_mode="single",             # "single" chain or "parallel_tempering"
+                 pt_replicas=4,                # Replicas on the temperature ladder
+                 pt_temp_ratio=2.0,            # Ratio between neighbouring ladder temperatures
+                 pt_swap_interval=1):          # Iterations between replica swap attempts
         super().__init__()
         self.main_params = main_params
         self.target_values_dict = target_values_dict
@@ -46,6 +122,10 @@ class SAWorker(QThread):
         self.omega_start = omega_start
         self.omega_end = omega_end
         self.omega_points = omega_points
+        self.evaluator = Evaluator(
+            main_params, omega_start, omega_end, omega_points, target_values_dict, weights_dict,
+            backend=evaluation_backend, n_workers=evaluation_workers,
+        )
         self.sa_initial_temp = sa_initial_temp
         self.sa_cooling_rate = sa_cooling_rate
         self.sa_num_iterations = sa_num_iterations
@@ -64,6 +144,11 @@ class SAWorker(QThread):
         self.rl_epsilon = float(rl_epsilon)
         self.rl_epsilon_decay = float(rl_epsilon_decay)
         self.step_scale = float(step_scale)
+        # Parallel tempering: replica i starts at sa_initial_temp * pt_temp_ratio**i
+        self.sa_mode = sa_mode if sa_mode in ("single", "parallel_tempering") else "single"
+        self.pt_replicas = max(2, int(pt_replicas))
+        self.pt_temp_ratio = max(1.0, float(pt_temp_ratio))
+        self.pt_swap_interval = max(1, int(pt_swap_interval))
         self.metrics = {
             'start_time': None,
             'end_time': None,
@@ -128,181 +213,11 @@ class SAWorker(QThread):
                     fixed_parameters[idx] = low
                 else:
                     parameter_bounds.append((low, high))
-            num_params = len(parameter_bounds)
 
-            # Initialize candidate solution (current state)
-            current_candidate = []
-            for j in range(num_params):
-                low, high = parameter_bounds[j]
-                if j in fixed_parameters:
-                    current_candidate.append(fixed_parameters[j])
-                else:
-                    current_candidate.append(random.uniform(low, high))
-            current_fitness = self.evaluate_candidate(current_candidate)
-            best_candidate = current_candidate[:]
-            best_fitness = current_fitness
-
-            # Initialize temperature
-            T = self.sa_initial_temp
-            initial_temp = self.sa_initial_temp
-            cooling_rate = float(self.sa_cooling_rate)
-            base_step_scale = float(0.1 if self.step_scale is None else self.step_scale)
-            accept_count = 0
-            attempt_count = 0
-
-            # ML bandit setup
-            if self.use_ml_adaptive:
-                deltas = [-0.5, -0.25, 0.0, 0.25, 0.5]
-                temp_mults = [0.75, 1.0, 1.25]
-                ml_actions = [(dS, dC, tm) for dS in deltas for dC in deltas for tm in temp_mults]
-                ml_counts = [0 for _ in ml_actions]
-                ml_sums = [0.0 for _ in ml_actions]
-                ml_t = 0
-                def ml_select(cur_step, cur_cooling, cur_T):
-                    nonlocal ml_t
-                    ml_t += 1
-                    scores = []
-                    for i in range(len(ml_actions)):
-                        if ml_counts[i] == 0:
-                            scores.append((float('inf'), i))
-                        else:
-                            avg = ml_sums[i] / ml_counts[i]
-                            bonus = self.ml_ucb_c * np.sqrt(np.log(max(ml_t, 1)) / ml_counts[i])
-                            scores.append((avg + bonus, i))
-                    scores.sort(key=lambda t: t[0], reverse=True)
-                    _, idx = scores[0]
-                    dS, dC, tm = ml_actions[idx]
-                    new_step = max(1e-6, cur_step * (1.0 + dS))
-                    new_cooling = min(0.9999, max(1e-6, cur_cooling * (1.0 + dC)))
-                    new_T = max(1e-12, cur_T * tm)
-                    return idx, new_step, new_cooling, new_T
-                def ml_update(idx, reward):
-                    ml_counts[idx] += 1
-                    ml_sums[idx] += float(reward)
-
-            # RL setup
-            if self.use_rl_controller:
-                deltas = [-0.5, -0.25, 0.0, 0.25, 0.5]
-                temp_mults = [0.75, 1.0, 1.25]
-                rl_actions = [(dS, dC, tm) for dS in deltas for dC in deltas for tm in temp_mults]
-                rl_q = {0: [0.0 for _ in rl_actions], 1: [0.0 for _ in rl_actions]}
-                rl_state = 0
-                def rl_select(cur_step, cur_cooling, cur_T):
-                    if random.random() < self.rl_epsilon:
-                        idx = random.randrange(len(rl_actions))
-                    else:
-                        values = rl_q[rl_state]
-                        idx = int(np.argmax(values)) if values else 0
-                    dS, dC, tm = rl_actions[idx]
-                    new_step = max(1e-6, cur_step * (1.0 + dS))
-                    new_cooling = min(0.9999, max(1e-6, cur_cooling * (1.0 + dC)))
-                    new_T = max(1e-12, cur_T * tm)
-                    return idx, new_step, new_cooling, new_T
-                def rl_update(state, action_idx, reward, next_state):
-                    q_old = rl_q[state][action_idx]
-                    q_next = max(rl_q[next_state]) if rl_q[next_state] else 0.0
-                    rl_q[state][action_idx] = q_old + self.rl_alpha * (reward + self.rl_gamma * q_next - q_old)
-
-            # Simulated Annealing main loop
-            for iteration in range(1, self.sa_num_iterations + 1):
-                iter_start = time.time()
-                try:
-                    self.progress.emit(int((iteration / max(1, self.sa_num_iterations)) * 100))
-                except Exception:
-                    pass
-                # Controller adjustments
-                if self.use_ml_adaptive:
-                    ml_idx, base_step_scale, cooling_rate, T = ml_select(base_step_scale, cooling_rate, T)
-                elif self.use_rl_controller:
-                    rl_idx, base_step_scale, cooling_rate, T = rl_select(base_step_scale, cooling_rate, T)
-                # Generate a new candidate by perturbing the current candidate
-                new_candidate = []
-                for j in range(num_params):
-                    if j in fixed_parameters:
-                        new_candidate.append(fixed_parameters[j])
-                    else:
-                        low, high = parameter_bounds[j]
-                        base_scale = (high - low) * base_step_scale
-                        perturbation = random.gauss(0, base_scale) * (T / max(1e-12, initial_temp))
-                        new_val = current_candidate[j] + perturbation
-                        # Ensure new value remains within bounds
-                        new_val = max(low, min(new_val, high))
-                        new_candidate.append(new_val)
-                _t0 = time.time()
-                new_fitness = self.evaluate_candidate(new_candidate)
-                if self.track_metrics:
-                    self.metrics['evaluation_times'].append(time.time() - _t0)
-                delta_fitness = new_fitness - current_fitness
-
-                # Accept new candidate if it is better or with a probability if worse
-                if delta_fitness < 0:
-                    current_candidate = new_candidate
-                    current_fitness = new_fitness
-                    accept = 1
-                else:
-                    acceptance_probability = np.exp(-delta_fitness / max(1e-12, T))
-                    if random.random() < acceptance_probability:
-                        current_candidate = new_candidate
-                        current_fitness = new_fitness
-                        accept = 1
-                    else:
-                        accept = 0
-                attempt_count += 1
-                accept_count += accept
-
-                # Update the best candidate found so far
-                if current_fitness < best_fitness:
-                    best_candidate = current_candidate[:]
-                    best_fitness = current_fitness
-
-                self.update.emit(f"Iteration {iteration}: Current={current_fitness:.6f}, Best={best_fitness:.6f}, T={T:.6f}, step={base_step_scale:.4f}, cool={cooling_rate:.5f}")
-
-                # Update temperature
-                T = T * cooling_rate
-
-                # Check convergence criterion
-                if best_fitness <= self.sa_tol:
-                    self.update.emit(f"[INFO] Convergence reached at iteration {iteration}")
-                    break
-                # Metrics
-                if self.track_metrics:
-                    iter_time = time.time() - iter_start
-                    self.metrics['generation_times'].append(iter_time)
-                    self.metrics['time_per_generation_breakdown'].append({'total': iter_time})
-                    self.metrics['best_fitness_per_gen'].append(best_fitness)
-                    self.metrics['fitness_history'].append([current_fitness])
-                    self.metrics['mean_fitness_history'].append(current_fitness)
-                    self.metrics['std_fitness_history'].append(0.0)
-                    self.metrics['temperature_history'].append(T)
-                    self.metrics['cooling_rate_history'].append(cooling_rate)
-                    self.metrics['step_scale_history'].append(base_step_scale)
-                    if attempt_count > 0 and iteration % 5 == 0:
-                        acc_rate = accept_count / max(1, attempt_count)
-                        self.metrics['acceptance_rate_history'].append(acc_rate)
-                        accept_count = 0
-                        attempt_count = 0
-                    self.metrics['rates_history'].append({'iteration': iteration, 'T': T, 'cooling': cooling_rate, 'step': base_step_scale})
-                    # Controller reward
-                    if self.use_ml_adaptive or self.use_rl_controller:
-                        last_best = self.metrics['best_fitness_per_gen'][-2] if len(self.metrics['best_fitness_per_gen']) > 1 else None
-                        imp = (last_best - best_fitness) if (last_best is not None and last_best > best_fitness) else 0.0
-                        acc_rate = self.metrics['acceptance_rate_history'][-1] if self.metrics['acceptance_rate_history'] else 0.0
-                        reward = (imp / max(iter_time, 1e-6)) - abs(acc_rate - self.ml_accept_target)
-                        if self.use_ml_adaptive:
-                            try:
-                                ml_update(ml_idx, reward)
-                            except Exception:
-                                pass
-                            self.metrics.setdefault('ml_controller_history', []).append({'iteration': iteration, 'T': T, 'cooling': cooling_rate, 'step': base_step_scale, 'best_fitness': best_fitness, 'reward': reward})
-                        elif self.use_rl_controller:
-                            try:
-                                next_state = 1 if imp > 0 else 0
-                                rl_update(rl_state, rl_idx, reward, next_state)
-                                rl_state = next_state
-                                self.rl_epsilon *= self.rl_epsilon_decay
-                            except Exception:
-                                pass
-                            self.metrics.setdefault('rl_controller_history', []).append({'iteration': iteration, 'T': T, 'cooling': cooling_rate, 'step': base_step_scale, 'best_fitness': best_fitness, 'reward': reward, 'epsilon': self.rl_epsilon})
+            if self.sa_mode == "parallel_tempering":
+                best_candidate, best_fitness = self._run_parallel_tempering(parameter_bounds, fixed_parameters)
+            else:
+                best_candidate, best_fitness = self._run_single_chain(parameter_bounds, fixed_parameters)
 
             # Final evaluation using best candidate
             try:
@@ -349,6 +264,278 @@ class SAWorker(QThread):
                     self._watchdog.stop()
             except Exception:
                 pass
+            self.evaluator.close()
+
+    def _run_single_chain(self, parameter_bounds, fixed_parameters):
+        """Classic simulated annealing: one Markov chain, one evaluation per step."""
+        num_params = len(parameter_bounds)
+        # Initialize candidate solution (current state)
+        current_candidate = []
+        for j in range(num_params):
+            low, high = parameter_bounds[j]
+            if j in fixed_parameters:
+                current_candidate.append(fixed_parameters[j])
+            else:
+                current_candidate.append(random.uniform(low, high))
+        current_fitness = self.evaluate_candidate(current_candidate)
+        best_candidate = current_candidate[:]
+        best_fitness = current_fitness
+
+        # Initialize temperature
+        T = self.sa_initial_temp
+        initial_temp = self.sa_initial_temp
+        cooling_rate = float(self.sa_cooling_rate)
+        base_step_scale = float(0.1 if self.step_scale is None else self.step_scale)
+        accept_count = 0
+        attempt_count = 0
+
+        # ML bandit / RL adaptation of step, cooling and temperature
+        controller = self._make_controller()
+
+        # Simulated Annealing main loop
+        for iteration in range(1, self.sa_num_iterations + 1):
+            iter_start = time.time()
+            try:
+                self.progress.emit(int((iteration / max(1, self.sa_num_iterations)) * 100))
+            except Exception:
+                pass
+            # Controller adjustments
+            if controller is not None:
+                base_step_scale, cooling_rate, T = controller.select(base_step_scale, cooling_rate, T)
+            # Generate a new candidate by perturbing the current candidate
+            new_candidate = []
+            for j in range(num_params):
+                if j in fixed_parameters:
+                    new_candidate.append(fixed_parameters[j])
+                else:
+                    low, high = parameter_bounds[j]
+                    base_scale = (high - low) * base_step_scale
+                    perturbation = random.gauss(0, base_scale) * (T / max(1e-12, initial_temp))
+                    new_val = current_candidate[j] + perturbation
+                    # Ensure new value remains within bounds
+                    new_val = max(low, min(new_val, high))
+                    new_candidate.append(new_val)
+            _t0 = time.time()
+            new_fitness = self.evaluate_candidate(new_candidate)
+            if self.track_metrics:
+                self.metrics['evaluation_times'].append(time.time() - _t0)
+            delta_fitness = new_fitness - current_fitness
+
+            # Accept new candidate if it is better or with a probability if worse
+            if delta_fitness < 0:
+                current_candidate = new_candidate
+                current_fitness = new_fitness
+                accept = 1
+            else:
+                acceptance_probability = np.exp(-delta_fitness / max(1e-12, T))
+                if random.random() < acceptance_probability:
+                    current_candidate = new_candidate
+                    current_fitness = new_fitness
+                    accept = 1
+                else:
+                    accept = 0
+            attempt_count += 1
+            accept_count += accept
+
+            # Update the best candidate found so far
+            if current_fitness < best_fitness:
+                best_candidate = current_candidate[:]
+                best_fitness = current_fitness
+
+            self.update.emit(f"Iteration {iteration}: Current={current_fitness:.6f}, Best={best_fitness:.6f}, T={T:.6f}, step={base_step_scale:.4f}, cool={cooling_rate:.5f}")
+
+            # Update temperature
+            T = T * cooling_rate
+
+            # Check convergence criterion
+            if best_fitness <= self.sa_tol:
+                self.update.emit(f"[INFO] Convergence reached at iteration {iteration}")
+                break
+            # Metrics
+            if self.track_metrics:
+                iter_time = time.time() - iter_start
+                self.metrics['generation_times'].append(iter_time)
+                self.metrics['time_per_generation_breakdown'].append({'total': iter_time})
+                self.metrics['best_fitness_per_gen'].append(best_fitness)
+                self.metrics['fitness_history'].append([current_fitness])
+                self.metrics['mean_fitness_history'].append(current_fitness)
+                self.metrics['std_fitness_history'].append(0.0)
+                self.metrics['temperature_history'].append(T)
+                self.metrics['cooling_rate_history'].append(cooling_rate)
+                self.metrics['step_scale_history'].append(base_step_scale)
+                if attempt_count > 0 and iteration % 5 == 0:
+                    acc_rate = accept_count / max(1, attempt_count)
+                    self.metrics['acceptance_rate_history'].append(acc_rate)
+                    accept_count = 0
+                    attempt_count = 0
+                self.metrics['rates_history'].append({'iteration': iteration, 'T': T, 'cooling': cooling_rate, 'step': base_step_scale})
+                # Controller reward
+                if controller is not None:
+                    last_best = self.metrics['best_fitness_per_gen'][-2] if len(self.metrics['best_fitness_per_gen']) > 1 else None
+                    imp = (last_best - best_fitness) if (last_best is not None and last_best > best_fitness) else 0.0
+                    acc_rate = self.metrics['acceptance_rate_history'][-1] if self.metrics['acceptance_rate_history'] else 0.0
+                    reward = (imp / max(iter_time, 1e-6)) - abs(acc_rate - self.ml_accept_target)
+                    try:
+                        controller.update(reward, imp > 0)
+                    except Exception:
+                        pass
+                    self._record_controller(iteration, T, cooling_rate, base_step_scale, best_fitness, reward, controller)
+
+        return best_candidate, best_fitness
+
+    def _run_parallel_tempering(self, parameter_bounds, fixed_parameters):
+        """
+        Parallel tempering: replicas on a temperature ladder advance in lock-step.
+
+        Every iteration each replica proposes one move and all proposals are
+        evaluated as one batch, so the evaluation backend can spread them over
+        its workers. Each replica keeps its own step scale, cooling rate and
+        ML-bandit/RL controller. Every ``pt_swap_interval`` iterations
+        neighbouring replicas (alternating even and odd pairs) exchange their
+        states with the Metropolis swap probability, so good states found by
+        hot, exploring replicas move down to the cold ones.
+        """
+        n = self.pt_replicas
+        lows = np.array([b[0] for b in parameter_bounds], dtype=float)
+        highs = np.array([b[1] for b in parameter_bounds], dtype=float)
+        fixed = np.array([j in fixed_parameters for j in range(len(parameter_bounds))], dtype=bool)
+        base_step_scale = float(0.1 if self.step_scale is None else self.step_scale)
+        replicas = []
+        for r in range(n):
+            T0 = float(self.sa_initial_temp) * self.pt_temp_ratio ** r
+            replicas.append({'T': T0, 'T0': T0, 'cooling': float(self.sa_cooling_rate), 'step': base_step_scale,
+                             'controller': self._make_controller(), 'accepts': []})
+        self.metrics['parallel_tempering'] = {
+            'replicas': n, 'temperature_ladder': [rep['T0'] for rep in replicas],
+            'swap_interval': self.pt_swap_interval,
+        }
+        self.metrics.setdefault('replica_temperature_history', [])
+        self.metrics.setdefault('swap_acceptance_history', [])
+
+        states = np.random.uniform(lows, highs, size=(n, len(parameter_bounds)))
+        states[:, fixed] = lows[fixed]
+        fitness = self.evaluate_candidates(states)
+        self.metrics['evaluation_count'] += n
+        replica_best = fitness.copy()
+        best_index = int(np.argmin(fitness))
+        best_candidate, best_fitness = states[best_index].tolist(), float(fitness[best_index])
+        swap_attempts = swap_accepts = 0
+        parity = 0
+
+        for iteration in range(1, self.sa_num_iterations + 1):
+            iter_start = time.time()
+            try:
+                self.progress.emit(int((iteration / max(1, self.sa_num_iterations)) * 100))
+            except Exception:
+                pass
+            for rep in replicas:
+                if rep['controller'] is not None:
+                    rep['step'], rep['cooling'], rep['T'] = rep['controller'].select(rep['step'], rep['cooling'], rep['T'])
+            temperatures = np.array([rep['T'] for rep in replicas])
+
+            # Propose one move per replica and evaluate them together
+            scales = np.array([rep['step'] * rep['T'] / max(1e-12, rep['T0']) for rep in replicas])
+            proposals = states + np.random.normal(size=states.shape) * scales[:, None] * (highs - lows)
+            proposals = np.clip(proposals, lows, highs)
+            proposals[:, fixed] = states[:, fixed]
+            _t0 = time.time()
+            new_fitness = self.evaluate_candidates(proposals)
+            if self.track_metrics:
+                self.metrics['evaluation_times'].append(time.time() - _t0)
+            self.metrics['evaluation_count'] += n
+
+            # Metropolis acceptance within each replica
+            delta = new_fitness - fitness
+            accept = (delta < 0) | (np.random.random(n) < np.exp(-np.maximum(delta, 0.0) / np.maximum(temperatures, 1e-12)))
+            states[accept] = proposals[accept]
+            fitness[accept] = new_fitness[accept]
+            for rep, accepted in zip(replicas, accept):
+                rep['accepts'] = (rep['accepts'] + [bool(accepted)])[-5:]
+                rep['T'] = rep['T'] * rep['cooling']
+
+            # Replica exchange between neighbouring temperatures
+            if iteration % self.pt_swap_interval == 0:
+                for i in range(parity, n - 1, 2):
+                    j = i + 1
+                    log_p = (fitness[i] - fitness[j]) * (1.0 / max(1e-12, temperatures[i]) - 1.0 / max(1e-12, temperatures[j]))
+                    swap_attempts += 1
+                    if log_p >= 0 or random.random() < np.exp(log_p):
+                        states[[i, j]] = states[[j, i]]
+                        fitness[[i, j]] = fitness[[j, i]]
+                        swap_accepts += 1
+                parity = 1 - parity
+
+            improvements = np.maximum(replica_best - fitness, 0.0)
+            replica_best = np.minimum(replica_best, fitness)
+            best_index = int(np.argmin(fitness))
+            if fitness[best_index] < best_fitness:
+                best_candidate, best_fitness = states[best_index].tolist(), float(fitness[best_index])
+
+            cold = replicas[0]
+            self.update.emit(f"Iteration {iteration}: Cold={fitness[0]:.6f}, Best={best_fitness:.6f}, "
+                             f"T={cold['T']:.6f}..{replicas[-1]['T']:.6f}, swaps={swap_accepts}/{swap_attempts}")
+
+            # Per-replica controller rewards
+            iter_time = time.time() - iter_start
+            for r, rep in enumerate(replicas):
+                if rep['controller'] is None:
+                    continue
+                acc_rate = sum(rep['accepts']) / max(1, len(rep['accepts']))
+                reward = (improvements[r] / max(iter_time, 1e-6)) - abs(acc_rate - self.ml_accept_target)
+                try:
+                    rep['controller'].update(reward, improvements[r] > 0)
+                except Exception:
+                    pass
+                self._record_controller(iteration, rep['T'], rep['cooling'], rep['step'], float(replica_best[r]),
+                                        reward, rep['controller'], replica=r)
+
+            if best_fitness <= self.sa_tol:
+                self.update.emit(f"[INFO] Convergence reached at iteration {iteration}")
+                break
+            if self.track_metrics:
+                self.metrics['generation_times'].append(iter_time)
+                self.metrics['time_per_generation_breakdown'].append({'total': iter_time})
+                self.metrics['best_fitness_per_gen'].append(best_fitness)
+                self.metrics['fitness_history'].append(fitness.tolist())
+                self.metrics['mean_fitness_history'].append(float(np.mean(fitness)))
+                self.metrics['std_fitness_history'].append(float(np.std(fitness)))
+                self.metrics['temperature_history'].append(cold['T'])
+                self.metrics['cooling_rate_history'].append(cold['cooling'])
+                self.metrics['step_scale_history'].append(cold['step'])
+                self.metrics['replica_temperature_history'].append([rep['T'] for rep in replicas])
+                if iteration % 5 == 0:
+                    self.metrics['acceptance_rate_history'].append(
+                        float(np.mean([sum(rep['accepts']) / max(1, len(rep['accepts'])) for rep in replicas])))
+                    self.metrics['swap_acceptance_history'].append(swap_accepts / max(1, swap_attempts))
+                self.metrics['rates_history'].append({'iteration': iteration, 'T': cold['T'], 'cooling': cold['cooling'], 'step': cold['step']})
+
+        self.metrics['parallel_tempering']['swap_acceptance_rate'] = swap_accepts / max(1, swap_attempts)
+        return best_candidate, best_fitness
+
+    def _make_controller(self):
+        """The step/cooling controller of one chain, or None for fixed settings."""
+        if self.use_rl_controller:
+            return SAStepController('rl', rl_alpha=self.rl_alpha, rl_gamma=self.rl_gamma,
+                                    rl_epsilon=self.rl_epsilon, rl_epsilon_decay=self.rl_epsilon_decay)
+        if self.use_ml_adaptive:
+            return SAStepController('ml_bandit', ucb_c=self.ml_ucb_c)
+        return None
+
+    def _record_controller(self, iteration, T, cooling, step, best_fitness, reward, controller, replica=None):
+        record = {'iteration': iteration, 'T': T, 'cooling': cooling, 'step': step, 'best_fitness': best_fitness, 'reward': reward}
+        if replica is not None:
+            record['replica'] = replica
+        if controller.kind == 'rl':
+            record['epsilon'] = controller.epsilon
+            self.metrics.setdefault('rl_controller_history', []).append(record)
+        else:
+            self.metrics.setdefault('ml_controller_history', []).append(record)
+
+    def evaluate_candidates(self, candidates):
+        """Fitness of several candidates, evaluated as one batch by the evaluator."""
+        summaries = self.evaluator.evaluate_many(np.asarray(candidates, dtype=float))
+        return np.array([self._candidate_fitness(candidate, summary)
+                         for candidate, summary in zip(candidates, summaries)], dtype=float)
 
     def evaluate_candidate(self, candidate):
         """
@@ -357,26 +544,15 @@ class SAWorker(QThread):
         and 1 plus a sparsity penalty.
         """
         try:
-            results = frf(
-                main_system_parameters=self.main_params,
-                dva_parameters=tuple(candidate),
-                omega_start=self.omega_start,
-                omega_end=self.omega_end,
-                omega_points=self.omega_points,
-                target_values_mass1=self.target_values_dict['mass_1'],
-                weights_mass1=self.weights_dict['mass_1'],
-                target_values_mass2=self.target_values_dict['mass_2'],
-                weights_mass2=self.weights_dict['mass_2'],
-                target_values_mass3=self.target_values_dict['mass_3'],
-                weights_mass3=self.weights_dict['mass_3'],
-                target_values_mass4=self.target_values_dict['mass_4'],
-                weights_mass4=self.weights_dict['mass_4'],
-                target_values_mass5=self.target_values_dict['mass_5'],
-                weights_mass5=self.weights_dict['mass_5'],
-                plot_figure=False,
-                show_peaks=False,
-                show_slopes=False
-            )
+            return self._candidate_fitness(candidate, self.evaluator.evaluate(candidate))
+        except Exception:
+            return 1e6
+
+    def _candidate_fitness(self, candidate, results):
+        """Fitness of ``candidate`` from its FRF summary (1e6 for failed evaluations)."""
+        try:
+            if not results or 'error' in results:
+                return 1e6
             singular_response = results.get('singular_response', None)
             if singular_response is None or not np.isfinite(singular_response):
                 return 1e6
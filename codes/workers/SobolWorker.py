@@ -12,7 +12,7 @@ class SobolWorker(QThread):
     
     def __init__(self, main_params, dva_bounds, dva_order,
                  omega_start, omega_end, omega_points, num_samples_list,
-                 target_values_dict, weights_dict, n_jobs):
+                 target_values_dict, weights_dict, n_jobs, evaluation_backend=None):
         super().__init__()
         self.main_params = main_params
         self.dva_bounds = dva_bounds
@@ -24,6 +24,7 @@ class SobolWorker(QThread):
         self.target_values_dict = target_values_dict
         self.weights_dict = weights_dict
         self.n_jobs = n_jobs
+        self.evaluation_backend = evaluation_backend  # e.g. "distributed"; None keeps joblib
 
     def run(self):
         try:
@@ -38,7 +39,8 @@ class SobolWorker(QThread):
                 target_values_dict=self.target_values_dict,
                 weights_dict=self.weights_dict,
                 visualize=False,  
-                n_jobs=self.n_jobs
+                n_jobs=self.n_jobs,
+                evaluation_backend=self.evaluation_backend
             )
             self.finished.emit(all_results, warnings)
         except Exception as e:
@@ -1,4 +1,5 @@
 from .base import Solver
+from .evaluator import Evaluator
 from .ga import GASolver
 from .pso import PSOSolver
 from .cmaes import CMAESSolver
@@ -11,6 +12,7 @@ from .rl import RLSolver
 
 __all__ = [
     'Solver',
+    'Evaluator',
     'GASolver',
     'PSOSolver',
     'CMAESSolver',
@@ -12,8 +12,8 @@ class AdaVEASolver(Solver):
     
     Ported from AdaVEAWorker.py, removing PyQt5 dependencies.
     """
-    def __init__(self, config, evaluate_fn=None, callback=None):
-        super().__init__(config, evaluate_fn, callback)
+    def __init__(self, config, evaluate_fn=None, callback=None, evaluate_batch_fn=None):
+        super().__init__(config, evaluate_fn, callback, evaluate_batch_fn)
         
         # AdaVEA specific configuration
         self.initial_cxpb = config.get('cxpb', 0.8)
@@ -91,7 +91,7 @@ class AdaVEASolver(Solver):
                 pop.append(self.toolbox.individual())
 
             # Evaluate initial population
-            fitnesses = list(map(self.toolbox.evaluate, pop))
+            fitnesses = self.evaluate_population(pop)
             for ind, fit in zip(pop, fitnesses):
                 ind.fitness.values = fit
 
@@ -116,7 +116,7 @@ class AdaVEASolver(Solver):
                 
                 # Evaluate invalid individuals
                 invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
-                fitnesses = map(self.toolbox.evaluate, invalid_ind)
+                fitnesses = self.evaluate_population(invalid_ind)
                 for ind, fit in zip(invalid_ind, fitnesses):
                     ind.fitness.values = fit
 
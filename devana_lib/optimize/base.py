@@ -1,5 +1,19 @@
+import functools
 from abc import ABC, abstractmethod
 
+from .evaluator import Evaluator
+
+def _closing_evaluator(solve):
+    """Wrap a solve() implementation so the solver's Evaluator is closed afterwards."""
+    @functools.wraps(solve)
+    def wrapper(self, *args, **kwargs):
+        try:
+            return solve(self, *args, **kwargs)
+        finally:
+            self.evaluator.close()
+    wrapper._closes_evaluator = True
+    return wrapper
+
 class Solver(ABC):
     """
     Base class for all optimization solvers in DeVana.
@@ -7,7 +21,14 @@ class Solver(ABC):
     This class provides a common interface for optimization algorithms,
     decoupling them from GUI frameworks (like PyQt5) and specific physics implementations.
     """
-    def __init__(self, config, evaluate_fn=None, callback=None):
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Every solve() releases the Evaluator's thread/process pool when it
+        # returns or raises; the pool is recreated if the solver is reused
+        if 'solve' in cls.__dict__ and not getattr(cls.solve, '_closes_evaluator', False):
+            cls.solve = _closing_evaluator(cls.__dict__['solve'])
+
+    def __init__(self, config, evaluate_fn=None, callback=None, evaluate_batch_fn=None):
         """
         Initialize the solver.
         
@@ -18,11 +39,27 @@ class Solver(ABC):
                 or expect it to be passed to the solve() method.
             callback (callable, optional): A function called periodically with 
                 progress updates. signature: (generation, best_fitness, best_individual, metrics)
+            evaluate_batch_fn (callable, optional): A function that evaluates a whole
+                population at once. It receives a (P, num_parameters) NumPy array and
+                returns a sequence of P fitness values (e.g. built on top of
+                physics.frf.frf_batch). When provided, solvers evaluate their
+                populations through it instead of calling evaluate_fn per individual.
+
+        Populations are evaluated by an `Evaluator`; config keys 'evaluation_backend'
+        ('serial', 'thread', 'process' or 'batch') and 'evaluation_workers' select
+        how. Its worker pool is shut down when solve() returns.
         """
         self.config = config
         self.evaluate_fn = evaluate_fn
+        self.evaluate_batch_fn = evaluate_batch_fn
         self.callback = callback
         self.stop_requested = False
+        self.evaluator = Evaluator(
+            evaluate_fn,
+            evaluate_batch_fn,
+            backend=config.get('evaluation_backend'),
+            n_workers=config.get('evaluation_workers'),
+        )
         
         # Common configuration parameters (with defaults)
         self.pop_size = config.get('pop_size', 50)
@@ -64,10 +101,30 @@ class Solver(ABC):
         Returns:
             The fitness of the individual.
         """
-        if self.evaluate_fn:
-            return self.evaluate_fn(individual)
+        if self.evaluate_fn or self.evaluate_batch_fn:
+            return self.evaluator.evaluate(individual)
         raise NotImplementedError("evaluate_fn not provided and evaluate() not overridden.")
 
+    def evaluate_population(self, individuals):
+        """
+        Evaluate a list of individuals.
+        
+        Goes through the solver's Evaluator (evaluate_batch_fn in a single call
+        when available, else evaluate_fn on the configured backend) and falls
+        back to evaluate() per individual when neither function was given.
+        
+        Args:
+            individuals: Sequence of individuals (lists or arrays of parameters).
+            
+        Returns:
+            list: One fitness per individual, in the same order.
+        """
+        if len(individuals) == 0:
+            return []
+        if self.evaluate_fn or self.evaluate_batch_fn:
+            return self.evaluator.evaluate_many(individuals)
+        return [self.evaluate(ind) for ind in individuals]
+
     @abstractmethod
     def solve(self):
         """
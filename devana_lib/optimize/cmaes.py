@@ -1,85 +1,171 @@
+import math
 import random
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
 import cma
+import numpy as np
 from devana.optimize.base import Solver
 
+# Restart schedules: a single run, increasing population (IPOP) or
+# alternating large and small populations (BIPOP)
+RESTART_STRATEGIES = ('none', 'ipop', 'bipop')
+
+
+def restart_popsizes(strategy, n_restarts, dimension, incpopsize=2.0, rng=None):
+    """
+    Population size and initial sigma factor of every run of a restart schedule.
+
+    Args:
+        strategy (str): One of RESTART_STRATEGIES.
+        n_restarts (int): Restarts after the first run.
+        dimension (int): Number of free parameters.
+        incpopsize (float): Population factor between large-population runs.
+        rng (random.Random, optional): Random source of the BIPOP small regime.
+
+    Returns:
+        list: (regime, popsize, sigma_factor) per run. IPOP multiplies the
+            population at every restart; BIPOP alternates large runs with
+            small runs of a random population between the default and the
+            last large one, started with a smaller sigma. The schedule is
+            fixed up front so that its runs can execute concurrently.
+    """
+    rng = rng or random.Random()
+    default = 4 + int(3 * math.log(max(1, dimension)))
+    n_runs = 1 + (max(0, int(n_restarts)) if strategy in ('ipop', 'bipop') else 0)
+    runs = []
+    n_large = 0
+    for run in range(n_runs):
+        if strategy == 'bipop' and run % 2 == 0 and run > 0:
+            u = rng.random()
+            large = default * incpopsize ** max(0, n_large - 1)
+            runs.append(('small', int(default * (large / default) ** (u * u)), 10 ** (-2 * u)))
+        else:
+            runs.append(('large', int(round(default * incpopsize ** n_large)), 1.0))
+            n_large += 1
+    return runs
+
+
 class CMAESSolver(Solver):
     """
     Covariance Matrix Adaptation Evolution Strategy (CMA-ES) Solver.
-    
-    Ported from CMAESWorker.py, removing PyQt5 dependencies.
+
+    Ported from CMAESWorker.py, removing PyQt5 dependencies. Every sampled
+    population goes through the ask/tell interface and is evaluated in one
+    `evaluate_population` call. Config keys 'restart_strategy' ('none',
+    'ipop' or 'bipop'), 'n_restarts', 'incpopsize' and 'restart_workers'
+    add restarts; up to 'restart_workers' of them run concurrently in
+    threads, sharing the solver's Evaluator (whose backend decides how many
+    cores the evaluations use). Their histories are merged by iteration.
     """
-    def __init__(self, config, evaluate_fn=None, callback=None):
-        super().__init__(config, evaluate_fn, callback)
-        
+    def __init__(self, config, evaluate_fn=None, callback=None, evaluate_batch_fn=None):
+        super().__init__(config, evaluate_fn, callback, evaluate_batch_fn)
+
         # CMA-ES specific configuration
         self.initial_sigma = config.get('initial_sigma', 0.5)
-        
-    def solve(self):
-        """Execute the CMA-ES optimization."""
-        # Extract parameter names and bounds
-        lower_bounds = [b[0] for b in self.parameter_bounds]
-        upper_bounds = [b[1] for b in self.parameter_bounds]
-        
-        # Build initial candidate x0
-        x0 = []
-        for j in range(self.num_parameters):
-            if j in self.fixed_parameters:
-                x0.append(self.fixed_parameters[j])
-            else:
-                x0.append(random.uniform(lower_bounds[j], upper_bounds[j]))
-        
-        # Options for cma
+        self.restart_strategy = config.get('restart_strategy', 'none')
+        if self.restart_strategy not in RESTART_STRATEGIES:
+            raise ValueError(f"Unknown restart strategy '{self.restart_strategy}', expected one of {RESTART_STRATEGIES}")
+        self.n_restarts = config.get('n_restarts', 0)
+        self.incpopsize = config.get('incpopsize', 2.0)
+        self.restart_workers = max(1, int(config.get('restart_workers', 1)))
+        self.seed = config.get('seed')
+        self._lock = threading.Lock()
+
+    def _run_restart(self, restart, popsize, sigma, seed):
+        """One CMA-ES run until it stops; returns its best and per-iteration history."""
+        rng = random.Random(seed)
+        # Only the free parameters are searched (cma rejects equal bounds)
+        free = [j for j in range(self.num_parameters) if j not in self.fixed_parameters]
+        template = np.array([self.fixed_parameters.get(j, 0.0) for j in range(self.num_parameters)], dtype=float)
+        x0 = [rng.uniform(*self.parameter_bounds[j]) for j in free]
         options = {
-            'bounds': [lower_bounds, upper_bounds],
+            'bounds': [[self.parameter_bounds[j][0] for j in free], [self.parameter_bounds[j][1] for j in free]],
             'maxiter': self.num_generations,
             'verb_disp': 0,
-            'tolx': self.tolerance
-        }
-        
-        # Objective wrapper to handle fixed parameters and callback logic
-        def objective(x):
-            # Enforce fixed parameters
-            for idx, val in self.fixed_parameters.items():
-                x[idx] = val
-            return self.evaluate(x.tolist())
-            
-        es = cma.CMAEvolutionStrategy(x0, self.initial_sigma, options)
-        
-        best_fitness = float('inf')
-        best_ind = None
-        metrics = {
-            'best_fitness_history': []
+            'tolx': self.tolerance,
+            'popsize': max(2, popsize),
+            'seed': seed % (2 ** 32) or 1,
         }
-        
-        it = 0
-        while not es.stop():
-            if self.stop_requested:
-                break
-                
-            it += 1
+
+        def apply_fixed(x):
+            full = template.copy()
+            full[free] = x
+            return full.tolist()
+
+        es = cma.CMAEvolutionStrategy(x0, sigma, options)
+
+        run = {'restart': restart, 'popsize': es.popsize, 'sigma0': sigma,
+               'best_fitness': float('inf'), 'best_individual': None, 'best_fitness_history': []}
+        while not es.stop() and not self.stop_requested:
             solutions = es.ask()
-            fitnesses = [objective(x) for x in solutions]
+            candidates = [apply_fixed(x) for x in solutions]
+            fitnesses = [float(f) for f in self.evaluate_population(candidates)]
             es.tell(solutions, fitnesses)
-            
-            # Find current best
-            cur_min_fit = min(fitnesses)
-            if cur_min_fit < best_fitness:
-                best_fitness = cur_min_fit
-                best_ind = solutions[fitnesses.index(cur_min_fit)].tolist()
-                
-            metrics['best_fitness_history'].append(best_fitness)
-            self._report_progress(it, best_fitness, best_ind, metrics)
-            
-            if best_fitness <= self.tolerance:
-                break
-                
-            if it >= self.num_generations:
+            best = int(np.argmin(fitnesses))
+            if fitnesses[best] < run['best_fitness']:
+                run['best_fitness'] = fitnesses[best]
+                run['best_individual'] = candidates[best]
+            run['best_fitness_history'].append(run['best_fitness'])
+            self._record_iteration(run)
+            if run['best_fitness'] <= self.tolerance:
                 break
-        
-        res = es.result
+        if run['best_individual'] is None and es.result.xbest is not None:
+            run['best_individual'] = apply_fixed(es.result.xbest)
+        run['iterations'] = len(run['best_fitness_history'])
+        return run
+
+    def _record_iteration(self, run):
+        """Merge the latest iteration of a run into the shared result and report progress."""
+        with self._lock:
+            self._runs[run['restart']] = run
+            if run['best_fitness'] < self._best[0]:
+                self._best = (run['best_fitness'], run['best_individual'])
+            # Runs are aligned by iteration; finished runs carry their best forward
+            histories = [r['best_fitness_history'] for r in self._runs.values() if r['best_fitness_history']]
+            length = max(len(h) for h in histories)
+            self._metrics['best_fitness_history'] = [
+                min(h[min(g, len(h) - 1)] for h in histories) for g in range(length)
+            ]
+            self._report_progress(length, self._best[0], self._best[1], self._metrics)
+
+    def solve(self):
+        """Execute the CMA-ES optimization."""
+        rng = random.Random(self.seed)
+        schedule = restart_popsizes(self.restart_strategy, self.n_restarts,
+                                    self.num_parameters - len(self.fixed_parameters), self.incpopsize, rng)
+        seeds = [rng.randrange(2 ** 31) for _ in schedule]
+        self._runs = {}
+        self._best = (float('inf'), None)
+        self._metrics = {'best_fitness_history': []}
+
+        with ThreadPoolExecutor(max_workers=min(self.restart_workers, len(schedule))) as executor:
+            pending = list(enumerate(zip(schedule, seeds)))
+            running = set()
+            while pending or running:
+                # Restarts stop being started once one reaches the tolerance
+                while pending and len(running) < self.restart_workers and not self.stop_requested \
+                        and self._best[0] > self.tolerance:
+                    restart, ((regime, popsize, sigma_factor), seed) = pending.pop(0)
+                    running.add(executor.submit(self._run_restart, restart, popsize,
+                                                self.initial_sigma * sigma_factor, seed))
+                if not running:
+                    break
+                done, running = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    run = future.result()
+                    self._runs[run['restart']] = run
+
+        self._metrics['restarts'] = [
+            dict({k: v for k, v in run.items() if k != 'best_fitness_history'}, regime=schedule[restart][0])
+            for restart, run in sorted(self._runs.items())
+        ]
+        best_fitness, best_ind = self._best
+        if best_ind is None and self._runs:
+            best_ind = min(self._runs.values(), key=lambda r: r['best_fitness'])['best_individual']
         return {
-            'best_individual': res.xbest.tolist() if res.xbest is not None else best_ind,
-            'best_fitness': res.fbest if res.fbest is not None else best_fitness,
-            'metrics': metrics,
+            'best_individual': best_ind,
+            'best_fitness': best_fitness,
+            'metrics': self._metrics,
             'parameter_names': self.parameter_names
         }
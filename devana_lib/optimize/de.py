@@ -1,88 +1,144 @@
-import random
 import numpy as np
 from devana.optimize.base import Solver
 
+# Number of distinct random population members each mutation strategy draws
+STRATEGY_DRAWS = {
+    'rand/1': 3,
+    'rand/2': 5,
+    'best/1': 2,
+    'best/2': 4,
+    'current-to-best/1': 2,
+    'current-to-rand/1': 3,
+}
+
+
+def mutation_indices(pop_size, count):
+    """
+    Random mutation partners of a whole population, drawn in one go.
+
+    Args:
+        pop_size (int): Number of individuals.
+        count (int): Partners per individual.
+
+    Returns:
+        np.ndarray: (pop_size, count) array whose row i holds distinct indices,
+            none of them i.
+    """
+    if pop_size - 1 < count:
+        raise ValueError(f"Need a population of at least {count + 1} individuals, got {pop_size}")
+    keys = np.random.random((pop_size, pop_size))
+    keys[np.arange(pop_size), np.arange(pop_size)] = np.inf
+    picked = np.argpartition(keys, count - 1, axis=1)[:, :count]
+    order = np.argsort(np.take_along_axis(keys, picked, axis=1), axis=1)
+    return np.take_along_axis(picked, order, axis=1)
+
+
+def donor_vectors(strategy, population, best, F):
+    """
+    Donor vectors of all targets for a DE mutation strategy.
+
+    Args:
+        strategy (str): One of STRATEGY_DRAWS.
+        population (np.ndarray): (P, D) population.
+        best (np.ndarray): Best individual so far.
+        F (float or np.ndarray): Mutation factor, scalar or one per individual.
+
+    Returns:
+        np.ndarray: (P, D) donor vectors.
+    """
+    x = population
+    r = mutation_indices(len(x), STRATEGY_DRAWS[strategy])
+    F = np.reshape(F, (-1, 1)) if np.ndim(F) else F
+    if strategy == 'rand/1':
+        return x[r[:, 0]] + F * (x[r[:, 1]] - x[r[:, 2]])
+    if strategy == 'rand/2':
+        return x[r[:, 0]] + F * (x[r[:, 1]] - x[r[:, 2]] + x[r[:, 3]] - x[r[:, 4]])
+    if strategy == 'best/1':
+        return best + F * (x[r[:, 0]] - x[r[:, 1]])
+    if strategy == 'best/2':
+        return best + F * (x[r[:, 0]] - x[r[:, 1]] + x[r[:, 2]] - x[r[:, 3]])
+    if strategy == 'current-to-best/1':
+        return x + F * (best - x) + F * (x[r[:, 0]] - x[r[:, 1]])
+    K = np.random.random((len(x), 1))
+    return x + K * (x[r[:, 0]] - x) + F * (x[r[:, 1]] - x[r[:, 2]])
+
+
 class DESolver(Solver):
     """
     Differential Evolution (DE) Solver.
-    
-    Ported from DEWorker.py, removing PyQt5 dependencies.
+
+    Ported from DEWorker.py, removing PyQt5 dependencies. The trial vectors
+    of a generation are created with population-matrix operations (bulk
+    partner sampling, binomial crossover masks, one bounds pass) and
+    evaluated together.
     """
-    def __init__(self, config, evaluate_fn=None, callback=None):
-        super().__init__(config, evaluate_fn, callback)
-        
+    def __init__(self, config, evaluate_fn=None, callback=None, evaluate_batch_fn=None):
+        super().__init__(config, evaluate_fn, callback, evaluate_batch_fn)
+
         # DE specific configuration
         self.F = config.get('F', 0.5)      # Mutation factor
         self.CR = config.get('CR', 0.7)     # Crossover probability
+        # Mutation strategy, one of STRATEGY_DRAWS; a '/bin' suffix is accepted
         self.strategy = config.get('strategy', 'rand/1/bin')
+        self.mutation = self.strategy[:-len('/bin')] if self.strategy.endswith('/bin') else self.strategy
+        if self.mutation not in STRATEGY_DRAWS:
+            raise ValueError(f"Unknown DE strategy '{self.strategy}'")
 
     def solve(self):
         """Execute the DE optimization."""
         num_pop = self.pop_size
         num_params = self.num_parameters
-        
-        # Initialize population
-        population = []
-        for i in range(num_pop):
-            ind = []
-            for j in range(num_params):
-                low, high = self.parameter_bounds[j]
-                if j in self.fixed_parameters:
-                    ind.append(self.fixed_parameters[j])
-                else:
-                    ind.append(random.uniform(low, high))
-            population.append(np.array(ind))
-            
+        bounds = np.array(self.parameter_bounds, dtype=float).reshape(num_params, 2)
+        low, high = bounds[:, 0], bounds[:, 1]
+        fixed_idx = list(self.fixed_parameters)
+        fixed_values = [self.fixed_parameters[j] for j in fixed_idx]
+
+        # Initialize population (fixed parameters have low == high)
+        population = np.random.uniform(low, high, (num_pop, num_params))
+        population[:, fixed_idx] = fixed_values
+
         # Evaluate initial population
-        fitnesses = [self.evaluate(ind.tolist()) for ind in population]
-        
+        fitnesses = np.asarray(self.evaluate_population(population.tolist()), dtype=float)
+
         # Global best
-        best_idx = np.argmin(fitnesses)
-        best_fitness = fitnesses[best_idx]
+        best_idx = int(np.argmin(fitnesses))
+        best_fitness = float(fitnesses[best_idx])
         best_ind = population[best_idx].copy()
-        
+
         metrics = {
             'best_fitness_history': []
         }
-        
+
         for gen in range(1, self.num_generations + 1):
             if self.stop_requested:
                 break
-                
-            for i in range(num_pop):
-                # Mutation
-                idxs = [idx for idx in range(num_pop) if idx != i]
-                r1, r2, r3 = random.sample(idxs, 3)
-                
-                # donor = x_r1 + F * (x_r2 - x_r3)
-                donor = population[r1] + self.F * (population[r2] - population[r3])
-                
-                # Crossover
-                trial = np.copy(population[i])
-                j_rand = random.randrange(num_params)
-                for j in range(num_params):
-                    if j in self.fixed_parameters:
-                        trial[j] = self.fixed_parameters[j]
-                    elif random.random() <= self.CR or j == j_rand:
-                        low, high = self.parameter_bounds[j]
-                        trial[j] = max(low, min(high, donor[j]))
-                
-                # Selection
-                trial_fitness = self.evaluate(trial.tolist())
-                if trial_fitness < fitnesses[i]:
-                    population[i] = trial
-                    fitnesses[i] = trial_fitness
-                    
-                    if trial_fitness < best_fitness:
-                        best_fitness = trial_fitness
-                        best_ind = trial.copy()
-            
+
+            # Mutation
+            donors = donor_vectors(self.mutation, population, best_ind, self.F)
+
+            # Binomial crossover, with at least one donor component (j_rand) per trial
+            mask = np.random.random((num_pop, num_params)) <= self.CR
+            mask[np.arange(num_pop), np.random.randint(num_params, size=num_pop)] = True
+            trials = np.where(mask, np.clip(donors, low, high), population)
+            trials[:, fixed_idx] = fixed_values
+
+            # Selection (trial vectors of the generation are evaluated together)
+            trial_fitnesses = np.asarray(self.evaluate_population(trials.tolist()), dtype=float)
+            improved = trial_fitnesses < fitnesses
+            population[improved] = trials[improved]
+            fitnesses[improved] = trial_fitnesses[improved]
+
+            gen_best = int(np.argmin(fitnesses))
+            if fitnesses[gen_best] < best_fitness:
+                best_fitness = float(fitnesses[gen_best])
+                best_ind = population[gen_best].copy()
+
             metrics['best_fitness_history'].append(best_fitness)
             self._report_progress(gen, best_fitness, best_ind.tolist(), metrics)
-            
+
             if best_fitness <= self.tolerance:
                 break
-                
+
         return {
             'best_individual': best_ind.tolist(),
             'best_fitness': best_fitness,
@@ -0,0 +1,107 @@
+import os
+import pickle
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+
+# Available evaluation backends
+EVALUATION_BACKENDS = ('serial', 'thread', 'process', 'batch')
+
+class Evaluator:
+    """
+    Evaluates individuals and populations for the solvers on a pluggable backend.
+
+    All solvers score populations through `evaluate_many`, so the backend can be
+    chosen per run (config key 'evaluation_backend') without changing the
+    algorithms: 'serial' calls evaluate_fn in turn, 'thread' and 'process' spread
+    the calls over a persistent pool, and 'batch' hands the whole population to
+    evaluate_batch_fn (e.g. built on physics.frf.frf_batch).
+    """
+    def __init__(self, evaluate_fn=None, evaluate_batch_fn=None, backend=None, n_workers=None):
+        """
+        Args:
+            evaluate_fn (callable, optional): Fitness of one individual. The 'process'
+                backend needs it to be picklable (a module-level function) and
+                falls back to threads otherwise.
+            evaluate_batch_fn (callable, optional): Fitnesses of a (P, num_parameters) array.
+            backend (str, optional): One of EVALUATION_BACKENDS. Defaults to 'batch' when
+                evaluate_batch_fn is given, else 'serial'.
+            n_workers (int, optional): Pool size of 'thread'/'process'; defaults to all
+                cores but one.
+        """
+        if backend is None:
+            backend = 'batch' if evaluate_batch_fn is not None else 'serial'
+        if backend not in EVALUATION_BACKENDS:
+            raise ValueError(f"Unknown evaluation backend '{backend}', expected one of {EVALUATION_BACKENDS}")
+        if backend == 'batch' and evaluate_batch_fn is None:
+            raise ValueError("The 'batch' evaluation backend needs evaluate_batch_fn")
+        self.evaluate_fn = evaluate_fn
+        self.evaluate_batch_fn = evaluate_batch_fn
+        self.backend = backend
+        self.n_workers = max(1, int(n_workers or (os.cpu_count() or 2) - 1))
+        self.evaluation_count = 0
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def evaluate(self, individual):
+        """Fitness of a single individual."""
+        self.evaluation_count += 1
+        if self.evaluate_fn is not None:
+            return self.evaluate_fn(individual)
+        if self.evaluate_batch_fn is not None:
+            return list(self.evaluate_batch_fn(np.array([list(individual)], dtype=float)))[0]
+        raise NotImplementedError("Neither evaluate_fn nor evaluate_batch_fn was provided.")
+
+    def evaluate_many(self, individuals):
+        """
+        Fitnesses of a population.
+
+        Args:
+            individuals: Sequence of individuals or a (P, num_parameters) array.
+
+        Returns:
+            list: One fitness per individual, in the same order.
+        """
+        if len(individuals) == 0:
+            return []
+        if self.backend == 'batch' or self.evaluate_fn is None:
+            self.evaluation_count += len(individuals)
+            batch = np.array([list(ind) for ind in individuals], dtype=float)
+            return list(self.evaluate_batch_fn(batch))
+        if self.backend == 'serial' or self.n_workers == 1 or len(individuals) == 1:
+            return [self.evaluate(ind) for ind in individuals]
+        # Solvers may evaluate from several threads (e.g. concurrent CMA-ES restarts)
+        with self._lock:
+            if self.backend == 'process' and self._executor is None:
+                try:
+                    pickle.dumps(self.evaluate_fn)
+                    self._executor = ProcessPoolExecutor(max_workers=self.n_workers)
+                except (pickle.PicklingError, AttributeError, TypeError, OSError, NotImplementedError):
+                    self.backend = 'thread'
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.n_workers)
+        self.evaluation_count += len(individuals)
+        rows = [list(ind) for ind in individuals] if self.backend == 'process' else list(individuals)
+        chunksize = max(1, len(rows) // (4 * self.n_workers))
+        try:
+            return list(self._executor.map(self.evaluate_fn, rows, chunksize=chunksize))
+        except BrokenProcessPool:
+            # Worker processes died (e.g. killed); finish this population in threads
+            self.close()
+            self.backend = 'thread'
+            self.evaluation_count -= len(individuals)
+            return self.evaluate_many(individuals)
+
+    def close(self):
+        """Shut the pool down; it is recreated on further use."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -8,8 +8,8 @@ class GASolver(Solver):
     
     Ported from GAWorker.py, removing PyQt5 dependencies.
     """
-    def __init__(self, config, evaluate_fn=None, callback=None):
-        super().__init__(config, evaluate_fn, callback)
+    def __init__(self, config, evaluate_fn=None, callback=None, evaluate_batch_fn=None):
+        super().__init__(config, evaluate_fn, callback, evaluate_batch_fn)
         
         # GA specific configuration
         self.cxpb = config.get('cxpb', 0.8)
@@ -64,7 +64,7 @@ class GASolver(Solver):
         pop = self.toolbox.population(n=self.pop_size)
         
         # Evaluate initial population
-        fitnesses = list(map(self.toolbox.evaluate, pop))
+        fitnesses = self.evaluate_population(pop)
         for ind, fit in zip(pop, fitnesses):
             ind.fitness.values = (fit,) if not isinstance(fit, (tuple, list)) else fit
 
@@ -99,7 +99,7 @@ class GASolver(Solver):
 
             # Evaluate invalid individuals
             invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
-            fitnesses = map(self.toolbox.evaluate, invalid_ind)
+            fitnesses = self.evaluate_population(invalid_ind)
             for ind, fit in zip(invalid_ind, fitnesses):
                 ind.fitness.values = (fit,) if not isinstance(fit, (tuple, list)) else fit
 
@@ -23,8 +23,8 @@ class MOGASolver(Solver):
     
     Ported from MOGAWorker.py, removing PyQt5 dependencies.
     """
-    def __init__(self, config, evaluate_fn=None, callback=None):
-        super().__init__(config, evaluate_fn, callback)
+    def __init__(self, config, evaluate_fn=None, callback=None, evaluate_batch_fn=None):
+        super().__init__(config, evaluate_fn, callback, evaluate_batch_fn)
         
         # MOGA specific configuration
         self.cxpb = config.get('cxpb', 0.9)
@@ -84,7 +84,7 @@ class MOGASolver(Solver):
             pop = self.toolbox.population(n=self.pop_size)
             
             # Evaluate initial population
-            fitnesses = list(map(self.toolbox.evaluate, pop))
+            fitnesses = self.evaluate_population(pop)
             for ind, fit in zip(pop, fitnesses):
                 ind.fitness.values = fit
 
@@ -111,7 +111,7 @@ class MOGASolver(Solver):
 
                 # Evaluate invalid individuals
                 invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
-                fitnesses = map(self.toolbox.evaluate, invalid_ind)
+                fitnesses = self.evaluate_population(invalid_ind)
                 for ind, fit in zip(invalid_ind, fitnesses):
                     ind.fitness.values = fit
 
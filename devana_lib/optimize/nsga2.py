@@ -1,15 +1,27 @@
 import random
+import numpy as np
 from deap import base, creator, tools
 from devana.optimize.base import Solver
+from devana.optimize.pareto import FrontMetrics, select_nsga2, tournament_dcd
+from devana.optimize.pareto_archive import ParetoArchive
 
 class NSGA2Solver(Solver):
     """
     Non-dominated Sorting Genetic Algorithm II (NSGA-II) Solver.
     
-    Ported from NSGA2Worker.py, removing PyQt5 dependencies.
+    Ported from NSGA2Worker.py, removing PyQt5 dependencies. Fronts and
+    crowding distances are computed once per generation on the objective
+    array (see devana.optimize.pareto) and reused by the parent tournament,
+    the survivor selection and the reported Pareto front. Every generation
+    the front is scored with FrontMetrics: config 'hv_ref_point' (in the
+    minimized objectives; defaults to the initial population's worst values
+    plus 10% of their range) and 'reference_front' (defaults to the best
+    front found so far). Every evaluated design is offered to a ParetoArchive
+    (config 'archive_max_size', 'archive_prune', 'archive_epsilon'), whose
+    members are returned as 'archive_front' and 'archive_objectives'.
     """
-    def __init__(self, config, evaluate_fn=None, callback=None):
-        super().__init__(config, evaluate_fn, callback)
+    def __init__(self, config, evaluate_fn=None, callback=None, evaluate_batch_fn=None):
+        super().__init__(config, evaluate_fn, callback, evaluate_batch_fn)
         
         # NSGA-II specific configuration
         self.cxpb = config.get('cxpb', 0.9)
@@ -20,6 +32,15 @@ class NSGA2Solver(Solver):
         
         # Objectives weights (default to 3 objectives minimizing)
         self.weights = config.get('weights', (-1.0, -1.0, -1.0))
+
+        # Quality indicators
+        self.hv_ref_point = config.get('hv_ref_point')
+        self.reference_front = config.get('reference_front')
+
+        # External archive of all non-dominated evaluations
+        self.archive_max_size = config.get('archive_max_size')
+        self.archive_prune = config.get('archive_prune', 'crowding')
+        self.archive_epsilon = config.get('archive_epsilon')
         
         # Setup DEAP
         self._setup_deap()
@@ -40,7 +61,6 @@ class NSGA2Solver(Solver):
                              low=low_bounds, up=high_bounds, eta=self.eta_c)
         self.toolbox.register("mutate", tools.mutPolynomialBounded, 
                              low=low_bounds, up=high_bounds, eta=self.eta_m, indpb=self.indpb)
-        self.toolbox.register("select", tools.selNSGA2)
 
     def _setup_deap(self):
         """Setup DEAP types safely for multi-objective optimization."""
@@ -49,6 +69,11 @@ class NSGA2Solver(Solver):
         if not hasattr(creator, "Individual"):
             creator.create("Individual", list, fitness=creator.FitnessMulti)
 
+    @staticmethod
+    def _objectives(individuals):
+        """(N, M) objectives of the individuals, all turned into minimization."""
+        return -np.array([ind.fitness.wvalues for ind in individuals], dtype=float).reshape(len(individuals), -1)
+
     def _generate_attr(self, i):
         """Generate a random attribute value within bounds."""
         if i in self.fixed_parameters:
@@ -61,16 +86,29 @@ class NSGA2Solver(Solver):
         pop = self.toolbox.population(n=self.pop_size)
         
         # Evaluate initial population
-        fitnesses = list(map(self.toolbox.evaluate, pop))
+        fitnesses = self.evaluate_population(pop)
         for ind, fit in zip(pop, fitnesses):
             ind.fitness.values = fit
 
-        # This is just to assign the crowding distance to the individuals
-        # no selection happens
-        pop = self.toolbox.select(pop, len(pop))
+        # Ranks and crowding distances of the population
+        objectives = self._objectives(pop)
+        _, ranks, crowding = select_nsga2(objectives, len(pop))
+        archive = ParetoArchive(objectives.shape[1], self.archive_max_size, self.archive_prune, self.archive_epsilon)
+        archive.add_many(objectives, pop)
+
+        ref_point = self.hv_ref_point
+        if ref_point is None:
+            worst, best = objectives.max(axis=0), objectives.min(axis=0)
+            ref_point = worst + 0.1 * np.where(worst > best, worst - best, 1.0)
+        front_metrics = FrontMetrics(ref_point, self.reference_front)
 
         metrics = {
-            'pareto_front_size_history': []
+            'pareto_front_size_history': [],
+            'archive_size_history': [],
+            'hv_history': [],
+            'igd_plus_history': [],
+            'gd_history': [],
+            'spread_history': [],
         }
 
         for gen in range(1, self.num_generations + 1):
@@ -78,8 +116,8 @@ class NSGA2Solver(Solver):
                 break
                 
             # Selection of parents
-            offspring = tools.selTournamentDCD(pop, len(pop))
-            offspring = [self.toolbox.clone(ind) for ind in offspring]
+            parents = tournament_dcd(objectives, crowding, len(pop))
+            offspring = [self.toolbox.clone(pop[i]) for i in parents]
 
             # Crossover and Mutation
             for ind1, ind2 in zip(offspring[::2], offspring[1::2]):
@@ -99,16 +137,29 @@ class NSGA2Solver(Solver):
 
             # Evaluate invalid individuals
             invalid_ind = [ind for ind in offspring if not ind.fitness.valid]
-            fitnesses = map(self.toolbox.evaluate, invalid_ind)
+            fitnesses = self.evaluate_population(invalid_ind)
             for ind, fit in zip(invalid_ind, fitnesses):
                 ind.fitness.values = fit
+            if invalid_ind:
+                archive.add_many(self._objectives(invalid_ind), invalid_ind)
+
+            # Select the next generation population; the kept fronts are whole
+            # but the last, so ranks in parents + offspring stay valid
+            combined = pop + offspring
+            combined_objectives = self._objectives(combined)
+            chosen, combined_ranks, combined_crowding = select_nsga2(combined_objectives, self.pop_size)
+            pop = [combined[i] for i in chosen]
+            objectives = combined_objectives[chosen]
+            ranks = combined_ranks[chosen]
+            crowding = combined_crowding[chosen]
 
-            # Select the next generation population
-            pop = self.toolbox.select(pop + offspring, self.pop_size)
-            
             # Pareto front info
-            pareto_front = tools.sortNondominated(pop, len(pop), first_front_only=True)[0]
+            pareto_front = [ind for ind, rank in zip(pop, ranks) if rank == 0]
             metrics['pareto_front_size_history'].append(len(pareto_front))
+            metrics['archive_size_history'].append(len(archive))
+            front_values = front_metrics.update(objectives[ranks == 0])
+            for key, name in (('HV', 'hv'), ('IGD+', 'igd_plus'), ('GD', 'gd'), ('Spread', 'spread')):
+                metrics[f'{name}_history'].append(front_values[key])
             
             # For reporting, we can use the best individual from the first front (e.g., min sum of objectives)
             best_ind = min(pareto_front, key=lambda ind: sum(ind.fitness.values))
@@ -116,13 +167,22 @@ class NSGA2Solver(Solver):
             
             self._report_progress(gen, best_fitness, best_ind, metrics)
 
-        final_pareto = tools.sortNondominated(pop, len(pop), first_front_only=True)[0]
+        if self.reference_front is None:
+            # Without a known front, score the generations against the final best front
+            for gen, values in enumerate(front_metrics.rescore()):
+                for key, name in (('IGD+', 'igd_plus'), ('GD', 'gd'), ('Spread', 'spread')):
+                    metrics[f'{name}_history'][gen] = values[key]
+
+        final_pareto = [ind for ind, rank in zip(pop, ranks) if rank == 0]
         
         return {
             'best_individual': best_ind, # One representative
             'best_fitness': best_fitness,
             'pareto_front': [list(ind) for ind in final_pareto],
             'pareto_objectives': [ind.fitness.values for ind in final_pareto],
+            # Back from minimized objectives to fitness values
+            'archive_front': archive.parameters.tolist(),
+            'archive_objectives': (-archive.objectives / np.asarray(self.weights, dtype=float)).tolist(),
             'metrics': metrics,
             'parameter_names': self.parameter_names
         }
@@ -0,0 +1,400 @@
+import bisect
+
+import numpy as np
+from scipy.spatial import cKDTree
+
+# Non-dominated sorting, crowding distance and quality indicators (HV, IGD+,
+# GD, Spread) on (N, M) arrays of objectives to be minimized. For DEAP
+# individuals use -np.array([ind.fitness.wvalues ...]). Sorting and selection
+# agree with DEAP's sortNondominated / assignCrowdingDist / selNSGA2.
+
+
+def dominance_matrix(objectives):
+    """
+    Pairwise Pareto dominance.
+
+    Args:
+        objectives (array-like): (N, M) objectives to be minimized.
+
+    Returns:
+        np.ndarray: (N, N) booleans, True at [i, j] if row i dominates row j.
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    n = len(objectives)
+    no_worse = np.ones((n, n), dtype=bool)
+    better = np.zeros((n, n), dtype=bool)
+    for column in objectives.T:
+        no_worse &= column[:, None] <= column[None, :]
+        better |= column[:, None] < column[None, :]
+    return no_worse & better
+
+
+def non_dominated_sort(objectives, k=None, first_front_only=False):
+    """
+    Fast non-dominated sort.
+
+    Args:
+        objectives (array-like): (N, M) objectives to be minimized.
+        k (int, optional): Stop once at least k rows are ranked.
+        first_front_only (bool): Return only the first front.
+
+    Returns:
+        list: Row index arrays of the fronts, best first.
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    n = len(objectives)
+    if n == 0:
+        return []
+    k = n if k is None else min(k, n)
+    dominates = dominance_matrix(objectives)
+    dominated_count = dominates.sum(axis=0)
+    fronts = []
+    ranked = 0
+    while ranked < k:
+        front = np.flatnonzero(dominated_count == 0)
+        fronts.append(front)
+        ranked += len(front)
+        if first_front_only:
+            break
+        dominated_count -= dominates[front].sum(axis=0)
+        dominated_count[front] = -1
+    return fronts
+
+
+def crowding_distance(objectives):
+    """
+    Crowding distance within one front.
+
+    Args:
+        objectives (array-like): (N, M) objectives of the front's members.
+
+    Returns:
+        np.ndarray: (N,) distances, inf for the extremes of every objective.
+    """
+    objectives = np.asarray(objectives, dtype=float).reshape(len(objectives), -1)
+    n, n_obj = objectives.shape
+    distances = np.zeros(n)
+    if n == 0:
+        return distances
+    # Ties are broken by the order of the previous objective, as in DEAP
+    order = np.arange(n)
+    for column in objectives.T:
+        order = order[np.argsort(column[order], kind='stable')]
+        distances[order[0]] = distances[order[-1]] = np.inf
+        span = column[order[-1]] - column[order[0]]
+        if span == 0:
+            continue
+        sorted_values = column[order]
+        distances[order[1:-1]] += (sorted_values[2:] - sorted_values[:-2]) / (n_obj * span)
+    return distances
+
+
+def select_nsga2(objectives, k):
+    """
+    NSGA-II survivor selection.
+
+    Args:
+        objectives (array-like): (N, M) objectives of parents and offspring.
+        k (int): Number of rows to keep.
+
+    Returns:
+        tuple: (chosen, ranks, crowding) - indices of the kept rows, the front
+            index of every row (len(fronts) if unranked) and its crowding
+            distance within its front.
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    fronts = non_dominated_sort(objectives, k)
+    ranks = np.full(len(objectives), len(fronts), dtype=int)
+    crowding = np.zeros(len(objectives))
+    for rank, front in enumerate(fronts):
+        ranks[front] = rank
+        crowding[front] = crowding_distance(objectives[front])
+
+    chosen = np.concatenate(fronts[:-1]) if len(fronts) > 1 else np.empty(0, dtype=int)
+    if fronts:
+        last = fronts[-1]
+        order = np.argsort(-crowding[last], kind='stable')
+        chosen = np.concatenate([chosen, last[order[:k - len(chosen)]]]).astype(int)
+    return chosen, ranks, crowding
+
+
+def tournament_dcd(objectives, crowding, k):
+    """
+    Binary tournaments on dominance, then crowding distance.
+
+    Args:
+        objectives (array-like): (N, M) objectives to be minimized.
+        crowding (array-like): (N,) crowding distances.
+        k (int): Number of winners; need not be a multiple of four.
+
+    Returns:
+        np.ndarray: (k,) indices of the winners.
+    """
+    objectives = np.asarray(objectives, dtype=float)
+    crowding = np.asarray(crowding, dtype=float)
+    n = len(objectives)
+    contestants = np.concatenate([np.random.permutation(n) for _ in range(-(-2 * k // n))])
+    a, b = contestants[:2 * k].reshape(k, 2).T
+    obj_a, obj_b = objectives[a], objectives[b]
+    a_dominates = np.all(obj_a <= obj_b, axis=1) & np.any(obj_a < obj_b, axis=1)
+    b_dominates = np.all(obj_b <= obj_a, axis=1) & np.any(obj_b < obj_a, axis=1)
+    a_wins = np.where(crowding[a] == crowding[b], np.random.random(k) <= 0.5, crowding[a] > crowding[b])
+    a_wins = a_dominates | (a_wins & ~b_dominates)
+    return np.where(a_wins, a, b)
+
+
+# Points that may enter or leave a tracked front in one update before the
+# hypervolume is recomputed with one sweep (a contribution costs about a
+# fifth of a sweep)
+INCREMENTAL_HV_MAX_CHANGES = 4
+
+# Reference rows per block of the IGD+ computation
+IGD_BLOCK_ROWS = 256
+
+
+def _hypervolume_2d(points, ref_point):
+    """Area dominated by 2-objective points inside the reference box."""
+    order = np.lexsort((points[:, 1], points[:, 0]))
+    x, y = points[order, 0], np.minimum.accumulate(points[order, 1])
+    widths = np.diff(np.append(x, ref_point[0]))
+    return float(np.sum(widths * (ref_point[1] - y)))
+
+
+def _hypervolume_3d(points, ref_point):
+    """Volume dominated by 3-objective points inside the reference box (HV3D sweep over f3)."""
+    ref_x, ref_y, ref_z = (float(v) for v in ref_point)
+    xs, ys = [], []
+    area = volume = 0.0
+    z_prev = None
+    for x, y, z in sorted(points.tolist(), key=lambda p: p[2]):
+        if z_prev is not None:
+            volume += area * (z - z_prev)
+        z_prev = z
+        i = bisect.bisect_left(xs, x)
+        if (i > 0 and ys[i - 1] <= y) or (i < len(xs) and xs[i] == x and ys[i] <= y):
+            continue
+        height = ys[i - 1] if i > 0 else ref_y
+        added = ((xs[i] if i < len(xs) else ref_x) - x) * (height - y)
+        j = i
+        while j < len(xs) and ys[j] >= y:
+            added += ((xs[j + 1] if j + 1 < len(xs) else ref_x) - xs[j]) * (ys[j] - y)
+            j += 1
+        xs[i:j] = [x]
+        ys[i:j] = [y]
+        area += added
+    if z_prev is not None:
+        volume += area * (ref_z - z_prev)
+    return volume
+
+
+def hypervolume(points, ref_point):
+    """
+    Exact hypervolume of a 2- or 3-objective point set.
+
+    Args:
+        points (array-like): (N, M) objectives to be minimized.
+        ref_point (array-like): (M,) reference point.
+
+    Returns:
+        float: Volume dominated by the points within the reference box.
+    """
+    ref_point = np.asarray(ref_point, dtype=float)
+    points = np.asarray(points, dtype=float).reshape(-1, len(ref_point))
+    points = points[np.all(points < ref_point, axis=1)]
+    if len(points) == 0:
+        return 0.0
+    if len(ref_point) == 2:
+        return _hypervolume_2d(points, ref_point)
+    if len(ref_point) == 3:
+        return _hypervolume_3d(points, ref_point)
+    raise ValueError(f"Hypervolume is implemented for 2 or 3 objectives, got {len(ref_point)}")
+
+
+def hypervolume_contribution(point, others, ref_point):
+    """
+    Hypervolume that a point adds to a set.
+
+    Args:
+        point (array-like): (M,) objectives.
+        others (array-like): (N, M) objectives of the set.
+        ref_point (array-like): (M,) reference point.
+
+    Returns:
+        float: Box volume of the point minus the hypervolume of the others
+            projected onto that box.
+    """
+    ref_point = np.asarray(ref_point, dtype=float)
+    point = np.asarray(point, dtype=float)
+    if np.any(point >= ref_point):
+        return 0.0
+    others = np.asarray(others, dtype=float).reshape(-1, len(point))
+    projected = np.maximum(others, point)
+    projected = projected[np.all(projected < ref_point, axis=1)]
+    at_point = projected == point
+    if np.any(np.all(at_point, axis=1)):
+        return 0.0
+    # Projections equal to the point in all objectives but one are slabs;
+    # the lowest slab per objective hides everything behind it
+    keep = np.ones(len(projected), dtype=bool)
+    for k in range(len(point)):
+        slabs = np.flatnonzero(np.all(np.delete(at_point, k, axis=1), axis=1))
+        if len(slabs):
+            lowest = slabs[np.argmin(projected[slabs, k])]
+            keep &= projected[:, k] < projected[lowest, k]
+            keep[lowest] = True
+    return float(np.prod(ref_point - point)) - hypervolume(projected[keep], ref_point)
+
+
+class HypervolumeTracker:
+    """
+    Exact hypervolume of a changing front, updated by the contributions of
+    the points that leave or enter it (one full sweep when more than
+    INCREMENTAL_HV_MAX_CHANGES points changed).
+    """
+    def __init__(self, ref_point):
+        self.ref_point = np.asarray(ref_point, dtype=float)
+        self.points = {}
+        self.value = 0.0
+
+    def update(self, front):
+        """Track the (N, M) front and return its hypervolume."""
+        front = np.asarray(front, dtype=float).reshape(-1, len(self.ref_point))
+        front = front[np.all(front < self.ref_point, axis=1)]
+        new_points = {tuple(row): row for row in front.tolist()}
+        leaving = [key for key in self.points if key not in new_points]
+        entering = [key for key in new_points if key not in self.points]
+
+        if len(leaving) + len(entering) > INCREMENTAL_HV_MAX_CHANGES:
+            self.points = new_points
+            self.value = hypervolume(list(new_points.values()), self.ref_point)
+            return self.value
+
+        for key in leaving:
+            point = self.points.pop(key)
+            self.value -= hypervolume_contribution(point, list(self.points.values()), self.ref_point)
+        for key in entering:
+            self.value += hypervolume_contribution(new_points[key], list(self.points.values()), self.ref_point)
+            self.points[key] = new_points[key]
+        self.value = max(self.value, 0.0)
+        return self.value
+
+
+def generational_distance(front, reference):
+    """Mean distance from the front's points to the nearest reference point (KD-tree)."""
+    front = np.asarray(front, dtype=float)
+    if len(front) == 0:
+        return float('inf')
+    distances, _ = cKDTree(reference).query(front)
+    return float(np.mean(distances))
+
+
+def igd_plus(front, reference):
+    """Mean over the reference points of the smallest ||max(a - r, 0)|| to a front point a."""
+    front = np.asarray(front, dtype=float)
+    reference = np.asarray(reference, dtype=float)
+    if len(front) == 0:
+        return float('inf')
+    nearest = []
+    for start in range(0, len(reference), IGD_BLOCK_ROWS):
+        block = reference[start:start + IGD_BLOCK_ROWS]
+        squared = np.zeros((len(block), len(front)))
+        for k in range(front.shape[1]):
+            squared += np.maximum(front[None, :, k] - block[:, None, k], 0.0) ** 2
+        nearest.append(np.sqrt(squared.min(axis=1)))
+    return float(np.mean(np.concatenate(nearest)))
+
+
+def spread(front, reference):
+    """Generalized spread (Delta) of a front; extremes are the reference points with the largest objectives."""
+    front = np.asarray(front, dtype=float)
+    reference = np.asarray(reference, dtype=float)
+    if len(front) < 2:
+        return 1.0
+    tree = cKDTree(front)
+    neighbour_distances = tree.query(front, k=2)[0][:, 1]
+    extremes = reference[np.argmax(reference, axis=0)]
+    extreme_distance = float(np.sum(tree.query(extremes)[0]))
+    mean_distance = float(np.mean(neighbour_distances))
+    denominator = extreme_distance + len(front) * mean_distance
+    if denominator == 0:
+        return 0.0
+    return (extreme_distance + float(np.sum(np.abs(neighbour_distances - mean_distance)))) / denominator
+
+
+def merge_fronts(reference, front):
+    """Non-dominated union of two non-dominated fronts, comparing only across them."""
+    reference = np.asarray(reference, dtype=float)
+    front = np.unique(np.asarray(front, dtype=float), axis=0)
+    if len(reference) == 0:
+        return front
+    no_worse = np.ones((len(front), len(reference)), dtype=bool)
+    no_better = np.ones((len(front), len(reference)), dtype=bool)
+    for k in range(front.shape[1]):
+        no_worse &= front[:, None, k] <= reference[None, :, k]
+        no_better &= front[:, None, k] >= reference[None, :, k]
+    reference_kept = ~np.any(no_worse & ~no_better, axis=0)
+    front_kept = ~np.any(no_better, axis=1)
+    return np.vstack([reference[reference_kept], front[front_kept]])
+
+
+def score_front(front, reference):
+    """
+    IGD+, GD and Spread of a front against a reference front, both scaled to
+    the reference's range.
+
+    Returns:
+        dict: 'IGD+', 'GD' and 'Spread'.
+    """
+    front = np.asarray(front, dtype=float)
+    reference = np.asarray(reference, dtype=float)
+    if len(front) == 0 or len(reference) == 0:
+        return {'IGD+': float('inf'), 'GD': float('inf'), 'Spread': 1.0}
+    low = reference.min(axis=0)
+    span = reference.max(axis=0) - low
+    span[span == 0] = 1.0
+    scaled_front = (front - low) / span
+    scaled_reference = (reference - low) / span
+    return {
+        'IGD+': igd_plus(scaled_front, scaled_reference),
+        'GD': generational_distance(scaled_front, scaled_reference),
+        'Spread': spread(scaled_front, scaled_reference),
+    }
+
+
+class FrontMetrics:
+    """
+    Per-generation HV, IGD+, GD and Spread of a front.
+
+    The hypervolume is tracked incrementally in raw units. IGD+, GD and
+    Spread come from score_front against the reference front; without a
+    known one the merged best front of all updates is used, which for an
+    elitist algorithm is the current front. The fronts are then kept so that
+    `rescore` can score them against the final reference after the run.
+    """
+    def __init__(self, ref_point, reference_front=None):
+        self.hypervolume = HypervolumeTracker(ref_point)
+        self.fixed_reference = reference_front is not None
+        self.reference = (np.asarray(reference_front, dtype=float) if self.fixed_reference
+                          else np.empty((0, len(self.hypervolume.ref_point))))
+        self.fronts = []
+
+    def update(self, front):
+        """
+        Args:
+            front (array-like): (N, M) objectives of the current non-dominated front.
+
+        Returns:
+            dict: 'HV', 'IGD+', 'GD' and 'Spread'.
+        """
+        front = np.unique(np.asarray(front, dtype=float).reshape(-1, len(self.hypervolume.ref_point)), axis=0)
+        metrics = {'HV': self.hypervolume.update(front)}
+        if not self.fixed_reference:
+            self.reference = merge_fronts(self.reference, front)
+            self.fronts.append(front)
+        metrics.update(score_front(front, self.reference))
+        return metrics
+
+    def rescore(self, reference=None):
+        """Scores of all kept fronts against `reference` (default: the final best front)."""
+        reference = self.reference if reference is None else np.asarray(reference, dtype=float)
+        return [score_front(front, reference) for front in self.fronts]
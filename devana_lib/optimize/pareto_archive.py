@@ -0,0 +1,450 @@
+import numpy as np
+from scipy.spatial import cKDTree
+
+from devana.optimize.pareto import crowding_distance, non_dominated_sort
+
+# External archive of the non-dominated designs among all evaluations of a
+# campaign, indexed by an ND-tree. Objectives are minimized, as in
+# devana.optimize.pareto.
+
+# Points a leaf of the ND-tree holds before it is split; leaves are compared
+# with a batch of candidates in one array operation, so fairly large leaves
+# (a shallower tree) are faster than the few points per leaf of the paper
+ND_TREE_LEAF_SIZE = 100
+
+# Children of a split leaf; the ND-tree authors suggest objectives + 1
+ND_TREE_CHILDREN = 4
+
+# Archive pruning policies:
+#   'crowding' - repeatedly drop the member with the smallest crowding
+#                distance (like NSGA-II), keeping the extremes
+#   'epsilon'  - keep one member per epsilon box of the objective space
+#                first, then fall back to 'crowding' if still too large
+PRUNE_POLICIES = ("crowding", "epsilon")
+
+# A bounded archive may grow this far past max_size before it is pruned
+# back, so pruning (and the tree rebuild after it) is amortized over many
+# insertions
+PRUNE_SLACK = 0.1
+
+# Removed rows are compacted away once they outnumber the members
+COMPACT_MIN_ROWS = 1024
+
+
+class _Node:
+    """ND-tree node: bounds of its points plus either points (leaf) or children."""
+
+    __slots__ = ("ideal", "nadir", "points", "children", "child_ideal", "child_nadir")
+
+    def __init__(self, ideal, nadir, points=None):
+        self.ideal = ideal
+        self.nadir = nadir
+        self.points = points if points is not None else []
+        self.children = None
+        self.child_ideal = None
+        self.child_nadir = None
+
+    def is_empty(self):
+        return not self.points if self.children is None else not self.children
+
+
+class ParetoArchive:
+    """
+    External archive of all non-dominated designs of a campaign.
+
+    Every evaluated design can be offered to the archive; it is kept if no
+    member weakly dominates it, and the members it dominates are removed.
+    The dominance checks go through an ND-tree (Jaszkiewicz & Lust, 2018):
+    each node keeps the ideal and nadir points of its subtree, so whole
+    subtrees are skipped, rejected against or emptied without looking at
+    their points. Bounds are only widened, which keeps them valid after
+    removals.
+
+    Members live in preallocated arrays (objectives, parameters), so the
+    queries (`dominated_by`, `dominating`, `nearest`, `knee_points`)
+    are NumPy operations over all of them. With `max_size` the archive is
+    pruned by one of PRUNE_POLICIES once it exceeds the size by PRUNE_SLACK.
+
+    Args:
+        n_objectives (int): Number of objectives, all minimized.
+        max_size (int, optional): Members kept after pruning; unbounded if None.
+        prune (str): One of PRUNE_POLICIES.
+        epsilon (float or array-like, optional): Box size per objective of
+            the 'epsilon' policy.
+    """
+
+    def __init__(self, n_objectives, max_size=None, prune="crowding", epsilon=None):
+        if prune not in PRUNE_POLICIES:
+            raise ValueError(f"Unknown pruning policy '{prune}', expected one of {PRUNE_POLICIES}")
+        if prune == "epsilon" and epsilon is None:
+            raise ValueError("The 'epsilon' pruning policy needs epsilon")
+        self.n_objectives = int(n_objectives)
+        self.max_size = max_size
+        self.prune = prune
+        self.epsilon = None if epsilon is None else np.broadcast_to(np.asarray(epsilon, dtype=float), (self.n_objectives,))
+        self._objectives = np.empty((64, self.n_objectives))
+        self._parameters = None
+        self._labels = []
+        self._alive = np.zeros(64, dtype=bool)
+        self._rows = 0
+        self._size = 0
+        self._root = None
+        self._tree = None
+        self.offered = 0
+
+    def __len__(self):
+        return self._size
+
+    def add(self, objectives, parameters=None, label=None):
+        """
+        Offer one design to the archive.
+
+        Args:
+            objectives (array-like): (n_objectives,) objectives of the design.
+            parameters (array-like, optional): Design vector stored with it.
+            label (optional): Any object stored with it (e.g. the generation).
+
+        Returns:
+            bool: True if the design entered the archive.
+        """
+        point = np.asarray(objectives, dtype=float).reshape(1, self.n_objectives)
+        return bool(self.add_many(point, None if parameters is None else [parameters], [label])[0])
+
+    def add_many(self, objectives, parameters=None, labels=None):
+        """
+        Offer a batch of designs, e.g. all evaluations of a generation.
+
+        The batch is first reduced to its own non-dominated, distinct rows
+        with one array operation. The remaining candidates then descend the
+        tree together: every visited node compares its children's bounds
+        with all candidates that reached it at once.
+
+        Args:
+            objectives (array-like): (N, n_objectives) objectives of the designs.
+            parameters (array-like, optional): (N, D) design vectors stored with them.
+            labels (sequence, optional): N objects stored with them.
+
+        Returns:
+            np.ndarray: (N,) booleans, True for the designs that entered the archive.
+        """
+        objectives = np.asarray(objectives, dtype=float).reshape(-1, self.n_objectives)
+        self.offered += len(objectives)
+        accepted = np.zeros(len(objectives), dtype=bool)
+        finite = np.flatnonzero(np.all(np.isfinite(objectives), axis=1))
+        if len(finite) == 0:
+            return accepted
+        _, first = np.unique(objectives[finite], axis=0, return_index=True)
+        candidates = finite[np.sort(first)]
+        if len(candidates) > 1:
+            candidates = candidates[non_dominated_sort(objectives[candidates], first_front_only=True)[0]]
+        candidates = candidates[self._offer(objectives[candidates])]
+        if len(candidates) == 0:
+            return accepted
+
+        accepted[candidates] = True
+        for i in candidates:
+            point = objectives[i]
+            row = self._store(point, None if parameters is None else parameters[i],
+                              None if labels is None else labels[i])
+            if self._root is None:
+                self._root = _Node(point.copy(), point.copy(), [row])
+            else:
+                self._insert(self._root, row, point)
+        self._tree = None
+        if self.max_size is not None and self._size > self.max_size * (1 + PRUNE_SLACK):
+            self._prune()
+        elif self._rows - self._size > max(self._size, COMPACT_MIN_ROWS):
+            self._rebuild(np.flatnonzero(self._alive[:self._rows]))
+        return accepted
+
+    def _store(self, point, parameters, label):
+        """Append a member row, growing the arrays as needed."""
+        if self._rows == len(self._alive):
+            capacity = 2 * len(self._alive)
+            self._objectives = np.resize(self._objectives, (capacity, self.n_objectives))
+            self._alive = np.concatenate([self._alive, np.zeros(capacity - len(self._alive), dtype=bool)])
+            if self._parameters is not None:
+                self._parameters = np.resize(self._parameters, (capacity, self._parameters.shape[1]))
+        if parameters is not None:
+            parameters = np.asarray(parameters, dtype=float).ravel()
+            if self._parameters is None:
+                self._parameters = np.full((len(self._alive), len(parameters)), np.nan)
+            self._parameters[self._rows] = parameters
+        elif self._parameters is not None:
+            self._parameters[self._rows] = np.nan
+        row = self._rows
+        self._objectives[row] = point
+        self._alive[row] = True
+        self._labels.append(label)
+        self._rows += 1
+        self._size += 1
+        return row
+
+    def _offer(self, points):
+        """
+        Check mutually non-dominated, distinct points against the members and
+        remove the members they dominate.
+
+        Returns:
+            np.ndarray: (len(points),) booleans, False for points weakly
+                dominated by a member.
+        """
+        rejected = np.zeros(len(points), dtype=bool)
+        root = self._root
+        if root is None:
+            return ~rejected
+        rejected |= np.all(root.nadir <= points, axis=1)
+        covering = ~rejected & np.all(points <= root.ideal, axis=1)
+        if covering.any():
+            # One point dominates every member, so no member dominates any other point
+            self._discard(root)
+            self._root = None
+            return ~rejected
+        comparable = ~rejected & (np.all(root.ideal <= points, axis=1) | np.all(points <= root.nadir, axis=1))
+        if comparable.any():
+            self._update(root, points, np.flatnonzero(comparable), rejected)
+            if root.is_empty():
+                self._root = None
+        return ~rejected
+
+    def _update(self, node, points, index, rejected):
+        """
+        Mark in `rejected` the points[index] that a member below `node`
+        weakly dominates, and remove the members that they dominate. In a
+        non-dominated archive a point cannot do both, so the order in which
+        the subtrees are visited does not matter. The points must be
+        comparable with the node's bounds without covering them (see
+        `_offer`).
+        """
+        candidates = points[index]
+        if node.children is None:
+            rows = np.asarray(node.points)
+            members = self._objectives[rows]
+            weakly_dominated = np.ones((len(candidates), len(rows)), dtype=bool)
+            no_worse = np.ones((len(candidates), len(rows)), dtype=bool)
+            for k in range(self.n_objectives):
+                weakly_dominated &= members[None, :, k] <= candidates[:, None, k]
+                no_worse &= candidates[:, None, k] <= members[None, :, k]
+            rejected[index[weakly_dominated.any(axis=1)]] = True
+            # Equal rows weakly dominate each other; those are rejections
+            dominated = np.any(no_worse & ~weakly_dominated, axis=0)
+            if dominated.any():
+                self._alive[rows[dominated]] = False
+                self._size -= int(np.count_nonzero(dominated))
+                node.points = rows[~dominated].tolist()
+            return
+
+        # The bounds of all children are compared with all points at once
+        shape = (len(candidates), len(node.children))
+        below_nadir = np.ones(shape, dtype=bool)
+        above_ideal = np.ones(shape, dtype=bool)
+        covers = np.ones(shape, dtype=bool)
+        inside = np.ones(shape, dtype=bool)
+        for k in range(self.n_objectives):
+            column = candidates[:, None, k]
+            below_nadir &= node.child_nadir[None, :, k] <= column
+            above_ideal &= node.child_ideal[None, :, k] <= column
+            covers &= column <= node.child_ideal[None, :, k]
+            inside &= column <= node.child_nadir[None, :, k]
+        rejects = below_nadir.any(axis=1)
+        rejected[index[rejects]] = True
+        live = ~rejects[:, None]
+        covered = np.any(covers & live, axis=0)
+        visit = live & ~covers & (above_ideal | inside)
+        empty = covered
+        for k in np.flatnonzero(covered):
+            self._discard(node.children[k])
+        for k in np.flatnonzero(visit.any(axis=0) & ~covered):
+            child = node.children[k]
+            self._update(child, points, index[visit[:, k]], rejected)
+            empty[k] = child.is_empty()
+        if empty.any():
+            self._set_children(node, [child for child, gone in zip(node.children, empty) if not gone])
+
+    def _discard(self, node):
+        """Remove all members below `node`."""
+        if node.children is None:
+            self._alive[node.points] = False
+            self._size -= len(node.points)
+            node.points = []
+        else:
+            for child in node.children:
+                self._discard(child)
+            self._set_children(node, [])
+
+    @staticmethod
+    def _set_children(node, children):
+        """
+        Attach `children` to `node`. Their bounds become rows of the
+        node's child_ideal/child_nadir arrays (the children keep views of
+        their rows), so that `_update` can test all of them at once.
+        """
+        node.children = children
+        node.child_ideal = np.array([child.ideal for child in children]).reshape(len(children), len(node.ideal))
+        node.child_nadir = np.array([child.nadir for child in children]).reshape(len(children), len(node.ideal))
+        for k, child in enumerate(children):
+            child.ideal = node.child_ideal[k]
+            child.nadir = node.child_nadir[k]
+
+    def _insert(self, node, row, point):
+        """Add a member below `node`, descending to the closest child."""
+        while True:
+            np.minimum(node.ideal, point, out=node.ideal)
+            np.maximum(node.nadir, point, out=node.nadir)
+            if node.children is None:
+                break
+            if not node.children:
+                node.children = None
+                node.points = []
+                break
+            centers = (node.child_ideal + node.child_nadir) / 2
+            node = node.children[int(np.argmin(((centers - point) ** 2).sum(axis=1)))]
+        node.points.append(row)
+        if len(node.points) > ND_TREE_LEAF_SIZE:
+            self._split(node)
+
+    def _split(self, node):
+        """Turn a full leaf into ND_TREE_CHILDREN leaves around far-apart seeds."""
+        rows = np.asarray(node.points)
+        members = self._objectives[rows]
+        distances = np.sqrt(np.sum((members[:, None, :] - members[None, :, :]) ** 2, axis=2))
+        seeds = [int(np.argmax(distances.mean(axis=1)))]
+        while len(seeds) < min(ND_TREE_CHILDREN, len(rows)):
+            seeds.append(int(np.argmax(distances[:, seeds].min(axis=1))))
+        owner = np.argmin(distances[:, seeds], axis=1)
+        children = []
+        for k in range(len(seeds)):
+            group = members[owner == k]
+            children.append(_Node(group.min(axis=0), group.max(axis=0), rows[owner == k].tolist()))
+        node.points = []
+        self._set_children(node, children)
+
+    def _prune(self):
+        """Shrink the archive to max_size with the configured policy."""
+        rows = np.flatnonzero(self._alive[:self._rows])
+        if self.prune == "epsilon":
+            boxes = np.floor(self._objectives[rows] / self.epsilon)
+            corner_distance = np.sum((self._objectives[rows] / self.epsilon - boxes) ** 2, axis=1)
+            # Per box, the member closest to the box's lower corner
+            order = np.lexsort((corner_distance,) + tuple(boxes.T[::-1]))
+            _, first = np.unique(boxes[order], axis=0, return_index=True)
+            rows = rows[np.sort(order[first])]
+        while len(rows) > self.max_size:
+            crowding = crowding_distance(self._objectives[rows])
+            # Several members at once while far above the target
+            n_drop = max(1, (len(rows) - self.max_size) // 4)
+            drop = np.argsort(crowding, kind="stable")[:n_drop]
+            rows = np.delete(rows, drop)
+        self._rebuild(rows)
+
+    def _rebuild(self, rows):
+        """Keep only `rows` (mutually non-dominated), compacting the arrays and the tree."""
+        rows = np.asarray(rows, dtype=int)
+        self._objectives = np.concatenate([self._objectives[rows], np.empty((max(64, len(rows)), self.n_objectives))])
+        if self._parameters is not None:
+            self._parameters = np.concatenate([self._parameters[rows],
+                                               np.full((max(64, len(rows)), self._parameters.shape[1]), np.nan)])
+        self._labels = [self._labels[i] for i in rows]
+        self._alive = np.zeros(len(self._objectives), dtype=bool)
+        self._alive[:len(rows)] = True
+        self._rows = self._size = len(rows)
+        self._root = None
+        self._tree = None
+        for row in range(len(rows)):
+            point = self._objectives[row]
+            if self._root is None:
+                self._root = _Node(point.copy(), point.copy(), [row])
+            else:
+                self._insert(self._root, row, point)
+
+    def _member_rows(self):
+        return np.flatnonzero(self._alive[:self._rows])
+
+    @property
+    def objectives(self):
+        """(N, n_objectives) objectives of the members."""
+        return self._objectives[self._member_rows()]
+
+    @property
+    def parameters(self):
+        """(N, D) design vectors of the members (NaN where none was given), or None."""
+        if self._parameters is None:
+            return None
+        return self._parameters[self._member_rows()]
+
+    @property
+    def labels(self):
+        """Labels of the members, in the order of `objectives`."""
+        return [self._labels[i] for i in self._member_rows()]
+
+    def dominated_by(self, points):
+        """
+        Members dominated by the given points.
+
+        Args:
+            points (array-like): (M,) point or (P, M) points.
+
+        Returns:
+            np.ndarray: (N,) or (P, N) booleans over the members.
+        """
+        points = np.asarray(points, dtype=float)
+        members = self.objectives
+        query = points.reshape(-1, self.n_objectives)
+        result = (np.all(query[:, None, :] <= members[None, :, :], axis=2)
+                  & np.any(query[:, None, :] < members[None, :, :], axis=2))
+        return result[0] if points.ndim == 1 else result
+
+    def dominating(self, points):
+        """Members dominating the given points; shaped like `dominated_by`."""
+        points = np.asarray(points, dtype=float)
+        members = self.objectives
+        query = points.reshape(-1, self.n_objectives)
+        result = (np.all(members[None, :, :] <= query[:, None, :], axis=2)
+                  & np.any(members[None, :, :] < query[:, None, :], axis=2))
+        return result[0] if points.ndim == 1 else result
+
+    def _scale(self, points, members):
+        low = members.min(axis=0)
+        span = members.max(axis=0) - low
+        span[span == 0] = 1.0
+        return (np.asarray(points, dtype=float) - low) / span
+
+    def nearest(self, reference, k=1):
+        """
+        Members closest to reference points, in objectives scaled to the
+        archive's range (KD-tree, rebuilt only after the archive changed).
+
+        Args:
+            reference (array-like): (M,) point or (P, M) points.
+            k (int): Members per reference point.
+
+        Returns:
+            tuple: (distances, indices) as `cKDTree.query`; indices refer
+                to `objectives`.
+        """
+        members = self.objectives
+        if self._tree is None:
+            self._tree = cKDTree(self._scale(members, members))
+        return self._tree.query(self._scale(reference, members), k=min(k, len(members)))
+
+    def knee_points(self, n=1):
+        """
+        Indices (into `objectives`) of the n members farthest beyond the
+        hyperplane through the extremes of the front, with every objective
+        scaled to [0, 1] between the archive's ideal and nadir points.
+        """
+        members = self.objectives
+        scaled = self._scale(members, members)
+        # In the scaled space the extremes span the plane sum(f) = 1
+        distance = (1.0 - scaled.sum(axis=1)) / np.sqrt(self.n_objectives)
+        return np.argsort(-distance, kind="stable")[:n]
+
+    def to_dict(self):
+        """Copy of the members for JSON (if the labels are JSON-friendly)."""
+        parameters = self.parameters
+        return {
+            "objectives": self.objectives.tolist(),
+            "parameters": None if parameters is None else parameters.tolist(),
+            "labels": self.labels,
+            "offered": self.offered,
+        }
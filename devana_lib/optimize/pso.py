@@ -1,15 +1,47 @@
-import random
+import math
 import numpy as np
 from devana.optimize.base import Solver
 
+
+def neighborhood_indices(swarm_size, topology='global'):
+    """
+    Neighborhoods of a swarm as a precomputed index array.
+
+    Args:
+        swarm_size (int): Number of particles.
+        topology (str): 'global', 'ring' or 'von_neumann'.
+
+    Returns:
+        np.ndarray: (swarm_size, K) array whose row i lists the neighbors of
+            particle i, itself included (padded with i where a row has fewer).
+    """
+    index = np.arange(swarm_size)
+    if topology == 'ring':
+        return np.stack([(index - 1) % swarm_size, index, (index + 1) % swarm_size], axis=1)
+    if topology == 'von_neumann':
+        side = int(math.ceil(math.sqrt(swarm_size)))
+        row, col = index // side, index % side
+        neighbors = np.stack([
+            index,
+            ((row - 1) % side) * side + col,
+            ((row + 1) % side) * side + col,
+            row * side + ((col - 1) % side),
+            row * side + ((col + 1) % side),
+        ], axis=1)
+        return np.where(neighbors < swarm_size, neighbors, index[:, None])
+    return np.tile(index, (swarm_size, 1))
+
+
 class PSOSolver(Solver):
     """
     Particle Swarm Optimization (PSO) Solver.
     
-    Ported from PSOWorker.py, removing PyQt5 dependencies.
+    Ported from PSOWorker.py, removing PyQt5 dependencies. The swarm is kept
+    as arrays (positions, velocities and personal bests of shape
+    [N, num_parameters]) and moved with whole-swarm NumPy expressions.
     """
-    def __init__(self, config, evaluate_fn=None, callback=None):
-        super().__init__(config, evaluate_fn, callback)
+    def __init__(self, config, evaluate_fn=None, callback=None, evaluate_batch_fn=None):
+        super().__init__(config, evaluate_fn, callback, evaluate_batch_fn)
         
         # PSO specific configuration
         self.w = config.get('w', 0.729)      # Inertia weight
@@ -19,50 +51,35 @@ class PSOSolver(Solver):
         
         # Boundary handling
         self.boundary_handling = config.get('boundary_handling', 'absorbing')
+        # Neighborhood topology: 'global', 'ring' or 'von_neumann'
+        self.topology = config.get('topology', 'global')
 
     def solve(self):
         """Execute the PSO optimization."""
         num_particles = self.pop_size
         num_params = self.num_parameters
         
+        lows = np.array([b[0] for b in self.parameter_bounds], dtype=float)
+        highs = np.array([b[1] for b in self.parameter_bounds], dtype=float)
+        fixed = np.zeros(num_params, dtype=bool)
+        fixed[list(self.fixed_parameters)] = True
+        
         # Calculate max velocities
-        max_velocities = []
-        for j in range(num_params):
-            low, high = self.parameter_bounds[j]
-            max_velocities.append((high - low) * self.max_velocity_factor)
-            
-        # Initialize swarm
-        swarm = []
-        for i in range(num_particles):
-            position = []
-            velocity = []
-            for j in range(num_params):
-                low, high = self.parameter_bounds[j]
-                if j in self.fixed_parameters:
-                    pos = self.fixed_parameters[j]
-                    vel = 0.0
-                else:
-                    pos = random.uniform(low, high)
-                    max_vel = max_velocities[j]
-                    vel = random.uniform(-max_vel, max_vel)
-                position.append(pos)
-                velocity.append(vel)
-            
-            fitness = self.evaluate(position)
+        max_velocities = (highs - lows) * self.max_velocity_factor
             
-            particle = {
-                'position': np.array(position),
-                'velocity': np.array(velocity),
-                'best_position': np.array(position),
-                'best_fitness': fitness,
-                'fitness': fitness
-            }
-            swarm.append(particle)
+        # Initialize swarm (fixed parameters have identical bounds)
+        positions = np.random.uniform(lows, highs, size=(num_particles, num_params))
+        velocities = np.random.uniform(-max_velocities, max_velocities, size=(num_particles, num_params))
+        velocities[:, fixed] = 0.0
+        fitness = np.array(self.evaluate_population(positions), dtype=float)
+        best_positions = positions.copy()
+        best_fitness = fitness.copy()
+        neighborhoods = neighborhood_indices(num_particles, self.topology)
             
         # Global best
-        global_best_idx = min(range(num_particles), key=lambda i: swarm[i]['best_fitness'])
-        global_best_position = swarm[global_best_idx]['best_position'].copy()
-        global_best_fitness = swarm[global_best_idx]['best_fitness']
+        global_best_idx = int(np.argmin(best_fitness))
+        global_best_position = best_positions[global_best_idx].copy()
+        global_best_fitness = float(best_fitness[global_best_idx])
         
         metrics = {
             'best_fitness_history': []
@@ -71,66 +88,55 @@ class PSOSolver(Solver):
         for it in range(1, self.num_generations + 1):
             if self.stop_requested:
                 break
+            
+            # Social attractor of each particle: its neighborhood best
+            if self.topology == 'global':
+                social_best = global_best_position
+            else:
+                rows = np.arange(num_particles)
+                social_best = best_positions[neighborhoods[rows, np.argmin(best_fitness[neighborhoods], axis=1)]]
                 
-            for i in range(num_particles):
-                particle = swarm[i]
-                
-                # Update velocity
-                r1 = random.random()
-                r2 = random.random()
-                
-                cognitive = self.c1 * r1 * (particle['best_position'] - particle['position'])
-                social = self.c2 * r2 * (global_best_position - particle['position'])
-                
-                new_velocity = self.w * particle['velocity'] + cognitive + social
-                
-                # Clamping and Fixed parameters
-                for j in range(num_params):
-                    if j in self.fixed_parameters:
-                        new_velocity[j] = 0.0
-                    else:
-                        new_velocity[j] = max(-max_velocities[j], min(max_velocities[j], new_velocity[j]))
-                
-                particle['velocity'] = new_velocity
-                
-                # Update position
-                new_position = particle['position'] + particle['velocity']
-                
-                # Boundary handling
-                for j in range(num_params):
-                    if j in self.fixed_parameters:
-                        new_position[j] = self.fixed_parameters[j]
-                    else:
-                        low, high = self.parameter_bounds[j]
-                        if new_position[j] < low or new_position[j] > high:
-                            if self.boundary_handling == 'absorbing':
-                                new_position[j] = max(low, min(high, new_position[j]))
-                                particle['velocity'][j] = 0.0
-                            elif self.boundary_handling == 'reflecting':
-                                if new_position[j] < low:
-                                    new_position[j] = 2*low - new_position[j]
-                                    particle['velocity'][j] = -particle['velocity'][j]
-                                else:
-                                    new_position[j] = 2*high - new_position[j]
-                                    particle['velocity'][j] = -particle['velocity'][j]
-                                # Re-clamp in case reflection still outside
-                                new_position[j] = max(low, min(high, new_position[j]))
-                
-                particle['position'] = new_position
-                
-                # Evaluate
-                fitness = self.evaluate(particle['position'].tolist())
-                particle['fitness'] = fitness
-                
-                # Update personal best
-                if fitness < particle['best_fitness']:
-                    particle['best_fitness'] = fitness
-                    particle['best_position'] = particle['position'].copy()
+            # Update velocity (one pair of random factors per particle)
+            r1 = np.random.random((num_particles, 1))
+            r2 = np.random.random((num_particles, 1))
+            new_velocity = (self.w * velocities
+                            + self.c1 * r1 * (best_positions - positions)
+                            + self.c2 * r2 * (social_best - positions))
+            
+            # Clamping and Fixed parameters
+            velocities = np.clip(new_velocity, -max_velocities, max_velocities)
+            velocities[:, fixed] = 0.0
+            
+            # Update position
+            positions = positions + velocities
+            
+            # Boundary handling
+            below = positions < lows
+            above = positions > highs
+            outside = below | above
+            if self.boundary_handling == 'reflecting':
+                positions = np.where(below, 2 * lows - positions, np.where(above, 2 * highs - positions, positions))
+                velocities = np.where(outside, -velocities, velocities)
+                # Re-clamp in case reflection still outside
+                positions = np.clip(positions, lows, highs)
+            elif self.boundary_handling == 'absorbing':
+                positions = np.clip(positions, lows, highs)
+                velocities = np.where(outside, 0.0, velocities)
+            positions[:, fixed] = lows[fixed]
+            
+            # Evaluate the whole swarm at once (synchronous update)
+            fitness = np.array(self.evaluate_population(positions), dtype=float)
+            
+            # Update personal bests
+            improved = fitness < best_fitness
+            best_fitness[improved] = fitness[improved]
+            best_positions[improved] = positions[improved]
                     
-                    # Update global best
-                    if fitness < global_best_fitness:
-                        global_best_fitness = fitness
-                        global_best_position = particle['best_position'].copy()
+            # Update global best
+            idx = int(np.argmin(best_fitness))
+            if best_fitness[idx] < global_best_fitness:
+                global_best_fitness = float(best_fitness[idx])
+                global_best_position = best_positions[idx].copy()
             
             metrics['best_fitness_history'].append(global_best_fitness)
             self._report_progress(it, global_best_fitness, global_best_position.tolist(), metrics)
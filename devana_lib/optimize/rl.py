@@ -1,8 +1,7 @@
 import numpy as np
-import random
-import pickle
 import os
 from .base import Solver
+from .experience import POLICY_FILE, ExperienceBuffer, migrate_legacy_file
 from ..sensitivity.sobol import perform_sobol_analysis
 
 class RLSolver(Solver):
@@ -10,11 +9,19 @@ class RLSolver(Solver):
     Reinforcement Learning Solver for DVA parameter optimization.
     
     This implementation uses a Deep Deterministic Policy Gradient (DDPG)-inspired 
-    approach adapted for continuous parameter spaces.
+    approach adapted for continuous parameter spaces. With config 'num_envs'
+    K > 1, K environments share the policy: every step proposes K parameter
+    vectors, evaluates them in one `evaluate_population` call and updates the
+    policy on those K transitions, topped up from the replay buffer.
     """
-    def __init__(self, config, evaluate_fn=None, callback=None):
-        super().__init__(config, evaluate_fn, callback)
-        
+    def __init__(self, config, evaluate_fn=None, callback=None, evaluate_batch_fn=None):
+        super().__init__(config, evaluate_fn, callback, evaluate_batch_fn)
+        self._init_state()
+
+    def _init_state(self):
+        """Set the hyperparameters, policy and replay buffer from the config."""
+        config = self.config
+
         # RL Hyperparameters
         self.num_episodes = config.get('num_episodes', 100)
         self.max_steps = config.get('max_steps', 50)
@@ -29,6 +36,7 @@ class RLSolver(Solver):
         self.replay_buffer_size = config.get('replay_buffer_size', 10000)
         self.batch_size = config.get('batch_size', 32)
         self.noise_std = config.get('noise_std', 0.1)
+        self.num_envs = max(1, int(config.get('num_envs', 1)))
         
         # Epsilon decay parameters
         self.linear_decay_step = config.get('linear_decay_step', None)
@@ -44,79 +52,87 @@ class RLSolver(Solver):
         self.policy_weights = np.random.randn(self.num_parameters) * 0.1
         self.policy_bias = np.zeros(self.num_parameters)
         
-        # Experience replay buffer
-        self.experience_buffer = []
+        # Experience replay buffer of (parameters, reward = -fitness); the
+        # policy is stateless
+        self.experience_buffer = ExperienceBuffer(self.replay_buffer_size, self.num_parameters)
         
-        # Experience saving/loading
+        # Experience saving/loading (a directory of segments plus policy.npz)
         self.experience_save_path = config.get('experience_save_path', None)
-        if config.get('load_existing_experience', False) and self.experience_save_path:
-            self._load_experience()
+        if self.experience_save_path:
+            # Earlier versions saved a single pickle file at this path
+            self._migrate_legacy_experience()
+            if config.get('load_existing_experience', False):
+                self._load_experience()
+
+    def _migrate_legacy_experience(self):
+        """Turn a pickle file of the earlier format into an experience directory (ValueError for other files)."""
+        if os.path.isfile(self.experience_save_path):
+            migrate_legacy_file(self.experience_save_path, self.num_parameters)
 
     def _load_experience(self):
-        """Load existing experience from file"""
-        if os.path.exists(self.experience_save_path):
+        """Load the most recent saved transitions and the policy."""
+        if os.path.isdir(self.experience_save_path):
             try:
-                with open(self.experience_save_path, 'rb') as f:
-                    data = pickle.load(f)
-                    self.experience_buffer = data.get('experience_buffer', [])
-                    self.policy_weights = data.get('policy_weights', self.policy_weights)
-                    self.policy_bias = data.get('policy_bias', self.policy_bias)
+                self.experience_buffer.load(self.experience_save_path)
+                policy_path = os.path.join(self.experience_save_path, POLICY_FILE)
+                if os.path.exists(policy_path):
+                    with np.load(policy_path) as policy:
+                        if policy['weights'].shape == self.policy_weights.shape:
+                            self.policy_weights = policy['weights'].copy()
+                            self.policy_bias = policy['bias'].copy()
             except Exception:
                 pass
 
     def _save_experience(self):
-        """Save experience to file"""
+        """Append the transitions gathered since the last save and replace the policy file."""
         if self.experience_save_path:
             try:
-                data = {
-                    'experience_buffer': self.experience_buffer,
-                    'policy_weights': self.policy_weights,
-                    'policy_bias': self.policy_bias
-                }
-                with open(self.experience_save_path, 'wb') as f:
-                    pickle.dump(data, f)
+                self._migrate_legacy_experience()
+                self.experience_buffer.save(self.experience_save_path)
+                os.makedirs(self.experience_save_path, exist_ok=True)
+                policy_path = os.path.join(self.experience_save_path, POLICY_FILE)
+                with open(policy_path + '.tmp', 'wb') as f:
+                    np.savez(f, weights=self.policy_weights, bias=self.policy_bias)
+                os.replace(policy_path + '.tmp', policy_path)
             except Exception:
                 pass
 
     def generate_parameters(self, add_noise=True):
         """Generate DVA parameters using current policy."""
-        raw_params = self.policy_weights + self.policy_bias
+        return self.generate_parameters_batch(1, add_noise)[0]
+
+    def generate_parameters_batch(self, n, add_noise=True):
+        """Generate n DVA parameter vectors from the current policy, each with its own noise."""
+        raw_params = np.tile(self.policy_weights + self.policy_bias, (n, 1))
         
         if add_noise and self.epsilon > 0:
-            noise = np.random.normal(0, self.noise_std * self.epsilon, self.num_parameters)
-            raw_params += noise
+            raw_params += np.random.normal(0, self.noise_std * self.epsilon, (n, self.num_parameters))
         
-        bounded_params = []
-        for i, (low, high) in enumerate(self.parameter_bounds):
-            if i in self.fixed_parameters:
-                bounded_params.append(self.fixed_parameters[i])
-            else:
-                normalized = 1 / (1 + np.exp(-raw_params[i]))  # Sigmoid activation
-                scaled = low + normalized * (high - low)
-                bounded_params.append(scaled)
+        # Sigmoid activation, scaled to the bounds
+        low = np.array([b[0] for b in self.parameter_bounds], dtype=float)
+        high = np.array([b[1] for b in self.parameter_bounds], dtype=float)
+        bounded_params = low + (high - low) / (1 + np.exp(-raw_params))
+        for i, value in self.fixed_parameters.items():
+            bounded_params[:, i] = value
         
-        return bounded_params
+        return bounded_params.tolist()
+
+    def update_policy(self, experiences, batch_size=None, fresh=0):
+        """Update the policy on a minibatch (default batch_size) drawn from the ExperienceBuffer.
 
-    def update_policy(self, experiences):
-        """Update the policy based on collected experiences."""
-        if len(experiences) < self.batch_size:
+        The `fresh` most recent transitions are always in the minibatch; it
+        is topped up with random older ones.
+        """
+        batch_size = batch_size or self.batch_size
+        if len(experiences) < batch_size and not fresh:
             return
         
-        batch = random.sample(experiences, min(self.batch_size, len(experiences)))
+        # Rewards are -fitness, so they are the advantages (lower fitness is better)
+        _, params, advantages = experiences.sample(batch_size, include_latest=fresh)
         
-        policy_gradient_weights = np.zeros_like(self.policy_weights)
-        policy_gradient_bias = np.zeros_like(self.policy_bias)
-        
-        for params, fitness in batch:
-            advantage = -fitness  # Lower fitness is better
-            
-            for i in range(self.num_parameters):
-                if i not in self.fixed_parameters:
-                    policy_gradient_weights[i] += advantage * params[i] * self.alpha
-                    policy_gradient_bias[i] += advantage * self.alpha
-        
-        self.policy_weights += policy_gradient_weights / len(batch)
-        self.policy_bias += policy_gradient_bias / len(batch)
+        free = np.array([i not in self.fixed_parameters for i in range(self.num_parameters)])
+        self.policy_weights += self.alpha * np.mean(advantages[:, None] * params, axis=0) * free
+        self.policy_bias += self.alpha * np.mean(advantages) * free
         
         # Regularization
         self.policy_weights *= 0.999
@@ -174,8 +190,9 @@ class RLSolver(Solver):
                         break
             self.parameter_data = new_parameter_data
             
-            # Re-initialize based on new order
-            self.__init__(self.config, self.evaluate_fn, self.callback)
+            # Re-initialize the RL state based on new order; the Evaluator
+            # and its pool are kept
+            self._init_state()
 
         best_fitness = float('inf')
         best_solution = None
@@ -185,30 +202,30 @@ class RLSolver(Solver):
                 break
                 
             episode_best_fitness = float('inf')
-            episode_experiences = []
 
-            for step in range(self.max_steps):
+            # One environment keeps the policy fixed for the episode, so all
+            # steps are evaluated together; K environments update it per step
+            step_sizes = [self.num_envs] * self.max_steps if self.num_envs > 1 else [self.max_steps]
+
+            for n_proposals in step_sizes:
                 if self.stop_requested:
                     break
                     
-                params = self.generate_parameters(add_noise=True)
-                fitness = self.evaluate(params)
+                step_params = self.generate_parameters_batch(n_proposals, add_noise=True)
+                step_fitness = [float(f) for f in self.evaluate_population(step_params)]
                 
-                episode_experiences.append((params, fitness))
-                
-                if fitness < best_fitness:
-                    best_fitness = fitness
-                    best_solution = params.copy()
-                
-                if fitness < episode_best_fitness:
-                    episode_best_fitness = fitness
+                best = int(np.argmin(step_fitness))
+                if step_fitness[best] < best_fitness:
+                    best_fitness = step_fitness[best]
+                    best_solution = list(step_params[best])
+                episode_best_fitness = min(episode_best_fitness, step_fitness[best])
+
+                # Update replay buffer and policy; K environments update on
+                # the K transitions just collected, topped up from replay
+                self.experience_buffer.add(step_params, -np.array(step_fitness, dtype=float))
+                fresh = len(step_params) if self.num_envs > 1 else 0
+                self.update_policy(self.experience_buffer, max(self.batch_size, self.num_envs), fresh)
 
-            # Update replay buffer and policy
-            self.experience_buffer.extend(episode_experiences)
-            if len(self.experience_buffer) > self.replay_buffer_size:
-                self.experience_buffer = self.experience_buffer[-self.replay_buffer_size:]
-            
-            self.update_policy(self.experience_buffer)
             self.update_epsilon(episode)
             
             self._report_progress(episode, best_fitness, best_solution, {
@@ -8,8 +8,8 @@ class SASolver(Solver):
     
     Ported from SAWorker.py, removing PyQt5 dependencies.
     """
-    def __init__(self, config, evaluate_fn=None, callback=None):
-        super().__init__(config, evaluate_fn, callback)
+    def __init__(self, config, evaluate_fn=None, callback=None, evaluate_batch_fn=None):
+        super().__init__(config, evaluate_fn, callback, evaluate_batch_fn)
         
         # SA specific configuration
         self.initial_temp = config.get('initial_temp', 100.0)
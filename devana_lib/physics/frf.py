@@ -1,3 +1,7 @@
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
 import numpy as np
 from scipy.integrate import simpson
 from scipy.signal import find_peaks, peak_prominences
@@ -157,6 +161,82 @@ def remove_zero_mass_dofs(
 
     return mm, cc, kk, ff, active_dofs
 
+SOLVE_METHODS = ('batched', 'loop', 'modal')
+FREQUENCY_BLOCK_SIZE = 8192
+MODAL_CONDITION_LIMIT = 1e8
+MODAL_POLE_TOLERANCE = 1e-10
+
+def _robust_solve(hmat, rhs):
+    try: return np.linalg.solve(hmat, rhs)
+    except np.linalg.LinAlgError:
+        scale = np.linalg.norm(hmat, ord=np.inf)
+        base_eps = (1e-12 if scale == 0 else 1e-12 * scale)
+        I = np.eye(hmat.shape[0], dtype=hmat.dtype)
+        for mult in (1.0, 1e1, 1e2, 1e3, 1e4):
+            try: return np.linalg.solve(hmat + (base_eps * mult) * I, rhs)
+            except np.linalg.LinAlgError: continue
+        try: return np.linalg.pinv(hmat) @ rhs
+        except Exception: return np.linalg.lstsq(hmat, rhs, rcond=None)[0]
+
+def solve_frequency_stack(hh_stack, rhs_stack):
+    """Solve a (n, d, d) stack of systems in one LAPACK call; only exactly singular members use `_robust_solve`."""
+    try: return np.linalg.solve(hh_stack, rhs_stack[..., None])[..., 0]
+    except np.linalg.LinAlgError: pass
+    sign, _ = np.linalg.slogdet(hh_stack)
+    singular = sign == 0
+    x = np.empty(rhs_stack.shape, dtype=np.result_type(hh_stack, rhs_stack))
+    regular = ~singular
+    if np.any(regular):
+        x[regular] = np.linalg.solve(hh_stack[regular], rhs_stack[regular][..., None])[..., 0]
+    for i in np.flatnonzero(singular):
+        x[i] = _robust_solve(hh_stack[i], rhs_stack[i])
+    return x
+
+def solve_dynamic_stiffness(mm, cc, kk, f_reduced, omega, zeta_dc, omega_dc):
+    """Response (n_dofs, n_omega) of all frequencies, assembled as a stacked dynamic-stiffness tensor."""
+    omega = np.asarray(omega, dtype=float)
+    A = np.empty((mm.shape[0], omega.size), dtype=complex)
+    scale = omega_dc**2
+    for start in range(0, omega.size, FREQUENCY_BLOCK_SIZE):
+        stop = min(start + FREQUENCY_BLOCK_SIZE, omega.size)
+        Om = omega[start:stop, None, None]
+        hh = (-Om**2 * mm + 2 * zeta_dc * Om * cc + kk) * scale
+        A[:, start:stop] = solve_frequency_stack(hh, np.ascontiguousarray(f_reduced[:, start:stop].T)).T * scale
+    return A
+
+def modal_decomposition(mm, cc, kk, zeta_dc):
+    """Poles and residue factors (poles, phi, psi) of the companion-form eigenproblem; None if M is singular or the modes are defective."""
+    n_dofs = mm.shape[0]
+    try: m_inv = np.linalg.inv(mm)
+    except np.linalg.LinAlgError: return None
+    state = np.zeros((2 * n_dofs, 2 * n_dofs))
+    state[:n_dofs, n_dofs:] = np.eye(n_dofs)
+    state[n_dofs:, :n_dofs] = m_inv @ kk
+    state[n_dofs:, n_dofs:] = 2 * zeta_dc * (m_inv @ cc)
+    if not np.all(np.isfinite(state)): return None
+    poles, vecs = np.linalg.eig(state)
+    if not np.isfinite(np.linalg.cond(vecs)) or np.linalg.cond(vecs) > MODAL_CONDITION_LIMIT: return None
+    vecs_inv = np.linalg.inv(vecs)
+    return poles, vecs[:n_dofs], -(vecs_inv[:, n_dofs:] @ m_inv)
+
+def solve_modal_response(mm, cc, kk, f_reduced, omega, zeta_dc, omega_dc):
+    """Pole-residue response (n_dofs, n_omega); falls back to the direct solve for defective designs and on-pole frequencies."""
+    modes = modal_decomposition(mm, cc, kk, zeta_dc)
+    if modes is None: return solve_dynamic_stiffness(mm, cc, kk, f_reduced, omega, zeta_dc, omega_dc)
+    poles, phi, psi = modes
+    omega = np.asarray(omega, dtype=float)
+    A = np.empty((mm.shape[0], omega.size), dtype=complex)
+    for start in range(0, omega.size, FREQUENCY_BLOCK_SIZE):
+        stop = min(start + FREQUENCY_BLOCK_SIZE, omega.size)
+        distance = omega[start:stop, None] - poles[None, :]
+        near_pole = np.any(np.abs(distance) <= MODAL_POLE_TOLERANCE * np.maximum(np.abs(poles), 1.0), axis=1)
+        distance[near_pole] = 1.0
+        A[:, start:stop] = phi @ ((psi @ f_reduced[:, start:stop]) / distance.T)
+        if np.any(near_pole):
+            cols = start + np.flatnonzero(near_pole)
+            A[:, cols] = solve_dynamic_stiffness(mm, cc, kk, f_reduced[:, cols], omega[cols], zeta_dc, omega_dc)
+    return A
+
 def safe_structure(key, value, ensure_serializable=True, recursive=True, tol=1e-8):
     def serialize(obj):
         if isinstance(obj, (np.integer,)): return int(obj)
@@ -234,28 +314,38 @@ def calculate_robust_slopes(peak_positions, peak_values, slope_threshold=0.01):
                     slope_max = slope
     return slopes, slope_max
 
-def process_mass(a_mass, omega, user_peak_positions=None):
-    a_mag = np.abs(a_mass)
+def mass_peak_arrays(a_mag, omega, user_peak_positions=None, refine_peaks=True, model_peaks=None):
+    """Sorted (peak_positions, peak_values) of one magnitude curve: the peak stage of `process_mass`."""
     peak_positions = []
     peak_values = []
-    if user_peak_positions is not None:
-        user_peak_positions = np.array(user_peak_positions)
-        for pos in user_peak_positions:
-            idx = np.argmin(np.abs(omega - pos))
-            peak_positions.append(omega[idx])
-            peak_values.append(a_mag[idx])
-    detected_positions, detected_values = find_significant_peaks(a_mag, omega)
-    if len(detected_positions) > 0:
-        peak_positions.extend(detected_positions)
-        peak_values.extend(detected_values)
-    peak_positions = np.array(peak_positions)
-    peak_values = np.array(peak_values)
-    sort_idx = np.argsort(peak_positions)
-    peak_positions = peak_positions[sort_idx]
-    peak_values = peak_values[sort_idx]
-    if len(peak_positions) > 0:
-        peak_indices = np.array([np.argmin(np.abs(omega - pos)) for pos in peak_positions])
-        peak_positions, peak_values = interpolate_peak_vicinity(a_mag, omega, peak_indices)
+    if model_peaks is not None:
+        peak_positions, peak_values = (np.asarray(v, dtype=float) for v in model_peaks)
+        sort_idx = np.argsort(peak_positions)
+        peak_positions, peak_values = peak_positions[sort_idx], peak_values[sort_idx]
+    else:
+        if user_peak_positions is not None:
+            user_peak_positions = np.array(user_peak_positions)
+            for pos in user_peak_positions:
+                idx = np.argmin(np.abs(omega - pos))
+                peak_positions.append(omega[idx])
+                peak_values.append(a_mag[idx])
+        detected_positions, detected_values = find_significant_peaks(a_mag, omega)
+        if len(detected_positions) > 0:
+            peak_positions.extend(detected_positions)
+            peak_values.extend(detected_values)
+        peak_positions = np.array(peak_positions)
+        peak_values = np.array(peak_values)
+        sort_idx = np.argsort(peak_positions)
+        peak_positions = peak_positions[sort_idx]
+        peak_values = peak_values[sort_idx]
+        if len(peak_positions) > 0 and refine_peaks:
+            peak_indices = np.array([np.argmin(np.abs(omega - pos)) for pos in peak_positions])
+            peak_positions, peak_values = interpolate_peak_vicinity(a_mag, omega, peak_indices)
+    return peak_positions, peak_values
+
+def process_mass(a_mass, omega, user_peak_positions=None, refine_peaks=True, model_peaks=None):
+    a_mag = np.abs(a_mass)
+    peak_positions, peak_values = mass_peak_arrays(a_mag, omega, user_peak_positions, refine_peaks=refine_peaks, model_peaks=model_peaks)
     bandwidths = {}
     for i in range(len(peak_positions)):
         for j in range(i + 1, len(peak_positions)):
@@ -274,6 +364,97 @@ def process_mass(a_mass, omega, user_peak_positions=None):
         "magnitude": a_mag,
     }
 
+FREQUENCY_GRIDS = ('uniform', 'adaptive')
+ADAPTIVE_INITIAL_POINTS = 129
+ADAPTIVE_TOLERANCE = 1e-4
+ADAPTIVE_MAX_PASSES = 30
+
+def _refinement_intervals(omega, magnitude, min_width, tol):
+    """Intervals bracketing a max/min of any DOF or with interpolation error > tol, and wider than 2 * min_width."""
+    h = np.diff(omega)
+    if omega.size < 3: return h >= 2 * min_width
+    left, mid, right = magnitude[:, :-2], magnitude[:, 1:-1], magnitude[:, 2:]
+    flat = (mid == left) & (mid == right)
+    extremum = (((mid >= left) & (mid >= right)) | ((mid <= left) & (mid <= right))) & ~flat
+    slopes = np.diff(magnitude, axis=1) / h
+    second = 2 * np.abs(np.diff(slopes, axis=1)) / (h[:-1] + h[1:])
+    scale = np.maximum(np.max(magnitude, axis=1, keepdims=True), np.finfo(float).tiny)
+    curved = second * np.maximum(h[:-1], h[1:])**2 / 8 > tol * scale
+    points = np.any(extremum | curved, axis=0)
+    refine = np.zeros(h.size, dtype=bool)
+    refine[:-1] |= points
+    refine[1:] |= points
+    return refine & (h >= 2 * min_width)
+
+def _peak_estimate(omega, magnitude):
+    return [find_significant_peaks(mag, omega) for mag in magnitude]
+
+def _peaks_converged(previous, current, position_tol, value_tol):
+    for (pos_a, val_a), (pos_b, val_b) in zip(previous, current):
+        if len(pos_a) != len(pos_b): return False
+        order_a, order_b = np.argsort(pos_a), np.argsort(pos_b)
+        if np.any(np.abs(pos_a[order_a] - pos_b[order_b]) > position_tol): return False
+        if np.any(np.abs(val_a[order_a] - val_b[order_b]) > value_tol * np.abs(val_b[order_b])): return False
+    return True
+
+def adaptive_frequency_sweep(response_fn, omega_start, omega_end, omega_points,
+                             tol=ADAPTIVE_TOLERANCE, initial_points=ADAPTIVE_INITIAL_POINTS,
+                             max_passes=ADAPTIVE_MAX_PASSES):
+    """Coarse grid bisected around resonances/anti-resonances until peaks converge; returns (omega, response)."""
+    omega = np.linspace(omega_start, omega_end, max(3, min(initial_points, omega_points)))
+    response = response_fn(omega)
+    min_width = (omega_end - omega_start) / max(omega_points - 1, 1)
+    previous = None
+    for _ in range(max_passes):
+        magnitude = np.abs(response)
+        current = _peak_estimate(omega, magnitude)
+        if previous is not None and _peaks_converged(previous, current, min_width, tol): break
+        previous = current
+        refine = _refinement_intervals(omega, magnitude, min_width, tol)
+        if not np.any(refine): break
+        new_omega = 0.5 * (omega[:-1][refine] + omega[1:][refine])
+        omega = np.concatenate([omega, new_omega])
+        response = np.concatenate([response, response_fn(new_omega)], axis=1)
+        order = np.argsort(omega, kind='stable')
+        omega, response = omega[order], response[:, order]
+    return omega, response
+
+PEAK_METHODS = ('grid', 'model')
+REAL_POLE_TOLERANCE = 1e-9
+
+def extract_model_peaks(response_fn, poles, omega_start, omega_end, resolution, min_prominence_ratio=0.05, max_peaks=5):
+    """Per-DOF (positions, values) seeded from the poles: Brent on |H| for complex poles, |H| at `resolution` from real (unbounded) poles."""
+    from scipy.optimize import minimize_scalar
+    poles = np.asarray(poles)
+    seeds = poles[(poles.real > omega_start) & (poles.real < omega_end)]
+    seeds = seeds[np.argsort(seeds.real)]
+    real = np.abs(seeds.imag) <= REAL_POLE_TOLERANCE * np.maximum(np.abs(seeds), 1.0)
+    n_dofs = response_fn(np.array([0.5 * (omega_start + omega_end)])).shape[0]
+    positions = np.empty((n_dofs, seeds.size))
+    values = np.empty((n_dofs, seeds.size))
+    if np.any(real):
+        centres = seeds.real[real]
+        sides = np.concatenate([centres - resolution, centres + resolution])
+        magnitude = np.abs(response_fn(np.clip(sides, omega_start, omega_end)))
+        positions[:, real] = centres
+        values[:, real] = np.maximum(magnitude[:, :centres.size], magnitude[:, centres.size:])
+    for k in np.flatnonzero(~real):
+        half_width = max(3 * abs(seeds[k].imag), resolution)
+        bounds = (max(omega_start, seeds[k].real - half_width), min(omega_end, seeds[k].real + half_width))
+        for dof in range(n_dofs):
+            search = minimize_scalar(lambda w: -np.abs(response_fn(np.array([w]))[dof, 0]), bounds=bounds,
+                                     method='bounded', options={'xatol': 1e-10 * max(abs(seeds[k]), 1.0)})
+            positions[dof, k], values[dof, k] = search.x, -search.fun
+    peaks = []
+    for dof in range(n_dofs):
+        keep = values[dof] >= min_prominence_ratio * np.max(values[dof], initial=0.0)
+        pos, val = positions[dof, keep], values[dof, keep]
+        if pos.size > max_peaks:
+            top = np.sort(np.argsort(val)[-max_peaks:])
+            pos, val = pos[top], val[top]
+        peaks.append((pos, val))
+    return peaks
+
 def calculate_composite_measure(mass_key, results, target_values, weights):
     composite = 0.0
     percentage_differences = {}
@@ -306,6 +487,195 @@ def calculate_singular_response(results, target_values_dict, weights_dict):
     results["singular_response"] = sum(composite_measures.values())
     return results
 
+OUTPUT_MODES = ('full', 'compact')
+MASS_LABELS = ("mass_1", "mass_2", "mass_3", "mass_4", "mass_5")
+COMPACT_MAX_PEAKS = 5
+
+class FRFCompactResult(NamedTuple):
+    """Fixed-layout result of `frf(..., output="compact")`; arrays are indexed by mass (0..4)."""
+    singular_response: float
+    percentage_error_sum: float
+    composite_measures: np.ndarray
+    active: np.ndarray
+    n_peaks: np.ndarray
+    peak_positions: np.ndarray
+    peak_values: np.ndarray
+    area_under_curve: np.ndarray
+    slope_max: np.ndarray
+    metrics: Optional[np.ndarray] = None
+    omega: Optional[np.ndarray] = None
+    magnitudes: Optional[np.ndarray] = None
+
+def _pair_slopes(peak_positions, peak_values, slope_threshold=0.01):
+    """Pairs (i, j), i < j, and their significant slopes (NaN otherwise), as in `calculate_robust_slopes`."""
+    n = len(peak_positions)
+    pairs = [(i, j) for i in range(n) for j in range(i + 1, n)]
+    slopes = np.full(len(pairs), np.nan)
+    if n <= 1: return pairs, slopes
+    amplitude_range = np.max(peak_values) - np.min(peak_values)
+    frequency_range = np.max(peak_positions) - np.min(peak_positions)
+    if amplitude_range == 0 or frequency_range == 0: return pairs, slopes
+    i, j = np.array(pairs).T
+    dx = peak_positions[j] - peak_positions[i]
+    with np.errstate(divide='ignore', invalid='ignore'):
+        slope = (peak_values[j] - peak_values[i]) / dx
+    significant = (dx != 0) & (np.abs(slope * (frequency_range / amplitude_range)) >= slope_threshold)
+    slopes[significant] = slope[significant]
+    return pairs, slopes
+
+def _criterion_index(criterion, prefix, n_indices):
+    try: indices = [int(part) for part in criterion[len(prefix):].split("_")]
+    except ValueError: return None
+    return indices if len(indices) == n_indices else None
+
+def compact_mass_metrics(a_mag, omega, **peak_options):
+    """(peak_positions, peak_values, area, pairs, slopes, slope_max) of one mass, without dicts."""
+    peak_positions, peak_values = mass_peak_arrays(a_mag, omega, **peak_options)
+    area = simpson(a_mag, x=omega) if len(a_mag) else np.nan
+    pairs, slopes = _pair_slopes(peak_positions, peak_values)
+    slope_max = slopes[np.nanargmax(np.abs(slopes))] if np.any(~np.isnan(slopes)) else np.nan
+    return peak_positions, peak_values, area, pairs, slopes, slope_max
+
+def build_compact_result(A, omega, active, objective, peak_options, keep_magnitudes=False):
+    """`FRFCompactResult` of one design from its reduced response A (n_active, n_omega)."""
+    n_mass = len(MASS_LABELS)
+    n_peaks = np.zeros(n_mass, dtype=int)
+    peak_positions = np.full((n_mass, COMPACT_MAX_PEAKS), np.nan)
+    peak_values = np.full((n_mass, COMPACT_MAX_PEAKS), np.nan)
+    area_under_curve = np.full(n_mass, np.nan)
+    slope_max = np.full(n_mass, np.nan)
+    metrics = np.zeros(objective.n_metrics)
+    magnitudes = np.zeros((n_mass, omega.size)) if keep_magnitudes else None
+    for local_idx, dof in enumerate(np.flatnonzero(active)):
+        lbl = MASS_LABELS[dof]
+        a_mag = np.abs(A[local_idx])
+        positions, values, area, pairs, slopes, s_max = compact_mass_metrics(a_mag, omega, **peak_options(local_idx, lbl))
+        objective.fill_metrics(metrics, dof, positions, values, area, pairs, slopes)
+        count = min(len(positions), COMPACT_MAX_PEAKS)
+        n_peaks[dof] = count
+        peak_positions[dof, :count] = positions[:count]
+        peak_values[dof, :count] = values[:count]
+        area_under_curve[dof], slope_max[dof] = area, s_max
+        if keep_magnitudes: magnitudes[dof] = a_mag
+    active = np.asarray(active, dtype=bool)
+    singular_response, composite_measures, percentage_error_sum = objective.evaluate(metrics, active)
+    return FRFCompactResult(
+        singular_response=float(singular_response), percentage_error_sum=float(percentage_error_sum),
+        composite_measures=composite_measures, active=active, n_peaks=n_peaks,
+        peak_positions=peak_positions, peak_values=peak_values, area_under_curve=area_under_curve,
+        slope_max=slope_max, metrics=metrics, omega=omega if keep_magnitudes else None, magnitudes=magnitudes,
+    )
+
+def _pair_slot(i, j, n_peaks):
+    """Position of the zero-based pair (i, j), i < j, in the pair order of `_pair_slopes`."""
+    return i * n_peaks - i * (i + 1) // 2 + (j - i - 1)
+
+def _criterion_slot(criterion):
+    """(kind, i, j) of a criterion with zero-based peak indices, or None if it always reads 0.0."""
+    if criterion.startswith("peak_value") or criterion.startswith("peak_position"):
+        kind = "peak_value" if criterion.startswith("peak_value") else "peak_position"
+        index = _criterion_index(criterion, kind + "_", 1)
+        return None if index is None or index[0] < 1 else (kind, index[0] - 1, None)
+    if criterion.startswith("bandwidth") or criterion.startswith("slope"):
+        kind = "bandwidth" if criterion.startswith("bandwidth") else "slope"
+        index = _criterion_index(criterion, kind + "_", 2)
+        return None if index is None or not 1 <= index[0] < index[1] else (kind, index[0] - 1, index[1] - 1)
+    if criterion == "area_under_curve": return "area_under_curve", None, None
+    return None
+
+def _metric_layout(max_peaks):
+    """Group offsets and size of one mass block of the metric vector."""
+    n_pairs = max_peaks * (max_peaks - 1) // 2
+    offsets = {"peak_value": 0, "peak_position": max_peaks, "area_under_curve": 2 * max_peaks,
+               "bandwidth": 2 * max_peaks + 1, "slope": 2 * max_peaks + 1 + n_pairs}
+    return offsets, 2 * max_peaks + 1 + 2 * n_pairs
+
+@dataclass(frozen=True)
+class CompiledObjective:
+    """Targets/weights resolved once into slots of a flat per-design metric vector (see `compile_objective`)."""
+    max_peaks: int
+    criteria: tuple
+    indices: np.ndarray
+    term_masses: np.ndarray
+    targets: np.ndarray
+    weight_vector: np.ndarray
+    mass_weights: np.ndarray
+
+    @property
+    def metric_offsets(self):
+        return _metric_layout(self.max_peaks)[0]
+
+    @property
+    def metrics_per_mass(self):
+        return _metric_layout(self.max_peaks)[1]
+
+    @property
+    def n_metrics(self):
+        return len(MASS_LABELS) * self.metrics_per_mass
+
+    def fill_metrics(self, metrics, mass_index, peak_positions, peak_values, area_under_curve, pairs, slopes):
+        """Write the metrics of one mass into its block of `metrics`."""
+        n, offsets = self.max_peaks, self.metric_offsets
+        block = metrics[mass_index * self.metrics_per_mass:(mass_index + 1) * self.metrics_per_mass]
+        count = min(len(peak_positions), n)
+        block[:count] = peak_values[:count]
+        block[offsets["peak_position"]:offsets["peak_position"] + count] = peak_positions[:count]
+        block[offsets["area_under_curve"]] = area_under_curve
+        if len(pairs):
+            i, j = np.array(pairs).T
+            keep = j < n
+            slot = _pair_slot(i[keep], j[keep], n)
+            block[offsets["bandwidth"] + slot] = peak_positions[j[keep]] - peak_positions[i[keep]]
+            block[offsets["slope"] + slot] = np.nan_to_num(slopes[keep], nan=0.0)
+
+    def composite_measures(self, metrics):
+        return metrics @ self.mass_weights
+
+    def singular_response(self, metrics):
+        return metrics @ self.weight_vector
+
+    def percentage_differences(self, metrics):
+        """Signed percentage difference of each term from its target, shape (..., n_terms)."""
+        actual = np.where(self.indices >= 0, metrics[..., np.maximum(self.indices, 0)], 0.0)
+        return (actual - self.targets) / self.targets * 100
+
+    def percentage_error_sum(self, metrics, active):
+        percentage = np.abs(self.percentage_differences(metrics))
+        return np.sum(percentage * np.asarray(active)[..., self.term_masses], axis=-1)
+
+    def evaluate(self, metrics, active):
+        """(singular_response, composite_measures, percentage_error_sum) of one or P metric vectors."""
+        return self.singular_response(metrics), self.composite_measures(metrics), self.percentage_error_sum(metrics, active)
+
+def compile_objective(target_values_dict, weights_dict, max_peaks=COMPACT_MAX_PEAKS):
+    """Parse the per-mass target/weight dicts once into a `CompiledObjective`."""
+    target_values_dict = target_values_dict or {}
+    weights_dict = weights_dict or {}
+    terms = []
+    for m, lbl in enumerate(MASS_LABELS):
+        weights = weights_dict.get(lbl) or {}
+        for criterion, target in (target_values_dict.get(lbl) or {}).items():
+            w = weights.get(criterion, 0.0)
+            if w == 0.0 or target == 0: continue
+            slot = _criterion_slot(criterion)
+            if slot is not None and slot[1] is not None:
+                max_peaks = max(max_peaks, 1 + max(k for k in slot[1:] if k is not None))
+            terms.append((m, lbl, criterion, slot, float(target), float(w)))
+    offsets, per_mass = _metric_layout(max_peaks)
+    indices = np.full(len(terms), -1, dtype=int)
+    mass_weights = np.zeros((len(MASS_LABELS) * per_mass, len(MASS_LABELS)))
+    for t, (m, _, _, slot, target, w) in enumerate(terms):
+        if slot is None: continue
+        kind, i, j = slot
+        indices[t] = m * per_mass + offsets[kind] + (_pair_slot(i, j, max_peaks) if j is not None else (i or 0))
+        mass_weights[indices[t], m] += w / target
+    return CompiledObjective(
+        max_peaks=max_peaks, criteria=tuple((lbl, criterion) for _, lbl, criterion, _, _, _ in terms),
+        indices=indices, term_masses=np.array([term[0] for term in terms], dtype=int),
+        targets=np.array([term[4] for term in terms], dtype=float),
+        weight_vector=mass_weights.sum(axis=1), mass_weights=mass_weights,
+    )
+
 def frf(
     main_system_parameters,
     dva_parameters,
@@ -326,7 +696,22 @@ def frf(
     user_peak_positions=None,
     interpolation_method='cubic',
     interpolation_points=1000,
+    solve_method='batched',
+    frequency_grid='uniform',
+    adaptive_tolerance=ADAPTIVE_TOLERANCE,
+    peak_method='grid',
+    output='full',
+    keep_magnitudes=False,
+    objective=None,
 ):
+    if solve_method not in SOLVE_METHODS:
+        raise ValueError(f"Unknown solve_method '{solve_method}'. Options: {SOLVE_METHODS}")
+    if frequency_grid not in FREQUENCY_GRIDS:
+        raise ValueError(f"Unknown frequency_grid '{frequency_grid}'. Options: {FREQUENCY_GRIDS}")
+    if peak_method not in PEAK_METHODS:
+        raise ValueError(f"Unknown peak_method '{peak_method}'. Options: {PEAK_METHODS}")
+    if output not in OUTPUT_MODES:
+        raise ValueError(f"Unknown output '{output}'. Options: {OUTPUT_MODES}")
     MU, LANDA_1, LANDA_2, LANDA_3, LANDA_4, LANDA_5, NU_1, NU_2, NU_3, NU_4, NU_5, A_LOW, A_UPP, F_1, F_2, OMEGA_DC, ZETA_DC = main_system_parameters
     (
         beta_1, beta_2, beta_3, beta_4, beta_5, beta_6, beta_7, beta_8, beta_9, beta_10,
@@ -365,55 +750,302 @@ def frf(
         [-lambda_3, -lambda_6, -lambda_10, -lambda_15, lambda_14 + lambda_6 + lambda_13 + lambda_3 + lambda_15 + lambda_10],
     ])
 
-    f_1_omega = F_1 * np.exp(1j * omega)
-    f_2_omega = F_2 * np.exp(1j * omega)
-    u_low = A_LOW * np.exp(1j * omega)
-    u_upp = A_UPP * np.exp(1j * omega)
-
-    f = np.array([
-        f_1_omega + 2 * ZETA_DC * OMEGA_DC * (1j * omega * u_low + NU_2 * 1j * omega * u_upp) + OMEGA_DC**2 * (u_low + LANDA_2 * u_upp),
-        f_2_omega + 2 * ZETA_DC * OMEGA_DC * (NU_4 * 1j * omega * u_low + NU_5 * 1j * omega * u_upp) + OMEGA_DC**2 * (LANDA_4 * u_low + LANDA_5 * u_upp),
-        beta_7 * (-omega**2) * u_low + 2 * ZETA_DC * OMEGA_DC * (nu_7 * 1j * omega * u_low + nu_8 * 1j * omega * u_upp) + OMEGA_DC**2 * (lambda_7 * u_low + lambda_8 * u_upp) + beta_8 * (-omega**2) * u_upp,
-        beta_11 * (-omega**2) * u_low + 2 * ZETA_DC * OMEGA_DC * (nu_11 * 1j * omega * u_low + nu_12 * 1j * omega * u_upp) + OMEGA_DC**2 * (lambda_11 * u_low + lambda_12 * u_upp) + beta_12 * (-omega**2) * u_upp,
-        beta_13 * (-omega**2) * u_low + 2 * ZETA_DC * OMEGA_DC * (nu_13 * 1j * omega * u_low + nu_14 * 1j * omega * u_upp) + OMEGA_DC**2 * (lambda_13 * u_low + lambda_14 * u_upp) + beta_14 * (-omega**2) * u_upp,
-    ])
+    def forcing(omega):
+        f_1_omega = F_1 * np.exp(1j * omega)
+        f_2_omega = F_2 * np.exp(1j * omega)
+        u_low = A_LOW * np.exp(1j * omega)
+        u_upp = A_UPP * np.exp(1j * omega)
+
+        return np.array([
+            f_1_omega + 2 * ZETA_DC * OMEGA_DC * (1j * omega * u_low + NU_2 * 1j * omega * u_upp) + OMEGA_DC**2 * (u_low + LANDA_2 * u_upp),
+            f_2_omega + 2 * ZETA_DC * OMEGA_DC * (NU_4 * 1j * omega * u_low + NU_5 * 1j * omega * u_upp) + OMEGA_DC**2 * (LANDA_4 * u_low + LANDA_5 * u_upp),
+            beta_7 * (-omega**2) * u_low + 2 * ZETA_DC * OMEGA_DC * (nu_7 * 1j * omega * u_low + nu_8 * 1j * omega * u_upp) + OMEGA_DC**2 * (lambda_7 * u_low + lambda_8 * u_upp) + beta_8 * (-omega**2) * u_upp,
+            beta_11 * (-omega**2) * u_low + 2 * ZETA_DC * OMEGA_DC * (nu_11 * 1j * omega * u_low + nu_12 * 1j * omega * u_upp) + OMEGA_DC**2 * (lambda_11 * u_low + lambda_12 * u_upp) + beta_12 * (-omega**2) * u_upp,
+            beta_13 * (-omega**2) * u_low + 2 * ZETA_DC * OMEGA_DC * (nu_13 * 1j * omega * u_low + nu_14 * 1j * omega * u_upp) + OMEGA_DC**2 * (lambda_13 * u_low + lambda_14 * u_upp) + beta_14 * (-omega**2) * u_upp,
+        ])
+
+    f = forcing(omega)
 
     mm, cc, kk, f_reduced, active = remove_zero_mass_dofs(mass_matrix, damping_matrix_raw, stiffness_matrix_raw, f)
     if mm.size == 0: raise ValueError("All degrees of freedom have zero mass.")
 
-    n_dofs = mm.shape[0]
-    A = np.zeros((n_dofs, len(omega)), dtype=complex)
-    def _robust_solve(hmat, rhs):
-        try: return np.linalg.solve(hmat, rhs)
-        except np.linalg.LinAlgError:
-            scale = np.linalg.norm(hmat, ord=np.inf)
-            base_eps = (1e-12 if scale == 0 else 1e-12 * scale)
-            I = np.eye(hmat.shape[0], dtype=hmat.dtype)
-            for mult in (1.0, 1e1, 1e2, 1e3, 1e4):
-                try: return np.linalg.solve(hmat + (base_eps * mult) * I, rhs)
-                except np.linalg.LinAlgError: continue
-            try: return np.linalg.pinv(hmat) @ rhs
-            except Exception: return np.linalg.lstsq(hmat, rhs, rcond=None)[0]
-
-    for i, Om in enumerate(Omega):
-        hh = -Om**2 * mm + 2 * ZETA_DC * Om * cc + kk
-        hh *= OMEGA_DC**2
-        A[:, i] = _robust_solve(hh, f_reduced[:, i]) * OMEGA_DC**2
+    def solve(Omega, f_reduced):
+        if solve_method == 'loop':
+            A = np.zeros((mm.shape[0], len(Omega)), dtype=complex)
+            for i, Om in enumerate(Omega):
+                hh = -Om**2 * mm + 2 * ZETA_DC * Om * cc + kk
+                hh *= OMEGA_DC**2
+                A[:, i] = _robust_solve(hh, f_reduced[:, i]) * OMEGA_DC**2
+            return A
+        if solve_method == 'modal': return solve_modal_response(mm, cc, kk, f_reduced, Omega, ZETA_DC, OMEGA_DC)
+        return solve_dynamic_stiffness(mm, cc, kk, f_reduced, Omega, ZETA_DC, OMEGA_DC)
+
+    if frequency_grid == 'adaptive':
+        omega, A = adaptive_frequency_sweep(lambda om: solve(om, forcing(om)[active]), omega_start, omega_end, omega_points, tol=adaptive_tolerance)
+    else:
+        A = solve(Omega, f_reduced)
+
+    model_peaks = None
+    if peak_method == 'model':
+        modes = modal_decomposition(mm, cc, kk, ZETA_DC)
+        if modes is not None:
+            response_fn = lambda om: solve(om, forcing(om)[active])
+            resolution = 0.5 * (omega_end - omega_start) / max(omega_points - 1, 1)
+            model_peaks = extract_model_peaks(response_fn, modes[0], omega_start, omega_end, resolution)
+
+    def peak_options(local_idx, lbl):
+        mass_peaks = user_peak_positions.get(lbl, None) if user_peak_positions else None
+        dof_peaks = None
+        if model_peaks is not None:
+            dof_peaks = model_peaks[local_idx]
+            if mass_peaks is not None:
+                user_pos = np.asarray(mass_peaks, dtype=float)
+                dof_peaks = (np.concatenate([user_pos, dof_peaks[0]]), np.concatenate([np.abs(response_fn(user_pos)[local_idx]), dof_peaks[1]]))
+        return {"user_peak_positions": mass_peaks, "refine_peaks": frequency_grid == 'uniform', "model_peaks": dof_peaks}
+
+    target_dict = {"mass_1": target_values_mass1, "mass_2": target_values_mass2, "mass_3": target_values_mass3, "mass_4": target_values_mass4, "mass_5": target_values_mass5}
+    weight_dict = {"mass_1": weights_mass1, "mass_2": weights_mass2, "mass_3": weights_mass3, "mass_4": weights_mass4, "mass_5": weights_mass5}
+    if output == 'compact':
+        if objective is None: objective = compile_objective(target_dict, weight_dict)
+        return build_compact_result(A, omega, active, objective, peak_options, keep_magnitudes)
 
     results = {}
     idxs = np.where(active)[0]
     label_map = {0: "mass_1", 1: "mass_2", 2: "mass_3", 3: "mass_4", 4: "mass_5"}
     for local_idx, dof in enumerate(idxs):
         lbl = label_map.get(dof, f"mass_{dof+1}")
-        mass_peaks = user_peak_positions.get(lbl, None) if user_peak_positions else None
-        results[lbl] = process_mass(A[local_idx, :], omega, user_peak_positions=mass_peaks)
+        results[lbl] = process_mass(A[local_idx, :], omega, **peak_options(local_idx, lbl))
 
-    target_dict = {"mass_1": target_values_mass1, "mass_2": target_values_mass2, "mass_3": target_values_mass3, "mass_4": target_values_mass4, "mass_5": target_values_mass5}
-    weight_dict = {"mass_1": weights_mass1, "mass_2": weights_mass2, "mass_3": weights_mass3, "mass_4": weights_mass4, "mass_5": weights_mass5}
     results = calculate_singular_response(results, target_dict, weight_dict)
     results["interpolation_info"] = {"method": interpolation_method, "points": interpolation_points}
+    if frequency_grid == 'adaptive':
+        results["frequency_grid"] = {"method": frequency_grid, "omega": omega, "points": int(omega.size)}
     return results
 
+DVA_BETA = slice(0, 15)
+DVA_LAMBDA = slice(15, 30)
+DVA_MU = slice(30, 33)
+DVA_NU = slice(33, 48)
+COUPLING_ELEMENTS = {1: (0, 2), 2: (0, 3), 3: (0, 4), 4: (1, 2), 5: (1, 3), 6: (1, 4), 9: (2, 3), 10: (2, 4), 15: (3, 4)}
+GROUNDED_ELEMENTS = {7: (2, 'low'), 8: (2, 'upp'), 11: (3, 'low'), 12: (3, 'upp'), 13: (4, 'low'), 14: (4, 'upp')}
+ABSORBER_MASS_DOFS = (2, 3, 4)
+
+@dataclass(frozen=True)
+class AssemblyOperator:
+    """Sparse (25, 48) maps d -> M, C, K (unscaled) and six (5, 48) forcing maps paired with `forcing_basis`."""
+    mass: object
+    damping: object
+    stiffness: object
+    forcing: tuple
+
+    def parameter_derivatives(self, index, main_system_parameters):
+        """Scaled dM, dC, dK (5 x 5) with respect to DVA parameter `index`, for gradients and rank-k updates."""
+        omega_dc, zeta_dc = main_system_parameters[15], main_system_parameters[16]
+        column = lambda op: op[:, index].toarray().reshape(5, 5)
+        return column(self.mass), 2 * zeta_dc * omega_dc * column(self.damping), omega_dc**2 * column(self.stiffness)
+
+def _element_stencil(element, offset):
+    entries = []
+    if element in COUPLING_ELEMENTS:
+        a, b = COUPLING_ELEMENTS[element]
+        entries += [(5 * a + a, 1.0), (5 * b + b, 1.0), (5 * a + b, -1.0), (5 * b + a, -1.0)]
+    else:
+        dof, _ = GROUNDED_ELEMENTS[element]
+        entries.append((5 * dof + dof, 1.0))
+    return [(row, offset + element - 1, value) for row, value in entries]
+
+@lru_cache(maxsize=None)
+def build_assembly_operator():
+    """Sparse `AssemblyOperator` of the 5-DOF DVA model (built once)."""
+    from scipy.sparse import csr_matrix
+    def _matrix(triplets, n_rows):
+        rows, cols, vals = zip(*triplets)
+        return csr_matrix((vals, (rows, cols)), shape=(n_rows, 48))
+    elements = sorted(COUPLING_ELEMENTS) + sorted(GROUNDED_ELEMENTS)
+    family = lambda offset: [t for e in elements for t in _element_stencil(e, offset)]
+    mass = family(DVA_BETA.start) + [(6 * dof, DVA_MU.start + i, 1.0) for i, dof in enumerate(ABSORBER_MASS_DOFS)]
+    forcing = []
+    for offset in (DVA_LAMBDA.start, DVA_NU.start, DVA_BETA.start):
+        for side in ('low', 'upp'):
+            forcing.append(_matrix([(dof, offset + e - 1, 1.0) for e, (dof, s) in GROUNDED_ELEMENTS.items() if s == side], 5))
+    return AssemblyOperator(mass=_matrix(mass, 25), damping=_matrix(family(DVA_NU.start), 25),
+                            stiffness=_matrix(family(DVA_LAMBDA.start), 25), forcing=tuple(forcing))
+
+def forcing_basis(main_system_parameters, omega):
+    """(6, n_omega) base-motion basis: Omega_dc^2 u, 2 zeta Omega_dc i w u, -w^2 u for u_low, u_upp."""
+    A_LOW, A_UPP, OMEGA_DC, ZETA_DC = (main_system_parameters[i] for i in (11, 12, 15, 16))
+    omega = np.asarray(omega, dtype=float)
+    u_low, u_upp = A_LOW * np.exp(1j * omega), A_UPP * np.exp(1j * omega)
+    return np.array([
+        OMEGA_DC**2 * u_low, OMEGA_DC**2 * u_upp,
+        2 * ZETA_DC * OMEGA_DC * 1j * omega * u_low, 2 * ZETA_DC * OMEGA_DC * 1j * omega * u_upp,
+        -omega**2 * u_low, -omega**2 * u_upp,
+    ])
+
+def main_system_matrices(main_system_parameters, omega=None):
+    """DVA-independent part M0, C0, K0 (scaled) and, if omega is given, f0."""
+    MU, LANDA_1, LANDA_2, LANDA_3, LANDA_4, LANDA_5, NU_1, NU_2, NU_3, NU_4, NU_5, A_LOW, A_UPP, F_1, F_2, OMEGA_DC, ZETA_DC = main_system_parameters
+    m0 = np.zeros((5, 5)); m0[0, 0], m0[1, 1] = 1.0, MU
+    c0 = np.zeros((5, 5)); c0[:2, :2] = [[1 + NU_1 + NU_2 + NU_3, -NU_3], [-NU_3, NU_5 + NU_4 + NU_3]]
+    k0 = np.zeros((5, 5)); k0[:2, :2] = [[1 + LANDA_1 + LANDA_2 + LANDA_3, -LANDA_3], [-LANDA_3, LANDA_5 + LANDA_4 + LANDA_3]]
+    c0 *= 2 * ZETA_DC * OMEGA_DC
+    k0 *= OMEGA_DC**2
+    if omega is None: return m0, c0, k0
+    omega = np.asarray(omega, dtype=float)
+    u_low, u_upp = A_LOW * np.exp(1j * omega), A_UPP * np.exp(1j * omega)
+    f0 = np.zeros((5, omega.size), dtype=complex)
+    f0[0] = F_1 * np.exp(1j * omega) + 2 * ZETA_DC * OMEGA_DC * (1j * omega * u_low + NU_2 * 1j * omega * u_upp) + OMEGA_DC**2 * (u_low + LANDA_2 * u_upp)
+    f0[1] = F_2 * np.exp(1j * omega) + 2 * ZETA_DC * OMEGA_DC * (NU_4 * 1j * omega * u_low + NU_5 * 1j * omega * u_upp) + OMEGA_DC**2 * (LANDA_4 * u_low + LANDA_5 * u_upp)
+    return m0, c0, k0, f0
+
+def assemble_population(main_system_parameters, dva_matrix, omega=None, operator=None):
+    """M, C, K (P, 5, 5) and, if omega is given, forcing (P, 5, n_omega) via the assembly operator."""
+    operator = operator or build_assembly_operator()
+    D = np.atleast_2d(np.asarray(dva_matrix, dtype=float))
+    if D.shape[1] != 48:
+        raise ValueError(f"dva_matrix must have 48 columns, got {D.shape[1]}")
+    OMEGA_DC, ZETA_DC = main_system_parameters[15], main_system_parameters[16]
+    n_pop = D.shape[0]
+    base = main_system_matrices(main_system_parameters, omega)
+    apply = lambda op: (op @ D.T).T
+    mass = base[0] + apply(operator.mass).reshape(n_pop, 5, 5)
+    damping = base[1] + 2 * ZETA_DC * OMEGA_DC * apply(operator.damping).reshape(n_pop, 5, 5)
+    stiffness = base[2] + OMEGA_DC**2 * apply(operator.stiffness).reshape(n_pop, 5, 5)
+    if omega is None: return mass, damping, stiffness
+    coeffs = np.stack([apply(op) for op in operator.forcing], axis=1)
+    forcing = base[3] + np.einsum('pkr,kw->prw', coeffs, forcing_basis(main_system_parameters, omega))
+    return mass, damping, stiffness, forcing
+
+BATCH_MAX_PEAKS = 5
+
+BATCH_SYSTEMS_BLOCK = 65536
+
+@dataclass
+class FRFBatchResult:
+    """Struct-of-arrays result of `frf_batch`; arrays are indexed [individual, mass, ...]."""
+    omega: np.ndarray
+    magnitudes: np.ndarray
+    active: np.ndarray
+    valid: np.ndarray
+    n_peaks: np.ndarray
+    peak_positions: np.ndarray
+    peak_values: np.ndarray
+    area_under_curve: np.ndarray
+    slope_max: np.ndarray
+    composite_measures: np.ndarray
+    percentage_error_sum: np.ndarray
+    singular_response: np.ndarray
+    metrics: np.ndarray
+
+    def __len__(self):
+        return self.singular_response.shape[0]
+
+def assemble_system_batch(main_system_parameters, dva_matrix, omega):
+    """Mass, damping, stiffness (P, 5, 5) and forcing (P, 5, n_omega) for a (P, 48) population."""
+    return assemble_population(main_system_parameters, dva_matrix, omega)
+
+def active_dof_mask_batch(mass, damping, stiffness, forcing, *, tol=1e-8):
+    """Vectorized ``remove_zero_mass_dofs`` criterion: (P, n_dofs) mask of DOFs that are kept."""
+    def _zero(mat):
+        zero = np.isclose(mat, 0, atol=tol)
+        return np.all(zero, axis=2) | np.all(zero, axis=1)
+
+    z_force = np.all(np.isclose(forcing, 0, atol=tol), axis=2)
+    return ~(_zero(mass) | (_zero(damping) & _zero(stiffness) & z_force))
+
+def solve_population_response(mass, damping, stiffness, forcing, active, omega, zeta_dc, omega_dc):
+    """Response (P, n_dofs, n_omega); designs sharing an active-DOF pattern are solved as one stacked tensor."""
+    omega = np.asarray(omega, dtype=float)
+    P, n_dofs, _ = mass.shape
+    response = np.zeros((P, n_dofs, omega.size), dtype=complex)
+    if P == 0 or omega.size == 0:
+        return response
+
+    scale = omega_dc**2
+    Om = omega[None, :, None, None]
+    patterns, inverse = np.unique(active, axis=0, return_inverse=True)
+    inverse = np.ravel(inverse)
+    per_block = max(1, BATCH_SYSTEMS_BLOCK // omega.size)
+    for g, pattern in enumerate(patterns):
+        dofs = np.flatnonzero(pattern)
+        if dofs.size == 0:
+            continue
+        members = np.flatnonzero(inverse == g)
+        sel = np.ix_(dofs, dofs)
+        for start in range(0, members.size, per_block):
+            idx = members[start:start + per_block]
+            mm = mass[idx][:, sel[0], sel[1]][:, None]
+            cc = damping[idx][:, sel[0], sel[1]][:, None]
+            kk = stiffness[idx][:, sel[0], sel[1]][:, None]
+            hh = (-Om**2 * mm + 2 * zeta_dc * Om * cc + kk) * scale
+            rhs = forcing[idx][:, dofs, :].transpose(0, 2, 1)
+            k = dofs.size
+            x = solve_frequency_stack(hh.reshape(-1, k, k), np.ascontiguousarray(rhs).reshape(-1, k))
+            response[idx[:, None], dofs[None, :], :] = x.reshape(idx.size, omega.size, k).transpose(0, 2, 1) * scale
+    return response
+
+def frf_batch(
+    main_system_parameters,
+    dva_matrix,
+    omega_start,
+    omega_end,
+    omega_points,
+    target_values_dict=None,
+    weights_dict=None,
+    *,
+    keep_magnitudes=True,
+    objective=None,
+):
+    """Evaluate a (P, 48) population in one vectorized solve, scored as (P, n_metrics) @ weights; returns an FRFBatchResult."""
+    if objective is None:
+        objective = compile_objective(target_values_dict, weights_dict)
+    ZETA_DC = main_system_parameters[16]
+    OMEGA_DC = main_system_parameters[15]
+
+    omega = np.linspace(omega_start, omega_end, omega_points)
+    mass, damping, stiffness, forcing = assemble_system_batch(main_system_parameters, dva_matrix, omega)
+    active = active_dof_mask_batch(mass, damping, stiffness, forcing)
+    response = solve_population_response(mass, damping, stiffness, forcing, active, omega, ZETA_DC, OMEGA_DC)
+    magnitudes = np.abs(response)
+
+    P, n_mass = active.shape
+    n_peaks = np.zeros((P, n_mass), dtype=int)
+    peak_positions = np.full((P, n_mass, BATCH_MAX_PEAKS), np.nan)
+    peak_values = np.full((P, n_mass, BATCH_MAX_PEAKS), np.nan)
+    area_under_curve = np.full((P, n_mass), np.nan)
+    slope_max = np.full((P, n_mass), np.nan)
+    metrics = np.zeros((P, objective.n_metrics))
+    valid = np.any(active, axis=1)
+
+    for p in np.flatnonzero(valid):
+        for m in np.flatnonzero(active[p]):
+            positions, values, area, pairs, slopes, s_max = compact_mass_metrics(magnitudes[p, m], omega)
+            objective.fill_metrics(metrics[p], m, positions, values, area, pairs, slopes)
+            count = min(len(positions), BATCH_MAX_PEAKS)
+            n_peaks[p, m] = count
+            peak_positions[p, m, :count] = positions[:count]
+            peak_values[p, m, :count] = values[:count]
+            area_under_curve[p, m], slope_max[p, m] = area, s_max
+
+    singular_response, composite_measures, percentage_error_sum = objective.evaluate(metrics, active)
+    singular_response[~valid] = np.nan
+
+    return FRFBatchResult(
+        omega=omega,
+        magnitudes=magnitudes if keep_magnitudes else np.empty((0, n_mass, 0)),
+        active=active,
+        valid=valid,
+        n_peaks=n_peaks,
+        peak_positions=peak_positions,
+        peak_values=peak_values,
+        area_under_curve=area_under_curve,
+        slope_max=slope_max,
+        composite_measures=composite_measures,
+        percentage_error_sum=percentage_error_sum,
+        singular_response=singular_response,
+        metrics=metrics,
+    )
+
 def perform_omega_points_sensitivity_analysis(
     main_system_parameters,
     dva_parameters,
@@ -1,5 +1,6 @@
 from typing import List, Dict, Optional, Tuple
-from ..physics.frf import frf as raw_frf
+import numpy as np
+from ..physics.frf import frf as raw_frf, frf_batch, assemble_population, build_assembly_operator
 
 class DVASystem:
     """
@@ -103,3 +104,35 @@ class DVASystem:
             def_targets[3], def_weights[3],
             def_targets[4], def_weights[4]
         )
+
+    def build_matrices(self, dva_matrix=None, omega=None):
+        """
+        Assemble M, C, K (and the forcing if omega is given) for many designs at once.
+        
+        dva_matrix: (P, 48) array of DVA vectors; defaults to the current dva_params.
+        Uses the linear-in-parameters assembly operator, so the whole population
+        is built with one sparse product per matrix.
+        """
+        if dva_matrix is None:
+            dva_matrix = [self.dva_params]
+        return assemble_population(self.main_params, dva_matrix, omega, build_assembly_operator())
+
+    def calculate_response_batch(self,
+                                 dva_matrix,
+                                 omega_start: float = 0.1,
+                                 omega_end: float = 10.0,
+                                 points: int = 1000,
+                                 target_masses: Optional[Dict[int, Dict[str, float]]] = None):
+        """
+        Calculate the FRF of a (P, 48) population of DVA designs in one call.
+        
+        target_masses has the same format as in calculate_response.
+        Returns a FRFBatchResult (see physics.frf.frf_batch).
+        """
+        targets, weights = {}, {}
+        for m_idx, values in (target_masses or {}).items():
+            if 1 <= m_idx <= 5:
+                targets[f"mass_{m_idx}"] = values
+                weights[f"mass_{m_idx}"] = {k: 1.0 for k in values.keys()}
+        return frf_batch(self.main_params, np.asarray(dva_matrix, dtype=float),
+                         omega_start, omega_end, points, targets, weights)
@@ -0,0 +1,5 @@
+import os
+
+# Keep the test suite away from any on-disk FRF cache configured by the
+# developer: the shared cache stays in memory only
+os.environ["DEVANA_FRF_CACHE"] = ""
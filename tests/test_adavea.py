@@ -1,6 +1,9 @@
 import unittest
 import sys
 import os
+import json
+import tempfile
+from unittest import mock
 from PyQt5.QtCore import QCoreApplication
 
 # Add 'codes' directory to sys.path
@@ -31,9 +34,8 @@ class TestAdaVEAWorker(unittest.TestCase):
         weights = {f"mass_{i}": {"peak_value_1": 1.0} for i in range(1, 6)}
         self.target_values_weights = (targets, weights)
 
-    def test_adavea_worker_run(self):
-        """Test if AdaVEAWorker can run and emit progress"""
-        worker = AdaVEAWorker(
+    def make_worker(self, results_dir):
+        return AdaVEAWorker(
             main_system_parameters=self.main_params,
             dva_parameters=[
                 (f"param_{i}", 0.0, 1.0, False, 0.0, 1.0) for i in range(48)
@@ -54,8 +56,15 @@ class TestAdaVEAWorker(unittest.TestCase):
             convergence_window=10,
             convergence_min_gen=1,
             hv_ref_point=(1.0, 72.0, 48.0),
-            heuristic_init_ratio=0.1
+            heuristic_init_ratio=0.1,
+            results_dir=results_dir
         )
+
+    def test_adavea_worker_run(self):
+        """Test if AdaVEAWorker can run, emit progress and save its Pareto archive"""
+        results_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(results_dir.cleanup)
+        worker = self.make_worker(results_dir.name)
         
         results = []
         def capture_progress(run_idx, current_gen, total_gens, metrics):
@@ -68,6 +77,26 @@ class TestAdaVEAWorker(unittest.TestCase):
 
         self.assertTrue(len(results) > 0, "AdaVEAWorker did not emit any progress")
         self.assertEqual(results[0], 1, "First generation should be 1")
+        with open(os.path.join(results_dir.name, "adavea_archive.json")) as f:
+            archive = json.load(f)
+        self.assertEqual(len(archive["objectives"]), len(worker.archive))
+        self.assertGreater(len(archive["objectives"]), 0)
+
+    def test_failure_emits_error_and_closes_evaluator(self):
+        """Test that an exception during the run is reported and the evaluator pools are released"""
+        results_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(results_dir.cleanup)
+        worker = self.make_worker(results_dir.name)
+        errors, finished = [], []
+        worker.error.connect(errors.append)
+        worker.finished.connect(finished.append)
+        with mock.patch.object(worker.evaluator, "evaluate_many", side_effect=RuntimeError("solver failed")), \
+                mock.patch.object(worker.evaluator, "close") as close:
+            worker.run()
+        self.assertEqual(errors, ["solver failed"])
+        self.assertEqual(finished, [])
+        close.assert_called_once()
+        self.assertFalse(worker.is_running)
 
 if __name__ == '__main__':
     unittest.main()
@@ -8,7 +8,7 @@ from PyQt5.QtCore import QCoreApplication
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../codes')))
 
 try:
-    from workers.CMAESWorker import CMAESWorker
+    from workers.CMAESWorker import CMAESWorker, RestartSchedule, merge_restart_histories
     CMAES_AVAILABLE = True
 except ImportError:
     CMAES_AVAILABLE = False
@@ -67,8 +67,102 @@ class TestCMAESWorker(unittest.TestCase):
             worker.terminate()
             worker.wait()
             self.fail("CMAESWorker timed out")
+        # Deliver the signals queued after the last poll
+        self.app.processEvents()
 
         self.assertTrue(len(results) > 0, "CMAESWorker did not emit any progress")
 
+    def test_restart_schedules(self):
+        """Test IPOP population growth and BIPOP regime alternation by evaluation budget"""
+        ipop = RestartSchedule("ipop", 2, 10, 0.3)
+        self.assertEqual([ipop.next_restart()["popsize"] for _ in range(3)], [10, 20, 40])
+        self.assertIsNone(ipop.next_restart())
+
+        bipop = RestartSchedule("bipop", 3, 10, 0.3)
+        first = bipop.next_restart()
+        bipop.record({"regime": "large", "evaluations": 100})
+        small = bipop.next_restart()
+        self.assertEqual((first["regime"], small["regime"]), ("large", "small"))
+        self.assertLessEqual(small["sigma0"], 0.3)
+        self.assertGreaterEqual(small["popsize"], 10)
+        bipop.record({"regime": "small", "evaluations": 200})
+        self.assertEqual(bipop.next_restart(), {"restart": 2, "regime": "large", "sigma0": 0.3, "popsize": 20})
+
+        merged = merge_restart_histories([
+            {"restart": 0, "evaluations": 20, "best_fitness": 2.0,
+             "history": {"best_fitness_per_gen": [3.0, 2.0], "fitness_history": [[3.0], [2.0]]}},
+            {"restart": 1, "evaluations": 40, "best_fitness": 1.0,
+             "history": {"best_fitness_per_gen": [4.0, 2.5, 1.0], "fitness_history": [[4.0], [2.5], [1.0]]}},
+        ])
+        self.assertEqual(merged["best_fitness_per_gen"], [3.0, 2.0, 1.0])
+        self.assertEqual(merged["fitness_history"], [[3.0, 4.0], [2.0, 2.5], [1.0]])
+        self.assertEqual((merged["evaluation_count"], merged["best_restart"]), (60, 1))
+
+    def test_ipop_restarts_with_controller(self):
+        """Test that IPOP restarts run with their own sigma controller and merge into one result"""
+        bounds = [(name, low, high, i == 0) for i, (name, low, high, _) in enumerate(self.dva_bounds)]
+        worker = CMAESWorker(
+            self.main_params,
+            self.targets, self.weights,
+            0, 200, 20,
+            cma_initial_sigma=0.3,
+            cma_max_iter=2,
+            cma_tol=1e-6,
+            cma_parameter_data=bounds,
+            use_rl_controller=True,
+            restart_strategy="ipop",
+            n_restarts=1,
+            restart_workers=1,
+            seed=7
+        )
+        outcome = {}
+        worker.finished.connect(lambda results, best, names, fitness: outcome.update(
+            metrics=results["benchmark_metrics"], best=best, fitness=fitness))
+        worker.error.connect(lambda message: outcome.update(error=message))
+        worker.run()
+
+        self.assertNotIn("error", outcome)
+        metrics = outcome["metrics"]
+        self.assertEqual([r["popsize"] for r in metrics["restarts"]], [15, 30])
+        self.assertEqual(metrics["evaluation_count"], 2 * 15 + 2 * 30)
+        self.assertEqual(len(metrics["best_fitness_per_gen"]), 2)
+        self.assertEqual(outcome["fitness"], min(r["best_fitness"] for r in metrics["restarts"]))
+        self.assertEqual([e["restart"] for e in metrics["rl_controller_history"]], [0, 0, 1, 1])
+        self.assertEqual(outcome["best"][0], 0.01)
+
+    def test_concurrent_restarts_in_processes(self):
+        """Test that restarts run concurrently in worker processes merge into one result"""
+        worker = CMAESWorker(
+            self.main_params,
+            self.targets, self.weights,
+            0, 200, 20,
+            cma_initial_sigma=0.3,
+            cma_max_iter=2,
+            cma_tol=1e-6,
+            cma_parameter_data=self.dva_bounds,
+            restart_strategy="ipop",
+            n_restarts=2,
+            restart_workers=2,
+            seed=11
+        )
+        outcome, messages = {}, []
+        worker.finished.connect(lambda results, best, names, fitness: outcome.update(
+            metrics=results["benchmark_metrics"], best=best, fitness=fitness))
+        worker.error.connect(lambda message: outcome.update(error=message))
+        worker.update.connect(messages.append)
+        worker.run()
+
+        self.assertNotIn("error", outcome)
+        self.assertFalse([m for m in messages if m.startswith("Warning: restart processes")])
+        metrics = outcome["metrics"]
+        restarts = sorted(metrics["restarts"], key=lambda r: r["restart"])
+        self.assertEqual([r["restart"] for r in restarts], [0, 1, 2])
+        self.assertEqual([r["popsize"] for r in restarts], [15, 30, 60])
+        self.assertEqual([r["seed"] for r in restarts], [11, 12, 13])
+        self.assertEqual(metrics["evaluation_count"], sum(r["evaluations"] for r in restarts))
+        self.assertEqual(metrics["evaluation_count"], 2 * (15 + 30 + 60))
+        self.assertEqual(len(metrics["best_fitness_per_gen"]), 2)
+        self.assertEqual(outcome["fitness"], min(r["best_fitness"] for r in restarts))
+
 if __name__ == '__main__':
     unittest.main()
@@ -7,7 +7,13 @@ from PyQt5.QtCore import QCoreApplication
 # Add 'codes' directory to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../codes')))
 
-from workers.DEWorker import DEWorker
+import pickle
+
+import numpy as np
+
+from workers.DEWorker import DEWorker, DEStrategy, AdaptiveMethod, de_fitness
+from modules.evaluator import Evaluator
+from modules.frf_cache import FRFCache
 
 class TestDEWorker(unittest.TestCase):
     @classmethod
@@ -68,5 +74,63 @@ class TestDEWorker(unittest.TestCase):
         self.assertTrue(len(results) > 0, "DEWorker did not emit any progress")
         self.assertLess(results[-1], 1e6)
 
+    def test_shared_evaluator_and_picklable_fitness(self):
+        """Test that a shared evaluator is used but not closed, and de_fitness pickles"""
+        evaluator = Evaluator(self.main_params, 0, 200, 20, self.targets, self.weights, cache=FRFCache())
+        self.addCleanup(evaluator.close)
+        worker = DEWorker(
+            self.main_params,
+            self.targets, self.weights,
+            0, 200, 20,
+            de_parameter_data=self.dva_bounds,
+            evaluator=evaluator
+        )
+        self.assertIs(worker.evaluator, evaluator)
+        self.assertFalse(worker._owns_evaluator)
+        individual = [0.5] * len(self.dva_bounds)
+        summary = evaluator.evaluate(individual)
+        self.assertEqual(pickle.loads(pickle.dumps(de_fitness))(individual, summary, 0.0, 0.0),
+                         abs(summary["singular_response"] - 1))
+        self.assertEqual(worker.evaluate_individual(individual, results={"error": "failed"}), 1e6)
+
+    def test_generate_trials_for_all_strategies(self):
+        """Test that whole-generation trials respect fixed parameters, bounds and crossover"""
+        bounds = [(low, high) for _, low, high, _ in self.dva_bounds]
+        fixed = {0: 0.25, 47: 0.75}
+        population = np.random.default_rng(0).uniform(0.01, 1.0, (12, len(bounds)))
+        for strategy in DEStrategy:
+            worker = DEWorker(self.main_params, self.targets, self.weights, 0, 200, 20,
+                              de_parameter_data=self.dva_bounds, strategy=strategy,
+                              de_F=2.0, de_CR=0.0, constraint_handling="reflection")
+            self.addCleanup(worker.evaluator.close)
+            trials, F, CR = worker._generate_trials(population, population[3], bounds, fixed)
+            self.assertEqual(trials.shape, population.shape)
+            self.assertEqual(F.shape, (12,))
+            self.assertTrue(np.all(trials[:, [0, 47]] == [0.25, 0.75]))
+            self.assertTrue(np.all((trials >= 0.01) & (trials <= 1.0)))
+            # CR = 0 takes exactly one donor component (j_rand) per trial
+            self.assertTrue(np.all(np.sum(trials[:, 1:47] != population[:, 1:47], axis=1) <= 1))
+
+        indices = worker._mutation_indices(6, 5)
+        for i, row in enumerate(indices):
+            self.assertEqual(sorted(row), [j for j in range(6) if j != i])
+        with self.assertRaises(ValueError):
+            worker._mutation_indices(3, 3)
+
+    def test_adaptive_parameters_are_per_individual(self):
+        """Test that JADE samples F and CR per individual and learns from successful trials"""
+        worker = DEWorker(self.main_params, self.targets, self.weights, 0, 200, 20,
+                          de_parameter_data=self.dva_bounds, adaptive_method=AdaptiveMethod.JADE)
+        self.addCleanup(worker.evaluator.close)
+        worker._initialize_adaptive_parameters(len(self.dva_bounds))
+        F, CR = worker._get_control_parameters(50)
+        self.assertGreater(len(set(F)), 1)
+        self.assertTrue(np.all((F >= 0.1) & (F <= 1.0) & (CR >= 0.0) & (CR <= 1.0)))
+        improved = np.zeros(50, dtype=bool)
+        improved[:5] = True
+        worker._record_successful_parameters(np.full(50, 0.9), np.full(50, 0.9), improved)
+        self.assertAlmostEqual(worker.adaptive_params["mu_F"], 0.54)
+        self.assertAlmostEqual(worker.adaptive_params["mu_CR"], 0.54)
+
 if __name__ == '__main__':
     unittest.main()
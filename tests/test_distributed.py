@@ -0,0 +1,107 @@
+import unittest
+import numpy as np
+import os
+import sys
+import time
+from unittest import mock
+
+# Add 'codes' directory to sys.path to allow importing modules correctly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../codes')))
+
+from modules.distributed import (
+    AUTHKEY_ENV, DISTRIBUTED_ERRORS, BrokerState, BrokerUnavailable, connect_broker, main,
+    start_broker, start_local_workers,
+)
+from modules.evaluator import Evaluator
+from modules.frf_cache import FRFCache
+
+
+MAIN_PARAMS = [1.0, 1.0, 1.0, 0.5, 0.5, 0.5, 0.75, 0.75, 0.75, 0.75, 0.75, 0.05, 0.95, 100.0, 100.0, 100.0, 0.01]
+TARGETS = {f"mass_{m}": {"peak_value_1": 2.0, "area_under_curve": 50.0} for m in range(1, 6)}
+
+
+class TestBrokerState(unittest.TestCase):
+    def setUp(self):
+        self.broker = BrokerState(heartbeat_timeout=0.2, steal_after=0.1)
+        self.config_id = self.broker.register_config({"problem": 1})
+        self.batch_ids = self.broker.submit(self.config_id, np.arange(10.0).reshape(5, 2), batch_rows=2)
+
+    def test_batches_and_results_keep_row_order(self):
+        """Test that batches split the rows in order and results are collected once"""
+        self.assertEqual(len(self.batch_ids), 3)
+        tasks = [self.broker.get_batch("w") for _ in self.batch_ids]
+        self.assertEqual([t[0] for t in tasks], self.batch_ids)
+        self.assertEqual(tasks[2][2].tolist(), [[8.0, 9.0]])
+        for batch_id, _, rows in reversed(tasks):
+            self.assertTrue(self.broker.put_result("w", batch_id, rows.tolist()))
+        self.assertEqual(sorted(self.broker.collect(self.batch_ids)), self.batch_ids)
+        self.assertEqual(self.broker.collect(self.batch_ids), {})
+
+    def test_lost_worker_batches_are_reassigned(self):
+        """Test that the batches of a silent worker go to another worker"""
+        lost = self.broker.get_batch("lost")
+        time.sleep(0.3)
+        self.assertEqual(self.broker.get_batch("alive")[0], lost[0])
+        self.assertEqual(self.broker.status()["requeued"], 1)
+
+    def test_idle_worker_steals_straggling_batch(self):
+        """Test that an idle worker takes over a copy of a slow batch and the first result wins"""
+        tasks = [self.broker.get_batch("slow") for _ in self.batch_ids]
+        self.assertIsNone(self.broker.get_batch("fast"))
+        time.sleep(0.15)
+        self.broker.heartbeat("slow")
+        stolen = self.broker.get_batch("fast")
+        self.assertEqual(stolen[0], tasks[0][0])
+        self.assertTrue(self.broker.put_result("fast", stolen[0], ["fast"]))
+        self.assertFalse(self.broker.put_result("slow", stolen[0], ["slow"]))
+        self.assertEqual(self.broker.collect([stolen[0]]), {stolen[0]: ["fast"]})
+
+
+class TestDistributedEvaluation(unittest.TestCase):
+    def test_localhost_workers_match_serial(self):
+        """Test that broker workers on localhost return the serial summaries in order"""
+        manager = start_broker(("127.0.0.1", 0), "test-secret")
+        self.addCleanup(manager.shutdown)
+        workers = start_local_workers(manager.address, "test-secret", n_workers=2, idle_timeout=30)
+        for worker in workers:
+            self.addCleanup(worker.terminate)
+
+        population = np.random.default_rng(3).uniform(0.01, 1.0, (40, 48))
+        evaluator = Evaluator(MAIN_PARAMS, 0, 200, 100, TARGETS, TARGETS, backend="distributed",
+                              cache=FRFCache(), broker_address=manager.address, broker_authkey="test-secret")
+        summaries = evaluator.evaluate_many(population)
+        self.assertEqual(evaluator.backend, "distributed")
+        reference = Evaluator(MAIN_PARAMS, 0, 200, 100, TARGETS, TARGETS, cache=FRFCache()).evaluate_many(population)
+        self.assertEqual([s["singular_response"] for s in summaries],
+                         [s["singular_response"] for s in reference])
+        self.assertEqual(connect_broker(manager.address, "test-secret").status()["pending"], 0)
+
+    def test_unreachable_broker_falls_back(self):
+        """Test that an unreachable broker leaves evaluation to local threads"""
+        evaluator = Evaluator(MAIN_PARAMS, 0, 200, 100, TARGETS, TARGETS, backend="distributed",
+                              cache=FRFCache(), broker_address=("127.0.0.1", 1), broker_authkey="test-secret")
+        self.addCleanup(evaluator.close)
+        self.assertEqual(len(evaluator.evaluate_many(np.full((2, 48), 0.5))), 2)
+        self.assertEqual(evaluator.backend, "thread")
+
+    def test_authkey_is_required(self):
+        """Test that neither the broker nor its clients fall back to a built-in secret"""
+        self.assertNotIn(RuntimeError, DISTRIBUTED_ERRORS)
+        with mock.patch.dict(os.environ, {AUTHKEY_ENV: ""}):
+            with self.assertRaises(BrokerUnavailable):
+                connect_broker(("127.0.0.1", 1))
+            with mock.patch("modules.distributed.serve_broker") as serve, \
+                    mock.patch("sys.stderr"), self.assertRaises(SystemExit):
+                main(["broker"])
+            serve.assert_not_called()
+
+    def test_wrong_authkey_is_rejected(self):
+        """Test that a client with another secret cannot use the broker"""
+        manager = start_broker(("127.0.0.1", 0), "test-secret")
+        self.addCleanup(manager.shutdown)
+        with self.assertRaises(BrokerUnavailable):
+            connect_broker(manager.address, "other-secret")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+import numpy as np
+import os
+import sys
+
+# Add 'codes' directory to sys.path to allow importing modules correctly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../codes')))
+
+from modules.evaluator import Evaluator, EVALUATION_BACKENDS
+from modules.frf_cache import FRFCache
+
+
+MAIN_PARAMS = [1.0, 1.0, 1.0, 0.5, 0.5, 0.5, 0.75, 0.75, 0.75, 0.75, 0.75, 0.05, 0.95, 100.0, 100.0, 100.0, 0.01]
+TARGETS = {f"mass_{m}": {"peak_value_1": 2.0, "area_under_curve": 50.0, "slope_1_2": 1.0} for m in range(1, 6)}
+WEIGHTS = {f"mass_{m}": {"peak_value_1": 1.0, "area_under_curve": 0.5, "slope_1_2": 0.1} for m in range(1, 6)}
+
+
+class TestEvaluator(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.population = np.random.default_rng(1).uniform(0.01, 1.0, (8, 48))
+
+    def make(self, backend, **kwargs):
+        evaluator = Evaluator(MAIN_PARAMS, 0, 200, 300, TARGETS, WEIGHTS,
+                              backend=backend, n_workers=2, cache=FRFCache(), **kwargs)
+        self.addCleanup(evaluator.close)
+        return evaluator
+
+    def test_backends_agree(self):
+        """Test that every backend returns the serial summaries"""
+        reference = self.make("serial").evaluate_many(self.population)
+        for backend in EVALUATION_BACKENDS:
+            summaries = self.make(backend).evaluate_many(self.population)
+            self.assertEqual(len(summaries), len(reference))
+            for summary, expected in zip(summaries, reference):
+                self.assertLess(abs(summary["singular_response"] - expected["singular_response"]),
+                                1e-9 * abs(expected["singular_response"]))
+                self.assertEqual(summary["composite_measures"].keys(), expected["composite_measures"].keys())
+                for mass, pdiffs in expected["percentage_differences"].items():
+                    self.assertEqual(summary["percentage_differences"][mass].keys(), pdiffs.keys())
+                    for criterion, value in pdiffs.items():
+                        self.assertLess(abs(summary["percentage_differences"][mass][criterion] - value),
+                                        1e-9 * max(1.0, abs(value)))
+
+    def test_batch_backend_uses_cache(self):
+        """Test that repeated designs are served from the cache by the batch backend"""
+        evaluator = self.make("batch")
+        first = evaluator.evaluate_many(self.population)
+        second = evaluator.evaluate_many(self.population[::-1])
+        self.assertEqual([s["singular_response"] for s in second[::-1]],
+                         [s["singular_response"] for s in first])
+        self.assertEqual(evaluator.cache_stats()["memory_hits"], len(self.population))
+        self.assertEqual(evaluator.evaluation_count, 2 * len(self.population))
+
+    def test_submit_resolves_to_summaries(self):
+        """Test that single designs submitted in the background give the serial summaries"""
+        reference = self.make("serial").evaluate_many(self.population)
+        for backend in ("serial", "thread", "batch"):
+            evaluator = self.make(backend)
+            futures = [evaluator.submit(row) for row in self.population]
+            for future, expected in zip(futures, reference):
+                self.assertLess(abs(future.result()["singular_response"] - expected["singular_response"]),
+                                1e-9 * abs(expected["singular_response"]))
+        self.assertIn("error", self.make("thread").submit(self.population[0, :3]).result())
+
+    def test_abort_and_errors(self):
+        """Test that aborted rows are None and failing rows carry an error"""
+        evaluator = self.make("serial")
+        self.assertEqual(evaluator.evaluate_many(self.population, should_stop=lambda: True),
+                         [None] * len(self.population))
+        # A DVA vector of the wrong length makes frf() raise
+        self.assertIn("error", evaluator.evaluate_many([self.population[0, :3]])[0])
+        with self.assertRaises(Exception):
+            evaluator.evaluate(self.population[0, :3])
+        with self.assertRaises(ValueError):
+            Evaluator(MAIN_PARAMS, 0, 200, 300, TARGETS, WEIGHTS, backend="gpu")
+
+
+if __name__ == '__main__':
+    unittest.main()
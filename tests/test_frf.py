@@ -6,9 +6,15 @@ import os
 # Add 'codes' directory to sys.path to allow importing modules correctly
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../codes')))
 
-from modules.FRF import frf, remove_zero_mass_dofs
+from modules.FRF import (
+    frf, frf_batch, remove_zero_mass_dofs, solve_frequency_stack,
+    modal_decomposition, solve_modal_response, solve_dynamic_stiffness,
+    assemble_population, build_assembly_operator, extract_model_peaks,
+    compile_objective,
+)
 
 class TestFRFModule(unittest.TestCase):
+
     def setUp(self):
         # Main System Parameters (17 values)
         # MU, LANDA_1-5, NU_1-5, A_LOW, A_UPP, F_1, F_2, OMEGA_DC, ZETA_DC
@@ -77,5 +83,233 @@ class TestFRFModule(unittest.TestCase):
         
         self.assertLess(np.std(responses), 1.0)
 
+    def test_batched_solve_matches_loop(self):
+        """Test that the stacked all-frequency solve reproduces the per-frequency loop"""
+        common = (
+            self.main_params, self.dva_params, 0, 200, 400,
+            self.targets, self.weights,
+            self.targets, self.weights,
+            self.targets, self.weights,
+            self.targets, self.weights,
+            self.targets, self.weights,
+        )
+        batched = frf(*common, solve_method='batched')
+        loop = frf(*common, solve_method='loop')
+
+        for mass in ("mass_1", "mass_2", "mass_3", "mass_4", "mass_5"):
+            np.testing.assert_allclose(batched[mass]["magnitude"], loop[mass]["magnitude"], rtol=1e-9, atol=1e-12)
+        self.assertAlmostEqual(batched["singular_response"], loop["singular_response"], places=8)
+
+    def test_stack_solve_singular_fallback(self):
+        """Test that only singular members of a stack take the regularized fallback"""
+        hh = np.array([np.eye(3) * 2.0, np.zeros((3, 3)), np.diag([1.0, 4.0, 5.0])], dtype=complex)
+        rhs = np.ones((3, 3), dtype=complex)
+
+        x = solve_frequency_stack(hh, rhs)
+
+        np.testing.assert_allclose(x[0], 0.5 * np.ones(3))
+        np.testing.assert_allclose(x[2], [1.0, 0.25, 0.2])
+        self.assertTrue(np.all(np.isfinite(x[1])))
+
+    def test_frf_batch_matches_frf(self):
+        """Test that the population-level FRF reproduces per-individual frf() calls"""
+        zero_mass = list(self.dva_params)
+        zero_mass[32] = 0.0  # mu_3 = 0 removes a DOF for this individual only
+        population = np.array([self.dva_params, zero_mass, [0.02]*15 + [0.4]*15 + [0.2]*3 + [0.1]*15])
+        targets = {f"mass_{m}": self.targets for m in range(1, 6)}
+        weights = {f"mass_{m}": self.weights for m in range(1, 6)}
+
+        batch = frf_batch(self.main_params, population, 0, 200, 120, targets, weights)
+
+        self.assertEqual(len(batch), 3)
+        for p, individual in enumerate(population):
+            single = frf(
+                self.main_params, list(individual), 0, 200, 120,
+                self.targets, self.weights,
+                self.targets, self.weights,
+                self.targets, self.weights,
+                self.targets, self.weights,
+                self.targets, self.weights,
+            )
+            self.assertAlmostEqual(batch.singular_response[p], single["singular_response"], places=6)
+            np.testing.assert_allclose(batch.magnitudes[p, 0], single["mass_1"]["magnitude"], rtol=1e-9, atol=1e-12)
+
+    def test_modal_engine_matches_direct_solve(self):
+        """Test that the pole-residue engine reproduces the direct dynamic-stiffness solve"""
+        common = (
+            self.main_params, self.dva_params, 0, 200, 3000,
+            self.targets, self.weights,
+            self.targets, self.weights,
+            self.targets, self.weights,
+            self.targets, self.weights,
+            self.targets, self.weights,
+        )
+        modal = frf(*common, solve_method='modal')
+        direct = frf(*common, solve_method='batched')
+
+        for mass in ("mass_1", "mass_2", "mass_3", "mass_4", "mass_5"):
+            np.testing.assert_allclose(modal[mass]["magnitude"], direct[mass]["magnitude"], rtol=1e-7, atol=1e-12)
+        self.assertAlmostEqual(modal["singular_response"] / direct["singular_response"], 1.0, places=7)
+
+    def test_modal_engine_defective_fallback(self):
+        """Test that a critically damped (defective) system falls back to the direct solve"""
+        # -s^2 + 2 s - 1 = -(s - 1)^2: a double pole with a single eigenvector
+        mm, cc, kk = np.eye(1), np.eye(1), -np.eye(1)
+        omega = np.linspace(0.0, 3.0, 31)
+        forcing = np.ones((1, omega.size), dtype=complex)
+
+        self.assertIsNone(modal_decomposition(mm, cc, kk, 1.0))
+        np.testing.assert_allclose(
+            solve_modal_response(mm, cc, kk, forcing, omega, 1.0, 1.0),
+            solve_dynamic_stiffness(mm, cc, kk, forcing, omega, 1.0, 1.0),
+        )
+
+    def test_assembly_operator(self):
+        """Test the linear assembly operator against known entries and finite differences"""
+        population = np.array([self.dva_params, [0.0]*48])
+        mass, damping, stiffness = assemble_population(self.main_params, population)
+
+        # Design 0: mass[0, 2] = -beta_1, mass[2, 2] = mu_1 + beta_1 + beta_4 + beta_7 + beta_8 + beta_9 + beta_10
+        self.assertAlmostEqual(mass[0, 0, 2], -0.01)
+        self.assertAlmostEqual(mass[0, 2, 2], 0.1 + 6 * 0.01)
+        # Design 1 (no absorbers) only keeps the main system
+        np.testing.assert_allclose(mass[1], np.diag([1.0, self.main_params[0], 0, 0, 0]))
+        np.testing.assert_allclose(stiffness[1, 2:, :], 0.0)
+
+        operator = build_assembly_operator()
+        for index in (0, 17, 31, 40):
+            shifted = np.array(self.dva_params)
+            shifted[index] += 1.0
+            dm, dc, dk = operator.parameter_derivatives(index, self.main_params)
+            m1, c1, k1 = assemble_population(self.main_params, shifted)
+            np.testing.assert_allclose(m1[0] - mass[0], dm, atol=1e-12)
+            np.testing.assert_allclose(c1[0] - damping[0], dc, atol=1e-9)
+            np.testing.assert_allclose(k1[0] - stiffness[0], dk, atol=1e-6)
+
+    def test_adaptive_grid_resolves_resonances(self):
+        """Test that the adaptive sweep locates resonances as well as a 10k uniform grid with far fewer solves"""
+        args = (
+            self.targets, self.weights,
+            self.targets, self.weights,
+            self.targets, self.weights,
+            self.targets, self.weights,
+            self.targets, self.weights,
+        )
+        uniform = frf(self.main_params, self.dva_params, 0, 200, 10000, *args)
+        adaptive = frf(self.main_params, self.dva_params, 0, 200, 10000, *args, frequency_grid='adaptive')
+
+        grid = adaptive["frequency_grid"]["omega"]
+        self.assertLess(adaptive["frequency_grid"]["points"], 1000)
+        self.assertTrue(np.all(np.diff(grid) > 0))
+        self.assertEqual(len(adaptive["mass_1"]["magnitude"]), grid.size)
+
+        # Resonances of this model are the real roots of det(-w^2 M + 2 zeta w C + K)
+        mass, damping, stiffness = assemble_population(self.main_params, [self.dva_params])
+        poles = modal_decomposition(mass[0], damping[0], stiffness[0], self.main_params[16])[0]
+        poles = poles.real[(poles.real > 0) & (poles.real < 200)]
+        spacing = 200 / 9999
+        for mass_key in ("mass_1", "mass_3"):
+            for result in (uniform, adaptive):
+                for position in result[mass_key]["peak_positions"].values():
+                    self.assertLess(np.min(np.abs(poles - position)), 3 * spacing)
+            self.assertEqual(len(adaptive[mass_key]["peak_positions"]), len(uniform[mass_key]["peak_positions"]))
+
+    def test_model_peaks_grid_independent(self):
+        """Test that model-based peak positions sit on the poles whatever the grid size"""
+        args = (
+            self.targets, self.weights,
+            self.targets, self.weights,
+            self.targets, self.weights,
+            self.targets, self.weights,
+            self.targets, self.weights,
+        )
+        coarse = frf(self.main_params, self.dva_params, 0, 200, 300, *args, peak_method='model')
+        fine = frf(self.main_params, self.dva_params, 0, 200, 3000, *args, peak_method='model')
+
+        mass, damping, stiffness = assemble_population(self.main_params, [self.dva_params])
+        poles = modal_decomposition(mass[0], damping[0], stiffness[0], self.main_params[16])[0].real
+        for mass_key in ("mass_1", "mass_2", "mass_5"):
+            positions = list(coarse[mass_key]["peak_positions"].values())
+            self.assertGreater(len(positions), 0)
+            self.assertEqual(positions, list(fine[mass_key]["peak_positions"].values()))
+            for position in positions:
+                self.assertLess(np.min(np.abs(poles - position)), 1e-9)
+            self.assertEqual(len(coarse[mass_key]["bandwidths"]), len(positions) * (len(positions) - 1) // 2)
+
+    def test_model_peaks_complex_pole(self):
+        """Test the Brent search against the analytic peak of a damped oscillator"""
+        w0, c = 10.0, 0.4
+        response = lambda w: (1.0 / (w0**2 - w**2 + 1j * c * w))[None, :]
+        root = np.sqrt(4 * w0**2 - c**2)
+        poles = np.array([(1j * c + root) / 2, (1j * c - root) / 2])
+
+        (positions, values), = extract_model_peaks(response, poles, 0.0, 20.0, resolution=0.01)
+
+        self.assertAlmostEqual(positions[0], np.sqrt(w0**2 - c**2 / 2), places=7)
+        self.assertAlmostEqual(values[0], 1.0 / (c * np.sqrt(w0**2 - c**2 / 4)), places=9)
+
+    def test_model_peaks_conjugate_pair_seeds_once(self):
+        """Test that a complex-conjugate pole pair yields a single peak"""
+        w0, c = 10.0, 0.4
+        response = lambda w: (1.0 / (w0**2 - w**2 + 1j * c * w))[None, :]
+        pole = (1j * c + np.sqrt(4 * w0**2 - c**2)) / 2
+        poles = np.array([pole, np.conj(pole)])
+
+        (positions, values), = extract_model_peaks(response, poles, 0.0, 20.0, resolution=0.01, max_peaks=2)
+
+        self.assertEqual(positions.size, 1)
+        self.assertAlmostEqual(positions[0], np.sqrt(w0**2 - c**2 / 2), places=7)
+
+    def test_compact_output_matches_full(self):
+        """Test that output='compact' gives the same metrics as the nested result dict"""
+        targets = {"peak_value_1": 50.0, "peak_position_2": 120.0, "bandwidth_1_2": 20.0,
+                   "slope_1_2": 1.0, "area_under_curve": 300.0}
+        weights = {key: 1.0 for key in targets}
+        args = (targets, weights) * 5
+
+        full = frf(self.main_params, self.dva_params, 0, 200, 800, *args)
+        compact = frf(self.main_params, self.dva_params, 0, 200, 800, *args, output='compact')
+
+        self.assertAlmostEqual(compact.singular_response, full["singular_response"], places=9)
+        pct = sum(abs(v) for diffs in full["percentage_differences"].values() for v in diffs.values())
+        self.assertAlmostEqual(compact.percentage_error_sum, pct, places=6)
+        for m, label in enumerate(("mass_1", "mass_2", "mass_3", "mass_4", "mass_5")):
+            positions = list(full[label]["peak_positions"].values())
+            np.testing.assert_allclose(compact.peak_positions[m, :len(positions)], positions)
+            self.assertAlmostEqual(compact.area_under_curve[m], full[label]["area_under_curve"])
+            self.assertAlmostEqual(compact.composite_measures[m], full["composite_measures"][label])
+        self.assertIsNone(compact.magnitudes)
+
+        with_mags = frf(self.main_params, self.dva_params, 0, 200, 800, *args, output='compact', keep_magnitudes=True)
+        np.testing.assert_allclose(with_mags.magnitudes[0], full["mass_1"]["magnitude"])
+
+    def test_compiled_objective_matches_dict_scoring(self):
+        """Test that the compiled objective scores like calculate_singular_response, singly and in batch"""
+        targets = {"peak_value_1": 50.0, "peak_value_7": 5.0, "bandwidth_1_3": 20.0, "slope_1_2": 1.0,
+                   "slope_max": 2.0, "area_under_curve": 300.0, "unknown": 4.0, "peak_position_2": 0.0}
+        weights = {key: 0.5 for key in targets}
+        labels = ("mass_1", "mass_2", "mass_3", "mass_4", "mass_5")
+        target_dict = {label: targets for label in labels}
+        weight_dict = {label: weights for label in labels}
+        objective = compile_objective(target_dict, weight_dict)
+        self.assertEqual(objective.max_peaks, 7)
+        self.assertEqual(len(objective.criteria), 5 * 7)
+
+        dva_matrix = np.array([self.dva_params] * 3)
+        dva_matrix[1, :15] = 0.03
+        dva_matrix[2, 32] = 0.0  # mu_3 = 0 drops a DOF
+        dva_matrix[2, [2, 5, 9, 12, 13, 14]] = 0.0
+        batch = frf_batch(self.main_params, dva_matrix, 0, 200, 400, target_dict, weight_dict, objective=objective)
+        np.testing.assert_allclose(batch.metrics @ objective.weight_vector, batch.singular_response)
+        for p, dva in enumerate(dva_matrix):
+            full = frf(self.main_params, dva, 0, 200, 400, *(targets, weights) * 5)
+            pct = sum(abs(v) for diffs in full["percentage_differences"].values() for v in diffs.values())
+            compact = frf(self.main_params, dva, 0, 200, 400, *(targets, weights) * 5,
+                          output='compact', objective=objective)
+            for result in (compact.singular_response, batch.singular_response[p]):
+                self.assertAlmostEqual(result, full["singular_response"], places=8)
+            for result in (compact.percentage_error_sum, batch.percentage_error_sum[p]):
+                self.assertAlmostEqual(result, pct, places=6)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,127 @@
+import unittest
+import multiprocessing
+import os
+import sys
+import tempfile
+from unittest import mock
+
+# Add 'codes' directory to sys.path to allow importing modules correctly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../codes')))
+
+from modules.FRF import frf
+from modules.frf_cache import CACHE_PATH_ENV, FRFCache, cached_frf, design_key, get_shared_cache
+
+
+MAIN_PARAMS = [1.0, 1.0, 1.0, 0.5, 0.5, 0.5, 0.75, 0.75, 0.75, 0.75, 0.75, 0.05, 0.95, 100.0, 100.0, 100.0, 0.01]
+DVA_PARAMS = [0.01] * 15 + [0.2] * 15 + [0.1] * 3 + [0.05] * 15
+TARGETS = {f"mass_{m}": {"peak_value_1": 2.0, "area_under_curve": 50.0} for m in range(1, 6)}
+WEIGHTS = {f"mass_{m}": {"peak_value_1": 1.0, "area_under_curve": 0.5} for m in range(1, 6)}
+
+
+def _store_range(path, start, stop):
+    cache = FRFCache(path)
+    for i in range(start, stop):
+        cache.put(f"key-{i}", {"value": i})
+    cache.close()
+
+
+class TestFRFCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "cache.sqlite")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_memory_and_disk_tiers(self):
+        """Test LRU eviction, disk promotion and hit statistics"""
+        cache = FRFCache(self.path, max_memory_entries=2)
+        for i in range(3):
+            cache.put(f"k{i}", i)
+        self.assertEqual(cache.stats()["memory_entries"], 2)
+        self.assertEqual(cache.get("k2"), 2)   # memory
+        self.assertEqual(cache.get("k0"), 0)   # evicted, served from disk
+        self.assertIsNone(cache.get("missing"))
+        stats = cache.stats()
+        self.assertEqual((stats["memory_hits"], stats["disk_hits"], stats["misses"]), (1, 1, 1))
+        self.assertAlmostEqual(stats["hit_rate"], 2 / 3)
+        self.assertEqual(cache.stats(since=stats)["lookups"], 0)
+
+        # A new session reads the entries written by the previous one
+        cache.close()
+        reopened = FRFCache(self.path)
+        self.assertEqual(reopened.get("k1"), 1)
+        self.assertEqual(reopened.stats()["disk_hits"], 1)
+
+    def test_concurrent_processes(self):
+        """Test that several processes can write to the same database"""
+        ctx = multiprocessing.get_context("spawn")
+        procs = [ctx.Process(target=_store_range, args=(self.path, 50 * k, 50 * (k + 1))) for k in range(3)]
+        for proc in procs:
+            proc.start()
+        for proc in procs:
+            proc.join(60)
+            self.assertEqual(proc.exitcode, 0)
+        cache = FRFCache(self.path)
+        self.assertEqual([cache.get(f"key-{i}")["value"] for i in range(150)], list(range(150)))
+
+    def test_batched_commits(self):
+        """Test that writes reach other connections only after a batch commit"""
+        cache = FRFCache(self.path, commit_every=100)
+        cache.put("k0", 0)
+        reader = FRFCache(self.path)
+        self.assertIsNone(reader.get("k0"))
+        cache.flush()
+        self.assertEqual(reader.get("k0"), 0)
+        cache.close()
+        reader.close()
+
+    def test_disk_tier_pruned(self):
+        """Test that the disk tier keeps only the newest max_disk_entries rows"""
+        cache = FRFCache(self.path, max_memory_entries=1, max_disk_entries=20, commit_every=5)
+        for i in range(100):
+            cache.put(f"k{i}", i)
+        cache.close()
+        reopened = FRFCache(self.path)
+        kept = [i for i in range(100) if reopened.get(f"k{i}") is not None]
+        self.assertLessEqual(len(kept), 20)
+        self.assertIn(99, kept)
+        self.assertNotIn(0, kept)
+
+    def test_shared_cache_memory_only_by_default(self):
+        """Test that the disk tier of the shared cache is opt-in"""
+        with mock.patch.dict(os.environ, {CACHE_PATH_ENV: ""}):
+            self.assertIsNone(get_shared_cache().path)
+        with mock.patch.dict(os.environ, {CACHE_PATH_ENV: self.path}):
+            self.assertEqual(get_shared_cache().path, self.path)
+
+    def test_design_key(self):
+        """Test that keys cover the design and objective but ignore float noise"""
+        args = (MAIN_PARAMS, DVA_PARAMS, 0, 200, 400, TARGETS, WEIGHTS)
+        key = design_key(*args)
+        noisy = [v + 1e-15 for v in DVA_PARAMS]
+        self.assertEqual(key, design_key(MAIN_PARAMS, noisy, 0, 200, 400, TARGETS, WEIGHTS))
+        self.assertNotEqual(key, design_key(MAIN_PARAMS, DVA_PARAMS, 0, 200, 401, TARGETS, WEIGHTS))
+        other_weights = dict(WEIGHTS, mass_1={"peak_value_1": 2.0})
+        self.assertNotEqual(key, design_key(MAIN_PARAMS, DVA_PARAMS, 0, 200, 400, TARGETS, other_weights))
+        self.assertNotEqual(key, design_key(*args, options={"solve_method": "modal"}))
+
+    def test_cached_frf_matches_frf(self):
+        """Test that cached results equal frf() and are private copies"""
+        cache = FRFCache(self.path)
+        reference = frf(MAIN_PARAMS, DVA_PARAMS, 0, 200, 400,
+                        *[d[f"mass_{m}"] for m in range(1, 6) for d in (TARGETS, WEIGHTS)])
+        first = cached_frf(MAIN_PARAMS, DVA_PARAMS, 0, 200, 400, TARGETS, WEIGHTS, cache=cache)
+        first["singular_response"] = None
+        second = cached_frf(MAIN_PARAMS, DVA_PARAMS, 0, 200, 400, TARGETS, WEIGHTS, cache=cache)
+        self.assertEqual(second["singular_response"], reference["singular_response"])
+        self.assertEqual(second["percentage_differences"], reference["percentage_differences"])
+        self.assertEqual(cache.stats()["memory_hits"], 1)
+
+        full = cached_frf(MAIN_PARAMS, DVA_PARAMS, 0, 200, 400, TARGETS, WEIGHTS, cache=cache, summary=False)
+        self.assertIn("mass_1", full)
+        self.assertEqual(cache.stats()["misses"], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+import sys
+import os
+import time
+from PyQt5.QtCore import QCoreApplication
+
+# Add 'codes' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../codes')))
+
+from modules.parallel import plan_core_budget
+from workers.GABenchmarkWorker import GABenchmarkWorker, run_ga_benchmark_job
+
+
+class TestGABenchmarkWorker(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QCoreApplication.instance():
+            cls.app = QCoreApplication(sys.argv)
+        else:
+            cls.app = QCoreApplication.instance()
+
+    def setUp(self):
+        main_params = [1.0, 1.0, 1.0, 0.5, 0.5, 0.5, 0.75, 0.75, 0.75, 0.75, 0.75,
+                       0.05, 0.95, 100.0, 100.0, 100.0, 0.01]
+        targets = {f"mass_{i}": {"peak_value_1": 1.0} for i in range(1, 6)}
+        self.ga_kwargs = dict(
+            main_params=main_params, target_values_dict=targets, weights_dict=targets,
+            omega_start=0, omega_end=200, omega_points=20,
+            ga_pop_size=6, ga_num_generations=2, ga_cxpb=0.7, ga_mutpb=0.2, ga_tol=1e-9,
+            ga_parameter_data=[(f"p{i}", 0.01, 1.0, False) for i in range(48)], alpha=0.01,
+        )
+
+    def test_core_budget_is_never_exceeded(self):
+        """Test that runs times evaluation workers stays within the core budget"""
+        self.assertEqual(plan_core_budget(30, 8), (8, 1))
+        self.assertEqual(plan_core_budget(3, 8), (3, 2))
+        self.assertEqual(plan_core_budget(5, 1), (1, 1))
+        for n_runs in range(1, 12):
+            for budget in range(1, 12):
+                runs, workers = plan_core_budget(n_runs, budget)
+                self.assertLessEqual(runs * workers, budget)
+
+    def test_seeded_runs_are_reproducible(self):
+        """Test that a run is determined by its seed"""
+        first = run_ga_benchmark_job(1, 7, self.ga_kwargs)
+        second = run_ga_benchmark_job(2, 7, self.ga_kwargs)
+        self.assertNotIn("error", first)
+        self.assertEqual(first["best_fitness"], second["best_fitness"])
+        self.assertEqual(first["best_ind"], second["best_ind"])
+
+    def run_benchmark(self, worker, timeout=60):
+        outcomes, messages = [], []
+        worker.run_finished.connect(outcomes.append)
+        worker.update.connect(messages.append)
+        worker.start()
+        deadline = time.time() + timeout
+        while not worker.isFinished() and time.time() < deadline:
+            self.app.processEvents()
+            time.sleep(0.05)
+        worker.wait()
+        self.app.processEvents()
+        return outcomes, messages
+
+    def test_runs_are_streamed(self):
+        """Test that every run is reported with its seed"""
+        worker = GABenchmarkWorker(self.ga_kwargs, 3, core_budget=1, base_seed=10)
+        outcomes, _ = self.run_benchmark(worker)
+        self.assertEqual([o["run_number"] for o in outcomes], [1, 2, 3])
+        self.assertEqual([o["seed"] for o in outcomes], [10, 11, 12])
+        self.assertTrue(all("best_fitness" in o for o in outcomes))
+
+    def test_concurrent_runs_in_processes(self):
+        """Test that runs spread over worker processes all arrive with their own seed"""
+        worker = GABenchmarkWorker(self.ga_kwargs, 3, core_budget=2, base_seed=20)
+        self.assertEqual(worker.concurrent_runs, 2)
+        outcomes, messages = self.run_benchmark(worker, timeout=180)
+
+        self.assertFalse([m for m in messages if m.startswith("Warning")])
+        by_run = {o["run_number"]: o for o in outcomes}
+        self.assertEqual(sorted(by_run), [1, 2, 3])
+        for run_number, outcome in by_run.items():
+            self.assertNotIn("error", outcome)
+            self.assertEqual(outcome["seed"], 20 + run_number - 1)
+        # A run in a worker process matches the same seed run in this thread
+        reference = run_ga_benchmark_job(2, 21, worker.ga_kwargs)
+        self.assertEqual(by_run[2]["best_fitness"], reference["best_fitness"])
+        self.assertEqual(by_run[2]["best_ind"], reference["best_ind"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import unittest
+import queue
+import sys
+import os
+import tempfile
+import time
+from unittest import mock
+from PyQt5.QtCore import QCoreApplication
+
+# Add 'codes' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../codes')))
+
+from workers.GABenchmarkWorker import run_ga_benchmark_job
+from workers.GAIslandWorker import GAIslandWorker, IslandMigration, merge_island_metrics, migration_targets
+
+
+class _Fitness:
+    def __init__(self, value):
+        self.values = (value,)
+        self.valid = True
+
+
+class _Individual(list):
+    def __init__(self, values, fitness):
+        super().__init__(values)
+        self.fitness = _Fitness(fitness)
+
+
+class TestIslandModel(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QCoreApplication.instance():
+            cls.app = QCoreApplication(sys.argv)
+        else:
+            cls.app = QCoreApplication.instance()
+
+    def test_migration_topologies(self):
+        """Test who receives the emigrants of an island on each topology"""
+        self.assertEqual(migration_targets("ring", 4, 3), [0])
+        self.assertEqual(migration_targets("fully_connected", 3, 1), [0, 2])
+        self.assertEqual(migration_targets("star", 3, 0), [1, 2])
+        self.assertEqual(migration_targets("star", 3, 2), [0])
+        self.assertIn(migration_targets("random", 4, 1)[0], (0, 2, 3))
+        self.assertEqual(migration_targets("ring", 1, 0), [])
+
+    def test_elites_migrate_on_interval(self):
+        """Test that the best individuals are exchanged every interval generations only"""
+        inboxes = [queue.Queue(), queue.Queue()]
+        first = IslandMigration(0, 2, inboxes, "ring", interval=2, n_migrants=1)
+        second = IslandMigration(1, 2, inboxes, "ring", interval=2, n_migrants=1)
+        population = [_Individual([0.1], 3.0), _Individual([0.2], 1.0), _Individual([0.3], 2.0)]
+        self.assertEqual(first(1, population), [])
+        self.assertTrue(inboxes[1].empty())
+        self.assertEqual(first(2, population), [])
+        self.assertEqual(second(2, [_Individual([0.9], 5.0)]), [([0.2], 1.0)])
+        self.assertEqual(first(4, population), [([0.9], 5.0)])
+        self.assertEqual((first.sent, first.received), (2, 1))
+
+    def test_metrics_are_merged(self):
+        """Test that island histories combine into one metrics dict and are kept per island"""
+        islands = [
+            {'best_fitness_per_gen': [5.0, 4.0, 3.0], 'mean_fitness_history': [6.0, 5.0, 4.0],
+             'best_individual_per_gen': [[1], [2], [3]], 'evaluation_count': 30, 'controller': 'fixed'},
+            {'best_fitness_per_gen': [4.5, 4.2], 'mean_fitness_history': [8.0, 7.0],
+             'best_individual_per_gen': [[7], [8]], 'evaluation_count': 20, 'controller': 'adaptive'},
+        ]
+        merged = merge_island_metrics(islands, {'n_islands': 2})
+        self.assertEqual(merged['best_fitness_per_gen'], [4.5, 4.0, 3.0])
+        self.assertEqual(merged['mean_fitness_history'], [7.0, 6.0, 4.0])
+        self.assertEqual(merged['best_individual_per_gen'], [[7], [2], [3]])
+        self.assertEqual(merged['evaluation_count'], 50)
+        self.assertEqual(merged['controller'], 'fixed')
+        self.assertEqual(merged['best_island'], 0)
+        self.assertEqual(len(merged['islands']), 2)
+
+    def ga_kwargs(self):
+        main_params = [1.0, 1.0, 1.0, 0.5, 0.5, 0.5, 0.75, 0.75, 0.75, 0.75, 0.75,
+                       0.05, 0.95, 100.0, 100.0, 100.0, 0.01]
+        targets = {f"mass_{i}": {"peak_value_1": 1.0} for i in range(1, 6)}
+        return dict(
+            main_params=main_params, target_values_dict=targets, weights_dict=targets,
+            omega_start=0, omega_end=200, omega_points=20,
+            ga_pop_size=6, ga_num_generations=4, ga_cxpb=0.7, ga_mutpb=0.2, ga_tol=1e-9,
+            ga_parameter_data=[(f"p{i}", 0.01, 1.0, False) for i in range(48)], alpha=0.01,
+        )
+
+    def test_immigrants_are_reevaluated(self):
+        """Test that an immigrant's home-island fitness is not trusted by the receiving island"""
+        def migration(gen, population):
+            # A fitness no local evaluation can produce
+            return [([0.5] * 48, -1e9)] if gen == 1 else []
+
+        outcome = run_ga_benchmark_job(1, 3, dict(self.ga_kwargs(), migration_hook=migration))
+        self.assertNotIn("error", outcome)
+        self.assertGreater(outcome["best_fitness"], -1e6)
+
+    def test_archipelago_run(self):
+        """Test that an island run finishes with the best island's results and merged metrics"""
+        ga_kwargs = self.ga_kwargs()
+        worker = GAIslandWorker(ga_kwargs, n_islands=2, migration_interval=2, n_migrants=1,
+                                core_budget=1, base_seed=5)
+        finished = []
+        worker.finished.connect(lambda *args: finished.append(args))
+        worker.start()
+        timeout = time.time() + 120
+        while not worker.isFinished() and time.time() < timeout:
+            self.app.processEvents()
+            time.sleep(0.05)
+        worker.wait()
+        self.app.processEvents()
+        self.assertEqual(len(finished), 1)
+        results, best_ind, _, best_fitness = finished[0]
+        metrics = results['benchmark_metrics']
+        self.assertEqual(len(best_ind), 48)
+        self.assertEqual(len(metrics['islands']), 2)
+        self.assertEqual(metrics['island_model']['topology'], "ring")
+        self.assertLessEqual(best_fitness, min(metrics['island_model']['best_fitness']))
+        self.assertEqual(metrics['island_model']['migrants_sent'], [2, 2])
+
+    def test_islands_share_frf_cache(self):
+        """Test that immigrants are served from the archipelago's disk cache, which is deleted afterwards"""
+        cache_dir = tempfile.mkdtemp()
+        # The second island runs longer, so it is still migrating when the first one sends
+        worker = GAIslandWorker(self.ga_kwargs(), n_islands=2, migration_interval=1, n_migrants=2,
+                                island_overrides=[{}, {'ga_num_generations': 30}],
+                                core_budget=2, base_seed=9)
+        finished = []
+        worker.finished.connect(lambda *args: finished.append(args))
+        with mock.patch("workers.GAIslandWorker.tempfile.mkdtemp", return_value=cache_dir):
+            worker.run()
+        self.app.processEvents()
+        self.assertEqual(len(finished), 1)
+        metrics = finished[0][0]['benchmark_metrics']
+        self.assertGreater(sum(metrics['island_model']['migrants_received']), 0)
+        self.assertGreater(metrics['frf_cache']['disk_hits'], 0)
+        self.assertFalse(os.path.exists(cache_dir))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,6 +1,8 @@
 import unittest
 import sys
 import os
+import json
+import tempfile
 import time
 from PyQt5.QtCore import QCoreApplication
 
@@ -38,7 +40,9 @@ class TestMOGAWorker(unittest.TestCase):
         self.target_values_weights = [[targets, weights] for _ in range(5)]
 
     def test_moga_worker_run(self):
-        """Test if MOGAWorker can run and emit progress"""
+        """Test if MOGAWorker can run, emit progress and save its Pareto archive"""
+        results_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(results_dir.cleanup)
         worker = MOGAWorker(
             self.main_params, 
             self.dva_bounds,
@@ -55,7 +59,8 @@ class TestMOGAWorker(unittest.TestCase):
             sparsity_alpha=0.01,
             sparsity_beta=0.01,
             num_runs=1,
-            random_seed=42
+            random_seed=42,
+            results_dir=results_dir.name
         )
         
         results = []
@@ -76,6 +81,10 @@ class TestMOGAWorker(unittest.TestCase):
             self.fail("MOGAWorker timed out")
 
         self.assertTrue(len(results) > 0, "MOGAWorker did not emit any progress")
+        with open(os.path.join(results_dir.name, "moga_archive.json")) as f:
+            archive = json.load(f)
+        self.assertEqual(len(archive["objectives"]), len(worker.archive))
+        self.assertEqual(len(archive["parameters"][0]), 48)
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,146 @@
+import unittest
+import numpy as np
+import os
+import sys
+
+# Add 'codes' directory to sys.path to allow importing modules correctly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../codes')))
+
+from modules.pareto import (FrontMetrics, HypervolumeTracker, crowding_distance, generational_distance,
+                            hypervolume, hypervolume_contribution, igd_plus, non_dominated_sort,
+                            select_nsga2, spread, tournament_dcd)
+
+try:
+    from deap import base, creator, tools
+    DEAP_AVAILABLE = True
+except ImportError:
+    DEAP_AVAILABLE = False
+
+
+class TestPareto(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(3)
+        # Continuous objectives and coarse integer ones with many ties and duplicates
+        self.samples = [rng.random((150, 3)), rng.integers(0, 6, (150, 3)).astype(float)]
+
+    def test_fronts_are_mutually_non_dominated(self):
+        """Test that every front member is dominated only by members of earlier fronts"""
+        for objectives in self.samples:
+            fronts = non_dominated_sort(objectives)
+            self.assertEqual(sorted(np.concatenate(fronts)), list(range(len(objectives))))
+            rank = np.empty(len(objectives), dtype=int)
+            for r, front in enumerate(fronts):
+                rank[front] = r
+            for i, j in np.ndindex(len(objectives), len(objectives)):
+                if np.all(objectives[i] <= objectives[j]) and np.any(objectives[i] < objectives[j]):
+                    self.assertLess(rank[i], rank[j])
+            first = non_dominated_sort(objectives, first_front_only=True)
+            self.assertEqual(len(first), 1)
+            np.testing.assert_array_equal(first[0], fronts[0])
+
+    @unittest.skipIf(not DEAP_AVAILABLE, "DEAP not installed")
+    def test_matches_deap(self):
+        """Test fronts, crowding distances and survivors against DEAP's NSGA-II tools"""
+        if not hasattr(creator, "ParetoTestFitness"):
+            creator.create("ParetoTestFitness", base.Fitness, weights=(-1.0, -1.0, -1.0))
+            creator.create("ParetoTestIndividual", list, fitness=creator.ParetoTestFitness)
+        for objectives in self.samples:
+            pop = [creator.ParetoTestIndividual([i]) for i in range(len(objectives))]
+            for ind, values in zip(pop, objectives):
+                ind.fitness.values = tuple(values)
+            deap_fronts = tools.sortNondominated(pop, len(pop))
+            fronts = non_dominated_sort(objectives)
+            self.assertEqual([sorted(ind[0] for ind in f) for f in deap_fronts], [sorted(f) for f in fronts])
+            for front in deap_fronts:
+                tools.emo.assignCrowdingDist(front)
+                order = [ind[0] for ind in front]
+                np.testing.assert_allclose(crowding_distance(objectives[order]),
+                                           [ind.fitness.crowding_dist for ind in front])
+
+            # Survivors may differ only among members of equal crowding distance
+            chosen, ranks, crowding = select_nsga2(objectives, 60)
+            self.assertEqual(len(chosen), 60)
+            survivors = tools.selNSGA2(pop, 60)
+            self.assertEqual(sorted(zip(ranks[chosen], crowding[chosen])),
+                             sorted(zip(ranks[[ind[0] for ind in survivors]],
+                                        crowding[[ind[0] for ind in survivors]])))
+
+    def test_tournament(self):
+        """Test that tournaments return k members and always pick a dominating contestant"""
+        objectives = self.samples[0]
+        _, _, crowding = select_nsga2(objectives, len(objectives))
+        for k in (1, 10, 150, 301):
+            winners = tournament_dcd(objectives, crowding, k)
+            self.assertEqual(len(winners), k)
+        # A population with one dominating point: it wins every tournament it enters
+        objectives = np.vstack([np.zeros((1, 3)), np.column_stack([np.arange(1, 10), np.arange(9, 0, -1), np.ones(9)])])
+        _, _, crowding = select_nsga2(objectives, len(objectives))
+        winners = tournament_dcd(objectives, crowding, 1000)
+        self.assertEqual(np.count_nonzero(winners == 0), 200)
+
+
+def grid_hypervolume(points, ref_point):
+    """Hypervolume summed over the cells of the grid spanned by the coordinates"""
+    points = points[np.all(points < ref_point, axis=1)]
+    axes = [np.unique(np.append(points[:, k], ref_point[k])) for k in range(len(ref_point))]
+    lows = np.stack([g.ravel() for g in np.meshgrid(*[a[:-1] for a in axes], indexing="ij")], axis=1)
+    sizes = np.prod(np.stack([g.ravel() for g in np.meshgrid(*[np.diff(a) for a in axes], indexing="ij")], axis=1), axis=1)
+    dominated = np.zeros(len(lows), dtype=bool)
+    for point in points:
+        dominated |= np.all(lows >= point, axis=1)
+    return float(sizes[dominated].sum())
+
+
+class TestQualityIndicators(unittest.TestCase):
+    def test_hypervolume_is_exact(self):
+        """Test hypervolumes and contributions against a grid computation, ties and dominated points included"""
+        rng = np.random.default_rng(5)
+        for trial in range(60):
+            n_obj = 3 if trial % 3 else 2
+            points = rng.integers(0, 6, (12, n_obj)).astype(float) if trial % 2 else rng.random((12, n_obj))
+            ref_point = np.full(n_obj, 5.5 if trial % 2 else 1.1)
+            expected = grid_hypervolume(points, ref_point)
+            self.assertAlmostEqual(hypervolume(points, ref_point), expected, places=9)
+            others = points[1:]
+            self.assertAlmostEqual(hypervolume_contribution(points[0], others, ref_point),
+                                   expected - grid_hypervolume(others, ref_point), places=9)
+        with self.assertRaises(ValueError):
+            hypervolume(rng.random((5, 4)), np.ones(4))
+
+    def test_tracker_follows_changing_front(self):
+        """Test that incremental and full hypervolume updates agree with a recomputation"""
+        rng = np.random.default_rng(6)
+        ref_point = np.full(3, 1.1)
+        tracker = HypervolumeTracker(ref_point)
+        points = rng.random((300, 3))
+        for changes in [1, 2, 3, 30, 1, 2, 60, 3] * 3:
+            points[rng.integers(0, len(points), changes)] = rng.random((changes, 3)) * 0.9
+            front = points[non_dominated_sort(points, first_front_only=True)[0]]
+            self.assertAlmostEqual(tracker.update(front), hypervolume(front, ref_point), places=10)
+
+    def test_front_scores(self):
+        """Test IGD+, GD and Spread on known fronts and the rescoring of a run"""
+        t = np.linspace(0, 1, 101)
+        reference = np.column_stack([t, 1 - t])
+        self.assertEqual(igd_plus(reference, reference), 0.0)
+        self.assertAlmostEqual(igd_plus(reference + 0.1, reference), np.hypot(0.1, 0.1))
+        # A dominating front has no IGD+ but does have a GD
+        self.assertEqual(igd_plus(reference - 0.1, reference), 0.0)
+        self.assertAlmostEqual(generational_distance(reference - 0.1, reference), np.hypot(0.1, 0.1))
+        self.assertAlmostEqual(spread(reference, reference), 0.0)
+        self.assertGreater(spread(reference[:20], reference), 0.5)
+
+        metrics = FrontMetrics([2.0, 2.0])
+        values = [metrics.update(reference + shift) for shift in (0.3, 0.2, 0.0)]
+        self.assertTrue(all(v["IGD+"] == 0.0 for v in values))
+        self.assertAlmostEqual(values[-1]["HV"], hypervolume(reference, [2.0, 2.0]))
+        rescored = [v["IGD+"] for v in metrics.rescore()]
+        self.assertGreater(rescored[0], rescored[1])
+        self.assertEqual(rescored[2], 0.0)
+        known = FrontMetrics([2.0, 2.0], reference_front=reference)
+        self.assertAlmostEqual(known.update(reference + 0.1)["IGD+"], np.hypot(0.1, 0.1))
+        self.assertEqual(known.rescore(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,110 @@
+import unittest
+import numpy as np
+import os
+import sys
+
+# Add 'codes' directory to sys.path to allow importing modules correctly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../codes')))
+
+import modules.pareto_archive as pareto_archive
+from modules.pareto import non_dominated_sort
+from modules.pareto_archive import ParetoArchive
+
+
+class TestParetoArchive(unittest.TestCase):
+    def setUp(self):
+        # Small leaves so that the tests exercise splits and deep trees
+        self.leaf_size = pareto_archive.ND_TREE_LEAF_SIZE
+        pareto_archive.ND_TREE_LEAF_SIZE = 5
+        self.rng = np.random.default_rng(11)
+
+    def tearDown(self):
+        pareto_archive.ND_TREE_LEAF_SIZE = self.leaf_size
+
+    def sphere(self, n):
+        """Points near the positive octant of the unit sphere (mostly non-dominated)"""
+        points = np.abs(self.rng.standard_normal((n, 3)))
+        return points / np.linalg.norm(points, axis=1)[:, None] * (1 + 0.05 * self.rng.random((n, 1)))
+
+    def test_archive_is_the_first_front_of_all_offers(self):
+        """Test the archive against a non-dominated sort of everything offered, one by one and in batches"""
+        for trial in range(12):
+            n_obj = 2 + trial % 2
+            # Coarse integer objectives give ties and duplicates
+            points = (self.rng.integers(0, 8, (400, n_obj)).astype(float) if trial % 3 == 0
+                      else self.rng.random((400, n_obj)))
+            parameters = self.rng.random((400, 4))
+            archive = ParetoArchive(n_obj)
+            if trial % 2:
+                for start in range(0, len(points), 37):
+                    archive.add_many(points[start:start + 37], parameters[start:start + 37])
+            else:
+                for point, params in zip(points, parameters):
+                    archive.add(point, params)
+            expected = np.unique(points[non_dominated_sort(points, first_front_only=True)[0]], axis=0)
+            self.assertEqual(len(archive), len(expected))
+            np.testing.assert_array_equal(np.unique(archive.objectives, axis=0), expected)
+            self.assertEqual(archive.offered, len(points))
+            # Parameters stay with their objectives
+            for objectives, params in zip(archive.objectives, archive.parameters):
+                matches = np.flatnonzero(np.all(points == objectives, axis=1))
+                self.assertTrue(any(np.allclose(parameters[i], params) for i in matches))
+
+        archive = ParetoArchive(2)
+        self.assertFalse(archive.add([np.nan, 1.0]))
+        self.assertTrue(archive.add([1.0, 1.0]))
+        self.assertFalse(archive.add([1.0, 1.0]))
+        self.assertTrue(archive.add([0.5, 2.0]))
+        self.assertTrue(archive.add([0.0, 0.0]))
+        np.testing.assert_array_equal(archive.objectives, [[0.0, 0.0]])
+
+    def test_bounded_archive(self):
+        """Test that pruning bounds the size, keeps the extremes and keeps the members non-dominated"""
+        points = self.sphere(3000)
+        archive = ParetoArchive(3, max_size=200)
+        for start in range(0, len(points), 100):
+            archive.add_many(points[start:start + 100])
+        self.assertLessEqual(len(archive), 200 * (1 + pareto_archive.PRUNE_SLACK))
+        members = archive.objectives
+        self.assertEqual(len(non_dominated_sort(members, first_front_only=True)[0]), len(members))
+        np.testing.assert_array_equal(members.min(axis=0), points.min(axis=0))
+
+        boxed = ParetoArchive(3, max_size=100, prune="epsilon", epsilon=0.2)
+        boxed.add_many(points)
+        self.assertLessEqual(len(boxed), 100)
+        boxes = np.floor(boxed.objectives / 0.2)
+        self.assertEqual(len(np.unique(boxes, axis=0)), len(boxes))
+        with self.assertRaises(ValueError):
+            ParetoArchive(3, prune="epsilon")
+
+    def test_queries(self):
+        """Test dominated-by, dominating, nearest and knee queries on a known front"""
+        t = np.linspace(0, 1, 11)
+        front = np.column_stack([t, 1 - t])
+        # A knee that bulges towards the origin
+        front[5] = [0.45, 0.45]
+        archive = ParetoArchive(2)
+        archive.add_many(front, front * 10, labels=list(range(11)))
+        members = archive.objectives
+
+        dominated = archive.dominated_by([0.42, 0.42])
+        np.testing.assert_array_equal(members[dominated], [[0.45, 0.45]])
+        self.assertEqual(archive.dominated_by([[0.42, 0.42], [2.0, 2.0]]).shape, (2, 11))
+        self.assertFalse(archive.dominated_by([2.0, 2.0]).any())
+        self.assertEqual(np.count_nonzero(archive.dominating([0.25, 0.95])), 2)
+
+        distances, indices = archive.nearest([[0.0, 1.0], [1.0, 0.0]])
+        np.testing.assert_allclose(distances, 0.0, atol=1e-12)
+        np.testing.assert_array_equal(members[indices], [[0.0, 1.0], [1.0, 0.0]])
+        self.assertEqual(archive.labels[indices[0]], 0)
+        np.testing.assert_allclose(archive.parameters[indices], members[indices] * 10)
+
+        np.testing.assert_array_equal(members[archive.knee_points()], [[0.45, 0.45]])
+        self.assertEqual(len(archive.knee_points(3)), 3)
+        data = archive.to_dict()
+        self.assertEqual(len(data["objectives"]), 11)
+        self.assertEqual(data["offered"], 11)
+
+
+if __name__ == '__main__':
+    unittest.main()
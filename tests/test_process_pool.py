@@ -0,0 +1,54 @@
+import unittest
+import numpy as np
+import os
+import sys
+
+# Add 'codes' directory to sys.path to allow importing modules correctly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../codes')))
+
+from modules.frf_cache import FRFCache, cached_frf
+from modules.process_pool import FRFProcessPool
+
+
+class TestFRFProcessPool(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.main_params = [1.0, 1.0, 1.0, 0.5, 0.5, 0.5, 0.75, 0.75, 0.75, 0.75, 0.75,
+                           0.05, 0.95, 100.0, 100.0, 100.0, 0.01]
+        cls.targets = {f"mass_{i}": {"peak_value_1": 1.0, "area_under_curve": 30.0} for i in range(1, 6)}
+        cls.population = np.random.default_rng(0).uniform(0.01, 1.0, (12, 48))
+        cls.pool = FRFProcessPool(cls.main_params, 0, 200, 200, cls.targets, cls.targets, n_workers=2)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.pool.close()
+
+    def test_matches_serial_evaluation(self):
+        """Test that the worker processes return the serial FRF summaries"""
+        summaries = self.pool.evaluate(self.population)
+        for row, summary in zip(self.population, summaries):
+            reference = cached_frf(self.main_params, tuple(row), 0, 200, 200,
+                                   self.targets, self.targets, cache=FRFCache())
+            self.assertEqual(summary["singular_response"], reference["singular_response"])
+        # A larger population grows the shared block
+        self.assertEqual(len(self.pool.evaluate(np.vstack([self.population] * 3))), 36)
+
+    def test_submit_single_design(self):
+        """Test that a design submitted on its own returns the same summary"""
+        futures = [self.pool.submit(row) for row in self.population[:3]]
+        expected = self.pool.evaluate(self.population[:3])
+        self.assertEqual([f.result()["singular_response"] for f in futures],
+                         [s["singular_response"] for s in expected])
+
+    def test_abort_skips_remaining_chunks(self):
+        """Test that an abort request leaves undispatched rows unevaluated"""
+        self.pool.chunk_size = 1
+        try:
+            summaries = self.pool.evaluate(self.population, should_stop=lambda: True)
+        finally:
+            self.pool.chunk_size = None
+        self.assertEqual(summaries, [None] * len(self.population))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import unittest
+import numpy as np
+import sys
+import os
+from PyQt5.QtCore import QCoreApplication
+
+# Add 'codes' directory to sys.path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../codes')))
+
+from workers.PSOWorker import PSOWorker, Swarm, TopologyType
+
+
+class TestPSOSwarm(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        if not QCoreApplication.instance():
+            cls.app = QCoreApplication(sys.argv)
+        else:
+            cls.app = QCoreApplication.instance()
+
+    def setUp(self):
+        main_params = [1.0, 1.0, 1.0, 0.5, 0.5, 0.5, 0.75, 0.75, 0.75, 0.75, 0.75,
+                       0.05, 0.95, 100.0, 100.0, 100.0, 0.01]
+        targets = {f"mass_{i}": {"peak_value_1": 1.0} for i in range(1, 6)}
+        self.bounds = [(f"p{i}", 0.01, 1.0, i % 6 == 0) for i in range(48)]
+        self.worker = PSOWorker(main_params, targets, targets, 0, 200, 20,
+                                pso_swarm_size=9, pso_num_iterations=4, pso_parameter_data=self.bounds)
+
+    def test_neighborhood_index_arrays(self):
+        """Test that every topology gives each particle itself and valid neighbors"""
+        for topology in TopologyType:
+            neighborhoods = self.worker.create_neighborhoods(10, topology)
+            self.assertEqual(neighborhoods.shape[0], 10)
+            self.assertTrue(np.all((neighborhoods >= 0) & (neighborhoods < 10)))
+            self.assertTrue(np.all(np.any(neighborhoods == np.arange(10)[:, None], axis=1)))
+        ring = self.worker.create_neighborhoods(5, TopologyType.RING)
+        self.assertEqual(ring[0].tolist(), [4, 0, 1])
+        random_rows = self.worker.create_neighborhoods(10, TopologyType.RANDOM)
+        self.assertTrue(all(len(set(row)) == 6 for row in random_rows.tolist()))
+
+    def test_swarm_bests(self):
+        """Test personal, neighborhood and global bests of the array swarm"""
+        swarm = Swarm(np.arange(8.0).reshape(4, 2), np.zeros((4, 2)), [4.0, 3.0, 2.0, 1.0])
+        swarm.positions = swarm.positions + 10
+        improved = swarm.update_personal_bests([5.0, 0.5, 2.5, 0.9])
+        self.assertEqual(improved.tolist(), [False, True, False, True])
+        self.assertEqual(swarm.stagnation.tolist(), [1, 0, 1, 0])
+        self.assertEqual(swarm.best_positions[1].tolist(), [12.0, 13.0])
+        self.assertEqual(swarm.global_best_index, 1)
+        swarm.update_neighborhood_bests(self.worker.create_neighborhoods(4, TopologyType.RING))
+        self.assertEqual(swarm.neighborhood_best_fitness.tolist(), [0.5, 0.5, 0.5, 0.9])
+        swarm.keep([3, 1])
+        self.assertEqual(swarm.best_fitness.tolist(), [0.9, 0.5])
+
+    def test_run_keeps_bounds_and_fixed_parameters(self):
+        """Test that the vectorized swarm stays in bounds and leaves fixed parameters alone"""
+        finished = []
+        self.worker.finished.connect(lambda *args: finished.append(args))
+        self.worker.run()
+        self.assertEqual(len(finished), 1)
+        best = np.array(finished[0][1])
+        self.assertTrue(np.all((best >= 0.01) & (best <= 1.0)))
+        self.assertTrue(np.all(best[::6] == 0.01))
+        self.assertEqual(finished[0][3], min(self.worker.metrics['best_fitness_per_gen']))
+
+
+if __name__ == '__main__':
+    unittest.main()
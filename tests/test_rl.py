@@ -1,13 +1,17 @@
 import unittest
 import sys
 import os
+import pickle
 import time
+import tempfile
+import numpy as np
 from PyQt5.QtCore import QCoreApplication
 
 # Add 'codes' directory to sys.path
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../codes')))
 
 from RL.RLWorker import RLWorker
+from RL.experience import LEGACY_SUFFIX, POLICY_FILE, ExperienceBuffer, migrate_legacy_file
 
 class TestRLWorker(unittest.TestCase):
     @classmethod
@@ -67,5 +71,119 @@ class TestRLWorker(unittest.TestCase):
 
         self.assertTrue(len(results) > 0, "RLWorker did not emit any progress")
 
+    def test_vectorized_proposals(self):
+        """Test that K environments get K distinct in-bounds proposals and a K-transition update"""
+        bounds = [(name, 0.2, 0.8, i == 0) for i, (name, _, _, _) in enumerate(self.dva_bounds)]
+        worker = RLWorker(
+            self.main_params, self.targets, self.weights, 0, 200, 20,
+            rl_num_episodes=1, rl_max_steps=2, rl_alpha=0.01, rl_gamma=0.9, rl_epsilon=0.5,
+            rl_epsilon_min=0.01, rl_epsilon_decay_type="linear", rl_epsilon_decay=0.99,
+            rl_parameter_data=bounds, batch_size=8, rl_num_envs=16
+        )
+        proposals = np.array(worker.generate_parameters_batch(16))
+        self.assertEqual(proposals.shape, (16, 48))
+        self.assertEqual(len(np.unique(proposals[:, 1])), 16)
+        self.assertTrue(np.all(proposals[:, 0] == 0.2))
+        self.assertTrue(np.all((proposals >= 0.2) & (proposals <= 0.8)))
+
+        worker.experience_buffer.add(proposals, -np.ones(16))
+        weights = worker.policy_weights.copy()
+        worker.update_policy(worker.experience_buffer, 16)
+        np.testing.assert_allclose(worker.policy_weights[1:],
+                                   (weights[1:] - 0.01 * proposals[:, 1:].mean(axis=0)) * 0.999)
+        worker.evaluator.close()
+
+    def test_vectorized_update_uses_fresh_transitions(self):
+        """Test that a K-environment update uses the K latest transitions even with older ones in the buffer"""
+        bounds = [(name, 0.2, 0.8, i == 0) for i, (name, _, _, _) in enumerate(self.dva_bounds)]
+        worker = RLWorker(
+            self.main_params, self.targets, self.weights, 0, 200, 20,
+            rl_num_episodes=1, rl_max_steps=2, rl_alpha=0.01, rl_gamma=0.9, rl_epsilon=0.5,
+            rl_epsilon_min=0.01, rl_epsilon_decay_type="linear", rl_epsilon_decay=0.99,
+            rl_parameter_data=bounds, batch_size=8, rl_num_envs=16
+        )
+        # Older transitions with a large reward would dominate a random minibatch
+        worker.experience_buffer.add(np.full((100, 48), 0.5), np.full(100, 50.0))
+        proposals = np.array(worker.generate_parameters_batch(16))
+        worker.experience_buffer.add(proposals, -np.ones(16))
+        weights = worker.policy_weights.copy()
+        worker.update_policy(worker.experience_buffer, 16, fresh=16)
+        np.testing.assert_allclose(worker.policy_weights[1:],
+                                   (weights[1:] - 0.01 * proposals[:, 1:].mean(axis=0)) * 0.999)
+        worker.evaluator.close()
+
+class TestExperienceBuffer(unittest.TestCase):
+    def test_ring_and_sampling(self):
+        """Test that the buffer keeps the latest transitions and samples distinct ones"""
+        buffer = ExperienceBuffer(10, 3)
+        actions = np.arange(45, dtype=float).reshape(15, 3)
+        buffer.add(actions[:4], -np.arange(4))
+        self.assertEqual(len(buffer), 4)
+        buffer.add(actions[4:], -np.arange(4, 15))
+        self.assertEqual(len(buffer), 10)
+        # The 10 most recent transitions survive
+        self.assertEqual(sorted(buffer.rewards), sorted(-np.arange(5, 15)))
+        states, sampled, rewards = buffer.sample(6)
+        self.assertEqual(states.shape, (6, 0))
+        self.assertEqual(len(np.unique(rewards)), 6)
+        np.testing.assert_array_equal(sampled, actions[(-rewards).astype(int)])
+
+        # The latest transitions are always drawn, the rest from older ones
+        _, _, rewards = buffer.sample(6, include_latest=4)
+        self.assertEqual(sorted(rewards[:4]), sorted(-np.arange(11, 15)))
+        self.assertTrue(np.all(rewards[4:] > -11))
+        self.assertEqual(len(np.unique(rewards)), 6)
+
+    def test_append_only_persistence(self):
+        """Test that saves append only new transitions and loads keep the most recent ones"""
+        directory = os.path.join(tempfile.mkdtemp(), "experience")
+        buffer = ExperienceBuffer(8, 2)
+        buffer.add(np.ones((5, 2)), np.arange(5))
+        self.assertEqual(buffer.save(directory), 5)
+        self.assertEqual(buffer.save(directory), 0)
+        buffer.add(np.ones((6, 2)), np.arange(5, 11))
+        self.assertEqual(buffer.save(directory), 6)
+        self.assertEqual(sorted(os.listdir(directory)), ["experience_000000.npy", "experience_000001.npy"])
+
+        loaded = ExperienceBuffer(8, 2)
+        self.assertEqual(loaded.load(directory), 8)
+        self.assertEqual(sorted(loaded.rewards), list(range(3, 11)))
+        # Loaded transitions are not written again
+        self.assertEqual(loaded.save(directory), 0)
+        # Segments of another parameter count are ignored
+        self.assertEqual(ExperienceBuffer(8, 3).load(directory), 0)
+
+    def test_legacy_file_is_migrated(self):
+        """Test that a pickle file of the earlier format becomes the first segment of a directory"""
+        path = os.path.join(tempfile.mkdtemp(), "experience.pkl")
+        transitions = [([0.1 * i, 0.2], 1.0 + i, {"singular_response": 1.0}) for i in range(4)]
+        transitions.append(([0.5, 0.5, 0.5], 9.0, {}))
+        with open(path, "wb") as f:
+            pickle.dump({"experience_buffer": transitions, "policy_weights": np.full(2, 0.3),
+                         "policy_bias": np.zeros(2)}, f)
+
+        self.assertEqual(migrate_legacy_file(path, 2), 4)
+        self.assertTrue(os.path.isdir(path))
+        self.assertTrue(os.path.isfile(path + LEGACY_SUFFIX))
+        loaded = ExperienceBuffer(8, 2)
+        self.assertEqual(loaded.load(path), 4)
+        self.assertEqual(sorted(loaded.rewards[:4]), [-4.0, -3.0, -2.0, -1.0])
+        with np.load(os.path.join(path, POLICY_FILE)) as policy:
+            np.testing.assert_array_equal(policy["weights"], np.full(2, 0.3))
+
+        # New experience is appended after the migrated segment
+        loaded.add(np.ones((1, 2)), [0.0])
+        self.assertEqual(loaded.save(path), 1)
+
+    def test_unknown_file_is_rejected(self):
+        """Test that a file that is not a legacy pickle gives a clear error and is left alone"""
+        path = os.path.join(tempfile.mkdtemp(), "notes.txt")
+        with open(path, "w") as f:
+            f.write("not experience")
+        with self.assertRaisesRegex(ValueError, "directory"):
+            migrate_legacy_file(path, 2)
+        self.assertTrue(os.path.isfile(path))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -66,5 +66,35 @@ class TestSAWorker(unittest.TestCase):
 
         self.assertTrue(len(results) > 0, "SAWorker did not emit any progress")
 
+    def test_parallel_tempering(self):
+        """Test that replicas advance in lock-step with one controller each"""
+        worker = SAWorker(
+            self.main_params,
+            self.targets, self.weights,
+            0, 200, 20,
+            sa_initial_temp=1.0,
+            sa_cooling_rate=0.9,
+            sa_num_iterations=6,
+            sa_tol=1e-9,
+            sa_parameter_data=self.dva_bounds,
+            use_ml_adaptive=True,
+            evaluation_backend="thread",
+            evaluation_workers=2,
+            sa_mode="parallel_tempering",
+            pt_replicas=3
+        )
+        finished = []
+        worker.finished.connect(lambda *args: finished.append(args))
+        worker.run()
+        self.assertEqual(len(finished), 1)
+        results, best_candidate, _, best_fitness = finished[0]
+        metrics = results['benchmark_metrics']
+        self.assertEqual(metrics['parallel_tempering']['temperature_ladder'], [1.0, 2.0, 4.0])
+        self.assertEqual(metrics['evaluation_count'], 3 * 7)
+        self.assertTrue(all(len(fits) == 3 for fits in metrics['fitness_history']))
+        self.assertEqual(min(metrics['best_fitness_per_gen']), best_fitness)
+        self.assertEqual(sorted({r['replica'] for r in metrics['ml_controller_history']}), [0, 1, 2])
+        self.assertEqual(len(best_candidate), len(self.dva_bounds))
+
 if __name__ == '__main__':
     unittest.main()
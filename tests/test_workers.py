@@ -66,6 +66,30 @@ class TestOptimizationWorkers(unittest.TestCase):
         self.assertTrue(len(results) > 0, "GAWorker did not emit any progress")
         self.assertLess(results[0], 1e6)
 
+    def test_ga_worker_steady_state(self):
+        """Test that the steady-state GA spends its evaluation budget and reports it"""
+        worker = GAWorker(
+            self.main_params,
+            self.targets, self.weights,
+            0, 200, 20, 8, 3, 0.7, 0.2, 1e-9,
+            self.dva_bounds,
+            evaluation_backend="thread",
+            evaluation_workers=2,
+            ga_mode="steady_state",
+            track_metrics=False
+        )
+        evaluations = []
+        finished = []
+        worker.evaluation_progress.connect(lambda done, total: evaluations.append((done, total)))
+        worker.finished.connect(lambda results, best, names, fitness: finished.append(fitness))
+
+        worker.run()
+
+        self.assertEqual(evaluations[-1], (24, 24))
+        self.assertEqual([done for done, _ in evaluations], sorted(done for done, _ in evaluations))
+        self.assertEqual(len(finished), 1)
+        self.assertLess(finished[0], 1e6)
+
     def test_pso_worker_evaluation(self):
         """Test basic fitness evaluation for PSO worker"""
         worker = PSOWorker(